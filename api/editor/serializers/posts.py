@@ -9,11 +9,28 @@ from rest_framework import serializers
 
 from api.editor.media_urls import relative_media_url
 from blog.models import SitePublication
+from editor.image_jobs import image_processing_status
+from editor.image_variants import IMAGE_SIZES, responsive_image
 from editor.models import Category, Post, PostGalleryImage, Series
 
 User = get_user_model()
 
 
+def responsive_image_data(field_file, slot: str) -> dict[str, Any] | None:
+    """Intrinsic size plus ``srcset``/``sizes`` per format for ``<picture>``."""
+    image = responsive_image(field_file)
+    if image is None:
+        return None
+    return {
+        "width": image.width,
+        "height": image.height,
+        "sizes": IMAGE_SIZES[slot],
+        "sources": [
+            {"type": mime_type, "srcset": srcset} for mime_type, srcset in image.sources
+        ],
+    }
+
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
@@ -67,14 +84,33 @@ class PostListSerializer(serializers.ModelSerializer):
 
 class PostGallerySerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    image_status = serializers.SerializerMethodField()
 
     class Meta:
         model = PostGalleryImage
-        fields = ("id", "gallery_key", "image", "image_url", "caption", "order")
+        fields = (
+            "id",
+            "gallery_key",
+            "image",
+            "image_url",
+            "image_variants",
+            "image_status",
+            "placeholder",
+            "color",
+            "caption",
+            "order",
+        )
 
     def get_image_url(self, obj: PostGalleryImage) -> str:
         return relative_media_url(obj.image)
 
+    def get_image_variants(self, obj: PostGalleryImage) -> dict[str, Any] | None:
+        return responsive_image_data(obj.image, "gallery")
+
+    def get_image_status(self, obj: PostGalleryImage) -> str | None:
+        return image_processing_status(obj, "image")
+
 
 class PostDetailSerializer(serializers.ModelSerializer):
     author = AuthorSerializer(read_only=True)
@@ -96,6 +132,8 @@ class PostDetailSerializer(serializers.ModelSerializer):
     gallery_images = PostGallerySerializer(many=True, read_only=True)
     cover_image_url = serializers.SerializerMethodField()
     cover_image = serializers.SerializerMethodField()
+    cover_image_variants = serializers.SerializerMethodField()
+    cover_image_status = serializers.SerializerMethodField()
     draft_preview_url = serializers.SerializerMethodField()
     is_on_site = serializers.SerializerMethodField()
 
@@ -110,6 +148,10 @@ class PostDetailSerializer(serializers.ModelSerializer):
             "author_id",
             "cover_image",
             "cover_image_url",
+            "cover_image_variants",
+            "cover_image_status",
+            "cover_placeholder",
+            "cover_color",
             "cover_image_credits",
             "cover_description",
             "body",
@@ -136,6 +178,12 @@ class PostDetailSerializer(serializers.ModelSerializer):
         url = relative_media_url(obj.cover_image)
         return url or None
 
+    def get_cover_image_variants(self, obj: Post) -> dict[str, Any] | None:
+        return responsive_image_data(obj.cover_image, "cover")
+
+    def get_cover_image_status(self, obj: Post) -> str | None:
+        return image_processing_status(obj, "cover_image")
+
     def get_draft_preview_url(self, obj: Post) -> str:
         request = self.context.get("request")
         path = obj.get_draft_url()
@@ -9,33 +9,14 @@ from django.conf import settings
 from core.models.network import NETWORK_SLUG_SITE, NETWORK_SLUG_TELEGRAM
 from editor.models import Post
 from sender.admin_views import _build_telegram_preview
-from sender.services.dto import PublishJobResult, StoryAvailabilityDTO
-from sender.services.post_sender import run_publish_job
+from sender.models import PublishJob
+from sender.services.dto import StoryAvailabilityDTO
+from sender.services.publish_jobs import submit_publish_job
 from sender.services.telegram_publisher import _telegram_secrets
 from sender.services.telegram_stories import check_story_availability
 
 
-def publish_job_result_to_dict(result: PublishJobResult) -> dict[str, Any]:
-    by_network: dict[str, Any] = {}
-    for key, item in result.by_network.items():
-        by_network[key] = {
-            "ok": item.ok,
-            "message_url": item.message_url,
-            "message_id": item.message_id,
-            "story_id": item.story_id,
-            "story_url": item.story_url,
-            "error": item.error,
-            "detail": item.detail,
-        }
-    return {
-        "all_ok": result.all_ok,
-        "post_id": result.post_id,
-        "status_updated": result.status_updated,
-        "by_network": by_network,
-    }
-
-
-def run_publish(
+def submit_publish(
     post_id: int,
     *,
     dest_site: bool,
@@ -43,7 +24,8 @@ def run_publish(
     telegram_format: str,
     crosslink_network: str | None,
     telegram_post_story: bool,
-) -> dict[str, Any]:
+) -> PublishJob:
+    """Queue (or, without ``PUBLISH_JOBS_ASYNC``, run) a publish job."""
     if not settings.PUBLIC_SITE_ENABLED:
         if dest_site:
             raise ValueError("Site publishing is disabled.")
@@ -54,14 +36,13 @@ def run_publish(
         slugs.append(NETWORK_SLUG_SITE)
     if dest_telegram:
         slugs.append(NETWORK_SLUG_TELEGRAM)
-    result = run_publish_job(
+    return submit_publish_job(
         post_id,
         slugs,
         telegram_format=telegram_format,
         telegram_crosslink_network=crosslink_network,
         telegram_post_story=telegram_post_story,
     )
-    return publish_job_result_to_dict(result)
 
 
 def story_availability_dict() -> dict[str, Any]:
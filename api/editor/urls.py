@@ -80,6 +80,21 @@ urlpatterns = [
         name="story_availability",
     ),
     path("publish/", publish.PublishView.as_view(), name="publish"),
+    path(
+        "publish/jobs/<int:job_id>/",
+        publish.PublishJobDetailView.as_view(),
+        name="publish_job_detail",
+    ),
+    path(
+        "publish/jobs/<int:job_id>/cancel/",
+        publish.PublishJobCancelView.as_view(),
+        name="publish_job_cancel",
+    ),
+    path(
+        "publish/jobs/<int:job_id>/retry/",
+        publish.PublishJobRetryView.as_view(),
+        name="publish_job_retry",
+    ),
     path("media/upload/", media.MediaUploadView.as_view(), name="media_upload"),
     path("config/networks/", config.NetworkListView.as_view(), name="network_list"),
     path(
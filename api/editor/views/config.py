@@ -17,7 +17,7 @@ from api.editor.serializers.config import (
     TelegramSettingsSerializer,
 )
 from core.models.network import Credential, Network
-from core.models.site_settings import get_site_settings
+from core.models.site_settings import get_site_settings, load_site_settings
 from core.models.telegram_settings import TelegramNetworkSettings
 from sender.models.post_link import PostLink
 
@@ -113,7 +113,8 @@ class SiteSettingsView(APIView):
         return Response({"ok": True, "settings": SiteSettingsSerializer(obj).data})
 
     def patch(self, request: Request) -> Response:
-        obj = get_site_settings()
+        # Edit a private copy; the cached row is shared by every request.
+        obj = load_site_settings()
         ser = SiteSettingsSerializer(obj, data=request.data, partial=True)
         ser.is_valid(raise_exception=True)
         ser.save()
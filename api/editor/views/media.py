@@ -2,12 +2,10 @@
 
 from __future__ import annotations
 
-import datetime
 import os
-import uuid
 
-from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from PIL import Image
 from rest_framework.parsers import MultiPartParser
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -15,6 +13,7 @@ from rest_framework.views import APIView
 
 from api.editor.media_urls import relative_media_path
 from api.editor.permissions import IsStaffUser
+from editor.image_upload import store_inline_image
 
 _VALID_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff")
 _EXT_BY_CONTENT_TYPE = {
@@ -38,13 +37,6 @@ def _extension_for_upload(name: str, content_type: str) -> str | None:
     return None
 
 
-def _safe_upload_basename(name: str, ext: str) -> str:
-    stem = os.path.splitext(os.path.basename(name or ""))[0].strip()
-    if not stem or stem in {".", ".."}:
-        stem = f"clipboard-{uuid.uuid4().hex[:12]}"
-    return f"{stem}{ext}"
-
-
 class MediaUploadView(APIView):
     permission_classes = [IsStaffUser]
     parser_classes = [MultiPartParser]
@@ -57,16 +49,16 @@ class MediaUploadView(APIView):
         ext = _extension_for_upload(uploaded.name, content_type)
         if ext is None:
             return Response({"error": "Unsupported file type"}, status=400)
-        basename = _safe_upload_basename(uploaded.name, ext)
-        date_path = datetime.datetime.now().strftime("%Y/%m/%d")
-        filename = f"img/post/{date_path}/{basename}"
-        file_path = default_storage.save(filename, ContentFile(uploaded.read()))
+        try:
+            file_path = store_inline_image(uploaded, ext)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            return Response({"error": "Invalid image"}, status=400)
         url = relative_media_path(default_storage.url(file_path))
         return Response(
             {
                 "url": url,
                 "uploaded": 1,
-                "fileName": basename,
+                "fileName": os.path.basename(file_path),
                 "filePath": file_path,
             },
         )
@@ -35,6 +35,7 @@ from api.editor.services.post_write_service import (
     validate_post_data,
 )
 from blog.models import SitePublication
+from editor.image_jobs import attach_image_job_statuses
 from editor.models import Category, Post, PostGalleryImage, Series
 from editor.post_history_service import PostHistoryService
 from editor.text_quality_service import PostTextQualityService, TextQualityRequestDTO
@@ -149,6 +150,7 @@ class PostDetailView(APIView):
 
     def get(self, request: Request, post_id: int) -> Response:
         post = self.get_object(post_id)
+        attach_image_job_statuses(post.gallery_images.all(), "image")
         serializer = PostDetailSerializer(post, context={"request": request})
         return Response({"ok": True, "post": serializer.data})
 
@@ -322,7 +324,8 @@ class PostGalleryListCreateView(APIView):
 
     def get(self, request: Request, post_id: int) -> Response:
         post = get_object_or_404(Post, pk=post_id)
-        images = post.gallery_images.order_by("gallery_key", "order")
+        images = list(post.gallery_images.order_by("gallery_key", "order"))
+        attach_image_job_statuses(images, "image")
         ser = PostGallerySerializer(images, many=True, context={"request": request})
         return Response({"ok": True, "results": ser.data})
 
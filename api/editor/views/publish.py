@@ -16,6 +16,13 @@ from api.editor.serializers.publish import (
 )
 from api.editor.services import publish_adapter
 from editor.models import Post
+from sender.models import PublishJob
+from sender.services.publish_jobs import (
+    PublishJobActiveError,
+    cancel_publish_job,
+    publish_job_to_dict,
+    retry_publish_job,
+)
 
 
 class PublishReadyPostsView(APIView):
@@ -61,6 +68,8 @@ class StoryAvailabilityView(APIView):
 
 
 class PublishView(APIView):
+    """Queue a publish job; ``202`` + job id while the worker runs it."""
+
     permission_classes = [IsStaffUser]
 
     def post(self, request: Request) -> Response:
@@ -69,7 +78,7 @@ class PublishView(APIView):
         data = ser.validated_data
         crosslink = (data.get("crosslink_network") or "").strip() or None
         try:
-            result = publish_adapter.run_publish(
+            job = publish_adapter.submit_publish(
                 data["post_id"],
                 dest_site=data["dest_site"],
                 dest_telegram=data["dest_telegram"],
@@ -82,4 +91,91 @@ class PublishView(APIView):
                 {"ok": False, "error": str(exc)},
                 status=status.HTTP_403_FORBIDDEN,
             )
-        return Response({"ok": result["all_ok"], "result": result})
+        except PublishJobActiveError as exc:
+            return Response(
+                {"ok": False, "error": str(exc), "job": publish_job_to_dict(exc.job)},
+                status=status.HTTP_409_CONFLICT,
+            )
+        payload = publish_job_to_dict(job)
+        if job.is_active:
+            return Response(
+                {"ok": True, "job": payload}, status=status.HTTP_202_ACCEPTED
+            )
+        result = payload["result"] or {}
+        return Response(
+            {"ok": bool(result.get("all_ok")), "job": payload, "result": result}
+        )
+
+
+class PublishJobDetailView(APIView):
+    """Status and, once finished, per-network results of a publish job."""
+
+    permission_classes = [IsStaffUser]
+
+    def get(self, request: Request, job_id: int) -> Response:
+        job = get_object_or_404(PublishJob, pk=job_id)
+        return Response({"ok": True, "job": publish_job_to_dict(job)})
+
+
+class PublishJobCancelView(APIView):
+    """Fail a queued job, or a running one left behind by a killed request."""
+
+    permission_classes = [IsStaffUser]
+
+    def post(self, request: Request, job_id: int) -> Response:
+        job = get_object_or_404(PublishJob, pk=job_id)
+        if not cancel_publish_job(job.pk, reason=f"Cancelled by {request.user}."):
+            job.refresh_from_db()
+            return Response(
+                {
+                    "ok": False,
+                    "error": (
+                        f"Publish job #{job.pk} is {job.status}; a running job "
+                        "can be cancelled only once its run has timed out."
+                    ),
+                    "job": publish_job_to_dict(job),
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        job.refresh_from_db()
+        return Response({"ok": True, "job": publish_job_to_dict(job)})
+
+
+class PublishJobRetryView(APIView):
+    """Run a failed job again; Telegram resumes after the last message sent."""
+
+    permission_classes = [IsStaffUser]
+
+    def post(self, request: Request, job_id: int) -> Response:
+        job = get_object_or_404(PublishJob, pk=job_id)
+        try:
+            retried = retry_publish_job(job.pk)
+        except PublishJobActiveError as exc:
+            return Response(
+                {"ok": False, "error": str(exc), "job": publish_job_to_dict(exc.job)},
+                status=status.HTTP_409_CONFLICT,
+            )
+        if retried is None:
+            job.refresh_from_db()
+            return Response(
+                {
+                    "ok": False,
+                    "error": (
+                        f"Publish job #{job.pk} was interrupted mid-run; "
+                        "publish the post again instead."
+                        if job.interrupted
+                        else f"Publish job #{job.pk} is {job.status}, not failed."
+                    ),
+                    "job": publish_job_to_dict(job),
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        payload = publish_job_to_dict(retried)
+        if retried.is_active:
+            return Response(
+                {"ok": True, "job": payload}, status=status.HTTP_202_ACCEPTED
+            )
+        result = payload["result"] or {}
+        return Response(
+            {"ok": bool(result.get("all_ok")), "job": payload, "result": result}
+        )
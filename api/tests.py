@@ -251,6 +251,11 @@ class EditorApiPostTests(TestCase):
 
 class EditorApiMediaUploadTests(TestCase):
     def setUp(self):
+        import tempfile
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
         self.client = APIClient()
         self.user = User.objects.create_user(
             email="media@example.com",
@@ -278,7 +283,24 @@ class EditorApiMediaUploadTests(TestCase):
         self.assertEqual(response.status_code, 200)
         payload = response.json()
         self.assertEqual(payload["uploaded"], 1)
-        self.assertTrue(payload["url"].endswith(".png"))
+        self.assertTrue(payload["filePath"].startswith("img/post/inline/"))
+        self.assertTrue(payload["url"].endswith((".avif", ".webp", ".jpg")))
+
+    def test_same_image_reuses_stored_file(self):
+        paths = []
+        for name in ("first.png", "image"):
+            response = self.client.post(
+                "/api/editor/v1/media/upload/",
+                {
+                    "upload": SimpleUploadedFile(
+                        name, self._png_bytes(), content_type="image/png"
+                    )
+                },
+                format="multipart",
+            )
+            self.assertEqual(response.status_code, 200)
+            paths.append(response.json()["filePath"])
+        self.assertEqual(paths[0], paths[1])
 
     def test_clipboard_upload_without_extension_uses_content_type(self):
         # Browsers often paste clipboard images with an empty/extension-less name.
@@ -295,8 +317,20 @@ class EditorApiMediaUploadTests(TestCase):
         self.assertEqual(response.status_code, 200)
         payload = response.json()
         self.assertEqual(payload["uploaded"], 1)
-        self.assertTrue(str(payload["fileName"]).endswith(".png"))
-        self.assertTrue(payload["url"].endswith(".png"))
+        self.assertTrue(payload["url"].endswith(payload["fileName"]))
+
+    def test_upload_rejects_corrupt_image(self):
+        uploaded = SimpleUploadedFile(
+            "broken.png",
+            b"not-an-image",
+            content_type="image/png",
+        )
+        response = self.client.post(
+            "/api/editor/v1/media/upload/",
+            {"upload": uploaded},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, 400)
 
     def test_upload_rejects_unknown_type(self):
         uploaded = SimpleUploadedFile(
@@ -782,6 +816,43 @@ class EditorApiPublishTests(TestCase):
         self.assertEqual(response.status_code, 403)
         self.assertFalse(response.json()["ok"])
 
+    @override_settings(PUBLISH_JOBS_ASYNC=True)
+    def test_async_publish_returns_job_to_poll(self):
+        from django.core.management import call_command
+
+        payload = {"post_id": self.post.pk, "dest_site": True, "dest_telegram": False}
+        response = self.client.post("/api/editor/v1/publish/", payload, format="json")
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()["job"]["id"]
+        again = self.client.post("/api/editor/v1/publish/", payload, format="json")
+        self.assertEqual(again.status_code, 409)
+
+        call_command("process_publish_jobs", "--once", stdout=io.StringIO())
+        status_response = self.client.get(f"/api/editor/v1/publish/jobs/{job_id}/")
+        job = status_response.json()["job"]
+        self.assertEqual(job["status"], "succeeded")
+        self.assertTrue(job["result"]["all_ok"])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, "published")
+
+    @override_settings(PUBLISH_JOBS_ASYNC=True)
+    def test_cancelled_job_can_be_retried(self):
+        payload = {"post_id": self.post.pk, "dest_site": True, "dest_telegram": False}
+        response = self.client.post("/api/editor/v1/publish/", payload, format="json")
+        job_id = response.json()["job"]["id"]
+
+        cancel = self.client.post(f"/api/editor/v1/publish/jobs/{job_id}/cancel/")
+        self.assertEqual(cancel.status_code, 200)
+        self.assertEqual(cancel.json()["job"]["status"], "failed")
+        again = self.client.post(f"/api/editor/v1/publish/jobs/{job_id}/cancel/")
+        self.assertEqual(again.status_code, 409)
+        retry = self.client.post(f"/api/editor/v1/publish/jobs/{job_id}/retry/")
+        self.assertEqual(retry.status_code, 202)
+        self.assertEqual(retry.json()["job"]["id"], job_id)
+        self.assertEqual(retry.json()["job"]["status"], "queued")
+        busy = self.client.post(f"/api/editor/v1/publish/jobs/{job_id}/retry/")
+        self.assertEqual(busy.status_code, 409)
+
     def test_telegram_preview_returns_cards(self):
         response = self.client.get(
             "/api/editor/v1/publish/telegram-preview/",
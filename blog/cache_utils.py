@@ -1,24 +1,162 @@
-"""Invalidate full-page cache for public blog list/detail views."""
+"""Surrogate-key invalidation for the public blog full-page cache.
+
+Each cached page records the surrogate keys it was built from (``post:12``,
+``tag:3``, ``category:1``…) and the time its render started. A change stamps
+only the keys it touches with the current time; a cached page is stale once
+any of its keys was stamped after the render began. No keyspace scans.
+"""
 
 from __future__ import annotations
 
 import logging
+import time
+from collections.abc import Iterable
 
-from django.core.cache import caches
+from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
+SURROGATE_KEY_CACHE_KEY = "blog.surrogate_key:{key}"
 
-def invalidate_blog_public_pages_cache() -> None:
-    cache = caches["default"]
-    delete_pattern = getattr(cache, "delete_pattern", None)
-    if delete_pattern is None:
-        logger.debug("Cache backend has no delete_pattern; skip blog page purge")
+# Every cached page depends on this one (nav categories, manual purge).
+SITE_KEY = "site"
+# The set of on-site posts changed (index list, "newest" sidebar).
+PUBLICATIONS_KEY = "publications"
+# Stamped by every bump: the global content version behind list/feed ETags.
+CONTENT_KEY = "content"
+
+
+def post_key(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def tag_key(tag_id: int) -> str:
+    return f"tag:{tag_id}"
+
+
+def category_key(category_id: int) -> str:
+    return f"category:{category_id}"
+
+
+def series_key(series_id: int) -> str:
+    return f"series:{series_id}"
+
+
+def _stamp_cache_key(key: str) -> str:
+    return SURROGATE_KEY_CACHE_KEY.format(key=key)
+
+
+def bump_surrogate_keys(keys: Iterable[str]) -> None:
+    """Invalidate every cached page that depends on any of *keys*."""
+    keys = set(keys)
+    if not keys:
         return
+    now = time.time_ns()
+    stamps = {_stamp_cache_key(key): now for key in keys | {CONTENT_KEY}}
+    try:
+        cache.set_many(stamps, timeout=None)
+    except Exception:
+        logger.exception("Failed to bump page cache surrogate keys")
+    _invalidate_nginx_copies(keys | {CONTENT_KEY})
+
+
+def _invalidate_nginx_copies(keys: set[str]) -> None:
+    # Pre-rendered and microcached pages are served by nginx without asking Django.
+    from blog.microcache import schedule_microcache_refresh
+    from blog.static_export import (
+        invalidate_static_pages,
+        schedule_static_export_refresh,
+    )
+
+    try:
+        invalidate_static_pages(keys)
+    except Exception:
+        logger.exception("Failed to invalidate static export")
+    schedule_static_export_refresh(keys)
+    schedule_microcache_refresh(keys)
+
+
+def ensure_surrogate_keys(keys: Iterable[str]) -> None:
+    """Create never-bumped stamps so a later lookup can tell them from evicted."""
+    cache_keys = [_stamp_cache_key(key) for key in set(keys)]
+    try:
+        present = cache.get_many(cache_keys)
+        for key in cache_keys:
+            if key not in present:
+                # ``add`` never overwrites a concurrent bump.
+                cache.add(key, 0, timeout=None)
+    except Exception:
+        logger.exception("Failed to seed page cache surrogate keys")
+
+
+def surrogate_keys_fresh_since(keys: Iterable[str], started_ns: int) -> bool:
+    """True when none of *keys* was bumped after *started_ns*.
+
+    Stamps are seeded when an entry is stored, so a missing one means it was
+    evicted and the entry is conservatively treated as stale.
+    """
+    cache_keys = [_stamp_cache_key(key) for key in set(keys)]
+    try:
+        stamps = cache.get_many(cache_keys)
+    except Exception:
+        logger.exception("Failed to read page cache surrogate keys")
+        return False
+    if len(stamps) != len(cache_keys):
+        return False
+    return all(int(stamps[key] or 0) < started_ns for key in cache_keys)
+
+
+def content_version() -> int:
+    """Nanosecond stamp of the last public content change (any bump)."""
+    key = _stamp_cache_key(CONTENT_KEY)
     try:
-        delete_pattern("*blog.post_list*")
-        delete_pattern("*blog.post_detail*")
-        delete_pattern("*editor.post_list*")
-        delete_pattern("*editor.post_detail*")
+        version = cache.get(key)
+        if version is None:
+            # Evicted or never bumped: start a new version (one full re-download).
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
     except Exception:
-        logger.exception("Failed to invalidate blog public page cache")
+        logger.exception("Failed to read public content version")
+        version = None
+    return int(version or time.time_ns())
+
+
+def record_page_dependencies(request, keys: Iterable[str]) -> None:
+    """Attach surrogate keys to the page being rendered (no-op when uncached)."""
+    collected = getattr(request, "_page_cache_dependencies", None)
+    if collected is not None:
+        collected.update(keys)
+
+
+def record_post_dependencies(request, posts: Iterable) -> None:
+    record_page_dependencies(
+        request,
+        (post_key(post.pk) for post in posts if post is not None),
+    )
+
+
+def public_post_dependency_keys(post_id: int) -> set[str]:
+    """Keys of every page an on-site post can appear on (lists, detail, nav)."""
+    from editor.models import Post, PostSeries
+
+    keys = {post_key(post_id), PUBLICATIONS_KEY}
+    category_id = (
+        Post.objects.filter(pk=post_id).values_list("category_id", flat=True).first()
+    )
+    if category_id is not None:
+        keys.add(category_key(category_id))
+    keys.update(
+        tag_key(tag_id) for tag_id in Post(pk=post_id).tags.values_list("pk", flat=True)
+    )
+    keys.update(
+        series_key(series_id)
+        for series_id in PostSeries.objects.filter(post_id=post_id).values_list(
+            "series_id", flat=True
+        )
+    )
+    return keys
+
+
+def invalidate_blog_public_pages_cache() -> None:
+    """Drop every cached public page (site-wide change, e.g. nav categories)."""
+    bump_surrogate_keys([SITE_KEY])
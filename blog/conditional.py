@@ -0,0 +1,160 @@
+"""ETag / Last-Modified validators so repeat visits get ``304`` before rendering.
+
+Lists, feeds and sitemaps use the global content version (stamped by every
+surrogate-key bump). Post detail adds the post's ``updated`` and
+``SitePublication.published_at``, cached per slug until the post's surrogate
+key is bumped, so a revalidation or page-cache hit needs no database query.
+Logged-in visitors get no validators: their HTML differs from the shared
+anonymous copy.
+"""
+
+# pyright: reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.views.decorators.http import condition
+
+from blog.cache_utils import (
+    SITE_KEY,
+    content_version,
+    ensure_surrogate_keys,
+    post_key,
+    surrogate_keys_fresh_since,
+)
+from blog.querysets import public_posts_queryset
+
+logger = logging.getLogger(__name__)
+
+POST_VALIDATORS_CACHE_KEY = "blog.post_validators:{digest}"
+POST_VALIDATORS_CACHE_TTL = 24 * 60 * 60
+
+
+def _is_shared_request(request: HttpRequest) -> bool:
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def _request_content_version(request: HttpRequest) -> int:
+    # ``condition`` asks for the ETag and Last-Modified separately.
+    if not hasattr(request, "_content_version"):
+        request._content_version = content_version()
+    return request._content_version
+
+
+def _from_ns(value_ns: int) -> datetime.datetime:
+    return datetime.datetime.fromtimestamp(value_ns / 1e9, tz=datetime.UTC)
+
+
+def content_etag(request: HttpRequest, *args, **kwargs) -> str | None:
+    if not _is_shared_request(request):
+        return None
+    return f"c{_request_content_version(request)}"
+
+
+def content_last_modified(
+    request: HttpRequest, *args, **kwargs
+) -> datetime.datetime | None:
+    if not _is_shared_request(request):
+        return None
+    return _from_ns(_request_content_version(request))
+
+
+def _load_post_validators(
+    slug: str,
+) -> tuple[datetime.datetime, datetime.datetime | None] | None:
+    """``(updated, published_at)`` of an on-site post, cached per slug.
+
+    The entry expires with the post's surrogate key (edits, publication
+    changes); only a cache miss queries the database.
+    """
+    key = POST_VALIDATORS_CACHE_KEY.format(
+        digest=hashlib.sha256(slug.encode()).hexdigest()
+    )
+    try:
+        cached = cache.get(key)
+    except Exception:
+        logger.exception("Failed to read cached post validators")
+        cached = None
+    if isinstance(cached, dict) and surrogate_keys_fresh_since(
+        [SITE_KEY, post_key(cached["post_id"])], cached["started_ns"]
+    ):
+        return cached["updated"], cached["published_at"]
+
+    started_ns = time.time_ns()
+    row = (
+        public_posts_queryset()
+        .filter(slug=slug)
+        .values_list("pk", "updated", "site_publication__published_at")
+        .first()
+    )
+    if row is None:
+        return None
+    post_id, updated, published_at = row
+    ensure_surrogate_keys([SITE_KEY, post_key(post_id)])
+    try:
+        cache.set(
+            key,
+            {
+                "post_id": post_id,
+                "updated": updated,
+                "published_at": published_at,
+                "started_ns": started_ns,
+            },
+            POST_VALIDATORS_CACHE_TTL,
+        )
+    except Exception:
+        logger.exception("Failed to cache post validators")
+    return updated, published_at
+
+
+def _post_validators(
+    request: HttpRequest, slug: str
+) -> tuple[datetime.datetime, datetime.datetime | None] | None:
+    if not hasattr(request, "_post_validators"):
+        request._post_validators = _load_post_validators(slug)
+    return request._post_validators
+
+
+def post_detail_etag(request: HttpRequest, slug: str) -> str | None:
+    row = _post_validators(request, slug) if _is_shared_request(request) else None
+    if row is None:
+        return None  # Old slug redirect or 404: let the view answer.
+    updated, published_at = row
+    raw = "|".join(
+        (
+            updated.isoformat(),
+            published_at.isoformat() if published_at else "",
+            str(_request_content_version(request)),
+        )
+    )
+    return "p" + hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+
+def post_detail_last_modified(
+    request: HttpRequest, slug: str
+) -> datetime.datetime | None:
+    row = _post_validators(request, slug) if _is_shared_request(request) else None
+    if row is None:
+        return None
+    updated, published_at = row
+    candidates = [updated, _from_ns(_request_content_version(request))]
+    if published_at is not None:
+        candidates.append(published_at)
+    return max(candidates)
+
+
+public_content_condition = condition(
+    etag_func=content_etag,
+    last_modified_func=content_last_modified,
+)
+post_detail_condition = condition(
+    etag_func=post_detail_etag,
+    last_modified_func=post_detail_last_modified,
+)
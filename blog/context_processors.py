@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+from core.services.tiered_cache import TieredCache
 from editor.models import Category
 
 # Primary nav category slugs (order preserved). Set ``Category.slug`` in admin.
 NAV_CATEGORY_SLUGS: tuple[str, ...] = ("blog", "projects")
 
 
-def nav_categories(request):
+def _load_nav_categories() -> list[Category]:
     by_slug = {
         category.slug: category
         for category in Category.objects.filter(slug__in=NAV_CATEGORY_SLUGS)
     }
-    return {
-        "nav_categories": [
-            by_slug[slug] for slug in NAV_CATEGORY_SLUGS if slug in by_slug
-        ],
-    }
+    return [by_slug[slug] for slug in NAV_CATEGORY_SLUGS if slug in by_slug]
+
+
+# Invalidated by editor.signals on any Category change.
+nav_categories_cache = TieredCache("nav_categories", _load_nav_categories)
+
+
+def nav_categories(request):
+    return {"nav_categories": nav_categories_cache.get()}
@@ -1,24 +1,119 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
 from django.contrib.syndication.views import Feed
+from django.http import Http404, HttpRequest
+from django.urls import reverse
 from django.utils.feedgenerator import Atom1Feed
-from django.utils.html import strip_tags
 
-from blog.querysets import public_posts_queryset
+from blog.cache_utils import (
+    PUBLICATIONS_KEY,
+    category_key,
+    record_page_dependencies,
+    record_post_dependencies,
+    tag_key,
+)
+from blog.conditional import public_content_condition
+from blog.page_cache import public_page_cache
+from blog.querysets import public_post_cards_queryset
+from blog.tag_helpers import resolve_tag_for_list
+from editor.models import Category, Post
+
+FEED_TITLE = "Shifted Stuff"
+FEED_ITEMS = 20
+
+
+@dataclass(frozen=True, slots=True)
+class FeedScope:
+    """What one feed URL lists; posts are fetched once in ``get_object``."""
+
+    title: str
+    link: str
+    description: str
+    posts: list[Post]
 
 
 class LatestPostsFeed(Feed):
-    title = "Shifted Stuff"
-    link = "/"
-    description = "Latest published posts."
     feed_type = Atom1Feed
 
-    def items(self):
-        return public_posts_queryset().order_by("-published")[:20]
+    def _scope(
+        self,
+        request: HttpRequest,
+        queryset,
+        *,
+        key: str,
+        title: str,
+        link: str,
+        description: str,
+    ) -> FeedScope:
+        posts = list(queryset.order_by("-published")[:FEED_ITEMS])
+        record_page_dependencies(request, [key])
+        record_post_dependencies(request, posts)
+        return FeedScope(title=title, link=link, description=description, posts=posts)
+
+    def get_object(self, request, *args, **kwargs):
+        return self._scope(
+            request,
+            public_post_cards_queryset(),
+            key=PUBLICATIONS_KEY,
+            title=FEED_TITLE,
+            link="/",
+            description="Latest published posts.",
+        )
+
+    def title(self, obj):
+        return obj.title
+
+    def link(self, obj):
+        return obj.link
+
+    def description(self, obj):
+        return obj.description
+
+    def items(self, obj):
+        return obj.posts
 
     def item_title(self, item):
         return (item.title or "").strip()
 
     def item_description(self, item):
-        return item.short_description or strip_tags(item.body or "")[:500] or ""
+        return item.short_description or item.preview_text[:500]
 
     def item_link(self, item):
         return item.get_absolute_url()
+
+
+class TagPostsFeed(LatestPostsFeed):
+    def get_object(self, request, *args, **kwargs):
+        tag, _redirect = resolve_tag_for_list(kwargs.get("tag_slug"))
+        if tag is None:
+            raise Http404("Tag not found")
+        return self._scope(
+            request,
+            public_post_cards_queryset().filter(tags__in=[tag]),
+            key=tag_key(tag.pk),
+            title=f"{FEED_TITLE}: #{tag.name}",
+            link=reverse("blog:post_list_by_tag", args=[tag.slug]),
+            description=f"Latest posts tagged #{tag.name}.",
+        )
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    def get_object(self, request, *args, **kwargs):
+        category = Category.get_by_url_slug(kwargs.get("category_slug"))
+        if category is None:
+            raise Http404("Category not found")
+        return self._scope(
+            request,
+            public_post_cards_queryset().filter(category=category),
+            key=category_key(category.pk),
+            title=f"{FEED_TITLE}: {category.name}",
+            link=reverse("blog:post_list_by_category", args=[category.slug]),
+            description=f"Latest posts in {category.name}.",
+        )
+
+
+def public_feed(feed: Feed, key_prefix: str):
+    """Feed view behind conditional GET and the shared public page cache."""
+    return public_content_condition(public_page_cache(key_prefix)(feed))
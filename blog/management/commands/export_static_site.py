@@ -0,0 +1,70 @@
+"""Pre-render public pages into STATIC_EXPORT_ROOT for nginx."""
+
+from __future__ import annotations
+
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.static_export import (
+    export_static_site,
+    run_static_export_worker,
+    static_export_root,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Write public post, list, tag/category, feed and sitemap pages to "
+        "STATIC_EXPORT_ROOT. Renders only missing or invalidated pages unless "
+        "--full (run after deploys), or keep them current with --loop."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-render every page (template or settings changes).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Render processes (default: STATIC_EXPORT_WORKERS).",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help=(
+                "Keep running: re-render pages invalidated by changes and "
+                "re-fetch changed microcached pages (every "
+                "STATIC_EXPORT_POLL_SECONDS); stop on SIGTERM."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        root = static_export_root()
+        if options["loop"]:
+            # Also re-fetches microcached pages, so it runs without an export too.
+            stop = threading.Event()
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: stop.set())
+            result = run_static_export_worker(
+                stop, getattr(settings, "STATIC_EXPORT_POLL_SECONDS", 5)
+            )
+        elif root is None:
+            self.stdout.write("STATIC_EXPORT_ROOT is not set; nothing to export.")
+            return
+        else:
+            workers = options["workers"]
+            if workers is None:
+                workers = getattr(settings, "STATIC_EXPORT_WORKERS", 4)
+            result = export_static_site(full=options["full"], workers=max(1, workers))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Static export in {root}: {result.rendered} rendered, "
+                f"{result.skipped} left to Django, {result.removed} removed."
+            )
+        )
@@ -0,0 +1,42 @@
+"""Print public page cache hit/miss/stale counters per view and per URL."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from blog.page_cache import PAGE_CACHE_OUTCOMES, page_cache_stats
+
+PUBLIC_PAGE_CACHE_PREFIXES = ("blog.post_list", "blog.post_detail")
+
+
+class Command(BaseCommand):
+    help = "Show full-page cache hit/miss/stale counters (last 7 days per counter)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            action="append",
+            default=[],
+            help="Absolute page URL to report per-key counters for (repeatable).",
+        )
+        parser.add_argument(
+            "--prefix",
+            action="append",
+            default=[],
+            help="View cache prefix (default: blog.post_list and blog.post_detail).",
+        )
+
+    def _line(self, label: str, stats: dict) -> str:
+        served = sum(stats.values())
+        ratio = (stats["hit"] + stats["stale"]) / served if served else 0.0
+        counters = " ".join(
+            f"{outcome}={stats[outcome]}" for outcome in PAGE_CACHE_OUTCOMES
+        )
+        return f"{label}: {counters} cached_ratio={ratio:.1%}"
+
+    def handle(self, *args, **options):
+        prefixes = options["prefix"] or PUBLIC_PAGE_CACHE_PREFIXES
+        for prefix in prefixes:
+            self.stdout.write(self._line(prefix, page_cache_stats(prefix)))
+            for url in options["url"]:
+                self.stdout.write(self._line(f"  {url}", page_cache_stats(prefix, url)))
@@ -0,0 +1,42 @@
+"""Recompute the precomputed "similar posts" table for on-site posts."""
+
+from __future__ import annotations
+
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.related_index import rebuild_related_posts, run_related_posts_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild RelatedPost rows from tag and title/body term similarity "
+        "(run once after deploys that add posts in bulk, or with --loop)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help=(
+                "Keep running and rebuild whenever a publish or retag flagged "
+                "the index (every RELATED_POSTS_POLL_SECONDS); stop on SIGTERM."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["loop"]:
+            stop = threading.Event()
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: stop.set())
+            changed = run_related_posts_worker(
+                stop, getattr(settings, "RELATED_POSTS_POLL_SECONDS", 30)
+            )
+        else:
+            changed = rebuild_related_posts()
+        self.stdout.write(
+            self.style.SUCCESS(f"Related posts updated for {changed} post(s).")
+        )
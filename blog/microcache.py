@@ -0,0 +1,157 @@
+"""Purge hook for the nginx microcache in front of Django.
+
+Open-source nginx has no purge API, so the rendered config exposes an internal
+server (``NGINX_MICROCACHE_REFRESH_URL``) that always fetches from Django and
+stores the result; re-fetching a changed page there replaces its cached copy.
+Changes queue their surrogate keys in Redis; the static-export service
+(``export_static_site --loop``) does the re-fetching.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Iterable
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.urls import NoReverseMatch, reverse
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from blog.cache_utils import PUBLICATIONS_KEY
+
+logger = logging.getLogger(__name__)
+
+MICROCACHE_REFRESH_TIMEOUT = 30
+MICROCACHE_PENDING_KEY = "blog.microcache:pending"
+
+
+def microcache_refresh_url() -> str:
+    return (getattr(settings, "NGINX_MICROCACHE_REFRESH_URL", "") or "").rstrip("/")
+
+
+def _redis():
+    """Raw client behind the default cache; ``None`` for non-Redis backends."""
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+def _reverse(view_name: str, *args) -> str | None:
+    try:
+        return reverse(view_name, args=args)
+    except NoReverseMatch:
+        return None
+
+
+def microcache_paths_for_keys(keys: Iterable[str]) -> list[str]:
+    """URLs whose first page is built from any of *keys*.
+
+    ``site`` is not expanded: a site-wide change waits for the microcache TTL.
+    Post detail is never microcached (see ``$microcache_skip``).
+    """
+    from taggit.models import Tag
+
+    from editor.models import Category
+
+    ids: dict[str, set[int]] = {"tag": set(), "category": set()}
+    paths: list[str | None] = []
+    for key in keys:
+        if key == PUBLICATIONS_KEY:
+            paths += [
+                reverse("blog:post_list"),
+                reverse("blog:feed"),
+                reverse("blog:html_sitemap"),
+                reverse("sitemap"),
+                reverse("sitemap_section", kwargs={"section": "posts"}),
+            ]
+            continue
+        kind, _, raw_id = key.partition(":")
+        if raw_id.isdigit() and kind in ids:
+            ids[kind].add(int(raw_id))
+    for slug in Category.objects.filter(pk__in=ids["category"]).values_list(
+        "slug", flat=True
+    ):
+        paths += [
+            _reverse("blog:post_list_by_category", slug),
+            _reverse("blog:category_feed", slug),
+        ]
+    for slug in Tag.objects.filter(pk__in=ids["tag"]).values_list("slug", flat=True):
+        paths += [
+            _reverse("blog:post_list_by_tag", slug),
+            _reverse("blog:tag_feed", slug),
+        ]
+    return [path for path in dict.fromkeys(paths) if path]
+
+
+def refresh_microcache(paths: Iterable[str]) -> int:
+    """Re-fetch *paths* through the refresh server; returns pages refreshed."""
+    base = microcache_refresh_url()
+    if not base:
+        return 0
+    host = urlparse(getattr(settings, "SITE_URL", "") or "").netloc
+    headers = {"Host": host} if host else {}
+    refreshed = 0
+    with requests.Session() as session:
+        for path in paths:
+            try:
+                response = session.get(
+                    f"{base}{path}",
+                    headers=headers,
+                    timeout=MICROCACHE_REFRESH_TIMEOUT,
+                    allow_redirects=False,
+                )
+            except requests.RequestException:
+                logger.warning("Failed to refresh microcached %s", path, exc_info=True)
+                continue
+            if response.status_code < 500:
+                refreshed += 1
+    return refreshed
+
+
+def schedule_microcache_refresh(keys: Iterable[str]) -> None:
+    """After commit, queue *keys* for the worker to re-fetch their pages."""
+    if not microcache_refresh_url():
+        return
+    keys = set(keys)
+    if not keys:
+        return
+
+    def _queue() -> None:
+        conn = _redis()
+        if conn is None:
+            return  # Pages expire on the microcache TTL.
+        try:
+            conn.sadd(cache.make_key(MICROCACHE_PENDING_KEY), *keys)
+        except Exception:
+            logger.exception("Failed to queue nginx microcache refresh")
+
+    transaction.on_commit(_queue)
+
+
+def refresh_microcache_if_pending() -> int | None:
+    """Re-fetch the pages of queued keys; ``None`` when nothing is queued."""
+    conn = _redis() if microcache_refresh_url() else None
+    if conn is None:
+        return None
+    pending_key = cache.make_key(MICROCACHE_PENDING_KEY)
+    taken_key = f"{pending_key}:refreshing:{uuid.uuid4().hex}"
+    try:
+        # Keys queued from now on go to a fresh set.
+        conn.rename(pending_key, taken_key)
+    except ResponseError:
+        return None  # Nothing queued.
+    keys = [key.decode() for key in conn.smembers(taken_key)]
+    try:
+        paths = microcache_paths_for_keys(keys)
+    except Exception:
+        conn.sadd(pending_key, *keys)
+        raise
+    finally:
+        conn.delete(taken_key)
+    return refresh_microcache(paths)
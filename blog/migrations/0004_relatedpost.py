@@ -0,0 +1,54 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0003_rename_blog_sitepub_pubat_idx_blog_sitepu_publish_3e0eea_idx"),
+        ("editor", "0016_post_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedPost",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="related_entries",
+                        to="editor.post",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="editor.post",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("post", "rank"),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("post", "rank"),
+                        name="blog_relatedpost_post_rank_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -18,3 +18,31 @@ class SitePublication(models.Model):
     def __str__(self) -> str:
         rid = getattr(self, "post_id", None)
         return f"Site publication for post_id={rid}"
+
+
+class RelatedPost(models.Model):
+    """Precomputed "similar posts" entry; rebuilt by ``blog.related_index``."""
+
+    post = models.ForeignKey(
+        "editor.Post",
+        on_delete=models.CASCADE,
+        related_name="related_entries",
+    )
+    related = models.ForeignKey(
+        "editor.Post",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ("post", "rank")
+        constraints = (
+            models.UniqueConstraint(
+                fields=["post", "rank"], name="blog_relatedpost_post_rank_uniq"
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"Related post #{self.rank} for post_id={self.post_id}"
@@ -0,0 +1,273 @@
+"""Full-page cache for anonymous public views, invalidated by surrogate keys.
+
+Expired or invalidated pages are kept for a grace period and served stale
+while a single worker (holding a short cache lock) re-renders them, so a
+purge during a traffic spike costs one render instead of one per worker.
+"""
+
+# pyright: reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import patch_response_headers
+
+from blog.cache_utils import (
+    SITE_KEY,
+    ensure_surrogate_keys,
+    surrogate_keys_fresh_since,
+)
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_KEY = "blog.page:{prefix}:{digest}"
+PAGE_CACHE_LOCK_KEY = "blog.page_lock:{prefix}:{digest}"
+PAGE_CACHE_STATS_KEY = "blog.page_stats:{prefix}:{digest}:{outcome}"
+PAGE_CACHE_STATS_TTL = 7 * 24 * 60 * 60
+PAGE_CACHE_STATUS_HEADER = "X-Page-Cache"
+
+HIT = "hit"
+MISS = "miss"
+STALE = "stale"
+PAGE_CACHE_OUTCOMES = (HIT, MISS, STALE)
+# Digest placeholder for the per-view totals kept next to per-URL counters.
+_ALL_PAGES = "all"
+
+# How long a cold miss waits for another worker's render before doing its own.
+_REBUILD_WAIT_SECONDS = 2.0
+_REBUILD_POLL_SECONDS = 0.05
+# Headers that must never be replayed to another visitor.
+_UNCACHED_HEADERS = frozenset({"set-cookie", "vary"})
+
+
+def page_cache_timeout() -> int:
+    """Seconds to keep a rendered page; ``0`` when the page cache is off."""
+    timeout = getattr(settings, "POST_PAGE_CACHE_TIMEOUT", 0)
+    if timeout <= 0 or settings.DEBUG or not getattr(settings, "IS_PRODUCTION", True):
+        return 0
+    return timeout
+
+
+def page_cache_stale_timeout() -> int:
+    """Seconds an expired page may still be served while it is rebuilt."""
+    return max(0, getattr(settings, "POST_PAGE_CACHE_STALE_TIMEOUT", 0))
+
+
+def page_cache_lock_timeout() -> int:
+    """Seconds before an abandoned rebuild lock frees itself."""
+    return max(1, getattr(settings, "POST_PAGE_CACHE_LOCK_TIMEOUT", 30))
+
+
+def page_cache_digest(absolute_uri: str) -> str:
+    return hashlib.sha256(absolute_uri.encode()).hexdigest()
+
+
+def page_cache_stats(key_prefix: str, absolute_uri: str | None = None) -> dict:
+    """Hit/miss/stale counters for one URL, or for the whole view when ``None``."""
+    digest = page_cache_digest(absolute_uri) if absolute_uri else _ALL_PAGES
+    keys = {
+        outcome: PAGE_CACHE_STATS_KEY.format(
+            prefix=key_prefix, digest=digest, outcome=outcome
+        )
+        for outcome in PAGE_CACHE_OUTCOMES
+    }
+    try:
+        values = cache.get_many(list(keys.values()))
+    except Exception:
+        logger.exception("Failed to read public page cache stats")
+        values = {}
+    return {outcome: int(values.get(key) or 0) for outcome, key in keys.items()}
+
+
+def _count(key_prefix: str, digest: str, outcome: str) -> None:
+    for scope in (digest, _ALL_PAGES):
+        key = PAGE_CACHE_STATS_KEY.format(
+            prefix=key_prefix, digest=scope, outcome=outcome
+        )
+        try:
+            if not cache.add(key, 1, PAGE_CACHE_STATS_TTL):
+                cache.incr(key)
+        except ValueError:
+            # Counter expired between ``add`` and ``incr``; drop this sample.
+            pass
+        except Exception:
+            logger.exception("Failed to count public page cache %s", outcome)
+            return
+
+
+def _request_is_cacheable(request: HttpRequest) -> bool:
+    # Logged-in editors see admin links in the header; never share their HTML.
+    if request.method not in ("GET", "HEAD"):
+        return False
+    # The static exporter needs a real render to collect the page's dependencies.
+    if getattr(request, "_static_export", False):
+        return False
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def _response_is_cacheable(response: HttpResponse) -> bool:
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not response.has_header("Cache-Control")
+    )
+
+
+def _read_entry(cache_key: str) -> dict | None:
+    try:
+        entry = cache.get(cache_key)
+    except Exception:
+        logger.exception("Failed to read public page cache")
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _entry_is_fresh(entry: dict) -> bool:
+    return entry.get("expires_at", 0) > time.time() and surrogate_keys_fresh_since(
+        entry["dependencies"], entry["started_ns"]
+    )
+
+
+def _acquire_lock(lock_key: str, token: str) -> bool:
+    # ``add`` is SET NX with an expiry on Redis: one winner, self-releasing.
+    try:
+        return cache.add(lock_key, token, page_cache_lock_timeout())
+    except Exception:
+        logger.exception("Failed to take public page cache lock")
+        return True
+
+
+def _release_lock(lock_key: str, token: str) -> None:
+    try:
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+    except Exception:
+        logger.exception("Failed to release public page cache lock")
+
+
+def _wait_for_rebuild(cache_key: str, lock_key: str) -> dict | None:
+    """Poll for the page another worker is rendering; ``None`` if it never lands."""
+    deadline = time.monotonic() + _REBUILD_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(_REBUILD_POLL_SECONDS)
+        entry = _read_entry(cache_key)
+        if entry is not None:
+            return entry
+        try:
+            if cache.get(lock_key) is None:
+                return None
+        except Exception:
+            return None
+    return None
+
+
+def _entry_from_response(
+    response: HttpResponse,
+    *,
+    started_ns: int,
+    expires_at: float,
+    dependencies: set[str],
+) -> dict:
+    return {
+        "status": response.status_code,
+        "content": response.content,
+        "headers": [
+            (name, value)
+            for name, value in response.items()
+            if name.lower() not in _UNCACHED_HEADERS
+        ],
+        "started_ns": started_ns,
+        "expires_at": expires_at,
+        "dependencies": sorted(dependencies),
+    }
+
+
+def _response_from_entry(entry: dict, outcome: str) -> HttpResponse:
+    response = HttpResponse(entry["content"], status=entry["status"])
+    for name, value in entry["headers"]:
+        response[name] = value
+    if outcome == STALE:
+        # Don't let browsers keep a copy we already know is outdated.
+        del response["Expires"]
+        patch_response_headers(response, cache_timeout=0)
+    response[PAGE_CACHE_STATUS_HEADER] = outcome.upper()
+    return response
+
+
+def public_page_cache(key_prefix: str):
+    """Cache anonymous GETs of a public view until TTL or a dependency bump.
+
+    Views report what they rendered via ``blog.cache_utils.record_*``. Outdated
+    pages are served stale (``POST_PAGE_CACHE_STALE_TIMEOUT``) while the worker
+    holding the rebuild lock renders a fresh copy.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request: HttpRequest, *args, **kwargs):
+            timeout = page_cache_timeout()
+            if timeout <= 0 or not _request_is_cacheable(request):
+                return view(request, *args, **kwargs)
+
+            digest = page_cache_digest(request.build_absolute_uri())
+            cache_key = PAGE_CACHE_KEY.format(prefix=key_prefix, digest=digest)
+            lock_key = PAGE_CACHE_LOCK_KEY.format(prefix=key_prefix, digest=digest)
+            stale_timeout = page_cache_stale_timeout()
+
+            entry = _read_entry(cache_key)
+            if entry is not None and _entry_is_fresh(entry):
+                _count(key_prefix, digest, HIT)
+                return _response_from_entry(entry, HIT)
+
+            token = uuid.uuid4().hex
+            locked = _acquire_lock(lock_key, token)
+            if not locked:
+                if entry is not None and stale_timeout > 0:
+                    _count(key_prefix, digest, STALE)
+                    return _response_from_entry(entry, STALE)
+                if entry is None:
+                    rebuilt = _wait_for_rebuild(cache_key, lock_key)
+                    if rebuilt is not None:
+                        _count(key_prefix, digest, HIT)
+                        return _response_from_entry(rebuilt, HIT)
+
+            _count(key_prefix, digest, MISS)
+            try:
+                started_ns = time.time_ns()
+                request._page_cache_dependencies = {SITE_KEY}
+                response = view(request, *args, **kwargs)
+                if isinstance(response, SimpleTemplateResponse):
+                    # Render now so template-time dependencies are recorded too.
+                    response.render()
+                if _response_is_cacheable(response):
+                    patch_response_headers(response, cache_timeout=timeout)
+                    entry = _entry_from_response(
+                        response,
+                        started_ns=started_ns,
+                        expires_at=time.time() + timeout,
+                        dependencies=request._page_cache_dependencies,
+                    )
+                    ensure_surrogate_keys(entry["dependencies"])
+                    try:
+                        cache.set(cache_key, entry, timeout + stale_timeout)
+                    except Exception:
+                        logger.exception("Failed to store public page cache")
+                    response[PAGE_CACHE_STATUS_HEADER] = MISS.upper()
+            finally:
+                if locked:
+                    _release_lock(lock_key, token)
+            return response
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,227 @@
+"""Keyset (cursor) pagination for public post lists.
+
+Pages seek by ``(published, id)`` instead of ``OFFSET`` so deep tag/category
+pages cost the same as the first one. Totals for "page N of M" come from a
+cached ``COUNT(*)`` per list scope.
+"""
+
+# pyright: reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import datetime
+import math
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import Q, QuerySet
+
+from blog.cache_utils import (
+    SITE_KEY,
+    ensure_surrogate_keys,
+    surrogate_keys_fresh_since,
+)
+from editor.models import Post
+
+POST_LIST_PAGE_SIZE = 12
+POST_LIST_COUNT_CACHE_KEY = "blog.post_list.count:{scope}"
+POST_LIST_COUNT_CACHE_TTL = 600
+
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.UTC)
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+_NEWEST_FIRST = ("-published", "-id")
+_OLDEST_FIRST = ("published", "id")
+
+
+@dataclass(frozen=True, slots=True)
+class PostCursor:
+    """Position of one list item plus the page number it was shown on."""
+
+    page: int
+    published: datetime.datetime
+    post_id: int
+
+    def encode(self) -> str:
+        micros = (self.published - _EPOCH) // _ONE_MICROSECOND
+        return f"{self.page}.{micros}.{self.post_id}"
+
+    @classmethod
+    def decode(cls, token: str | None) -> PostCursor | None:
+        """Parse ``<page>.<published µs>.<id>``; ``None`` for anything malformed."""
+        parts = (token or "").strip().split(".")
+        if len(parts) != 3:
+            return None
+        try:
+            page, micros, post_id = (int(part) for part in parts)
+        except ValueError:
+            return None
+        if page < 1 or post_id < 1:
+            return None
+        try:
+            published = _EPOCH + datetime.timedelta(microseconds=micros)
+        except OverflowError:
+            return None
+        return cls(page=page, published=published, post_id=post_id)
+
+    @classmethod
+    def for_post(cls, post: Post, *, page: int) -> PostCursor:
+        return cls(page=page, published=post.published, post_id=post.pk)
+
+
+def _older_than(cursor: PostCursor) -> Q:
+    # ``published__lte`` is redundant but gives Postgres an index range bound.
+    return Q(published__lte=cursor.published) & (
+        Q(published__lt=cursor.published)
+        | Q(published=cursor.published, id__lt=cursor.post_id)
+    )
+
+
+def _newer_than(cursor: PostCursor) -> Q:
+    return Q(published__gte=cursor.published) & (
+        Q(published__gt=cursor.published)
+        | Q(published=cursor.published, id__gt=cursor.post_id)
+    )
+
+
+class KeysetPage:
+    """One page of a keyset-paginated post list (iterable like ``Page``)."""
+
+    is_keyset = True
+
+    def __init__(
+        self,
+        object_list: list[Post],
+        *,
+        number: int,
+        num_pages: int,
+        has_next: bool,
+        has_previous: bool,
+    ):
+        self.object_list = object_list
+        self.number = number
+        self.num_pages = max(num_pages, number)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self) -> Iterator[Post]:
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: int) -> Post:
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    @property
+    def next_query(self) -> str:
+        """Query string for the next page (``""`` when there is none)."""
+        if not self._has_next or not self.object_list:
+            return ""
+        cursor = PostCursor.for_post(self.object_list[-1], page=self.number)
+        return f"after={cursor.encode()}"
+
+    @property
+    def previous_query(self) -> str:
+        """Query string for the previous page; page 1 is the bare list URL."""
+        if not self._has_previous or not self.object_list or self.number <= 2:
+            return ""
+        cursor = PostCursor.for_post(self.object_list[0], page=self.number)
+        return f"before={cursor.encode()}"
+
+
+def cached_post_count(queryset: QuerySet[Post], *, scope: str) -> int:
+    """``COUNT(*)`` for *queryset*, cached per list surrogate key.
+
+    *scope* is the list's surrogate key (``publications``, ``tag:3``…); bumping
+    it expires the cached total together with the cached list pages.
+    """
+    key = POST_LIST_COUNT_CACHE_KEY.format(scope=scope)
+    cached = cache.get(key)
+    if isinstance(cached, dict) and surrogate_keys_fresh_since(
+        [SITE_KEY, scope], cached["started_ns"]
+    ):
+        return cached["total"]
+    started_ns = time.time_ns()
+    total = queryset.count()
+    ensure_surrogate_keys([SITE_KEY, scope])
+    cache.set(
+        key,
+        {"total": total, "started_ns": started_ns},
+        POST_LIST_COUNT_CACHE_TTL,
+    )
+    return total
+
+
+def keyset_page(
+    queryset: QuerySet[Post],
+    *,
+    total: int,
+    after: PostCursor | None = None,
+    before: PostCursor | None = None,
+    page_size: int = POST_LIST_PAGE_SIZE,
+) -> KeysetPage:
+    """Fetch the page following *after* (or preceding *before*) in one query."""
+    queryset = queryset.filter(published__isnull=False)
+    num_pages = max(1, math.ceil(total / page_size))
+
+    if before is not None:
+        rows = list(
+            queryset.filter(_newer_than(before)).order_by(*_OLDEST_FIRST)[
+                : page_size + 1
+            ]
+        )
+        has_previous = len(rows) > page_size
+        rows = rows[:page_size]
+        rows.reverse()
+        number = max(2, before.page - 1) if has_previous else 1
+        return KeysetPage(
+            rows,
+            number=number,
+            num_pages=num_pages,
+            has_next=True,
+            has_previous=has_previous,
+        )
+
+    if after is not None:
+        queryset = queryset.filter(_older_than(after))
+    rows = list(queryset.order_by(*_NEWEST_FIRST)[: page_size + 1])
+    return KeysetPage(
+        rows[:page_size],
+        number=after.page + 1 if after is not None else 1,
+        num_pages=num_pages,
+        has_next=len(rows) > page_size,
+        has_previous=after is not None,
+    )
+
+
+def cursor_for_page_number(
+    queryset: QuerySet[Post],
+    page_number: int,
+    *,
+    page_size: int = POST_LIST_PAGE_SIZE,
+) -> PostCursor | None:
+    """Cursor that opens legacy ``?page=N``; ``None`` for page 1 or past the end.
+
+    Still an ``OFFSET`` over two indexed columns, but only for old ``?page=``
+    links that are then 301-redirected to the cursor URL.
+    """
+    if page_number <= 1:
+        return None
+    offset = (page_number - 1) * page_size
+    rows = list(
+        queryset.filter(published__isnull=False)
+        .order_by(*_NEWEST_FIRST)
+        .values_list("published", "id")[offset - 1 : offset]
+    )
+    if not rows:
+        return None
+    published, post_id = rows[0]
+    return PostCursor(page=page_number - 1, published=published, post_id=post_id)
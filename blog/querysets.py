@@ -1,5 +1,8 @@
 from editor.models import Post
 
+# Cards, feeds and sidebars read the stored text derivatives, never the body.
+POST_CARD_DEFERRED_FIELDS = ("body", "search_vector")
+
 
 def public_posts_queryset():
     """Posts visible on the anonymous public blog (requires SitePublication)."""
@@ -9,6 +12,11 @@ def public_posts_queryset():
     )
 
 
+def public_post_cards_queryset():
+    """``public_posts_queryset`` without the heavy text columns cards never read."""
+    return public_posts_queryset().defer(*POST_CARD_DEFERRED_FIELDS)
+
+
 def feed_posts_queryset():
     """Staff lenta feed: all published posts regardless of site channel."""
     return Post.objects.filter(status="published")
@@ -0,0 +1,222 @@
+"""Batch job that precomputes ``RelatedPost`` rows for on-site posts.
+
+Each post becomes a sparse vector: an L2-normalised tag block (tags weighted
+by rarity) plus an L2-normalised TF-IDF block over title/body words. Cosine
+similarity for all pairs is a sparse product walked through an inverted
+index, so only posts sharing a feature are ever scored.
+
+Publishing, unpublishing or retagging only flags the index as stale; the
+rebuild runs in ``manage.py rebuild_related_posts --loop`` (the
+related-posts compose service), never in a web request.
+"""
+
+# pyright: reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from blog.cache_utils import bump_surrogate_keys, post_key
+from blog.models import RelatedPost
+from blog.querysets import public_posts_queryset
+from editor.models import Post
+
+logger = logging.getLogger(__name__)
+
+RELATED_POSTS_PER_POST = 8
+RELATED_POSTS_LOCK_KEY = "blog.related_posts:rebuild_lock"
+RELATED_POSTS_DIRTY_KEY = "blog.related_posts:dirty"
+RELATED_POSTS_PENDING_KEY = "blog.related_posts:pending"
+RELATED_POSTS_LOCK_TTL = 600
+
+# Share of the score coming from tags; the rest comes from body/title words.
+_TAG_SHARE = 0.6
+# Words in more than this share of posts carry no signal (stop words).
+_MAX_TERM_DOC_SHARE = 0.5
+_MAX_TERMS_PER_POST = 200
+_TITLE_REPEAT = 3
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+
+Vector = dict[str, float]
+
+
+def _normalized(weights: Vector) -> Vector:
+    norm = math.sqrt(sum(value * value for value in weights.values()))
+    if not norm:
+        return {}
+    return {feature: value / norm for feature, value in weights.items()}
+
+
+def _words(title: str, body: str) -> Counter[str]:
+    text = f"{title} " * _TITLE_REPEAT + strip_tags(body or "")
+    return Counter(_WORD_RE.findall(text.lower()))
+
+
+def build_post_vectors(
+    posts: list[tuple[int, str, str]],
+    post_tags: dict[int, set[int]],
+) -> dict[int, Vector]:
+    """Sparse feature vectors for ``(id, title, body)`` rows, unit length each."""
+    total = len(posts)
+    if not total:
+        return {}
+    term_counts = {post_id: _words(title, body) for post_id, title, body in posts}
+    term_df = Counter(term for counts in term_counts.values() for term in counts)
+    tag_df = Counter(tag for tags in post_tags.values() for tag in tags)
+    max_df = max(2, int(total * _MAX_TERM_DOC_SHARE))
+
+    vectors: dict[int, Vector] = {}
+    for post_id, counts in term_counts.items():
+        terms = {
+            term: (1 + math.log(count)) * math.log(total / term_df[term])
+            for term, count in counts.items()
+            if 1 < term_df[term] <= max_df
+        }
+        if len(terms) > _MAX_TERMS_PER_POST:
+            top = sorted(terms.items(), key=lambda item: item[1], reverse=True)
+            terms = dict(top[:_MAX_TERMS_PER_POST])
+        tags = {
+            str(tag): math.log(1 + total / tag_df[tag])
+            for tag in post_tags.get(post_id, ())
+            if tag_df[tag] > 1
+        }
+        tag_block = _normalized(tags)
+        word_block = _normalized(terms)
+        tag_scale = math.sqrt(_TAG_SHARE) if word_block else 1.0
+        word_scale = math.sqrt(1 - _TAG_SHARE) if tag_block else 1.0
+        vectors[post_id] = {
+            **{f"t:{tag}": value * tag_scale for tag, value in tag_block.items()},
+            **{f"w:{term}": value * word_scale for term, value in word_block.items()},
+        }
+    return vectors
+
+
+def rank_related(
+    vectors: dict[int, Vector],
+    published_rank: dict[int, int],
+    *,
+    limit: int = RELATED_POSTS_PER_POST,
+) -> dict[int, list[tuple[int, float]]]:
+    """Top *limit* ``(related_id, cosine)`` per post; newer posts win ties."""
+    postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+    for post_id, vector in vectors.items():
+        for feature, value in vector.items():
+            postings[feature].append((post_id, value))
+
+    ranked: dict[int, list[tuple[int, float]]] = {}
+    for post_id, vector in vectors.items():
+        scores: dict[int, float] = defaultdict(float)
+        for feature, value in vector.items():
+            for other_id, other_value in postings[feature]:
+                if other_id != post_id:
+                    scores[other_id] += value * other_value
+        best = sorted(
+            scores.items(),
+            key=lambda item: (-item[1], published_rank.get(item[0], 0)),
+        )
+        ranked[post_id] = [
+            (other_id, score) for other_id, score in best[:limit] if score > 0
+        ]
+    return ranked
+
+
+def _rebuild() -> int:
+    posts = list(
+        public_posts_queryset()
+        .order_by("-published", "-id")
+        .values_list("id", "title", "body")
+    )
+    post_ids = [post_id for post_id, _title, _body in posts]
+    post_tags: dict[int, set[int]] = defaultdict(set)
+    for post_id, tag_id in Post.objects.filter(
+        pk__in=post_ids, tags__isnull=False
+    ).values_list("id", "tags__id"):
+        post_tags[post_id].add(tag_id)
+
+    ranked = rank_related(
+        build_post_vectors(posts, post_tags),
+        {post_id: index for index, post_id in enumerate(post_ids)},
+    )
+
+    previous: dict[int, list[int]] = defaultdict(list)
+    for post_id, related_id in RelatedPost.objects.order_by(
+        "post_id", "rank"
+    ).values_list("post_id", "related_id"):
+        previous[post_id].append(related_id)
+
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        RelatedPost.objects.bulk_create(
+            RelatedPost(post_id=post_id, related_id=related_id, rank=rank, score=score)
+            for post_id, entries in ranked.items()
+            for rank, (related_id, score) in enumerate(entries, start=1)
+        )
+    changed = [
+        post_id
+        for post_id, entries in ranked.items()
+        if previous.get(post_id, []) != [related_id for related_id, _ in entries]
+    ]
+    bump_surrogate_keys(post_key(post_id) for post_id in changed)
+    return len(changed)
+
+
+def rebuild_related_posts() -> int:
+    """Recompute every on-site post's recommendations; returns posts changed.
+
+    Concurrent callers don't run twice: they flag the running job to repeat.
+    """
+    if not cache.add(RELATED_POSTS_LOCK_KEY, 1, RELATED_POSTS_LOCK_TTL):
+        cache.set(RELATED_POSTS_DIRTY_KEY, 1, RELATED_POSTS_LOCK_TTL)
+        return 0
+    try:
+        changed = _rebuild()
+        while cache.delete(RELATED_POSTS_DIRTY_KEY):
+            changed += _rebuild()
+        return changed
+    finally:
+        cache.delete(RELATED_POSTS_LOCK_KEY)
+
+
+def schedule_related_posts_rebuild() -> None:
+    """Flag a rebuild for the worker once the current transaction commits."""
+    if not getattr(settings, "RELATED_POSTS_REBUILD_ON_CHANGE", True):
+        return
+
+    def _flag() -> None:
+        try:
+            cache.set(RELATED_POSTS_PENDING_KEY, 1, None)
+        except Exception:
+            logger.exception("Failed to flag related posts rebuild")
+
+    transaction.on_commit(_flag)
+
+
+def rebuild_related_posts_if_pending() -> int | None:
+    """Rebuild if a change was flagged since the last run; ``None`` when idle."""
+    if not cache.delete(RELATED_POSTS_PENDING_KEY):
+        return None
+    try:
+        return rebuild_related_posts()
+    except Exception:
+        cache.set(RELATED_POSTS_PENDING_KEY, 1, None)
+        raise
+
+
+def run_related_posts_worker(stop: threading.Event, poll_seconds: int) -> int:
+    """Rebuild flagged changes every *poll_seconds* until *stop* is set."""
+    changed = 0
+    while not stop.wait(max(1, poll_seconds)):
+        try:
+            changed += rebuild_related_posts_if_pending() or 0
+        except Exception:
+            logger.exception("Failed to rebuild related posts")
+    return changed
@@ -0,0 +1,118 @@
+"""Series prev/next for post detail from a cached, window-ranked member list.
+
+One ``LAG``/``LEAD`` query over ``order_position`` lists a series' on-site
+members with their neighbours. The list is cached per series and expires when
+the series surrogate key is bumped (``PostSeries`` / ``SitePublication``
+signals), so a detail view needs one lookup for its ``PostSeries`` row and one
+for the neighbour posts.
+"""
+
+# pyright: reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db.models import F, Window
+from django.db.models.functions import Lag, Lead
+
+from blog.cache_utils import (
+    ensure_surrogate_keys,
+    series_key,
+    surrogate_keys_fresh_since,
+)
+from blog.querysets import public_post_cards_queryset
+from editor.models import Post, PostSeries, Series
+
+SERIES_MEMBERS_CACHE_KEY = "blog.series_members:{series_id}"
+SERIES_MEMBERS_CACHE_TTL = 24 * 60 * 60
+
+
+@dataclass(frozen=True, slots=True)
+class SeriesMember:
+    """An on-site post in a series with its on-site neighbours."""
+
+    post_id: int
+    position: int
+    previous_post_id: int | None
+    next_post_id: int | None
+
+
+def _load_series_members(series_id: int) -> list[tuple]:
+    ordered = {"partition_by": [F("series_id")], "order_by": F("order_position").asc()}
+    return list(
+        PostSeries.objects.filter(
+            series_id=series_id,
+            order_position__isnull=False,
+            post__status="published",
+            post__site_publication__isnull=False,
+        )
+        .annotate(
+            previous_post_id=Window(Lag("post_id"), **ordered),
+            next_post_id=Window(Lead("post_id"), **ordered),
+        )
+        .order_by("order_position")
+        .values_list("post_id", "order_position", "previous_post_id", "next_post_id")
+    )
+
+
+def series_members(series_id: int) -> list[SeriesMember]:
+    """On-site members of a series in ``order_position`` order (cached)."""
+    key = SERIES_MEMBERS_CACHE_KEY.format(series_id=series_id)
+    dependencies = [series_key(series_id)]
+    cached = cache.get(key)
+    if isinstance(cached, dict) and surrogate_keys_fresh_since(
+        dependencies, cached["started_ns"]
+    ):
+        rows = cached["rows"]
+    else:
+        started_ns = time.time_ns()
+        rows = _load_series_members(series_id)
+        ensure_surrogate_keys(dependencies)
+        cache.set(
+            key,
+            {"rows": rows, "started_ns": started_ns},
+            SERIES_MEMBERS_CACHE_TTL,
+        )
+    return [SeriesMember(*row) for row in rows]
+
+
+def _neighbour_ids(
+    members: list[SeriesMember], post_id: int, position: int
+) -> tuple[int | None, int | None]:
+    for member in members:
+        if member.post_id == post_id:
+            return member.previous_post_id, member.next_post_id
+    # Draft preview / off-site post: nearest on-site parts around its position.
+    earlier = [member.post_id for member in members if member.position < position]
+    later = [member.post_id for member in members if member.position > position]
+    return (earlier[-1] if earlier else None), (later[0] if later else None)
+
+
+def series_navigation(
+    post: Post,
+) -> tuple[Series | None, Post | None, Post | None]:
+    """Return ``(series, previous_on_site, next_on_site)`` for *post*."""
+    post_series = (
+        PostSeries.objects.select_related("series")
+        .filter(post=post, order_position__isnull=False)
+        .first()
+    )
+    if post_series is None:
+        return None, None, None
+    previous_id, next_id = _neighbour_ids(
+        series_members(post_series.series_id),
+        post.pk,
+        post_series.order_position,
+    )
+    neighbour_ids = [pk for pk in (previous_id, next_id) if pk is not None]
+    neighbours = (
+        public_post_cards_queryset().in_bulk(neighbour_ids) if neighbour_ids else {}
+    )
+    return (
+        post_series.series,
+        neighbours.get(previous_id) if previous_id is not None else None,
+        neighbours.get(next_id) if next_id is not None else None,
+    )
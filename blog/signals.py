@@ -3,11 +3,13 @@ from __future__ import annotations
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from blog.cache_utils import invalidate_blog_public_pages_cache
+from blog.cache_utils import bump_surrogate_keys, public_post_dependency_keys
 from blog.models import SitePublication
+from blog.related_index import schedule_related_posts_rebuild
 
 
 @receiver(post_save, sender=SitePublication)
 @receiver(post_delete, sender=SitePublication)
-def _invalidate_on_site_publication_change(sender, **kwargs) -> None:
-    invalidate_blog_public_pages_cache()
+def _invalidate_on_site_publication_change(sender, instance, **kwargs) -> None:
+    bump_surrogate_keys(public_post_dependency_keys(instance.post_id))
+    schedule_related_posts_rebuild()
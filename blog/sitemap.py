@@ -1,7 +1,17 @@
 # pyright: reportAttributeAccessIssue=false
+"""XML sitemap index with size-bounded post pages, cached until publications change."""
 
+from __future__ import annotations
+
+from functools import wraps
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
+from django.db.models import Max
 
+from blog.cache_utils import PUBLICATIONS_KEY, record_page_dependencies
+from blog.conditional import public_content_condition
+from blog.page_cache import public_page_cache
 from blog.querysets import public_posts_queryset
 
 
@@ -9,8 +19,39 @@ class PostSitemap(Sitemap):
     changefreq = "weekly"
     priority = 0.9
 
+    @property
+    def limit(self) -> int:
+        return max(1, getattr(settings, "SITEMAP_PAGE_SIZE", 5000))
+
     def items(self):
-        return public_posts_queryset()
+        # Each page is one LIMIT/OFFSET slice over the keyset index columns.
+        return (
+            public_posts_queryset()
+            .only("slug", "updated")
+            .order_by("-published", "-id")
+        )
 
     def lastmod(self, obj):
         return obj.updated
+
+    def get_latest_lastmod(self):
+        # Default implementation walks every item; the index needs one MAX().
+        return public_posts_queryset().aggregate(latest=Max("updated"))["latest"]
+
+
+sitemaps = {"posts": PostSitemap}
+
+
+def cached_sitemap_view(view, key_prefix: str):
+    """Wrap a ``django.contrib.sitemaps`` view in 304s and the public page cache.
+
+    Rendered pages depend on the set of on-site posts only, so post edits show
+    up in ``lastmod`` after the cache TTL rather than on every save.
+    """
+
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        record_page_dependencies(request, [PUBLICATIONS_KEY])
+        return view(request, *args, **kwargs)
+
+    return public_content_condition(public_page_cache(key_prefix)(wrapped))
@@ -0,0 +1,390 @@
+"""Pre-render public pages to ``STATIC_EXPORT_ROOT`` for nginx ``try_files``.
+
+Pages go through the normal Django handler as an anonymous GET, so the output
+is byte-for-byte what ``blog.views`` serves. Each exported page is listed in
+a manifest with the surrogate keys it was built from; ``bump_surrogate_keys``
+deletes the pages depending on a bumped key at once (nginx falls back to
+Django) and the refresh worker (``export_static_site --loop``) re-renders
+whatever is missing from the manifest.
+"""
+
+# pyright: reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import fcntl
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.base import BaseHandler
+from django.db import close_old_connections, connections, transaction
+from django.urls import NoReverseMatch, reverse
+
+from blog.cache_utils import (
+    CONTENT_KEY,
+    SITE_KEY,
+    ensure_surrogate_keys,
+    surrogate_keys_fresh_since,
+)
+from blog.querysets import public_posts_queryset
+from core.services.precompress import (
+    PRECOMPRESS_MIN_BYTES,
+    precompress_bytes,
+    remove_precompressed,
+)
+
+logger = logging.getLogger(__name__)
+
+STATIC_EXPORT_MANIFEST = ".manifest.json"
+STATIC_EXPORT_LOCK_FILE = ".lock"
+STATIC_EXPORT_DIRTY_KEY = "blog.static_export:dirty"
+
+# Pages written per manifest update (one JSON rewrite under the file lock).
+_CHUNK_SIZE = 25
+# Directory URLs of Atom feeds; every other directory URL is an HTML page.
+_FEED_SUFFIX = "/feed/"
+# Pages the page cache refreshes on TTL (titles, lastmod); exported copies have
+# no TTL, so they go on any content change instead.
+_CONTENT_KEY_VIEWS = frozenset({"blog:html_sitemap", "sitemap", "sitemap_section"})
+
+
+@dataclass(frozen=True, slots=True)
+class StaticExportResult:
+    rendered: int = 0
+    skipped: int = 0
+    removed: int = 0
+
+
+def static_export_root() -> Path | None:
+    """Export directory, or ``None`` when static export is off."""
+    root = getattr(settings, "STATIC_EXPORT_ROOT", "")
+    return Path(root) if root else None
+
+
+def export_file_name(path: str) -> str:
+    """File (relative to the export root) nginx looks up for URL *path*.
+
+    ``/slug/`` → ``slug/index.html``, ``/feed/`` → ``feed/index.atom``;
+    file-like URLs (``/sitemap.xml``) are stored as is.
+    """
+    relative = path.lstrip("/")
+    if not path.endswith("/"):
+        return relative
+    return relative + ("index.atom" if path.endswith(_FEED_SUFFIX) else "index.html")
+
+
+def static_page_exists(path: str) -> bool:
+    """True when nginx would answer *path* from the export directory."""
+    root = static_export_root()
+    return root is not None and (root / export_file_name(path)).is_file()
+
+
+def _reverse_slug(view_name: str, slug: str | None) -> str | None:
+    try:
+        return reverse(view_name, args=[slug]) if slug else None
+    except NoReverseMatch:
+        # Legacy non-ASCII slugs have no canonical URL of their own.
+        return None
+
+
+def public_page_paths() -> list[str]:
+    """Every public URL the export covers (first page of each list)."""
+    posts = public_posts_queryset()
+    paths: list[str | None] = [
+        reverse("blog:post_list"),
+        reverse("blog:feed"),
+        reverse("blog:html_sitemap"),
+        reverse("sitemap"),
+        reverse("sitemap_section", kwargs={"section": "posts"}),
+    ]
+    for slug in posts.order_by("-published", "-id").values_list("slug", flat=True):
+        paths.append(_reverse_slug("blog:post_detail", slug))
+    for slug in (
+        posts.filter(category__isnull=False)
+        .values_list("category__slug", flat=True)
+        .distinct()
+    ):
+        paths.append(_reverse_slug("blog:post_list_by_category", slug))
+        paths.append(_reverse_slug("blog:category_feed", slug))
+    for slug in (
+        posts.filter(tags__isnull=False).values_list("tags__slug", flat=True).distinct()
+    ):
+        paths.append(_reverse_slug("blog:post_list_by_tag", slug))
+        paths.append(_reverse_slug("blog:tag_feed", slug))
+    return [path for path in dict.fromkeys(paths) if path]
+
+
+# --- manifest ---------------------------------------------------------------
+
+
+@contextmanager
+def _locked_manifest(root: Path) -> Iterator[dict[str, dict]]:
+    """Manifest pages (``path`` → ``{"file", "dependencies"}``), saved on exit.
+
+    An ``flock`` serializes web workers, the refresh and pool processes, so a
+    page is never written after an invalidation already looked for it.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / STATIC_EXPORT_LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            manifest_path = root / STATIC_EXPORT_MANIFEST
+            try:
+                pages = json.loads(manifest_path.read_text(encoding="utf-8"))
+            except (FileNotFoundError, ValueError):
+                pages = {}
+            before = json.dumps(pages, sort_keys=True)
+            yield pages
+            if json.dumps(pages, sort_keys=True) != before:
+                _write_atomic(manifest_path, json.dumps(pages).encode())
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _write_atomic(target: Path, content: bytes) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(content)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _remove_page(root: Path, pages: dict[str, dict], path: str) -> None:
+    entry = pages.pop(path, None)
+    target = root / (entry or {}).get("file", export_file_name(path))
+    remove_precompressed(target)
+    target.unlink(missing_ok=True)
+
+
+def _publish_page(target: Path, content: bytes) -> None:
+    # Drop old .gz/.br first so nginx never pairs new HTML with an old copy.
+    remove_precompressed(target)
+    _write_atomic(target, content)
+    if len(content) >= PRECOMPRESS_MIN_BYTES:
+        precompress_bytes(target, content)
+
+
+def invalidate_static_pages(keys: Iterable[str]) -> int:
+    """Delete exported pages built from any of *keys*; returns pages removed."""
+    root = static_export_root()
+    keys = set(keys)
+    if root is None or not keys or not (root / STATIC_EXPORT_MANIFEST).exists():
+        return 0
+    with _locked_manifest(root) as pages:
+        stale = [
+            path
+            for path, entry in pages.items()
+            if keys.intersection(entry["dependencies"])
+        ]
+        for path in stale:
+            _remove_page(root, pages, path)
+    return len(stale)
+
+
+# --- rendering --------------------------------------------------------------
+
+
+def _site_origin() -> tuple[str, bool]:
+    parsed = urlparse(getattr(settings, "SITE_URL", "") or "")
+    host = parsed.netloc or (settings.ALLOWED_HOSTS or ["localhost"])[0]
+    return host, parsed.scheme == "https"
+
+
+_handler: BaseHandler | None = None
+
+
+def _get_handler() -> BaseHandler:
+    global _handler
+    if _handler is None:
+        handler = BaseHandler()
+        handler.load_middleware()
+        _handler = handler
+    return _handler
+
+
+def _render(path: str) -> tuple[bytes | None, set[str], int]:
+    """``(content or None, dependencies, started_ns)`` for one anonymous GET."""
+    from django.test.client import RequestFactory
+
+    host, secure = _site_origin()
+    request = RequestFactory().get(path, secure=secure, HTTP_HOST=host)
+    # Bypasses the page cache so the view runs and reports its dependencies.
+    request._static_export = True
+    request._page_cache_dependencies = {SITE_KEY}
+    started_ns = time.time_ns()
+    response = _get_handler().get_response(request)
+    exportable = (
+        response.status_code == 200 and not response.streaming and not response.cookies
+    )
+    content = response.content if exportable else None
+    dependencies = set(request._page_cache_dependencies)
+    match = getattr(request, "resolver_match", None)
+    if match is not None and match.view_name in _CONTENT_KEY_VIEWS:
+        dependencies.add(CONTENT_KEY)
+    return content, dependencies, started_ns
+
+
+def _export_chunk(paths: list[str]) -> tuple[int, int]:
+    """Render *paths* and publish the fresh ones; ``(rendered, skipped)``."""
+    root = static_export_root()
+    if root is None:
+        return 0, len(paths)
+    results = []
+    for path in paths:
+        try:
+            results.append((path, *_render(path)))
+        except Exception:
+            logger.exception("Failed to pre-render %s", path)
+            results.append((path, None, set(), 0))
+    close_old_connections()
+
+    rendered = skipped = 0
+    with _locked_manifest(root) as pages:
+        for path, content, dependencies, started_ns in results:
+            if content is not None:
+                ensure_surrogate_keys(dependencies)
+            if content is None or not surrogate_keys_fresh_since(
+                dependencies, started_ns
+            ):
+                # Redirect/404, or changed mid-render: leave it to Django.
+                _remove_page(root, pages, path)
+                skipped += 1
+                continue
+            file_name = export_file_name(path)
+            _publish_page(root / file_name, content)
+            pages[path] = {"file": file_name, "dependencies": sorted(dependencies)}
+            rendered += 1
+    return rendered, skipped
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def _chunks(paths: list[str]) -> list[list[str]]:
+    return [paths[i : i + _CHUNK_SIZE] for i in range(0, len(paths), _CHUNK_SIZE)]
+
+
+def _export_paths(paths: list[str], *, workers: int) -> tuple[int, int]:
+    chunks = _chunks(paths)
+    if workers <= 1 or len(chunks) <= 1:
+        totals = [_export_chunk(chunk) for chunk in chunks]
+    else:
+        # Children open their own connections; never share the parent's sockets.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as pool:
+            totals = list(pool.map(_export_chunk, chunks))
+    return sum(r for r, _ in totals), sum(s for _, s in totals)
+
+
+def export_static_site(*, full: bool = False, workers: int = 1) -> StaticExportResult:
+    """Bring the export directory in line with the public site.
+
+    Incremental runs render only pages missing from the manifest (new or
+    invalidated); *full* re-renders everything, across *workers* processes.
+    Pages no longer public are deleted either way.
+    """
+    root = static_export_root()
+    if root is None:
+        return StaticExportResult()
+    current = public_page_paths()
+    current_set = set(current)
+    with _locked_manifest(root) as pages:
+        gone = [path for path in pages if path not in current_set]
+        for path in gone:
+            _remove_page(root, pages, path)
+        exported = set(pages)
+    todo = current if full else [path for path in current if path not in exported]
+    rendered, skipped = _export_paths(todo, workers=workers)
+    return StaticExportResult(rendered=rendered, skipped=skipped, removed=len(gone))
+
+
+def refresh_static_export_if_pending() -> StaticExportResult | None:
+    """Incremental export if a change was flagged since; ``None`` when idle."""
+    if not cache.delete(STATIC_EXPORT_DIRTY_KEY):
+        return None
+    try:
+        return export_static_site()
+    except Exception:
+        cache.set(STATIC_EXPORT_DIRTY_KEY, 1, None)
+        raise
+
+
+def run_static_export_worker(
+    stop: threading.Event, poll_seconds: int
+) -> StaticExportResult:
+    """Re-render flagged changes every *poll_seconds* until *stop* is set.
+
+    Pages queued for the nginx microcache are re-fetched in the same pass,
+    after the export so both copies change together.
+    """
+    from blog.microcache import refresh_microcache_if_pending
+
+    total = StaticExportResult()
+    while not stop.wait(max(1, poll_seconds)):
+        try:
+            result = refresh_static_export_if_pending()
+        except Exception:
+            logger.exception("Failed to refresh static export")
+            result = None
+        if result is not None:
+            total = StaticExportResult(
+                rendered=total.rendered + result.rendered,
+                skipped=total.skipped + result.skipped,
+                removed=total.removed + result.removed,
+            )
+        try:
+            refresh_microcache_if_pending()
+        except Exception:
+            logger.exception("Failed to refresh nginx microcache")
+    return total
+
+
+def schedule_static_export_refresh(keys: Iterable[str]) -> None:
+    """After commit: drop pages built from *keys* again and flag the worker.
+
+    The second invalidation catches pages rendered from pre-commit data. The
+    re-render is left to ``manage.py export_static_site --loop``, never to the
+    web process.
+    """
+    if static_export_root() is None:
+        return
+    keys = set(keys)
+
+    def _run() -> None:
+        try:
+            invalidate_static_pages(keys)
+        except Exception:
+            logger.exception("Failed to invalidate static export")
+            return
+        if getattr(settings, "STATIC_EXPORT_REFRESH_ON_CHANGE", True):
+            try:
+                cache.set(STATIC_EXPORT_DIRTY_KEY, 1, None)
+            except Exception:
+                logger.exception("Failed to flag static export refresh")
+
+    transaction.on_commit(_run)
@@ -1,6 +1,8 @@
 import io
 import re
+from pathlib import Path
 from typing import cast
+from unittest import mock
 
 from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -500,8 +502,34 @@ class PublicDiscoveryTests(TestCase):
     def test_xml_sitemap_lists_public_post(self):
         response = self.client.get(reverse("sitemap"))
         self.assertEqual(response.status_code, 200)
+        self.assertContains(response, reverse("sitemap_section", args=["posts"]))
+
+        response = self.client.get(reverse("sitemap_section", args=["posts"]))
+        self.assertEqual(response.status_code, 200)
         self.assertContains(response, self.post.slug)
 
+    @override_settings(SITEMAP_PAGE_SIZE=1)
+    def test_xml_sitemap_pages_are_size_bounded(self):
+        newer = Post(
+            title="Newer sitemap post",
+            slug="newer-sitemap-post",
+            author=self.author,
+            body="<p>Newer</p>",
+            status="published",
+        )
+        newer.save(_allow_publish_via_sender=True)
+        SitePublication.objects.create(post=newer, published_at=newer.published)
+
+        section = reverse("sitemap_section", args=["posts"])
+        index = self.client.get(reverse("sitemap"))
+        self.assertContains(index, f"{section}?p=2")
+
+        first = self.client.get(section)
+        second = self.client.get(section, {"p": 2})
+        self.assertContains(first, newer.slug)
+        self.assertNotContains(first, self.post.slug)
+        self.assertContains(second, self.post.slug)
+
     def test_html_sitemap_lists_public_post(self):
         response = self.client.get(reverse("blog:html_sitemap"))
         self.assertEqual(response.status_code, 200)
@@ -512,6 +540,72 @@ class PublicDiscoveryTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, self.post.title)
 
+    def test_tag_and_category_feeds_are_scoped(self):
+        self.post.tags.add("scoped")
+        other = Post(
+            title="Elsewhere post",
+            slug="elsewhere-post",
+            author=self.author,
+            body="<p>Other</p>",
+            status="published",
+        )
+        other.save(_allow_publish_via_sender=True)
+        SitePublication.objects.create(post=other, published_at=other.published)
+
+        tag_feed = self.client.get(reverse("blog:tag_feed", args=["scoped"]))
+        self.assertContains(tag_feed, self.post.title)
+        self.assertNotContains(tag_feed, "Elsewhere post")
+        category_feed = self.client.get(
+            reverse("blog:category_feed", args=[self.category.slug])
+        )
+        self.assertContains(category_feed, self.post.title)
+        self.assertNotContains(category_feed, "Elsewhere post")
+        missing = self.client.get(reverse("blog:tag_feed", args=["nope"]))
+        self.assertEqual(missing.status_code, 404)
+
+    def test_repeat_requests_revalidate_with_304(self):
+        for url in (
+            reverse("blog:feed"),
+            reverse("sitemap"),
+            reverse("blog:post_list"),
+            self.post.get_absolute_url(),
+        ):
+            first = self.client.get(url)
+            self.assertTrue(first.has_header("ETag"), url)
+            self.assertTrue(first.has_header("Last-Modified"), url)
+            repeat = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+            self.assertEqual(repeat.status_code, 304, url)
+
+    def test_post_edit_changes_detail_etag(self):
+        url = self.post.get_absolute_url()
+        etag = self.client.get(url)["ETag"]
+        self.post.title = "Discoverable post, edited"
+        self.post.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_detail_validators_are_cached_until_the_post_changes(self):
+        from django.core.cache import cache
+        from django.test import RequestFactory
+
+        from blog.conditional import post_detail_etag
+
+        cache.clear()
+        factory = RequestFactory()
+        etag = post_detail_etag(factory.get("/"), self.post.slug)
+        with self.assertNumQueries(0):
+            self.assertEqual(post_detail_etag(factory.get("/"), self.post.slug), etag)
+
+        self.post.title = "Discoverable post, edited again"
+        self.post.save()
+        self.assertNotEqual(post_detail_etag(factory.get("/"), self.post.slug), etag)
+
+    def test_logged_in_pages_have_no_validators(self):
+        self.client.force_login(self.author)
+        response = self.client.get(self.post.get_absolute_url())
+        self.assertFalse(response.has_header("ETag"))
+
     def test_search_finds_public_post(self):
         response = self.client.get(
             reverse("blog:post_search"), {"query": "Discoverable"}
@@ -598,3 +692,526 @@ class PublicDiscoveryTests(TestCase):
         self.assertEqual(search_empty.status_code, 200)
         list_invalid = self.client.get(reverse("blog:post_list"), {"page": "abc"})
         self.assertEqual(list_invalid.status_code, 200)
+
+
+class PostListKeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.author = cast(UserManager, User.objects).create_user(
+            email="keyset@example.com",
+            password="secret12345",
+        )
+        self.category = Category.objects.create(name="Keyset")
+        self.posts = []
+        for index in range(14):
+            post = Post(
+                title=f"Keyset post {index:02d}",
+                slug=f"keyset-post-{index:02d}",
+                author=self.author,
+                body="<p>Body</p>",
+                status="published",
+                category=self.category,
+            )
+            post.save(_allow_publish_via_sender=True)
+            SitePublication.objects.create(post=post, published_at=post.published)
+            self.posts.append(post)
+
+    def test_cursor_round_trip_and_rejects_garbage(self):
+        from blog.pagination import PostCursor
+
+        post = self.posts[0]
+        cursor = PostCursor.for_post(post, page=3)
+        decoded = PostCursor.decode(cursor.encode())
+        self.assertEqual(decoded, cursor)
+        for token in ("", "abc", "1.2", "0.1.1", "1.x.1"):
+            self.assertIsNone(PostCursor.decode(token))
+
+    def test_next_and_previous_pages_follow_cursor(self):
+        first = self.client.get(reverse("blog:post_list"))
+        self.assertEqual(first.status_code, 200)
+        first_page = first.context["posts"]
+        self.assertEqual(len(first_page), 12)
+        self.assertEqual((first_page.number, first_page.num_pages), (1, 2))
+        self.assertTrue(first_page.has_next())
+        self.assertContains(first, "1 / 2")
+
+        second = self.client.get(f"{reverse('blog:post_list')}?{first_page.next_query}")
+        self.assertEqual(second.status_code, 200)
+        second_page = second.context["posts"]
+        self.assertEqual(
+            [post.title for post in second_page],
+            ["Keyset post 01", "Keyset post 00"],
+        )
+        self.assertFalse(second_page.has_next())
+        self.assertIn("стр. 2", second.context["list_seo"]["title"])
+        self.assertIn("Страница 2 из 2", second.context["list_seo"]["description"])
+        self.assertIn("?after=", second.context["list_seo"]["canonical_url"])
+        self.assertEqual(second_page.previous_query, "")
+
+    def test_legacy_page_number_redirects_to_cursor(self):
+        response = self.client.get(reverse("blog:post_list"), {"page": "2"})
+        self.assertEqual(response.status_code, 301)
+        self.assertIn("after=", response["Location"])
+        followed = self.client.get(response["Location"])
+        self.assertEqual(len(followed.context["posts"]), 2)
+
+        past_end = self.client.get(reverse("blog:post_list"), {"page": "99"})
+        self.assertEqual(past_end.status_code, 301)
+        self.assertEqual(past_end["Location"], response["Location"])
+
+        first = self.client.get(reverse("blog:post_list"), {"page": "1"})
+        self.assertEqual(first.status_code, 301)
+        self.assertEqual(first["Location"], reverse("blog:post_list"))
+
+    @override_settings(POST_LIST_KEYSET_PAGINATION=False)
+    def test_offset_mode_keeps_numbered_pages(self):
+        response = self.client.get(reverse("blog:post_list"), {"page": "2"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["posts"].number, 2)
+
+
+@override_settings(DEBUG=False, IS_PRODUCTION=True, POST_PAGE_CACHE_TIMEOUT=300)
+class PublicPageCacheInvalidationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.author = cast(UserManager, User.objects).create_user(
+            email="page-cache@example.com",
+            password="secret12345",
+        )
+        self.category = Category.objects.create(name="Cached")
+        self.post = self._public_post("Cached post", "cached-post")
+
+    def _public_post(self, title: str, slug: str) -> Post:
+        post = Post(
+            title=title,
+            slug=slug,
+            author=self.author,
+            body="<p>Body</p>",
+            status="published",
+            category=self.category,
+        )
+        post.save(_allow_publish_via_sender=True)
+        SitePublication.objects.create(post=post, published_at=post.published)
+        return post
+
+    def _rename_without_signals(self, post: Post, title: str) -> None:
+        Post.objects.filter(pk=post.pk).update(title=title)
+
+    def test_surrogate_key_bump_expires_only_dependent_entries(self):
+        import time
+
+        from blog.cache_utils import (
+            bump_surrogate_keys,
+            ensure_surrogate_keys,
+            surrogate_keys_fresh_since,
+        )
+
+        self.assertFalse(surrogate_keys_fresh_since(["post:1"], time.time_ns()))
+        ensure_surrogate_keys(["post:1", "post:2"])
+        started = time.time_ns()
+        self.assertTrue(surrogate_keys_fresh_since(["post:1", "post:2"], started))
+        bump_surrogate_keys(["post:2"])
+        self.assertFalse(surrogate_keys_fresh_since(["post:2"], started))
+        self.assertTrue(surrogate_keys_fresh_since(["post:1"], started))
+
+    def test_draft_autosave_keeps_cached_detail(self):
+        url = reverse("blog:post_detail", args=[self.post.slug])
+        self.assertContains(self.client.get(url), "Cached post")
+        self._rename_without_signals(self.post, "Renamed behind cache")
+
+        draft = Post.objects.create(
+            title="Draft autosave",
+            slug="draft-autosave",
+            author=self.author,
+            body="<p>Draft</p>",
+            status="draft",
+            category=self.category,
+        )
+        draft.body = "<p>Draft v2</p>"
+        draft.save()
+        draft.tags.add("drafty")
+
+        self.assertContains(self.client.get(url), "Cached post")
+
+    def test_public_post_save_refreshes_its_pages(self):
+        url = reverse("blog:post_detail", args=[self.post.slug])
+        list_url = reverse("blog:post_list")
+        self.client.get(url)
+        self.client.get(list_url)
+
+        self.post.refresh_from_db()
+        self.post.title = "Edited title"
+        self.post.save()
+
+        self.assertContains(self.client.get(url), "Edited title")
+        self.assertContains(self.client.get(list_url), "Edited title")
+
+    def test_tagging_public_post_refreshes_tag_list(self):
+        from taggit.models import Tag
+
+        tag = Tag.objects.create(name="fresh", slug="fresh")
+        other = self._public_post("Other post", "other-post")
+        other.tags.add(tag)
+        tag_url = reverse("blog:post_list_by_tag", args=["fresh"])
+        self.assertNotContains(self.client.get(tag_url), "Cached post")
+
+        self.post.tags.add(tag)
+        self.assertContains(self.client.get(tag_url), "Cached post")
+
+    def test_unpublishing_on_site_post_refreshes_counts_and_series(self):
+        from blog.cache_utils import PUBLICATIONS_KEY
+        from blog.pagination import cached_post_count
+        from blog.querysets import public_posts_queryset
+        from blog.series_navigation import series_members
+        from editor.models import PostSeries, Series
+
+        series = Series.objects.create(name="Cached series")
+        PostSeries.objects.create(post=self.post, series=series, order_position=1)
+        self.assertEqual(
+            cached_post_count(public_posts_queryset(), scope=PUBLICATIONS_KEY), 1
+        )
+        self.assertEqual(len(series_members(series.pk)), 1)
+
+        self.post.refresh_from_db()
+        self.post.status = "draft"
+        self.post.save()
+
+        self.assertEqual(
+            cached_post_count(public_posts_queryset(), scope=PUBLICATIONS_KEY), 0
+        )
+        self.assertEqual(series_members(series.pk), [])
+
+    def test_outdated_page_is_served_stale_while_another_worker_rebuilds(self):
+        from django.core.cache import cache
+
+        from blog.page_cache import (
+            PAGE_CACHE_LOCK_KEY,
+            page_cache_digest,
+            page_cache_stats,
+        )
+
+        url = reverse("blog:post_detail", args=[self.post.slug])
+        absolute_url = f"http://testserver{url}"
+        lock_key = PAGE_CACHE_LOCK_KEY.format(
+            prefix="blog.post_detail", digest=page_cache_digest(absolute_url)
+        )
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "MISS")
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "HIT")
+
+        self.post.refresh_from_db()
+        self.post.title = "Rebuilt title"
+        self.post.save()
+
+        cache.set(lock_key, "other-worker", 30)
+        stale = self.client.get(url)
+        self.assertEqual(stale["X-Page-Cache"], "STALE")
+        self.assertContains(stale, "Cached post")
+        self.assertNotContains(stale, "Rebuilt title")
+
+        cache.delete(lock_key)
+        fresh = self.client.get(url)
+        self.assertEqual(fresh["X-Page-Cache"], "MISS")
+        self.assertContains(fresh, "Rebuilt title")
+        self.assertIsNone(cache.get(lock_key))
+        self.assertEqual(
+            page_cache_stats("blog.post_detail", absolute_url),
+            {"hit": 1, "miss": 2, "stale": 1},
+        )
+
+    @override_settings(POST_PAGE_CACHE_STALE_TIMEOUT=0)
+    def test_stale_serving_can_be_disabled(self):
+        from django.core.cache import cache
+
+        from blog.page_cache import PAGE_CACHE_LOCK_KEY, page_cache_digest
+
+        url = reverse("blog:post_detail", args=[self.post.slug])
+        self.client.get(url)
+        self.post.refresh_from_db()
+        self.post.title = "Rendered anyway"
+        self.post.save()
+        cache.set(
+            PAGE_CACHE_LOCK_KEY.format(
+                prefix="blog.post_detail",
+                digest=page_cache_digest(f"http://testserver{url}"),
+            ),
+            "other-worker",
+            30,
+        )
+        self.assertContains(self.client.get(url), "Rendered anyway")
+
+    def test_logged_in_requests_bypass_cache(self):
+        url = reverse("blog:post_detail", args=[self.post.slug])
+        self.client.get(url)
+        self._rename_without_signals(self.post, "Seen by editor")
+        self.client.force_login(self.author)
+        self.assertContains(self.client.get(url), "Seen by editor")
+
+
+class StaticExportTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        from django.core.cache import cache
+
+        cache.clear()
+        export_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(export_dir.cleanup)
+        self.root = Path(export_dir.name)
+        overrides = override_settings(
+            STATIC_EXPORT_ROOT=export_dir.name,
+            SITE_URL="http://testserver",
+            POST_VIEW_COUNT_FLUSH_INTERVAL=0,
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        self.author = cast(UserManager, User.objects).create_user(
+            email="static-export@example.com",
+            password="secret12345",
+        )
+        self.category = Category.objects.create(name="Exported")
+        self.post = Post(
+            title="Exported post",
+            slug="exported-post",
+            author=self.author,
+            body="<p>Static body</p>",
+            status="published",
+            category=self.category,
+        )
+        self.post.save(_allow_publish_via_sender=True)
+        SitePublication.objects.create(post=self.post, published_at=self.post.published)
+
+    def test_export_writes_pages_and_invalidation_drops_dependents(self):
+        from blog.static_export import export_static_site
+
+        result = export_static_site()
+        self.assertGreater(result.rendered, 0)
+        detail = self.root / "exported-post" / "index.html"
+        self.assertIn("Exported post", detail.read_text(encoding="utf-8"))
+        self.assertTrue((self.root / "index.html").is_file())
+        self.assertTrue((self.root / "feed" / "index.atom").is_file())
+        self.assertTrue((self.root / "sitemap.xml").is_file())
+        self.assertEqual(export_static_site().rendered, 0)
+
+        self.post.refresh_from_db()
+        self.post.title = "Re-exported post"
+        self.post.save()
+        self.assertFalse(detail.exists())
+        self.assertFalse((self.root / "index.html").exists())
+
+        export_static_site()
+        self.assertIn("Re-exported post", detail.read_text(encoding="utf-8"))
+
+    def test_changes_flag_the_export_worker_instead_of_rendering(self):
+        from blog.static_export import (
+            export_static_site,
+            refresh_static_export_if_pending,
+        )
+
+        export_static_site()
+        detail = self.root / "exported-post" / "index.html"
+        self.assertIsNone(refresh_static_export_if_pending())
+
+        self.post.refresh_from_db()
+        self.post.title = "Flagged post"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post.save()
+        self.assertFalse(detail.exists())
+
+        result = refresh_static_export_if_pending()
+        assert result is not None
+        self.assertGreater(result.rendered, 0)
+        self.assertIn("Flagged post", detail.read_text(encoding="utf-8"))
+        self.assertIsNone(refresh_static_export_if_pending())
+
+    def test_beacon_counts_only_views_served_from_the_export(self):
+        from blog.static_export import export_static_site
+
+        beacon = reverse("blog:static_page_view_beacon")
+        headers = {
+            "HTTP_X_ORIGINAL_URI": reverse("blog:post_detail", args=[self.post.slug]),
+            "HTTP_USER_AGENT": "Mozilla/5.0",
+        }
+        self.assertEqual(self.client.get(beacon, **headers).status_code, 204)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 0)
+
+        export_static_site()
+        self.client.get(beacon, **headers)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.views, 1)
+
+
+@override_settings(NGINX_MICROCACHE_REFRESH_URL="http://nginx:8081")
+class MicrocacheRefreshTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.author = cast(UserManager, User.objects).create_user(
+            email="microcache@example.com",
+            password="secret12345",
+        )
+        self.category = Category.objects.create(name="Cached")
+
+    def test_changes_are_queued_for_the_worker_without_post_detail(self):
+        from blog.microcache import refresh_microcache_if_pending
+
+        post = Post(
+            title="Microcached",
+            slug="microcached",
+            author=self.author,
+            body="<p>Body</p>",
+            status="published",
+            category=self.category,
+        )
+        with (
+            mock.patch("blog.microcache.refresh_microcache", return_value=0) as fetch,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            post.save(_allow_publish_via_sender=True)
+            SitePublication.objects.create(post=post, published_at=post.published)
+        fetch.assert_not_called()
+
+        with mock.patch("blog.microcache.refresh_microcache", return_value=0) as fetch:
+            self.assertEqual(refresh_microcache_if_pending(), 0)
+            self.assertIsNone(refresh_microcache_if_pending())
+        paths = fetch.call_args.args[0]
+        self.assertIn(reverse("blog:post_list"), paths)
+        self.assertIn(
+            reverse("blog:post_list_by_category", args=[self.category.slug]), paths
+        )
+        self.assertNotIn(reverse("blog:post_detail", args=[post.slug]), paths)
+
+
+class RelatedPostIndexTests(TestCase):
+    def setUp(self):
+        self.author = cast(UserManager, User.objects).create_user(
+            email="related@example.com",
+            password="secret12345",
+        )
+        self.category = Category.objects.create(name="Related")
+
+    def _public_post(self, slug: str, body: str, tags: list[str]) -> Post:
+        post = Post(
+            title=slug.replace("-", " "),
+            slug=slug,
+            author=self.author,
+            body=body,
+            status="published",
+            category=self.category,
+        )
+        post.save(_allow_publish_via_sender=True)
+        SitePublication.objects.create(post=post, published_at=post.published)
+        post.tags.add(*tags)
+        return post
+
+    def test_rebuild_ranks_rare_tags_and_shared_terms_first(self):
+        from blog.models import RelatedPost
+        from blog.related_index import rebuild_related_posts
+        from blog.related_posts import similar_and_newest_posts
+
+        source = self._public_post(
+            "alps-hike", "<p>Glacier crossing with crampons.</p>", ["travel", "alps"]
+        )
+        close = self._public_post(
+            "alps-again", "<p>Another glacier and crampons day.</p>", ["alps"]
+        )
+        loose = self._public_post(
+            "city-break", "<p>Museums and coffee.</p>", ["travel"]
+        )
+        self._public_post("filler-one", "<p>Museums.</p>", ["travel"])
+        self._public_post("filler-two", "<p>Coffee.</p>", ["travel"])
+
+        self.assertGreater(rebuild_related_posts(), 0)
+        ranked = list(
+            RelatedPost.objects.filter(post=source).values_list("related_id", flat=True)
+        )
+        self.assertEqual(ranked[0], close.pk)
+        self.assertIn(loose.pk, ranked)
+
+        similar, newest = similar_and_newest_posts(source, excluded_ids=[close.pk])
+        self.assertNotIn(close, similar)
+        self.assertEqual(len(similar) + len(newest), 3)
+
+    def test_publication_flags_rebuild_for_the_worker(self):
+        from django.core.cache import cache
+
+        from blog.models import RelatedPost
+        from blog.related_index import rebuild_related_posts_if_pending
+
+        cache.clear()
+        first = self._public_post("first-trip", "<p>Rivers.</p>", ["rivers"])
+        with self.captureOnCommitCallbacks(execute=True):
+            second = self._public_post("second-trip", "<p>Rivers.</p>", ["rivers"])
+        self.assertFalse(RelatedPost.objects.exists())
+
+        self.assertIsNotNone(rebuild_related_posts_if_pending())
+        self.assertTrue(RelatedPost.objects.filter(post=first, related=second).exists())
+        self.assertIsNone(rebuild_related_posts_if_pending())
+
+
+class SeriesNavigationTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        from editor.models import PostSeries, Series
+
+        cache.clear()
+        self.author = cast(UserManager, User.objects).create_user(
+            email="series@example.com",
+            password="secret12345",
+        )
+        self.series = Series.objects.create(name="Road trip")
+        self.first = self._post("Part one", "part-one", public=True)
+        self.draft = self._post("Part two draft", "part-two", public=False)
+        self.third = self._post("Part three", "part-three", public=True)
+        for position, post in enumerate([self.first, self.draft, self.third], 1):
+            PostSeries.objects.create(
+                post=post, series=self.series, order_position=position
+            )
+
+    def _post(self, title: str, slug: str, *, public: bool) -> Post:
+        post = Post(
+            title=title,
+            slug=slug,
+            author=self.author,
+            body="<p>Body</p>",
+            status="published" if public else "draft",
+        )
+        post.save(_allow_publish_via_sender=public)
+        if public:
+            SitePublication.objects.create(post=post, published_at=post.published)
+        return post
+
+    def test_neighbours_skip_off_site_parts(self):
+        from blog.series_navigation import series_members, series_navigation
+
+        self.assertEqual(
+            [member.post_id for member in series_members(self.series.pk)],
+            [self.first.pk, self.third.pk],
+        )
+        self.assertEqual(series_navigation(self.first), (self.series, None, self.third))
+        self.assertEqual(
+            series_navigation(self.draft), (self.series, self.first, self.third)
+        )
+
+    def test_cached_members_cost_two_queries(self):
+        from blog.series_navigation import series_navigation
+
+        series_navigation(self.third)
+        with self.assertNumQueries(2):
+            self.assertEqual(
+                series_navigation(self.third), (self.series, self.first, None)
+            )
+
+    def test_new_part_invalidates_cached_members(self):
+        from blog.series_navigation import series_navigation
+        from editor.models import PostSeries
+
+        series_navigation(self.third)
+        fourth = self._post("Part four", "part-four", public=True)
+        PostSeries.objects.create(post=fourth, series=self.series, order_position=4)
+        self.assertEqual(
+            series_navigation(self.third), (self.series, self.first, fourth)
+        )
@@ -1,22 +1,42 @@
 from django.urls import path
 
 from blog import views
-from blog.feeds import LatestPostsFeed
+from blog.feeds import (
+    CategoryPostsFeed,
+    LatestPostsFeed,
+    TagPostsFeed,
+    public_feed,
+)
 
 app_name = "blog"
 
 urlpatterns = [
     path("", views.post_list, name="post_list"),
     path("sitemap/", views.html_sitemap, name="html_sitemap"),
-    path("feed/", LatestPostsFeed(), name="feed"),
+    path("feed/", public_feed(LatestPostsFeed(), "blog.feed"), name="feed"),
     path(
         "category/<slug:category_slug>/",
         views.post_list,
         name="post_list_by_category",
     ),
+    path(
+        "category/<slug:category_slug>/feed/",
+        public_feed(CategoryPostsFeed(), "blog.category_feed"),
+        name="category_feed",
+    ),
     path("tag/<str:tag_slug>/", views.post_list, name="post_list_by_tag"),
+    path(
+        "tag/<str:tag_slug>/feed/",
+        public_feed(TagPostsFeed(), "blog.tag_feed"),
+        name="tag_feed",
+    ),
     path("search/", views.post_search, name="post_search"),
     path("lenta/", views.post_feed_lenta, name="post_lenta"),
+    path(
+        "_static-export/view/",
+        views.static_page_view_beacon,
+        name="static_page_view_beacon",
+    ),
     path("og-image/<slug>.jpg", views.post_og_image, name="post_og_image"),
     path("<slug>/", views.post_detail, name="post_detail"),
 ]
@@ -1,30 +1,64 @@
 # pyright: reportAttributeAccessIssue=false
+import math
+from urllib.parse import urlencode
+
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.search import SearchRank
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
-from django.db.models import Prefetch
+from django.db.models import F, Prefetch
+from django.db.models.functions import Lower
 from django.http import (
     Http404,
     HttpRequest,
     HttpResponse,
     HttpResponsePermanentRedirect,
+    HttpResponseRedirect,
 )
 from django.shortcuts import render
-from django.views.decorators.cache import cache_page
+from django.urls import Resolver404, resolve
 from django.views.decorators.vary import vary_on_cookie
 from taggit.models import Tag
 
+from blog.cache_utils import (
+    PUBLICATIONS_KEY,
+    category_key,
+    record_page_dependencies,
+    record_post_dependencies,
+    series_key,
+    tag_key,
+)
 from blog.category_helpers import resolve_category_for_list
-from blog.querysets import feed_posts_queryset, public_posts_queryset
-from blog.related_posts import series_navigation, similar_and_newest_posts
+from blog.conditional import post_detail_condition, public_content_condition
+from blog.page_cache import public_page_cache
+from blog.pagination import (
+    POST_LIST_PAGE_SIZE,
+    KeysetPage,
+    PostCursor,
+    cached_post_count,
+    cursor_for_page_number,
+    keyset_page,
+)
+from blog.querysets import (
+    POST_CARD_DEFERRED_FIELDS,
+    feed_posts_queryset,
+    public_post_cards_queryset,
+    public_posts_queryset,
+)
+from blog.related_posts import similar_and_newest_posts
+from blog.series_navigation import series_navigation
+from blog.static_export import static_page_exists
 from blog.tag_helpers import resolve_tag_for_list
 from editor.forms import SearchForm
 from editor.image_upload import (
     ensure_post_share_image,
     social_share_image_size,
 )
-from editor.models import Category, PostSlugRedirect
+from editor.image_variants import attach_image_variants
+from editor.models import Category, Post, PostSlugRedirect
+from editor.search_service import post_search_query
+from editor.view_count_service import record_post_view, should_count_post_view
 from sender.models import PostLink
 from sender.services.url_helpers import (
     post_og_image_absolute_url,
@@ -32,17 +66,6 @@ from sender.services.url_helpers import (
 )
 
 
-def _public_page_cache(key_prefix: str):
-    timeout = getattr(settings, "POST_PAGE_CACHE_TIMEOUT", 0)
-    if timeout <= 0 or settings.DEBUG or not getattr(settings, "IS_PRODUCTION", True):
-
-        def _noop(view):
-            return view
-
-        return _noop
-    return cache_page(timeout, key_prefix=key_prefix)
-
-
 def _label_for_category_slug(category_slug: str | None) -> str:
     if not category_slug:
         return "Рубрика"
@@ -64,18 +87,27 @@ def _post_list_seo(
     site = settings.SITE_URL.rstrip("/")
     site_name = "Shifted Stuff"
 
-    if posts_page is not None:
+    page_query = ""
+    if isinstance(posts_page, KeysetPage):
+        page_num = posts_page.number
+        total_pages = posts_page.num_pages
+        for key in ("after", "before"):
+            if page_num > 1 and request.GET.get(key):
+                page_query = urlencode({key: request.GET[key]})
+                break
+    elif posts_page is not None:
         page_num = posts_page.number
         total_pages = posts_page.paginator.num_pages
+        page_query = f"page={page_num}"
     else:
         page_num = 1
         total_pages = 1
 
     path = request.path
-    if page_num <= 1:
+    if page_num <= 1 or not page_query:
         canonical_url = f"{site}{path}"
     else:
-        canonical_url = f"{site}{path}?page={page_num}"
+        canonical_url = f"{site}{path}?{page_query}"
 
     list_heading: str | None = None
 
@@ -119,12 +151,71 @@ def _post_list_seo(
     }
 
 
+def _legacy_page_redirect(
+    request: HttpRequest,
+    object_list,
+    *,
+    total: int,
+) -> HttpResponsePermanentRedirect | None:
+    """301 old ``?page=N`` links to the equivalent keyset cursor URL."""
+    try:
+        page_number = int(request.GET.get("page") or 1)
+    except ValueError:
+        return None
+    last_page = max(1, math.ceil(total / POST_LIST_PAGE_SIZE))
+    page_number = min(page_number, last_page)
+    query = request.GET.copy()
+    del query["page"]
+    cursor = cursor_for_page_number(object_list, page_number)
+    if page_number > 1 and cursor is None:
+        return None
+    if cursor is not None:
+        query["after"] = cursor.encode()
+    url = f"{request.path}?{query.urlencode()}" if query else request.path
+    return HttpResponsePermanentRedirect(url)
+
+
+def _render_post_list(
+    request: HttpRequest,
+    *,
+    posts,
+    tag: Tag | None,
+    category: Category | None,
+    category_slug: str | None,
+    tag_slug: str | None,
+) -> HttpResponse:
+    list_seo = _post_list_seo(
+        request,
+        tag=tag,
+        category=category,
+        category_slug=category_slug,
+        tag_slug=tag_slug,
+        posts_page=posts,
+        list_empty=posts is None,
+    )
+    if posts is not None:
+        attach_image_variants(posts, "cover_image")
+    return render(
+        request,
+        "blog/post/list.html",
+        {
+            "page": request.GET.get("page") if posts is not None else None,
+            "posts": posts,
+            "tag": tag,
+            "category": category,
+            "list_seo": list_seo,
+        },
+    )
+
+
 @vary_on_cookie
-@_public_page_cache("blog.post_list")
+@public_content_condition
+@public_page_cache("blog.post_list")
 def post_list(request, tag_slug=None, category_slug=None):
-    object_list = public_posts_queryset()
+    object_list = public_post_cards_queryset()
     tag = None
     category = None
+    list_key = PUBLICATIONS_KEY
 
     if tag_slug:
         tag, redirect = resolve_tag_for_list(tag_slug)
@@ -133,6 +224,7 @@ def post_list(request, tag_slug=None, category_slug=None):
         if tag is None:
             raise Http404("Tag not found")
         object_list = object_list.filter(tags__in=[tag])
+        list_key = tag_key(tag.pk)
 
     if category_slug:
         category, redirect = resolve_category_for_list(category_slug)
@@ -140,32 +232,47 @@ def post_list(request, tag_slug=None, category_slug=None):
             return redirect
         if category is not None:
             object_list = object_list.filter(category=category)
+            list_key = category_key(category.pk)
         else:
             object_list = object_list.none()
+            list_key = ""
 
-    if not object_list:
-        list_seo = _post_list_seo(
+    record_page_dependencies(request, [list_key or PUBLICATIONS_KEY])
+
+    def render_list(posts) -> HttpResponse:
+        if posts is not None:
+            record_post_dependencies(request, posts)
+        return _render_post_list(
             request,
+            posts=posts,
             tag=tag,
             category=category,
             category_slug=category_slug,
             tag_slug=tag_slug,
-            posts_page=None,
-            list_empty=True,
         )
-        return render(
-            request,
-            "blog/post/list.html",
-            {
-                "page": None,
-                "posts": None,
-                "tag": tag,
-                "category": category,
-                "list_seo": list_seo,
-            },
+
+    if getattr(settings, "POST_LIST_KEYSET_PAGINATION", True):
+        total = cached_post_count(object_list, scope=list_key) if list_key else 0
+        if "page" in request.GET:
+            redirect = _legacy_page_redirect(request, object_list, total=total)
+            if redirect is not None:
+                return redirect
+        after = PostCursor.decode(request.GET.get("after"))
+        before = (
+            None if after is not None else PostCursor.decode(request.GET.get("before"))
         )
+        posts = keyset_page(object_list, total=total, after=after, before=before)
+        if not posts:
+            if after is not None or before is not None:
+                # Cursor outlived its rows (unpublished/deleted); restart the list.
+                return HttpResponseRedirect(request.path)
+            return render_list(None)
+        return render_list(posts)
+
+    if not object_list:
+        return render_list(None)
 
-    paginator = Paginator(object_list, 12)
+    paginator = Paginator(object_list, POST_LIST_PAGE_SIZE)
     page = request.GET.get("page")
     try:
         posts = paginator.page(page)
@@ -173,34 +280,17 @@ def post_list(request, tag_slug=None, category_slug=None):
         posts = paginator.page(1)
     except EmptyPage:
         posts = paginator.page(paginator.num_pages)
-    list_seo = _post_list_seo(
-        request,
-        tag=tag,
-        category=category,
-        category_slug=category_slug,
-        tag_slug=tag_slug,
-        posts_page=posts,
-        list_empty=False,
-    )
-    return render(
-        request,
-        "blog/post/list.html",
-        {
-            "page": page,
-            "posts": posts,
-            "tag": tag,
-            "category": category,
-            "list_seo": list_seo,
-        },
-    )
+    return render_list(posts)
 
 
 @vary_on_cookie
-@_public_page_cache("blog.post_detail")
+@post_detail_condition
+@public_page_cache("blog.post_detail")
 def post_detail(request, slug):
+    # The page shows ``rendered_body``; galleries are already expanded there.
     post = (
         public_posts_queryset()
-        .prefetch_related("gallery_images")
+        .defer(*POST_CARD_DEFERRED_FIELDS)
         .filter(slug=slug)
         .first()
     )
@@ -228,9 +318,20 @@ def post_detail(request, slug):
         post,
         excluded_ids=excluded_series_post_ids,
     )
+    record_post_dependencies(
+        request,
+        [post, previous_post, next_post, *similar_posts, *newest_posts],
+    )
+    record_page_dependencies(request, [PUBLICATIONS_KEY])
+    if current_series is not None:
+        record_page_dependencies(request, [series_key(current_series.pk)])
 
     if post.cover_image and post.cover_image.name:
         ensure_post_share_image(post)
+    attach_image_variants(
+        [post, previous_post, next_post, *similar_posts, *newest_posts],
+        "cover_image",
+    )
 
     return render(
         request,
@@ -291,14 +392,12 @@ def post_search(request):
             if len(query) > 200:
                 query = query[:200]
 
-            search_query = SearchQuery(query)
-            search_vector = SearchVector("title", weight="A") + SearchVector(
-                "body", weight="B"
-            )
-
+            # Stored, GIN-indexed vector: ``@@`` narrows to matches before ranking.
+            search_query = post_search_query(query)
             queryset = (
-                public_posts_queryset()
-                .annotate(rank=SearchRank(search_vector, search_query))
+                public_post_cards_queryset()
+                .filter(search_vector=search_query)
+                .annotate(rank=SearchRank(F("search_vector"), search_query))
                 .filter(rank__gte=0.3)
                 .order_by("-rank", "-published")
             )
@@ -311,6 +410,7 @@ def post_search(request):
                 results = paginator.page(1)
             except EmptyPage:
                 results = paginator.page(paginator.num_pages)
+            attach_image_variants(results, "cover_image")
 
             query_params = request.GET.copy()
             if "page" in query_params:
@@ -334,6 +434,7 @@ def post_feed_lenta(request: HttpRequest):
     """Authenticated feed: all site-published posts with outbound PostLink buttons."""
     queryset = (
         feed_posts_queryset()
+        .defer(*POST_CARD_DEFERRED_FIELDS)
         .select_related("category", "author")
         .prefetch_related(
             Prefetch(
@@ -354,6 +455,7 @@ def post_feed_lenta(request: HttpRequest):
         posts = paginator.page(1)
     except EmptyPage:
         posts = paginator.page(paginator.num_pages)
+    attach_image_variants(posts, "cover_image")
 
     return render(
         request,
@@ -362,12 +464,17 @@ def post_feed_lenta(request: HttpRequest):
     )
 
 
+@vary_on_cookie
+@public_content_condition
+@public_page_cache("blog.html_sitemap")
 def html_sitemap(request):
-    posts = list(
-        public_posts_queryset()
-        .select_related("category")
-        .prefetch_related("tags")
-        .order_by("-published")
+    # Titles edits refresh on TTL; new/removed publications purge right away.
+    record_page_dependencies(request, [PUBLICATIONS_KEY])
+    public_posts = public_posts_queryset()
+    posts = (
+        public_posts.only("title", "slug", "published")
+        .order_by("-published", "-id")
+        .iterator(chunk_size=500)
     )
 
     categories = (
@@ -381,18 +488,50 @@ def html_sitemap(request):
         .order_by("name")
     )
 
-    tags_by_slug = {}
-    for post in posts:
-        for tag in post.tags.all():
-            tags_by_slug[tag.slug] = tag
-    tags = sorted(tags_by_slug.values(), key=lambda tag: tag.name.lower())
+    tags = list(
+        Tag.objects.filter(
+            taggit_taggeditem_items__content_type=ContentType.objects.get_for_model(
+                Post
+            ),
+            taggit_taggeditem_items__object_id__in=public_posts.values("pk"),
+        )
+        .distinct()
+        .order_by(Lower("name"))
+    )
 
     return render(
         request,
         "blog/post/sitemap.html",
         {
             "posts": posts,
+            "posts_count": cached_post_count(public_posts, scope=PUBLICATIONS_KEY),
             "categories": categories,
             "tags": tags,
         },
     )
+
+
+def static_page_view_beacon(request: HttpRequest) -> HttpResponse:
+    """Count a post view nginx answered from the static export.
+
+    nginx mirrors only the requests it answered from an exported page here,
+    with the original path in ``X-Original-URI``; views Django rendered itself
+    are counted by ``PostDetailViewCountMiddleware``, so only exported pages
+    count here.
+    """
+    path = request.headers.get("X-Original-URI", "").split("?", 1)[0]
+    try:
+        match = resolve(path)
+    except Resolver404:
+        match = None
+    slug = match.kwargs.get("slug") if match is not None else None
+    if (
+        request.method == "GET"
+        and match is not None
+        and match.view_name == "blog:post_detail"
+        and slug
+        and static_page_exists(path)
+        and should_count_post_view(request, slug)
+    ):
+        record_post_view(slug)
+    return HttpResponse(status=204)
@@ -0,0 +1,34 @@
+"""Report hit ratios of the two-tier singleton caches."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+import blog.context_processors  # noqa: F401  (registers nav_categories)
+import core.models  # noqa: F401  (registers site and Telegram settings)
+from core.services.tiered_cache import (
+    L1_HIT,
+    L2_HIT,
+    MISS,
+    tiered_cache_stats,
+    tiered_caches,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Print process-memory (L1) hits, Redis (L2) hits and database loads of "
+        "each tiered cache, summed over all workers for the last 7 days."
+    )
+
+    def handle(self, *args, **options):
+        for name in sorted(tiered_caches()):
+            stats = tiered_cache_stats(name)
+            total = sum(stats.values())
+            ratio = (stats[L1_HIT] + stats[L2_HIT]) / total if total else 0.0
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{name}: {stats[L1_HIT]} l1, {stats[L2_HIT]} l2, "
+                    f"{stats[MISS]} miss, hit ratio {ratio:.1%}"
+                )
+            )
@@ -2,11 +2,10 @@
 
 from __future__ import annotations
 
-from django.core.cache import cache
 from django.db import models
 
-SITE_SETTINGS_CACHE_KEY = "core.site_settings.solo"
-SITE_SETTINGS_CACHE_TTL = 60
+from core.services.tiered_cache import TieredCache
+
 SITE_SETTINGS_PK = 1
 
 
@@ -59,11 +58,11 @@ class SiteSettings(models.Model):
     def save(self, *args, **kwargs):
         self.pk = SITE_SETTINGS_PK
         super().save(*args, **kwargs)
-        cache.delete(SITE_SETTINGS_CACHE_KEY)
+        site_settings_cache.invalidate()
 
     def delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
-        cache.delete(SITE_SETTINGS_CACHE_KEY)
+        site_settings_cache.invalidate()
 
     def normalized_twitter_site(self) -> str:
         site = (self.twitter_site or "").strip()
@@ -72,12 +71,15 @@ class SiteSettings(models.Model):
         return site
 
 
-def get_site_settings() -> SiteSettings:
-    """Return the singleton row, creating defaults if missing."""
-    cached = cache.get(SITE_SETTINGS_CACHE_KEY)
-    if isinstance(cached, SiteSettings):
-        return cached
-
+def load_site_settings() -> SiteSettings:
+    """Uncached singleton row (for editing), creating defaults if missing."""
     obj, _created = SiteSettings.objects.get_or_create(pk=SITE_SETTINGS_PK)
-    cache.set(SITE_SETTINGS_CACHE_KEY, obj, SITE_SETTINGS_CACHE_TTL)
     return obj
+
+
+site_settings_cache = TieredCache("site_settings", load_site_settings)
+
+
+def get_site_settings() -> SiteSettings:
+    """Return the shared singleton row (read-only; see ``load_site_settings``)."""
+    return site_settings_cache.get()
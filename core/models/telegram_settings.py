@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 
 from core.models.network import NETWORK_SLUG_TELEGRAM, Network
+from core.services.tiered_cache import TieredCache
 
 
 class TelegramNetworkSettings(models.Model):
@@ -60,8 +61,7 @@ class TelegramNetworkSettings(models.Model):
         return text or None
 
 
-def get_telegram_network_settings() -> TelegramNetworkSettings | None:
-    """Return Telegram settings row, or ``None`` if not configured."""
+def _load_telegram_network_settings() -> TelegramNetworkSettings | None:
     return (
         TelegramNetworkSettings.objects.select_related("network")
         .filter(network__slug=NETWORK_SLUG_TELEGRAM)
@@ -69,6 +69,17 @@ def get_telegram_network_settings() -> TelegramNetworkSettings | None:
     )
 
 
+# Invalidated by core.signals on TelegramNetworkSettings / Network changes.
+telegram_settings_cache = TieredCache(
+    "telegram_network_settings", _load_telegram_network_settings
+)
+
+
+def get_telegram_network_settings() -> TelegramNetworkSettings | None:
+    """Return the shared (read-only) Telegram settings row, or ``None``."""
+    return telegram_settings_cache.get()
+
+
 def post_continuation_prefix() -> str | None:
     """Configured continuation prefix, or ``None`` for the built-in default."""
     settings = get_telegram_network_settings()
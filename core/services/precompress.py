@@ -0,0 +1,120 @@
+"""Write ``.gz`` (and ``.br`` when brotli is installed) siblings for nginx.
+
+nginx ``gzip_static`` / ``brotli_static`` then serve text assets without
+compressing per request. Already-compressed formats (JPEG, PNG, WebP, fonts)
+are skipped: they would not shrink.
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+try:
+    import brotli  # pyright: ignore[reportMissingImports]
+except ImportError:
+    brotli = None
+
+PRECOMPRESS_SUFFIXES = frozenset(
+    {
+        ".atom",
+        ".css",
+        ".csv",
+        ".html",
+        ".ico",
+        ".js",
+        ".json",
+        ".map",
+        ".mjs",
+        ".svg",
+        ".txt",
+        ".xml",
+    }
+)
+PRECOMPRESS_MIN_BYTES = 1024
+# Keep a compressed copy only when it saves at least this share of the bytes.
+_MIN_SAVING = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class PrecompressResult:
+    files: int = 0
+    written: int = 0
+    bytes_saved: int = 0
+
+
+def _variants(data: bytes) -> Iterator[tuple[str, bytes]]:
+    # mtime=0: identical input gives identical output (stable ETags, no rewrites).
+    yield ".gz", gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield ".br", brotli.compress(data, quality=11)
+
+
+def _write_if_changed(target: Path, data: bytes) -> bool:
+    try:
+        if target.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, target)
+    return True
+
+
+def precompress_bytes(path: Path, data: bytes) -> tuple[int, int]:
+    """Write compressed siblings of *path* holding *data*; ``(written, saved)``."""
+    written = saved = 0
+    for suffix, compressed in _variants(data):
+        target = path.with_name(path.name + suffix)
+        if len(compressed) > len(data) * (1 - _MIN_SAVING):
+            target.unlink(missing_ok=True)
+            continue
+        if _write_if_changed(target, compressed):
+            written += 1
+        saved += len(data) - len(compressed)
+    return written, saved
+
+
+def should_precompress(path: Path) -> bool:
+    return (
+        path.suffix.lower() in PRECOMPRESS_SUFFIXES
+        and not path.name.startswith(".")
+        and path.is_file()
+        and path.stat().st_size >= PRECOMPRESS_MIN_BYTES
+    )
+
+
+def remove_precompressed(path: Path) -> None:
+    for suffix in (".gz", ".br"):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def precompress_tree(root: Path) -> PrecompressResult:
+    """Precompress every eligible file under *root*; drop orphaned siblings."""
+    files = written = saved = 0
+    if not root.is_dir():
+        return PrecompressResult()
+    for dirpath, _dirnames, filenames in os.walk(root):
+        directory = Path(dirpath)
+        for name in filenames:
+            path = directory / name
+            if path.suffix in (".gz", ".br"):
+                # Only our own siblings: a user-uploaded ``.tar.gz`` stays.
+                source = path.with_suffix("")
+                if (
+                    source.suffix.lower() in PRECOMPRESS_SUFFIXES
+                    and not source.exists()
+                ):
+                    path.unlink(missing_ok=True)
+                continue
+            if not should_precompress(path):
+                continue
+            files += 1
+            file_written, file_saved = precompress_bytes(path, path.read_bytes())
+            written += file_written
+            saved += file_saved
+    return PrecompressResult(files=files, written=written, bytes_saved=saved)
@@ -0,0 +1,193 @@
+"""Two-tier cache for small hot singletons: process memory in front of Redis.
+
+A value is stored in Redis under its current version stamp and copied into
+the worker's memory. The copy is trusted for ``TIERED_CACHE_L1_TTL`` seconds
+without any round trip; after that one GET of the version stamp tells whether
+it is still current. ``invalidate()`` bumps the stamp, which every worker
+sees on its next check. Treat returned values as read-only: they are shared.
+"""
+
+# pyright: reportAttributeAccessIssue=false
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+TIERED_CACHE_VERSION_KEY = "core.tiered:{name}:version"
+TIERED_CACHE_VALUE_KEY = "core.tiered:{name}:{version}"
+TIERED_CACHE_STATS_KEY = "core.tiered_stats:{name}:{outcome}"
+TIERED_CACHE_STATS_TTL = 7 * 24 * 60 * 60
+
+L1_HIT = "l1"
+L2_HIT = "l2"
+MISS = "miss"
+TIERED_CACHE_OUTCOMES = (L1_HIT, L2_HIT, MISS)
+
+# Local counters are added to the shared Redis ones at most this often.
+_STATS_FLUSH_SECONDS = 30.0
+
+_registry: dict[str, TieredCache] = {}
+
+
+def tiered_cache_l1_ttl() -> float:
+    """Seconds a worker trusts its copy unchecked; ``0`` outside production.
+
+    Tests and dev change rows with ``update()`` + ``cache.clear()``, so there
+    every read revalidates against the (cheap) Redis version stamp.
+    """
+    ttl = getattr(settings, "TIERED_CACHE_L1_TTL", 5)
+    if ttl <= 0 or not getattr(settings, "IS_PRODUCTION", True):
+        return 0
+    return ttl
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    version: int
+    trusted_until: float
+
+
+class TieredCache:
+    """Memoize ``loader()`` per process and in Redis, keyed by a version stamp."""
+
+    def __init__(
+        self, name: str, loader: Callable[[], Any], *, timeout: int = 300
+    ) -> None:
+        self.name = name
+        self.loader = loader
+        self.timeout = timeout
+        self._entry: _Entry | None = None
+        self._lock = threading.Lock()
+        self._counts: Counter[str] = Counter()
+        self._flushed_at = time.monotonic()
+        _registry[name] = self
+
+    def _version_key(self) -> str:
+        return TIERED_CACHE_VERSION_KEY.format(name=self.name)
+
+    def _current_version(self) -> int:
+        key = self._version_key()
+        version = cache.get(key)
+        if version is None:
+            # Never bumped, evicted or cleared: start a new version.
+            cache.add(key, time.time_ns(), timeout=None)
+            version = cache.get(key)
+        return int(version or 0)
+
+    def get(self) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry
+        if entry is not None and entry.trusted_until > now:
+            self._count(L1_HIT)
+            return entry.value
+
+        try:
+            version = self._current_version()
+        except Exception:
+            logger.exception("Failed to read %s cache version", self.name)
+            self._count(MISS)
+            return self.loader()
+
+        trusted_until = now + tiered_cache_l1_ttl()
+        if entry is not None and entry.version == version:
+            outcome, value = L1_HIT, entry.value
+        else:
+            value_key = TIERED_CACHE_VALUE_KEY.format(name=self.name, version=version)
+            try:
+                boxed = cache.get(value_key)
+            except Exception:
+                logger.exception("Failed to read %s cache value", self.name)
+                boxed = None
+            if isinstance(boxed, tuple) and len(boxed) == 1:
+                outcome, value = L2_HIT, boxed[0]
+            else:
+                outcome, value = MISS, self.loader()
+                try:
+                    # Boxed so a cached ``None`` differs from a miss.
+                    cache.set(value_key, (value,), self.timeout)
+                except Exception:
+                    logger.exception("Failed to store %s cache value", self.name)
+        with self._lock:
+            self._entry = _Entry(value, version, trusted_until)
+        self._count(outcome)
+        self._maybe_flush_stats(now)
+        return value
+
+    def invalidate(self) -> None:
+        """Drop the value everywhere: now, and again once the transaction commits.
+
+        The second bump covers workers that reloaded pre-commit rows in between.
+        """
+        self._bump()
+        transaction.on_commit(self._bump)
+
+    def _bump(self) -> None:
+        with self._lock:
+            self._entry = None
+        try:
+            cache.set(self._version_key(), time.time_ns(), timeout=None)
+        except Exception:
+            logger.exception("Failed to bump %s cache version", self.name)
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def _maybe_flush_stats(self, now: float) -> None:
+        with self._lock:
+            if now - self._flushed_at < _STATS_FLUSH_SECONDS:
+                return
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = now
+        self._flush(counts)
+
+    def flush_stats(self) -> None:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        self._flush(counts)
+
+    def _flush(self, counts: Counter[str]) -> None:
+        for outcome, count in counts.items():
+            key = TIERED_CACHE_STATS_KEY.format(name=self.name, outcome=outcome)
+            try:
+                if not cache.add(key, count, TIERED_CACHE_STATS_TTL):
+                    cache.incr(key, count)
+            except ValueError:
+                # Counter expired between ``add`` and ``incr``; drop these samples.
+                pass
+            except Exception:
+                logger.exception("Failed to record %s cache stats", self.name)
+                return
+
+
+def tiered_caches() -> dict[str, TieredCache]:
+    return dict(_registry)
+
+
+def tiered_cache_stats(name: str) -> dict[str, int]:
+    """Shared L1/L2/miss counters of one cache (all workers, last 7 days)."""
+    keys = {
+        outcome: TIERED_CACHE_STATS_KEY.format(name=name, outcome=outcome)
+        for outcome in TIERED_CACHE_OUTCOMES
+    }
+    try:
+        values = cache.get_many(list(keys.values()))
+    except Exception:
+        logger.exception("Failed to read tiered cache stats")
+        values = {}
+    return {outcome: int(values.get(key) or 0) for outcome, key in keys.items()}
@@ -1,4 +1,4 @@
-"""Security-related Django signal handlers."""
+"""Security-related Django signal handlers and settings cache invalidation."""
 
 from __future__ import annotations
 
@@ -6,8 +6,15 @@ import logging
 
 from django.contrib.auth.signals import user_logged_in
 from django.core.mail import send_mail
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
+from core.models.network import Network
+from core.models.telegram_settings import (
+    TelegramNetworkSettings,
+    telegram_settings_cache,
+)
+
 log = logging.getLogger(__name__)
 
 
@@ -18,6 +25,14 @@ def rotate_session_on_login(sender, request, user, **kwargs):
         request.session.cycle_key()
 
 
+@receiver(post_save, sender=TelegramNetworkSettings)
+@receiver(post_delete, sender=TelegramNetworkSettings)
+@receiver(post_save, sender=Network)
+@receiver(post_delete, sender=Network)
+def _invalidate_telegram_settings_cache(sender, **kwargs) -> None:
+    telegram_settings_cache.invalidate()
+
+
 def _send_lockout_email(subject: str, body: str) -> None:
     from core.services.site_settings import SiteSettingsService
 
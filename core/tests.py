@@ -217,6 +217,74 @@ class SiteSettingsTests(TestCase):
         self.assertEqual(cfg.admin_email, "env-admin@example.com")
 
 
+class TieredCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def test_save_invalidates_site_settings(self):
+        from core.models import get_site_settings
+        from core.models.site_settings import load_site_settings
+
+        self.assertEqual(get_site_settings().site_name, load_site_settings().site_name)
+        obj = load_site_settings()
+        obj.site_name = "Renamed Blog"
+        obj.save()
+        self.assertEqual(get_site_settings().site_name, "Renamed Blog")
+
+    @override_settings(TIERED_CACHE_L1_TTL=60, IS_PRODUCTION=True)
+    def test_l1_skips_redis_until_invalidated(self):
+        from core.services.tiered_cache import (
+            L1_HIT,
+            L2_HIT,
+            MISS,
+            TieredCache,
+            tiered_cache_stats,
+        )
+
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return len(loads)
+
+        first = TieredCache("test_counter", loader)
+        self.assertEqual(first.get(), 1)
+        with patch("core.services.tiered_cache.cache.get") as cache_get:
+            self.assertEqual(first.get(), 1)
+        cache_get.assert_not_called()
+
+        # Another worker finds the value in Redis without loading it.
+        second = TieredCache("test_counter", loader)
+        self.assertEqual(second.get(), 1)
+        self.assertEqual(len(loads), 1)
+
+        first.invalidate()
+        self.assertEqual(first.get(), 2)
+
+        first.flush_stats()
+        second.flush_stats()
+        self.assertEqual(
+            tiered_cache_stats("test_counter"), {L1_HIT: 1, L2_HIT: 1, MISS: 2}
+        )
+
+    def test_telegram_settings_cache_follows_saves(self):
+        from core.models import NETWORK_SLUG_TELEGRAM, TelegramNetworkSettings
+        from core.models.telegram_settings import post_continuation_prefix
+
+        network, _ = Network.objects.get_or_create(
+            slug=NETWORK_SLUG_TELEGRAM, defaults={"name": "Telegram"}
+        )
+        row, _ = TelegramNetworkSettings.objects.get_or_create(network=network)
+        row.post_continuation_text = "More:"
+        row.save()
+        self.assertEqual(post_continuation_prefix(), "More:")
+        row.post_continuation_text = "Next:"
+        row.save()
+        self.assertEqual(post_continuation_prefix(), "Next:")
+
+
 class SiteDomainSyncTests(TestCase):
     def test_hostname_and_cookie_parent(self):
         self.assertEqual(
@@ -351,6 +419,73 @@ class NginxRedirectRenderTests(TestCase):
         self.assertIn("editor.shiftedblog.local", editor_block)
         self.assertIn("203.0.113.10", editor_block)
 
+    def test_microcache_and_precompressed_serving(self):
+        render = _load_render_nginx_conf()
+        template = (self._render_root() / "nginx" / "nginx.conf.template").read_text(
+            encoding="utf-8"
+        )
+        env = {"DOMAIN": "example.com", "SITE_URL": "https://example.com"}
+        text = render.render(env, template, template_root=self._render_root())
+        self.assertNotIn("__", text)
+        self.assertIn("keys_zone=microcache", text)
+        self.assertIn("proxy_cache_bypass $microcache_bypass $microcache_skip;", text)
+        self.assertIn("proxy_no_cache $microcache_bypass $microcache_skip;", text)
+        self.assertIn("~^/[^/]+/$  1;", text)
+        self.assertIn("$cookie_sessionid", text)
+        self.assertIn("listen 8081;", text)
+        self.assertIn("gzip_static on;", text)
+        self.assertNotIn("brotli", text)
+
+        text = render.render(
+            {**env, "NGINX_MICROCACHE_SECONDS": "0", "NGINX_BROTLI": "true"},
+            template,
+            template_root=self._render_root(),
+        )
+        self.assertNotIn("proxy_cache", text)
+        self.assertTrue(text.startswith("load_module"))
+        self.assertIn("brotli_static on;", text)
+
+    def test_view_beacon_is_mirrored_only_for_exported_pages(self):
+        render = _load_render_nginx_conf()
+        template = (self._render_root() / "nginx" / "nginx.conf.template").read_text(
+            encoding="utf-8"
+        )
+        text = render.render(
+            {"DOMAIN": "example.com", "SITE_URL": "https://example.com"},
+            template,
+            template_root=self._render_root(),
+        )
+        self.assertEqual(text.count("mirror /_static-export/view/;"), 1)
+        page = text.split("location @static_export_page {", 1)[1].split("}", 1)[0]
+        self.assertIn("mirror /_static-export/view/;", page)
+        self.assertIn("return 418;", text)
+
+
+class PrecompressTests(TestCase):
+    def test_precompress_tree_writes_gzip_and_drops_orphans(self):
+        import gzip
+
+        from core.services.precompress import precompress_tree
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            css = root / "css" / "site.css"
+            css.parent.mkdir()
+            css.write_text("body { color: red; }\n" * 200, encoding="utf-8")
+            (root / "photo.jpg").write_bytes(b"\xff\xd8" * 2000)
+            (root / "gone.js.gz").write_bytes(b"stale")
+
+            result = precompress_tree(root)
+
+            self.assertEqual(result.files, 1)
+            self.assertEqual(
+                gzip.decompress((root / "css" / "site.css.gz").read_bytes()),
+                css.read_bytes(),
+            )
+            self.assertFalse((root / "photo.jpg.gz").exists())
+            self.assertFalse((root / "gone.js.gz").exists())
+            self.assertEqual(precompress_tree(root).written, 0)
+
 
 @override_settings(ADMIN_URL="mellon")
 class UserAdminTests(TestCase):
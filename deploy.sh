@@ -47,11 +47,14 @@ fi
 # shellcheck disable=SC1091
 source ./scripts/load-editor-ui-build-env.sh
 
+# Services that run the application image (web plus the queue workers).
+APP_SERVICES=(web image-worker publish-worker view-count-flusher related-posts static-export)
+
 docker compose -f docker-compose.prod.yml build web
 
 if docker compose -f docker-compose.prod.yml ps --status running -q nginx 2>/dev/null | grep -q .; then
   echo "Rolling deploy (keeping nginx on 80/443)..."
-  docker compose -f docker-compose.prod.yml up -d --no-build web db redis
+  docker compose -f docker-compose.prod.yml up -d --no-build "${APP_SERVICES[@]}" db redis
 else
   COMPOSE_FILE=docker-compose.prod.yml WAIT_SECONDS=45 ./scripts/free-web-ports.sh .
   docker compose -f docker-compose.prod.yml up -d --remove-orphans
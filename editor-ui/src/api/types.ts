@@ -84,6 +84,21 @@ export interface PublishResult {
   >;
 }
 
+export type PublishJobStatus = "queued" | "running" | "succeeded" | "failed";
+
+export interface PublishJob {
+  id: number;
+  post_id: number;
+  status: PublishJobStatus;
+  networks: string[];
+  result: PublishResult | null;
+  error: string;
+  interrupted: boolean;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 export interface TelegramPreviewCard {
   send_index: number;
   send_total: number;
@@ -1,7 +1,12 @@
 import { useEffect, useState } from "react";
 import { useMutation, useQuery } from "@tanstack/react-query";
 import { apiFetch } from "@/api/client";
-import type { PostListItem, PublishResult, TelegramPreviewResponse } from "@/api/types";
+import type {
+  PostListItem,
+  PublishJob,
+  PublishResult,
+  TelegramPreviewResponse,
+} from "@/api/types";
 import { useAuth } from "@/features/auth/useAuth";
 import { PublishResultDialog } from "@/features/publish/PublishResultDialog";
 import { TelegramPreviewCards } from "@/features/publish/TelegramPreviewCards";
@@ -17,6 +22,7 @@ export function PublishPage() {
   const [telegramStory, setTelegramStory] = useState(false);
   const [result, setResult] = useState<PublishResult | null>(null);
   const [requestError, setRequestError] = useState<string | null>(null);
+  const [jobId, setJobId] = useState<number | null>(null);
   const [showPreview, setShowPreview] = useState(false);
   const t = useT();
 
@@ -56,24 +62,50 @@ export function PublishPage() {
     },
   });
 
+  const jobQuery = useQuery({
+    queryKey: ["publish-job", jobId],
+    enabled: jobId !== null,
+    queryFn: () =>
+      apiFetch<{ ok: boolean; job: PublishJob }>(`/publish/jobs/${jobId}/`),
+    refetchInterval: (query) => {
+      const status = query.state.data?.job.status;
+      return status === "succeeded" || status === "failed" ? false : 2000;
+    },
+  });
+
+  useEffect(() => {
+    const job = jobQuery.data?.job;
+    if (!job || job.status === "queued" || job.status === "running") return;
+    setJobId(null);
+    if (job.result) setResult(job.result);
+    else setRequestError(t("publish.jobFailed", { message: job.error }));
+  }, [jobQuery.data, t]);
+
   const publishMutation = useMutation({
     mutationFn: () =>
-      apiFetch<{ ok: boolean; result: PublishResult }>("/publish/", {
-        method: "POST",
-        body: JSON.stringify({
-          post_id: postId,
-          dest_site: destSite,
-          dest_telegram: destTelegram,
-          telegram_format: telegramFormat,
-          crosslink_network: crosslinkNetwork || null,
-          telegram_post_story: telegramStory,
-        }),
-      }),
+      apiFetch<{ ok: boolean; job: PublishJob; result?: PublishResult }>(
+        "/publish/",
+        {
+          method: "POST",
+          body: JSON.stringify({
+            post_id: postId,
+            dest_site: destSite,
+            dest_telegram: destTelegram,
+            telegram_format: telegramFormat,
+            crosslink_network: crosslinkNetwork || null,
+            telegram_post_story: telegramStory,
+          }),
+        },
+      ),
     onMutate: () => {
       setResult(null);
       setRequestError(null);
+      setJobId(null);
+    },
+    onSuccess: (data) => {
+      if (data.result) setResult(data.result);
+      else setJobId(data.job.id);
     },
-    onSuccess: (data) => setResult(data.result),
     onError: (error) => {
       setRequestError(
         t("publish.requestFailed", {
@@ -216,12 +248,17 @@ export function PublishPage() {
             </button>
             <button
               type="button"
-              disabled={!postId || publishMutation.isPending}
+              disabled={!postId || publishMutation.isPending || jobId !== null}
               onClick={() => publishMutation.mutate()}
               className="rounded-lg bg-accent px-4 py-2 text-sm text-white"
             >
               {t("publish.submit")}
             </button>
+            {jobId !== null && (
+              <span className="self-center text-sm text-text-muted">
+                {t("publish.running")}
+              </span>
+            )}
           </div>
         </div>
         <div className="rounded-xl border border-border bg-surface p-4">
@@ -202,6 +202,8 @@ export const en: Record<MessageKey, string> = {
   "publish.statusUpdated": "Post status updated to “Published”.",
   "publish.networkFailed": "failed",
   "publish.requestFailed": "Publishing failed: {message}",
+  "publish.running": "Publishing in the background…",
+  "publish.jobFailed": "Publish job failed: {message}",
 
   "preview.ownerPremium": "Has premium: {value}",
   "preview.yes": "yes",
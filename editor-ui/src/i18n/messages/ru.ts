@@ -199,6 +199,8 @@ export const ru = {
   "publish.statusUpdated": "Статус поста обновлён на «Опубликован».",
   "publish.networkFailed": "ошибка",
   "publish.requestFailed": "Не удалось выполнить публикацию: {message}",
+  "publish.running": "Публикация выполняется в фоне…",
+  "publish.jobFailed": "Задача публикации завершилась с ошибкой: {message}",
 
   "preview.ownerPremium": "Есть премиум: {value}",
   "preview.yes": "да",
@@ -1,4 +1,4 @@
-"""Invalidate full-page cache for public post list/detail views (django-redis)."""
+"""Invalidate full-page cache for public post list/detail views."""
 
 from __future__ import annotations
 
@@ -0,0 +1,66 @@
+"""Registry of files derived from uploaded images (share/Telegram JPEG, srcset)."""
+
+from __future__ import annotations
+
+import hashlib
+import io
+
+from django.core.files.storage import default_storage
+from PIL import Image
+
+from editor.models import DerivedImage
+
+
+def source_content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def storage_content_hash(name: str) -> str:
+    """``source_content_hash`` of a stored file, read chunk by chunk."""
+    digest = hashlib.sha256()
+    with default_storage.open(name, "rb") as fh:
+        for chunk in fh.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def derived_image(source_name: str, kind: str) -> DerivedImage | None:
+    """Registered derivative of *source_name*; one indexed lookup, no file I/O."""
+    if not source_name:
+        return None
+    return DerivedImage.objects.filter(
+        source_name=source_name, kind=kind, target_width=0
+    ).first()
+
+
+def register_derived_image(
+    *,
+    source_name: str,
+    source_hash: str,
+    kind: str,
+    storage_name: str,
+    data: bytes,
+    target_width: int = 0,
+) -> DerivedImage:
+    """Record (or replace) the derivative just written to *storage_name*."""
+    # Reads the header only; the pixels are never decoded.
+    with Image.open(io.BytesIO(data)) as im:
+        width, height = im.size
+    entry, _created = DerivedImage.objects.update_or_create(
+        source_name=source_name,
+        kind=kind,
+        target_width=target_width,
+        defaults={
+            "source_hash": source_hash,
+            "storage_name": storage_name,
+            "width": width,
+            "height": height,
+            "size_bytes": len(data),
+        },
+    )
+    return entry
+
+
+def forget_derived_images(source_name: str) -> None:
+    """Drop registry rows for a source path whose bytes were just replaced."""
+    DerivedImage.objects.filter(source_name=source_name).delete()
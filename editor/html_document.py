@@ -0,0 +1,275 @@
+"""Parse post body HTML once into a token stream shared by every text output.
+
+Card previews, text quality metrics, Telegram HTML, Telegram rich HTML and the
+stored detail-page HTML (``Post.rendered_body``) all read the same
+``HtmlDocument``; it is memoized in-process by a hash of the HTML, so one
+revision is parsed once per worker however many of those outputs are built
+from it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from html import unescape
+from html.parser import HTMLParser
+
+HTML_DOCUMENT_CACHE_SIZE = 128
+
+START = "start"
+END = "end"
+DATA = "data"
+GALLERY = "gallery"
+
+GALLERY_PLACEHOLDER_RE = re.compile(r"\[gallery:(\d+)\]", re.IGNORECASE)
+_NBSP_RE = re.compile(r"[\u00a0\u202f]")
+
+# CKEditor inline styles → semantic tags; the first matching style wins.
+_SPAN_STYLE_TAGS = (
+    (re.compile(r"font-weight\s*:\s*(?:bold|[6-9]00)", re.IGNORECASE), "strong"),
+    (re.compile(r"font-style\s*:\s*italic", re.IGNORECASE), "em"),
+    (re.compile(r"text-decoration\s*:\s*underline", re.IGNORECASE), "u"),
+    (re.compile(r"text-decoration\s*:\s*line-through", re.IGNORECASE), "s"),
+)
+
+# Plain text keeps paragraph structure: these end a block ("\n\n").
+_PLAIN_BLOCK_END_TAGS = frozenset(
+    {
+        "div",
+        "section",
+        "article",
+        "blockquote",
+        "li",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+    }
+)
+_PLAIN_CELL_END_TAGS = frozenset({"td", "th"})
+
+
+def decode_html_entities(value: str) -> str:
+    """Decode (possibly double-escaped) entities and non-breaking spaces."""
+    if not value:
+        return ""
+    text = str(value)
+    for _ in range(3):
+        decoded = unescape(text)
+        if decoded == text:
+            break
+        text = decoded
+    text = re.sub(r"&nbsp;", " ", text, flags=re.IGNORECASE)
+    return _NBSP_RE.sub(" ", text)
+
+
+@dataclass(frozen=True, slots=True)
+class HtmlToken:
+    kind: str
+    tag: str = ""
+    attrs: tuple[tuple[str, str | None], ...] = ()
+    data: str = ""
+    gallery_key: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class BodySegment:
+    """A run of raw body HTML, or a ``[gallery:N]`` placeholder between runs."""
+
+    html: str = ""
+    gallery_key: int | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class HtmlDocument:
+    tokens: tuple[HtmlToken, ...]
+    plain_text: str
+    segments: tuple[BodySegment, ...]
+    tag_counts: dict[str, int]
+
+
+class HtmlTokenHandler:
+    """Replay an ``HtmlDocument`` through ``HTMLParser``-style callbacks.
+
+    Gallery placeholders are dropped; subclasses that need them override
+    ``handle_gallery``.
+    """
+
+    def feed_document(self, document: HtmlDocument) -> None:
+        for token in document.tokens:
+            if token.kind == DATA:
+                self.handle_data(token.data)
+            elif token.kind == START:
+                self.handle_starttag(token.tag, list(token.attrs))
+            elif token.kind == END:
+                self.handle_endtag(token.tag)
+            elif token.gallery_key is not None:
+                self.handle_gallery(token.gallery_key)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        pass
+
+    def handle_endtag(self, tag: str) -> None:
+        pass
+
+    def handle_data(self, data: str) -> None:
+        pass
+
+    def handle_gallery(self, key: int) -> None:
+        pass
+
+
+class _Tokenizer(HTMLParser):
+    """Single ``HTMLParser`` pass: tokens, plain text and gallery offsets."""
+
+    def __init__(self, source: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self._source = source
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+        self.tokens: list[HtmlToken] = []
+        self.plain: list[str] = []
+        self.galleries: list[tuple[int, int, int]] = []
+        self.tag_counts: Counter[str] = Counter()
+        self._span_stack: list[str | None] = []
+
+    def _source_offset(self) -> int:
+        lineno, column = self.getpos()
+        return self._line_starts[lineno - 1] + column
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag == "span":
+            start_text = self.get_starttag_text() or ""
+            mapped = next(
+                (
+                    name
+                    for pattern, name in _SPAN_STYLE_TAGS
+                    if pattern.search(start_text)
+                ),
+                None,
+            )
+            self._span_stack.append(mapped)
+            if mapped is None:
+                return
+            tag, attrs = mapped, []
+        self.tag_counts[tag] += 1
+        self.tokens.append(HtmlToken(START, tag=tag, attrs=tuple(attrs)))
+        if tag == "p":
+            self.plain.append("\n\n")
+        elif tag == "br":
+            self.plain.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "span":
+            mapped = self._span_stack.pop() if self._span_stack else None
+            if mapped is None:
+                return
+            tag = mapped
+        self.tokens.append(HtmlToken(END, tag=tag))
+        if tag in _PLAIN_BLOCK_END_TAGS:
+            self.plain.append("\n\n")
+        elif tag in _PLAIN_CELL_END_TAGS:
+            self.plain.append(" ")
+
+    def handle_data(self, data: str) -> None:
+        if not data:
+            return
+        pos = 0
+        chunk_start = None
+        for match in GALLERY_PLACEHOLDER_RE.finditer(data):
+            self._append_text(data[pos : match.start()])
+            key = int(match.group(1))
+            self.tokens.append(HtmlToken(GALLERY, gallery_key=key))
+            if chunk_start is None:
+                chunk_start = self._source_offset()
+            raw = GALLERY_PLACEHOLDER_RE.search(self._source, chunk_start)
+            if raw is not None and int(raw.group(1)) == key:
+                self.galleries.append((raw.start(), raw.end(), key))
+                chunk_start = raw.end()
+            pos = match.end()
+        self._append_text(data[pos:])
+
+    def _append_text(self, text: str) -> None:
+        if text:
+            self.tokens.append(HtmlToken(DATA, data=text))
+            self.plain.append(text)
+
+
+def _plain_text(pieces: list[str]) -> str:
+    text = decode_html_entities("".join(pieces))
+    text = re.sub(r"[ \t]{2,}", " ", text)
+    text = re.sub(r"\s*\n\n\s*", "\n\n", text)
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _segments(source: str, galleries: list[tuple[int, int, int]]) -> list[BodySegment]:
+    segments: list[BodySegment] = []
+    pos = 0
+    for start, end, key in galleries:
+        if start > pos:
+            segments.append(BodySegment(html=source[pos:start]))
+        segments.append(BodySegment(gallery_key=key))
+        pos = end
+    if pos < len(source):
+        segments.append(BodySegment(html=source[pos:]))
+    return segments
+
+
+def parse_html_document(html: str) -> HtmlDocument:
+    """Tokenize *html* without the memo (use ``html_document`` in callers)."""
+    tokenizer = _Tokenizer(html)
+    tokenizer.feed(html)
+    tokenizer.close()
+    return HtmlDocument(
+        tokens=tuple(tokenizer.tokens),
+        plain_text=_plain_text(tokenizer.plain),
+        segments=tuple(_segments(html, tokenizer.galleries)),
+        tag_counts=dict(tokenizer.tag_counts),
+    )
+
+
+_documents: OrderedDict[str, HtmlDocument] = OrderedDict()
+_documents_lock = threading.Lock()
+_documents_stats = {"hits": 0, "misses": 0}
+
+
+def html_document(html: str | None) -> HtmlDocument:
+    """Memoized ``parse_html_document``, keyed by a hash of *html*."""
+    html = html or ""
+    digest = hashlib.blake2b(html.encode(), digest_size=16).hexdigest()
+    with _documents_lock:
+        document = _documents.get(digest)
+        if document is not None:
+            _documents.move_to_end(digest)
+            _documents_stats["hits"] += 1
+            return document
+        _documents_stats["misses"] += 1
+    document = parse_html_document(html)
+    with _documents_lock:
+        _documents[digest] = document
+        while len(_documents) > HTML_DOCUMENT_CACHE_SIZE:
+            _documents.popitem(last=False)
+    return document
+
+
+def html_document_cache_info() -> dict[str, int]:
+    with _documents_lock:
+        return {**_documents_stats, "size": len(_documents)}
+
+
+def clear_html_document_cache() -> None:
+    with _documents_lock:
+        _documents.clear()
+        _documents_stats.update(hits=0, misses=0)
+
+
+def first_sentence_of(text: str) -> str:
+    """First sentence of already plain *text* (whitespace collapsed)."""
+    text = re.sub(r"\s+", " ", text or "").strip()
+    if not text:
+        return ""
+    return re.split(r"(?<=[.!?…])\s+", text, maxsplit=1)[0].strip()
@@ -0,0 +1,271 @@
+"""Image encoding off the request path (``IMAGE_PROCESSING_ASYNC``).
+
+The upload request stores the original untouched plus its placeholder and
+queues an ``ImageJob``. ``manage.py process_image_jobs`` claims jobs with
+``SKIP LOCKED``, runs ``process_image_upload`` (delivery file, srcset ladder,
+share JPEG) in a process pool and saves the new file name on the row, so the
+usual save signals re-render and purge the affected pages.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from editor.image_placeholder import apply_image_placeholder, placeholder_from_bytes
+from editor.image_upload import image_processing_async, process_image_upload
+from editor.models import DerivedImage, ImageJob
+
+logger = logging.getLogger(__name__)
+
+IMAGE_JOB_MAX_ATTEMPTS = 3
+ACTIVE_STATUSES = (ImageJob.Status.PENDING, ImageJob.Status.PROCESSING)
+
+
+def _poll_seconds() -> float:
+    return float(getattr(settings, "IMAGE_JOB_POLL_SECONDS", 2))
+
+
+def _job_timeout() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, "IMAGE_JOB_TIMEOUT", 600)))
+
+
+def defer_image_upload(instance, field_name: str, raw: bytes) -> None:
+    """Store the upload as-is; ``enqueue_image_jobs`` queues it after the save."""
+    # Decodes a reduced draft only: validates the file and yields the placeholder.
+    apply_image_placeholder(instance, field_name, placeholder_from_bytes(raw))
+    field = getattr(instance, field_name)
+    field.save(os.path.basename(field.name), ContentFile(raw), save=False)
+    deferred = getattr(instance, "_deferred_image_fields", set())
+    instance._deferred_image_fields = {*deferred, field_name}
+
+
+def enqueue_image_jobs(instance) -> None:
+    """(Re)queue every field ``defer_image_upload`` stored on *instance*."""
+    fields = instance.__dict__.pop("_deferred_image_fields", set())
+    for field_name in sorted(fields):
+        ImageJob.objects.update_or_create(
+            model_label=instance._meta.label_lower,
+            object_id=instance.pk,
+            field_name=field_name,
+            defaults={
+                "source_name": getattr(instance, field_name).name,
+                "status": ImageJob.Status.PENDING,
+                "attempts": 0,
+                "error": "",
+                "started": None,
+                "finished": None,
+            },
+        )
+
+
+def image_job_pending(instance, field_name: str) -> bool:
+    """True while the stored file of *field_name* is an unprocessed original."""
+    if not image_processing_async() or instance.pk is None:
+        return False
+    if field_name in getattr(instance, "_deferred_image_fields", ()):
+        return True
+    return ImageJob.objects.filter(
+        model_label=instance._meta.label_lower,
+        object_id=instance.pk,
+        field_name=field_name,
+        status__in=ACTIVE_STATUSES,
+    ).exists()
+
+
+def attach_image_job_statuses(instances: Iterable, field_name: str) -> None:
+    """Preload what ``image_processing_status`` reads for *instances*, in one query."""
+    instances = [obj for obj in instances if obj is not None and obj.pk is not None]
+    if not instances:
+        return
+    statuses = dict(
+        ImageJob.objects.filter(
+            model_label=instances[0]._meta.label_lower,
+            object_id__in=[obj.pk for obj in instances],
+            field_name=field_name,
+        ).values_list("object_id", "status")
+    )
+    for obj in instances:
+        cached = getattr(obj, "_image_job_statuses", None) or {}
+        obj._image_job_statuses = {
+            **cached,
+            field_name: statuses.get(obj.pk, ImageJob.Status.DONE),
+        }
+
+
+def image_processing_status(instance, field_name: str) -> str | None:
+    """``pending``/``processing``/``done``/``failed``; ``None`` without an image."""
+    if not getattr(instance, field_name) or instance.pk is None:
+        return None
+    preloaded = getattr(instance, "_image_job_statuses", None) or {}
+    if field_name in preloaded:
+        return preloaded[field_name]
+    status = (
+        ImageJob.objects.filter(
+            model_label=instance._meta.label_lower,
+            object_id=instance.pk,
+            field_name=field_name,
+        )
+        .values_list("status", flat=True)
+        .first()
+    )
+    return status or ImageJob.Status.DONE
+
+
+def claim_image_jobs(limit: int) -> list[int]:
+    """Mark up to *limit* queued (or abandoned) jobs as processing; their ids."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    abandoned = Q(status=ImageJob.Status.PROCESSING, started__lt=now - _job_timeout())
+    with transaction.atomic():
+        # A worker that died mid-job leaves it processing; give up eventually.
+        ImageJob.objects.filter(abandoned, attempts__gte=IMAGE_JOB_MAX_ATTEMPTS).update(
+            status=ImageJob.Status.FAILED,
+            error="Worker did not finish the job.",
+            finished=now,
+        )
+        job_ids = list(
+            ImageJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status=ImageJob.Status.PENDING) | abandoned)
+            .order_by("created")
+            .values_list("pk", flat=True)[:limit]
+        )
+        ImageJob.objects.filter(pk__in=job_ids).update(
+            status=ImageJob.Status.PROCESSING,
+            started=now,
+            attempts=F("attempts") + 1,
+        )
+    return job_ids
+
+
+def _discard_outputs(storage_name: str) -> None:
+    """Delete a delivery file (and its derivatives) nobody will reference."""
+    for entry in DerivedImage.objects.filter(source_name=storage_name):
+        if entry.storage_name != storage_name:
+            default_storage.delete(entry.storage_name)
+    DerivedImage.objects.filter(source_name=storage_name).delete()
+    default_storage.delete(storage_name)
+
+
+def _process(job: ImageJob) -> str:
+    model = apps.get_model(job.model_label)
+    instance = model._default_manager.filter(pk=job.object_id).first()
+    claimed = ImageJob.objects.filter(
+        pk=job.pk, source_name=job.source_name, status=ImageJob.Status.PROCESSING
+    )
+    if instance is None:
+        ImageJob.objects.filter(pk=job.pk, source_name=job.source_name).delete()
+        return ImageJob.Status.DONE
+    if getattr(instance, job.field_name).name != job.source_name:
+        # Cleared since, or replaced: a new upload re-queues this row.
+        claimed.update(status=ImageJob.Status.DONE, finished=timezone.now())
+        return ImageJob.Status.DONE
+
+    with default_storage.open(job.source_name, "rb") as fh:
+        raw = fh.read()
+    process_image_upload(instance, job.field_name, raw)
+    delivery_name = getattr(instance, job.field_name).name
+    with transaction.atomic():
+        current = (
+            model._default_manager.select_for_update()
+            .filter(pk=job.object_id)
+            .values_list(job.field_name, flat=True)
+            .first()
+        )
+        if current != job.source_name:
+            transaction.on_commit(lambda: _discard_outputs(delivery_name))
+            claimed.update(status=ImageJob.Status.DONE, finished=timezone.now())
+            return ImageJob.Status.DONE
+        # Model save: placeholder columns ride along, signals purge pages.
+        instance.save(update_fields=[job.field_name])
+        claimed.update(status=ImageJob.Status.DONE, error="", finished=timezone.now())
+    if delivery_name != job.source_name:
+        default_storage.delete(job.source_name)
+    return ImageJob.Status.DONE
+
+
+def run_image_job(job_id: int) -> str:
+    """Process one claimed job; failures are recorded on the row, never raised."""
+    job = ImageJob.objects.filter(pk=job_id).first()
+    if job is None:
+        return ImageJob.Status.DONE
+    try:
+        return _process(job)
+    except Exception as exc:
+        logger.exception("Image job %s failed", job)
+        status = (
+            ImageJob.Status.PENDING
+            if job.attempts < IMAGE_JOB_MAX_ATTEMPTS
+            else ImageJob.Status.FAILED
+        )
+        ImageJob.objects.filter(
+            pk=job.pk, source_name=job.source_name, status=ImageJob.Status.PROCESSING
+        ).update(
+            status=status,
+            error=f"{type(exc).__name__}: {exc}"[:1000],
+            finished=timezone.now(),
+        )
+        return status
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def _drain_inline() -> int:
+    processed = 0
+    while job_ids := claim_image_jobs(1):
+        run_image_job(job_ids[0])
+        processed += 1
+    return processed
+
+
+def run_image_worker(*, workers: int = 1, once: bool = False) -> int:
+    """Claim and process jobs until stopped (or the queue is empty with *once*)."""
+    if workers <= 1 and once:
+        return _drain_inline()
+    processed = 0
+    while True:
+        # Children open their own connections; never share the parent's sockets.
+        connections.close_all()
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max(1, workers),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            ) as pool:
+                running: set[Future] = set()
+                while True:
+                    job_ids = claim_image_jobs(max(1, workers) - len(running))
+                    running.update(pool.submit(run_image_job, pk) for pk in job_ids)
+                    if not running:
+                        if once:
+                            return processed
+                        time.sleep(_poll_seconds())
+                        continue
+                    done, running = wait(
+                        running, timeout=_poll_seconds(), return_when=FIRST_COMPLETED
+                    )
+                    for future in done:
+                        future.result()
+                        processed += 1
+        except BrokenProcessPool:
+            # A child died (OOM on a huge upload); its job is retried once stale.
+            logger.exception("Image worker pool broke; restarting it")
@@ -0,0 +1,158 @@
+"""Inline placeholders for covers and gallery images: tiny blurred WebP + colour.
+
+Templates paint them as the ``<img>`` background, so cards and carousels show
+the image's shape and tone before the real file arrives, with no extra request.
+Images with transparent pixels get none: the background would stay visible
+through them after load. They (and files that could not be read) store
+``NO_PLACEHOLDER`` as their colour, so backfills skip them. All pixel work
+runs in Pillow's C loops over a 64px thumbnail (a few ms).
+"""
+
+from __future__ import annotations
+
+import base64
+import io
+import logging
+from dataclasses import dataclass
+
+from django.core.files.storage import default_storage
+from django.db.models import QuerySet
+from PIL import Image, ImageFilter, ImageOps
+
+from editor.image_upload import _flatten_for_jpeg
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_EDGE = 16
+PLACEHOLDER_QUALITY = 40
+# Long edge of the thumbnail the colour is measured on.
+_SAMPLE_EDGE = 64
+_PALETTE_SIZE = 8
+# Colour of images that were looked at and get no placeholder (CSS ``none``).
+NO_PLACEHOLDER = "none"
+
+# Model fields holding (placeholder data URI, dominant colour) per image field.
+IMAGE_PLACEHOLDER_FIELDS = {
+    ("editor", "post", "cover_image"): ("cover_placeholder", "cover_color"),
+    ("editor", "postgalleryimage", "image"): ("placeholder", "color"),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ImagePlaceholder:
+    data_uri: str = ""
+    color: str = ""
+
+
+def _fit(size: tuple[int, int], edge: int) -> tuple[int, int]:
+    width, height = size
+    scale = edge / max(width, height)
+    if scale >= 1:
+        return width, height
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _has_transparency(im: Image.Image) -> bool:
+    if im.mode == "P" and "transparency" in im.info:
+        im = im.convert("RGBA")
+    if im.mode not in ("RGBA", "LA", "PA"):
+        return False
+    lowest_alpha, _highest = im.getchannel("A").getextrema()
+    return lowest_alpha < 255
+
+
+def compute_image_placeholder(im: Image.Image) -> ImagePlaceholder:
+    """Blurred ``PLACEHOLDER_EDGE``px WebP data URI and dominant ``#rrggbb``.
+
+    No data URI and ``NO_PLACEHOLDER`` for images with transparent pixels.
+    """
+    # BOX + reducing_gap shrinks in integer steps first: cheap even at 2560px.
+    thumbnail = im.resize(
+        _fit(im.size, _SAMPLE_EDGE), Image.Resampling.BOX, reducing_gap=3.0
+    )
+    if _has_transparency(thumbnail):
+        return ImagePlaceholder(color=NO_PLACEHOLDER)
+    sample = _flatten_for_jpeg(thumbnail)
+    # Most common colour of a median-cut palette: the tone a reader notices,
+    # unlike the mean, which greys out high-contrast images.
+    palette_image = sample.quantize(
+        colors=_PALETTE_SIZE, method=Image.Quantize.MEDIANCUT
+    )
+    _count, index = max(palette_image.getcolors() or [(0, 0)])
+    palette = palette_image.getpalette() or [0, 0, 0]
+    red, green, blue = palette[index * 3 : index * 3 + 3]
+
+    tiny = sample.resize(
+        _fit(sample.size, PLACEHOLDER_EDGE), Image.Resampling.LANCZOS
+    ).filter(ImageFilter.GaussianBlur(0.5))
+    buf = io.BytesIO()
+    tiny.save(buf, format="WEBP", quality=PLACEHOLDER_QUALITY, method=6)
+    encoded = base64.b64encode(buf.getvalue()).decode("ascii")
+    return ImagePlaceholder(
+        data_uri=f"data:image/webp;base64,{encoded}",
+        color=f"#{red:02x}{green:02x}{blue:02x}",
+    )
+
+
+def placeholder_fields(instance, field_name: str) -> tuple[str, str] | None:
+    meta = instance._meta
+    return IMAGE_PLACEHOLDER_FIELDS.get((meta.app_label, meta.model_name, field_name))
+
+
+def apply_image_placeholder(
+    instance, field_name: str, placeholder: ImagePlaceholder
+) -> None:
+    fields = placeholder_fields(instance, field_name)
+    if fields is not None:
+        setattr(instance, fields[0], placeholder.data_uri)
+        setattr(instance, fields[1], placeholder.color)
+
+
+def _placeholder_of(fh) -> ImagePlaceholder:
+    with Image.open(fh) as im:
+        # JPEGs decode straight at 1/2..1/8 scale: no full-size pixels.
+        im.draft("RGB", (_SAMPLE_EDGE * 4, _SAMPLE_EDGE * 4))
+        return compute_image_placeholder(ImageOps.exif_transpose(im))
+
+
+def placeholder_from_bytes(raw: bytes) -> ImagePlaceholder:
+    return _placeholder_of(io.BytesIO(raw))
+
+
+def placeholder_from_storage(name: str) -> ImagePlaceholder:
+    with default_storage.open(name, "rb") as fh:
+        return _placeholder_of(fh)
+
+
+def refresh_image_placeholders(
+    queryset: QuerySet, field_name: str, *, force: bool = False
+) -> tuple[int, int]:
+    """Fill placeholder columns of *queryset* from stored files; ``(changed, failed)``.
+
+    Without *force* only images never looked at (no colour) are read. Rows
+    whose placeholder came out unchanged are not counted as changed.
+    """
+    placeholder_attr, color_attr = IMAGE_PLACEHOLDER_FIELDS[
+        (queryset.model._meta.app_label, queryset.model._meta.model_name, field_name)
+    ]
+    queryset = queryset.exclude(**{field_name: ""}).exclude(
+        **{f"{field_name}__isnull": True}
+    )
+    if not force:
+        queryset = queryset.filter(**{color_attr: ""})
+    changed = failed = 0
+    rows = queryset.values_list("pk", field_name, placeholder_attr)
+    for pk, name, old_data_uri in rows.iterator():
+        try:
+            placeholder = placeholder_from_storage(name)
+        except (OSError, ValueError, Image.DecompressionBombError):
+            logger.warning("Failed to build placeholder of %s", name, exc_info=True)
+            # Marked as seen: a broken file is not re-read on every run.
+            placeholder = ImagePlaceholder(color=NO_PLACEHOLDER)
+            failed += 1
+        queryset.model._default_manager.filter(pk=pk).update(
+            **{placeholder_attr: placeholder.data_uri, color_attr: placeholder.color}
+        )
+        if placeholder.data_uri != old_data_uri:
+            changed += 1
+    return changed, failed
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import io
 import os
 from typing import TYPE_CHECKING
@@ -9,7 +10,11 @@ from typing import TYPE_CHECKING
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
-from django.core.files.uploadedfile import InMemoryUploadedFile, TemporaryUploadedFile
+from django.core.files.uploadedfile import (
+    InMemoryUploadedFile,
+    TemporaryUploadedFile,
+    UploadedFile,
+)
 from PIL import Image, ImageOps, features
 
 if TYPE_CHECKING:
@@ -19,6 +24,9 @@ _HAS_AVIF = bool(features.check("avif"))
 
 SOCIAL_SHARE_WIDTH = 1200
 SOCIAL_SHARE_HEIGHT = 630
+# Editor inline (body) uploads, stored as ``{dir}/{sha[:2]}/{sha[:32]}.{ext}``.
+INLINE_IMAGE_DIR = "img/post/inline"
+_DELIVERY_EXTENSIONS = (".avif", ".webp", ".jpg")
 
 
 def social_share_image_size() -> tuple[int, int]:
@@ -90,6 +98,20 @@ def social_share_storage_name(cover_storage_name: str) -> str:
     return f"{directory}/{share_filename}" if directory else share_filename
 
 
+def telegram_jpeg_storage_name(source_storage_name: str) -> str:
+    """JPEG sibling path re-encoded for Bot API photo uploads."""
+    directory, filename = os.path.split(source_storage_name)
+    stem, _ext = os.path.splitext(filename)
+    telegram_filename = f"{stem}-telegram.jpg"
+    return f"{directory}/{telegram_filename}" if directory else telegram_filename
+
+
+def _replace_storage_file(name: str, data: bytes) -> str:
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(data))
+
+
 def _crop_and_resize_for_social(im: Image.Image) -> Image.Image:
     """Center-crop to Open Graph / X card ratio and resize for link previews."""
     target_w, target_h = social_share_image_size()
@@ -130,13 +152,27 @@ def encode_image_as_jpeg_preserve_ratio(im: Image.Image) -> bytes:
     return _encode_rgb_jpeg(im)
 
 
-def save_social_share_jpeg(cover_storage_name: str, im: Image.Image) -> str:
+def save_social_share_jpeg(
+    cover_storage_name: str,
+    im: Image.Image,
+    *,
+    source_hash: str,
+) -> str:
     """Write or replace ``{stem}-share.jpg`` next to the cover delivery file."""
-    share_name = social_share_storage_name(cover_storage_name)
+    from editor.derived_image_service import register_derived_image
+    from editor.models import DerivedImage
+
     data = encode_image_as_share_jpeg(im)
-    if default_storage.exists(share_name):
-        default_storage.delete(share_name)
-    default_storage.save(share_name, ContentFile(data))
+    share_name = _replace_storage_file(
+        social_share_storage_name(cover_storage_name), data
+    )
+    register_derived_image(
+        source_name=cover_storage_name,
+        source_hash=source_hash,
+        kind=DerivedImage.Kind.SHARE_JPEG,
+        storage_name=share_name,
+        data=data,
+    )
     return share_name
 
 
@@ -181,32 +217,116 @@ def share_jpeg_has_social_dimensions(data: bytes) -> bool:
         return False
 
 
-def ensure_post_share_image(post) -> str | None:
-    """Return ``{stem}-share.jpg`` path; generate when missing or stale."""
+def registered_post_share_image(post) -> str | None:
+    """Share JPEG path if one of the current size is registered; never writes.
+
+    One indexed lookup, memoised on *post*; no storage I/O.
+    """
+    from editor.derived_image_service import derived_image
+    from editor.models import DerivedImage
+
     cover = post.cover_image
     if not cover or not cover.name:
         return None
 
     cover_name = cover.name
-    share_name = social_share_storage_name(cover_name)
-    if default_storage.exists(share_name):
-        with default_storage.open(share_name, "rb") as share_file:
-            data = share_file.read()
-        if share_jpeg_has_social_dimensions(data):
-            return share_name
+    # Detail views ask twice per render (view + og:image URL); look up once.
+    memo = getattr(post, "_share_image_memo", None)
+    if memo is not None and memo[0] == cover_name:
+        return memo[1]
+    entry = derived_image(cover_name, DerivedImage.Kind.SHARE_JPEG)
+    if entry is None or (entry.width, entry.height) != social_share_image_size():
+        # Missing, or built for an older SOCIAL_SHARE_IMAGE size.
+        return None
+    post._share_image_memo = (cover_name, entry.storage_name)
+    return entry.storage_name
 
+
+def ensure_post_share_image(post) -> str | None:
+    """Return the share JPEG path; generate it when the cover has none yet.
+
+    Registered covers of the current share size cost one indexed lookup and
+    no storage I/O.
+    """
+    from editor.derived_image_service import (
+        register_derived_image,
+        source_content_hash,
+    )
+    from editor.models import DerivedImage
+
+    cover = post.cover_image
+    if not cover or not cover.name:
+        return None
+
+    share_name = registered_post_share_image(post)
+    if share_name is not None:
+        return share_name
+
+    cover_name = cover.name
     try:
         raw = read_cover_bytes(cover)
-        data = build_share_jpeg_from_cover_bytes(raw)
     except (OSError, ValueError):
         return None
 
+    # Share JPEGs written before the registry existed are adopted as-is.
+    share_name = social_share_storage_name(cover_name)
+    data = None
     if default_storage.exists(share_name):
-        default_storage.delete(share_name)
-    default_storage.save(share_name, ContentFile(data))
+        with default_storage.open(share_name, "rb") as share_file:
+            existing = share_file.read()
+        if share_jpeg_has_social_dimensions(existing):
+            data = existing
+    if data is None:
+        try:
+            data = build_share_jpeg_from_cover_bytes(raw)
+        except (OSError, ValueError):
+            return None
+        share_name = _replace_storage_file(share_name, data)
+
+    register_derived_image(
+        source_name=cover_name,
+        source_hash=source_content_hash(raw),
+        kind=DerivedImage.Kind.SHARE_JPEG,
+        storage_name=share_name,
+        data=data,
+    )
+    post._share_image_memo = (cover_name, share_name)
     return share_name
 
 
+def ensure_telegram_jpeg(source_storage_name: str) -> bytes:
+    """JPEG bytes for a Bot API photo upload, re-encoded only once per source."""
+    from editor.derived_image_service import (
+        derived_image,
+        register_derived_image,
+        source_content_hash,
+    )
+    from editor.models import DerivedImage
+
+    entry = derived_image(source_storage_name, DerivedImage.Kind.TELEGRAM_JPEG)
+    if entry is not None:
+        try:
+            with default_storage.open(entry.storage_name, "rb") as fh:
+                return fh.read()
+        except OSError:
+            pass  # Derived file went missing; rebuild it below.
+
+    with default_storage.open(source_storage_name, "rb") as fh:
+        raw = fh.read()
+    data = build_telegram_jpeg_from_image_bytes(raw)
+    telegram_name = _replace_storage_file(
+        telegram_jpeg_storage_name(source_storage_name), data
+    )
+    register_derived_image(
+        source_name=source_storage_name,
+        source_hash=source_content_hash(raw),
+        kind=DerivedImage.Kind.TELEGRAM_JPEG,
+        storage_name=telegram_name,
+        data=data,
+    )
+    return data
+
+
 def _encode_delivery(im: Image.Image, stem: str) -> tuple[str, ContentFile]:
     """Return (filename, content) for AVIF, WebP, or JPEG."""
     buf = io.BytesIO()
@@ -245,16 +365,120 @@ def _encode_delivery(im: Image.Image, stem: str) -> tuple[str, ContentFile]:
     return f"{stem}.jpg", ContentFile(buf.read())
 
 
+def _upload_digest(uploaded: UploadedFile) -> str:
+    digest = hashlib.sha256()
+    for chunk in uploaded.chunks():
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def store_inline_image(uploaded: UploadedFile, ext: str) -> str:
+    """Normalized, content-addressed copy of an editor body upload; storage name.
+
+    Keyed by the SHA-256 of the uploaded bytes, hashed chunk by chunk, so
+    pasting the same image again returns the stored file without decoding
+    it. Animated images (*ext* is their validated extension) are kept as-is.
+    """
+    digest = _upload_digest(uploaded)
+    stem = f"{INLINE_IMAGE_DIR}/{digest[:2]}/{digest[:32]}"
+    for extension in dict.fromkeys((*_DELIVERY_EXTENSIONS, ext)):
+        if default_storage.exists(f"{stem}{extension}"):
+            return f"{stem}{extension}"
+    uploaded.seek(0)
+    with Image.open(uploaded) as im:
+        if getattr(im, "is_animated", False):
+            # Re-encoding keeps the first frame only.
+            uploaded.seek(0)
+            return default_storage.save(f"{stem}{ext}", uploaded)
+        im = _normalize_opened_image(im)
+        filename, content = _encode_delivery(im, os.path.basename(stem))
+    data = content.read()
+    content.seek(0)
+    name = default_storage.save(f"{os.path.dirname(stem)}/{filename}", content)
+    _register_inline_image(name, data, width=im.width)
+    return name
+
+
+def _register_inline_image(name: str, data: bytes, *, width: int) -> None:
+    """Record an AVIF/WebP body image as its own top rung, so rendering the
+    post body gets its size from the registry instead of the file."""
+    from editor.derived_image_service import (
+        register_derived_image,
+        source_content_hash,
+    )
+    from editor.image_variants import VARIANT_FORMATS
+
+    extension = os.path.splitext(name)[1].lower()
+    for fmt in VARIANT_FORMATS:
+        if fmt.extension == extension:
+            register_derived_image(
+                source_name=name,
+                source_hash=source_content_hash(data),
+                kind=fmt.kind,
+                storage_name=name,
+                data=data,
+                target_width=width,
+            )
+
+
+def image_processing_async() -> bool:
+    return bool(getattr(settings, "IMAGE_PROCESSING_ASYNC", False))
+
+
+def process_image_upload(instance, field_name: str, raw: bytes) -> None:
+    """Encode *raw* as the field's delivery file, srcset ladder, placeholder
+    and (covers) share JPEG. Saves files only; the caller saves the row."""
+    from editor.derived_image_service import (
+        forget_derived_images,
+        source_content_hash,
+    )
+    from editor.image_placeholder import (
+        apply_image_placeholder,
+        compute_image_placeholder,
+    )
+    from editor.image_variants import save_image_variants
+
+    field = getattr(instance, field_name)
+    with Image.open(io.BytesIO(raw)) as im:
+        im = _normalize_opened_image(im)
+
+        apply_image_placeholder(instance, field_name, compute_image_placeholder(im))
+        stem = _base_name(field.name)
+        filename, content = _encode_delivery(im, stem)
+        delivery_bytes = content.read()
+        content.seek(0)
+        field.save(filename, content, save=False)
+        if not field.name:
+            return
+        # A reused storage name must not keep derivatives of the old bytes.
+        forget_derived_images(field.name)
+        delivery_hash = source_content_hash(delivery_bytes)
+        save_image_variants(
+            field.name, im, source_hash=delivery_hash, source_data=delivery_bytes
+        )
+        if field_name == "cover_image":
+            save_social_share_jpeg(field.name, im, source_hash=delivery_hash)
+
+
 def normalize_image_field_file(
     instance,
     field_name: str,
     update_fields: set[str] | None,
 ) -> None:
-    """New uploads → AVIF/WebP/JPEG; no-op for stored files or skipped saves."""
+    """New uploads → AVIF/WebP/JPEG, srcset ladder and placeholder; no-op otherwise.
+
+    Sets the instance's placeholder columns (``editor.image_placeholder``);
+    callers saving with ``update_fields`` must include them. With
+    ``IMAGE_PROCESSING_ASYNC`` only the original and its placeholder are
+    stored here; ``editor.image_jobs`` encodes the rest after the save.
+    """
     if update_fields is not None and field_name not in update_fields:
         return
+    from editor.image_placeholder import ImagePlaceholder, apply_image_placeholder
+
     field = getattr(instance, field_name)
     if not field:
+        apply_image_placeholder(instance, field_name, ImagePlaceholder())
         return
     if not _is_new_upload(field):
         return
@@ -265,19 +489,18 @@ def normalize_image_field_file(
     finally:
         field.close()
 
-    with Image.open(io.BytesIO(raw)) as im:
-        im = ImageOps.exif_transpose(im)
-        if im.mode == "CMYK":
-            im = im.convert("RGB")
-        im = _maybe_downscale(im)
-        if im.mode not in ("RGB", "RGBA"):
-            if im.mode in ("L", "LA"):
-                im = im.convert("RGBA" if im.mode == "LA" else "RGB")
-            else:
-                im = im.convert("RGBA" if "transparency" in im.info else "RGB")
+    if image_processing_async():
+        from editor.image_jobs import defer_image_upload
 
-        stem = _base_name(field.name)
-        filename, content = _encode_delivery(im, stem)
-        field.save(filename, content, save=False)
-        if field_name == "cover_image" and field.name:
-            save_social_share_jpeg(field.name, im)
+        defer_image_upload(instance, field_name, raw)
+    else:
+        process_image_upload(instance, field_name, raw)
+
+
+def enqueue_deferred_image_jobs(instance) -> None:
+    """After the row is saved: queue the uploads ``defer_image_upload`` kept."""
+    if not getattr(instance, "_deferred_image_fields", None):
+        return
+    from editor.image_jobs import enqueue_image_jobs
+
+    enqueue_image_jobs(instance)
@@ -0,0 +1,286 @@
+"""Responsive width ladder (AVIF + WebP) for covers and gallery images.
+
+Every rung is written next to the delivery file as ``{stem}-{width}w.{ext}``
+and recorded as a ``DerivedImage``. The delivery file is recorded as the top
+rung of its own format, so building ``srcset`` / ``width`` / ``height`` for a
+page needs one indexed query and no storage I/O.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import multiprocessing
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connections
+from PIL import Image
+
+from editor.image_upload import (
+    _HAS_AVIF,
+    _avif_quality,
+    _normalize_opened_image,
+    _replace_storage_file,
+    _webp_quality,
+)
+from editor.models import DerivedImage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_IMAGE_VARIANT_WIDTHS = (320, 640, 1024, 1600)
+# ``sizes`` per layout slot, so templates and API clients pick the same rung.
+IMAGE_SIZES = {
+    # Post column: .post-content-container / .post-cover-image-container.
+    "cover": "(max-width: 740px) 100vw, 700px",
+    "gallery": "(max-width: 740px) 100vw, 700px",
+    # List grid: col-sm-6 col-lg-4.
+    "card": "(max-width: 575px) 100vw, (max-width: 991px) 50vw, 33vw",
+    # Bookmark and series-navigation thumbnails.
+    "thumbnail": "200px",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class VariantFormat:
+    kind: str
+    pillow_format: str
+    extension: str
+    mime_type: str
+
+
+# Preference order: browsers take the first ``<source>`` they support.
+VARIANT_FORMATS = (
+    VariantFormat(DerivedImage.Kind.AVIF_VARIANT, "AVIF", ".avif", "image/avif"),
+    VariantFormat(DerivedImage.Kind.WEBP_VARIANT, "WEBP", ".webp", "image/webp"),
+)
+VARIANT_KINDS = tuple(fmt.kind for fmt in VARIANT_FORMATS)
+
+
+@dataclass(frozen=True, slots=True)
+class ResponsiveImage:
+    src: str
+    width: int | None = None
+    height: int | None = None
+    # ``(mime type, srcset)`` per available format, in preference order.
+    sources: tuple[tuple[str, str], ...] = ()
+
+
+def image_variant_widths() -> tuple[int, ...]:
+    widths = getattr(settings, "IMAGE_VARIANT_WIDTHS", DEFAULT_IMAGE_VARIANT_WIDTHS)
+    return tuple(sorted({int(width) for width in widths if int(width) > 0}))
+
+
+def _variant_formats() -> list[VariantFormat]:
+    return [fmt for fmt in VARIANT_FORMATS if fmt.pillow_format != "AVIF" or _HAS_AVIF]
+
+
+def image_variant_storage_name(source_name: str, width: int, extension: str) -> str:
+    directory, filename = os.path.split(source_name)
+    stem, _ext = os.path.splitext(filename)
+    variant_filename = f"{stem}-{width}w{extension}"
+    return f"{directory}/{variant_filename}" if directory else variant_filename
+
+
+def _encode(im: Image.Image, fmt: VariantFormat) -> bytes:
+    buf = io.BytesIO()
+    if fmt.pillow_format == "AVIF":
+        im.save(
+            buf,
+            format="AVIF",
+            quality=_avif_quality(),
+            speed=int(getattr(settings, "IMAGE_UPLOAD_AVIF_SPEED", 6)),
+        )
+    else:
+        im.save(buf, format="WEBP", quality=_webp_quality(), method=6)
+    return buf.getvalue()
+
+
+def save_image_variants(
+    source_name: str,
+    im: Image.Image,
+    *,
+    source_hash: str,
+    source_data: bytes,
+) -> list[DerivedImage]:
+    """Write and register every ladder rung narrower than *im* (the delivery file)."""
+    from editor.derived_image_service import register_derived_image
+
+    formats = _variant_formats()
+    width, height = im.size
+    entries: list[DerivedImage] = []
+    source_extension = os.path.splitext(source_name)[1].lower()
+    for fmt in formats:
+        if fmt.extension == source_extension:
+            entries.append(
+                register_derived_image(
+                    source_name=source_name,
+                    source_hash=source_hash,
+                    kind=fmt.kind,
+                    storage_name=source_name,
+                    data=source_data,
+                    target_width=width,
+                )
+            )
+    for target in image_variant_widths():
+        if target >= width:
+            break
+        resized = im.resize(
+            (target, max(1, round(height * target / width))),
+            Image.Resampling.LANCZOS,
+        )
+        for fmt in formats:
+            try:
+                data = _encode(resized, fmt)
+            except (OSError, ValueError):
+                logger.warning(
+                    "Failed to encode %s %dw of %s",
+                    fmt.pillow_format,
+                    target,
+                    source_name,
+                    exc_info=True,
+                )
+                continue
+            storage_name = _replace_storage_file(
+                image_variant_storage_name(source_name, target, fmt.extension), data
+            )
+            entries.append(
+                register_derived_image(
+                    source_name=source_name,
+                    source_hash=source_hash,
+                    kind=fmt.kind,
+                    storage_name=storage_name,
+                    data=data,
+                    target_width=target,
+                )
+            )
+    return entries
+
+
+def build_image_variants(source_name: str) -> int:
+    """(Re)build the ladder of a stored delivery file; returns rungs recorded."""
+    from editor.derived_image_service import source_content_hash
+
+    with default_storage.open(source_name, "rb") as fh:
+        raw = fh.read()
+    with Image.open(io.BytesIO(raw)) as im:
+        im = _normalize_opened_image(im)
+        DerivedImage.objects.filter(
+            source_name=source_name, kind__in=VARIANT_KINDS
+        ).delete()
+        entries = save_image_variants(
+            source_name, im, source_hash=source_content_hash(raw), source_data=raw
+        )
+    return len(entries)
+
+
+def _build_one(source_name: str) -> int:
+    try:
+        return build_image_variants(source_name)
+    except (OSError, ValueError):
+        logger.warning("Failed to build variants of %s", source_name, exc_info=True)
+        return -1
+
+
+def _init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def image_variant_sources() -> list[str]:
+    """Storage names of every cover and gallery image."""
+    from editor.models import Post, PostGalleryImage
+
+    names = set(
+        Post.objects.exclude(cover_image="").values_list("cover_image", flat=True)
+    )
+    names.update(PostGalleryImage.objects.values_list("image", flat=True))
+    return sorted(name for name in names if name)
+
+
+def build_missing_image_variants(
+    *, force: bool = False, workers: int = 1
+) -> tuple[int, int]:
+    """Build ladders for images without one (all with *force*); ``(built, failed)``."""
+    names = image_variant_sources()
+    if not force:
+        done = set(
+            DerivedImage.objects.filter(
+                source_name__in=names, kind__in=VARIANT_KINDS
+            ).values_list("source_name", flat=True)
+        )
+        names = [name for name in names if name not in done]
+    if workers <= 1 or len(names) <= 1:
+        results = [_build_one(name) for name in names]
+    else:
+        # Children open their own connections; never share the parent's sockets.
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(names)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        ) as pool:
+            results = list(pool.map(_build_one, names))
+    failed = sum(1 for rungs in results if rungs < 0)
+    return len(results) - failed, failed
+
+
+def image_variants(source_names: Iterable[str]) -> dict[str, list[DerivedImage]]:
+    """Ladder rows of each name (narrowest first), in one query."""
+    names = {name for name in source_names if name}
+    by_source: dict[str, list[DerivedImage]] = {name: [] for name in names}
+    if not names:
+        return by_source
+    for entry in DerivedImage.objects.filter(
+        source_name__in=names, kind__in=VARIANT_KINDS
+    ).order_by("target_width"):
+        by_source[entry.source_name].append(entry)
+    return by_source
+
+
+def attach_image_variants(instances: Iterable, field_name: str) -> None:
+    """Preload the ladders that ``responsive_image`` reads for *instances*."""
+    instances = [obj for obj in instances if obj is not None]
+    named = [(obj, getattr(obj, field_name).name) for obj in instances]
+    variants = image_variants(name for _obj, name in named)
+    for obj, name in named:
+        if name:
+            cached = getattr(obj, "_image_variants", None) or {}
+            obj._image_variants = {**cached, name: variants[name]}
+
+
+def responsive_image(field_file) -> ResponsiveImage | None:
+    """``src``, intrinsic size and per-format ``srcset`` of an image field."""
+    if not field_file or not field_file.name:
+        return None
+    name = field_file.name
+    preloaded = getattr(field_file.instance, "_image_variants", None) or {}
+    entries = preloaded.get(name)
+    if entries is None:
+        entries = image_variants([name])[name]
+    width = height = None
+    sources: list[tuple[str, str]] = []
+    for fmt in VARIANT_FORMATS:
+        rungs = [entry for entry in entries if entry.kind == fmt.kind]
+        if not rungs:
+            continue
+        sources.append(
+            (
+                fmt.mime_type,
+                ", ".join(
+                    f"{default_storage.url(entry.storage_name)} {entry.width}w"
+                    for entry in rungs
+                ),
+            )
+        )
+    for entry in entries:
+        if entry.storage_name == name:
+            width, height = entry.width, entry.height
+    return ResponsiveImage(
+        src=field_file.url, width=width, height=height, sources=tuple(sources)
+    )
@@ -0,0 +1,371 @@
+"""Body outputs as built before ``editor.html_document``: one parse per output.
+
+Frozen copies of the regex pre-passes and ``HTMLParser`` walkers that the
+shared parse replaced, kept only so ``benchmark_body_parsing`` can time the
+old path against the new one. Not used anywhere else; do not fix bugs here.
+Rich HTML is converted without a media resolver (images are dropped), as the
+benchmark never resolves storage paths.
+"""
+
+from __future__ import annotations
+
+import re
+from html import escape, unescape
+from html.parser import HTMLParser
+
+from django.utils.html import strip_tags
+
+from editor.html_document import decode_html_entities
+from editor.templatetags.editor_filters import (
+    _add_space_after_period,
+    preview_inline_space,
+    strip_gallery_placeholders,
+    truncatechars_whole_words,
+)
+from sender.services.telegram_format import (
+    _BLOCK_BREAK,
+    _BLOCK_BREAK_TAGS,
+    _LINE_BREAK,
+    _NESTABLE_INLINE,
+    _map_tag_to_telegram,
+    _normalize_telegram_plain_text,
+    _strip_gallery_placeholders,
+    escape_telegram_html,
+    sanitize_telegram_html,
+)
+from sender.services.telegram_rich_format import (
+    _RICH_BLOCK_CONTAINER_ALIASES,
+    _attr,
+    _map_block_tag,
+    _map_inline_tag,
+    _normalize_plain_text,
+    sanitize_telegram_rich_html,
+)
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_SPAN_STYLE_SUBS = (
+    (r"<span[^>]*font-weight\s*:\s*(?:bold|[6-9]00)[^>]*>(.*?)</span>", "strong"),
+    (r"<span[^>]*font-style\s*:\s*italic[^>]*>(.*?)</span>", "em"),
+    (r"<span[^>]*text-decoration\s*:\s*underline[^>]*>(.*?)</span>", "u"),
+    (r"<span[^>]*text-decoration\s*:\s*line-through[^>]*>(.*?)</span>", "s"),
+)
+
+
+def _striptags_preserve_paragraphs(value: str) -> str:
+    if not value:
+        return ""
+    value = strip_gallery_placeholders(value)
+    value = re.sub(r"</p>\s*<p[^>]*>", "\n\n", str(value))
+    value = re.sub(r"<p[^>]*>", "\n\n", value)
+    value = re.sub(r"</p>", "", value)
+    value = re.sub(
+        r"</(?:div|section|article|blockquote|li|h[1-6])>",
+        "\n\n",
+        value,
+        flags=re.IGNORECASE,
+    )
+    value = re.sub(r"<br\s*/?>", "\n", value, flags=re.IGNORECASE)
+    value = strip_tags(value)
+    value = decode_html_entities(value)
+    value = re.sub(r"\n{3,}", "\n\n", value)
+    return value.strip()
+
+
+def _first_sentence(value: str) -> str:
+    if not value:
+        return ""
+    text = strip_tags(str(value))
+    text = re.sub(r"\s+", " ", text).strip()
+    if not text:
+        return ""
+    return re.split(r"(?<=[.!?…])\s+", text, maxsplit=1)[0].strip()
+
+
+def card_text(body: str) -> tuple[str, str]:
+    """Preview text and first sentence (``compute_post_text_derivatives``)."""
+    inline = preview_inline_space(_striptags_preserve_paragraphs(body or ""))
+    preview = _add_space_after_period(inline)
+    return (
+        truncatechars_whole_words(preview, 600),
+        truncatechars_whole_words(_first_sentence(body), 300),
+    )
+
+
+def quality_text(body: str) -> tuple[str, int, int]:
+    """What text quality read from HTML: plain text, heading and list counts."""
+    plain_text = unescape(_TAG_RE.sub(" ", body))
+    heading_hits = len(re.findall(r"<h[1-6][^>]*>", body, re.IGNORECASE))
+    list_hits = len(re.findall(r"<(?:ul|ol)[^>]*>", body, re.IGNORECASE))
+    return plain_text, heading_hits, list_hits
+
+
+def body_segments(body: str) -> list[str]:
+    """``get_post_body_segments`` split: ``[html0, key1, html1, ...]``."""
+    return re.split(r"\[gallery:(\d+)\]", body or "")
+
+
+def _map_span_styles(html: str) -> str:
+    text = html
+    for pattern, tag in _SPAN_STYLE_SUBS:
+        text = re.sub(
+            pattern, rf"<{tag}>\1</{tag}>", text, flags=re.IGNORECASE | re.DOTALL
+        )
+    text = re.sub(
+        r"<span[^>]*>(.*?)</span>", r"\1", text, flags=re.IGNORECASE | re.DOTALL
+    )
+    text = re.sub(r"<pre>\s*<code[^>]*>", "<pre>", text, flags=re.IGNORECASE)
+    return re.sub(r"</code>\s*</pre>", "</pre>", text, flags=re.IGNORECASE)
+
+
+def _convert_headings_to_telegram_blocks(html: str) -> str:
+    def repl(match: re.Match[str]) -> str:
+        plain = unescape(re.sub(r"<[^>]+>", "", match.group(1) or "")).strip()
+        if not plain:
+            return _BLOCK_BREAK
+        return f"{_BLOCK_BREAK}<b>{escape_telegram_html(plain)}</b>{_BLOCK_BREAK}"
+
+    return re.sub(
+        r"<h[1-6][^>]*>(.*?)</h[1-6]>", repl, html, flags=re.IGNORECASE | re.DOTALL
+    )
+
+
+class _TelegramHTMLConverter(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._out: list[str] = []
+        self._tag_stack: list[str] = []
+        self._in_pre = False
+
+    def get_html(self) -> str:
+        return sanitize_telegram_html("".join(self._out).strip())
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        tag_l = tag.lower()
+        if tag_l == "br":
+            self._out.append(_LINE_BREAK)
+            return
+        if (tag_l.startswith("h") and tag_l[1:].isdigit()) or tag_l == "img":
+            return
+        if tag_l in ("ul", "ol", "figure", "table"):
+            return
+        if tag_l == "li":
+            self._out.append("• ")
+            return
+        if tag_l == "pre":
+            self._in_pre = True
+            self._open_tag("pre")
+            return
+        if tag_l == "code" and self._in_pre:
+            return
+        if tag_l == "a":
+            href = _attr(attrs, "href")
+            if href:
+                self._out.append(f'<a href="{escape(href, quote=True)}">')
+                self._tag_stack.append("a")
+            return
+        tg = _map_tag_to_telegram(tag_l)
+        if tg and not (tg in _NESTABLE_INLINE and tg in self._tag_stack):
+            self._open_tag(tg)
+
+    def handle_endtag(self, tag: str) -> None:
+        tag_l = tag.lower()
+        if (tag_l.startswith("h") and tag_l[1:].isdigit()) or tag_l == "img":
+            return
+        if tag_l in ("ul", "ol", "figure", "table", "li"):
+            if tag_l == "li":
+                self._out.append(_LINE_BREAK)
+            return
+        if tag_l == "code" and self._in_pre:
+            return
+        if tag_l == "pre":
+            self._close_tag("pre")
+            self._in_pre = False
+            self._out.append(_BLOCK_BREAK)
+            return
+        if tag_l == "a":
+            self._close_tag("a")
+            return
+        tg = _map_tag_to_telegram(tag_l)
+        if tg:
+            if tg in _NESTABLE_INLINE and tg not in self._tag_stack:
+                return
+            self._close_tag(tg)
+            if tag_l == "blockquote":
+                self._out.append(_BLOCK_BREAK)
+            return
+        if tag_l in _BLOCK_BREAK_TAGS:
+            self._out.append(_BLOCK_BREAK)
+
+    def handle_data(self, data: str) -> None:
+        if data:
+            self._out.append(escape_telegram_html(_normalize_telegram_plain_text(data)))
+
+    def _open_tag(self, tag: str) -> None:
+        self._out.append(f"<{tag}>")
+        self._tag_stack.append(tag)
+
+    def _close_tag(self, tag: str) -> None:
+        if tag not in self._tag_stack:
+            return
+        while self._tag_stack:
+            open_tag = self._tag_stack.pop()
+            self._out.append(f"</{open_tag}>")
+            if open_tag == tag:
+                return
+
+
+def telegram_html(body: str) -> str:
+    """``html_body_to_telegram_html``: regex pre-passes, then its own parse."""
+    if not body:
+        return ""
+    cleaned = _convert_headings_to_telegram_blocks(_map_span_styles(body))
+    cleaned = _strip_gallery_placeholders(cleaned)
+    cleaned = re.sub(
+        r"<figure[^>]*>.*?</figure>", "", cleaned, flags=re.DOTALL | re.IGNORECASE
+    )
+    cleaned = re.sub(r"<img[^>]*>", "", cleaned, flags=re.IGNORECASE)
+    parser = _TelegramHTMLConverter()
+    parser.feed(cleaned)
+    parser.close()
+    return parser.get_html()
+
+
+_RICH_BLOCK_END_TAGS = frozenset(
+    {
+        "p",
+        "div",
+        "section",
+        "article",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "ul",
+        "ol",
+        "li",
+        "table",
+        "thead",
+        "tbody",
+        "tr",
+        "th",
+        "td",
+        "blockquote",
+        "details",
+        "summary",
+    }
+)
+
+
+class _TelegramRichHTMLConverter(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._out: list[str] = []
+        self._tag_stack: list[str] = []
+        self._in_pre = False
+        self._figure_depth = 0
+
+    def get_html(self) -> str:
+        return sanitize_telegram_rich_html("".join(self._out).strip())
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        tag_l = tag.lower()
+        if tag_l == "figure":
+            self._figure_depth += 1
+            return
+        if self._figure_depth or tag_l == "img":
+            return
+        if tag_l in ("br", "hr"):
+            self._out.append(f"<{tag_l}>")
+            return
+        if tag_l.startswith("h") and len(tag_l) == 2 and tag_l[1].isdigit():
+            self._open(tag_l)
+            return
+        if tag_l == "pre":
+            self._in_pre = True
+            self._open("pre")
+            return
+        if tag_l == "code" and self._in_pre:
+            return
+        if tag_l == "a":
+            href = _attr(attrs, "href")
+            if href:
+                self._out.append(f'<a href="{escape(href, quote=True)}">')
+                self._tag_stack.append("a")
+            return
+        if tag_l in ("ul", "ol", "table", "thead", "tbody", "tr", "blockquote"):
+            self._open(tag_l)
+            return
+        if tag_l in _RICH_BLOCK_CONTAINER_ALIASES:
+            self._open(_RICH_BLOCK_CONTAINER_ALIASES[tag_l])
+            return
+        if tag_l in ("p", "li", "th", "td", "details", "summary"):
+            attr_bits = [
+                f'{key.lower()}="{escape(str(val), quote=True)}"'
+                for key, val in attrs
+                if tag_l == "td" and key.lower() in ("colspan", "rowspan") and val
+            ]
+            if attr_bits:
+                self._out.append(f"<{tag_l} {' '.join(attr_bits)}>")
+                self._tag_stack.append(tag_l)
+            else:
+                self._open(tag_l)
+            return
+        tg = _map_inline_tag(tag_l)
+        if tg:
+            self._open(tg)
+
+    def handle_endtag(self, tag: str) -> None:
+        tag_l = tag.lower()
+        if tag_l == "figure":
+            self._figure_depth = max(0, self._figure_depth - 1)
+            return
+        if self._figure_depth or tag_l == "img":
+            return
+        if tag_l == "code" and self._in_pre:
+            return
+        if tag_l == "pre":
+            self._close("pre")
+            self._in_pre = False
+            return
+        if tag_l == "a":
+            self._close("a")
+            return
+        if tag_l in _RICH_BLOCK_END_TAGS:
+            close_tag = _map_block_tag(tag_l) or tag_l
+            if close_tag in _RICH_BLOCK_CONTAINER_ALIASES.values():
+                close_tag = "p"
+            self._close(close_tag)
+            return
+        tg = _map_inline_tag(tag_l)
+        if tg:
+            self._close(tg)
+
+    def handle_data(self, data: str) -> None:
+        if data and not self._figure_depth:
+            self._out.append(escape_telegram_html(_normalize_plain_text(data)))
+
+    def _open(self, tag: str) -> None:
+        self._out.append(f"<{tag}>")
+        self._tag_stack.append(tag)
+
+    def _close(self, tag: str) -> None:
+        if tag not in self._tag_stack:
+            return
+        while self._tag_stack:
+            open_tag = self._tag_stack.pop()
+            self._out.append(f"</{open_tag}>")
+            if open_tag == tag:
+                return
+
+
+def telegram_rich_html(body: str) -> str:
+    """``html_body_to_telegram_rich_html``: span pre-pass, then its own parse."""
+    if not body:
+        return ""
+    parser = _TelegramRichHTMLConverter()
+    parser.feed(_strip_gallery_placeholders(_map_span_styles(body)))
+    parser.close()
+    return parser.get_html()
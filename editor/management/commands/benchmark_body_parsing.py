@@ -0,0 +1,98 @@
+"""Time the body outputs built the old way (a parse per output) vs one shared parse."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from django.core.management.base import BaseCommand
+
+from editor.html_document import clear_html_document_cache, html_document
+from editor.management.commands import _baseline_body_outputs as baseline
+from editor.models import Post
+from editor.post_text_service import compute_post_text_derivatives
+from sender.services.telegram_format import html_body_to_telegram_html
+from sender.services.telegram_rich_format import html_body_to_telegram_rich_html
+
+BodyOutputs = tuple[tuple[str, Callable[[str], object]], ...]
+
+
+def _quality_text(body: str) -> tuple[str, object]:
+    # Everything text quality reads from the HTML (the rest is plain-text work).
+    document = html_document(body)
+    return document.plain_text, document.tag_counts
+
+
+BASELINE_OUTPUTS: BodyOutputs = (
+    ("card text", baseline.card_text),
+    ("quality text", baseline.quality_text),
+    ("telegram html", baseline.telegram_html),
+    ("telegram rich html", baseline.telegram_rich_html),
+    ("gallery segments", baseline.body_segments),
+)
+
+SHARED_OUTPUTS: BodyOutputs = (
+    ("card text", compute_post_text_derivatives),
+    ("quality text", _quality_text),
+    ("telegram html", html_body_to_telegram_html),
+    ("telegram rich html", html_body_to_telegram_rich_html),
+    ("gallery segments", lambda body: html_document(body).segments),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark building every body output (card text, text quality, "
+        "Telegram HTML, rich HTML, gallery segments) from recent posts with "
+        "the previous regex + HTMLParser converters versus one shared parse."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=50, help="Posts to sample.")
+        parser.add_argument(
+            "--repeat", type=int, default=3, help="Runs per mode (best is kept)."
+        )
+
+    def handle(self, *args, **options):
+        bodies = list(
+            Post.objects.exclude(body="")
+            .order_by("-updated")
+            .values_list("body", flat=True)[: max(1, options["limit"])]
+        )
+        if not bodies:
+            self.stdout.write("No posts with a body to benchmark.")
+            return
+
+        def run_outputs(outputs: BodyOutputs, *, cold: bool) -> None:
+            if cold:
+                clear_html_document_cache()
+            for body in bodies:
+                for _name, build in outputs:
+                    build(body)
+
+        modes = (
+            # Each converter parses (and regex-rewrites) the body on its own.
+            ("previous converters", lambda: run_outputs(BASELINE_OUTPUTS, cold=True)),
+            # First build after a save: one parse per body, shared by all outputs.
+            ("shared parse", lambda: run_outputs(SHARED_OUTPUTS, cold=True)),
+            # Memo hits only: the document of an unchanged body is already parsed.
+            ("shared parse, memoized", lambda: run_outputs(SHARED_OUTPUTS, cold=False)),
+        )
+        results = {}
+        for label, run in modes:
+            timings = []
+            for _ in range(max(1, options["repeat"])):
+                started = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - started)
+            results[label] = min(timings)
+            self.stdout.write(
+                f"{label}: {results[label] * 1000:.1f} ms for {len(bodies)} post(s) "
+                f"({results[label] * 1000 / len(bodies):.2f} ms/post)"
+            )
+        clear_html_document_cache()
+
+        shared = results["shared parse"]
+        if shared > 0:
+            ratio = results["previous converters"] / shared
+            self.stdout.write(self.style.SUCCESS(f"Shared parse speedup: {ratio:.2f}x"))
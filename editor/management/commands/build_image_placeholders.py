@@ -0,0 +1,47 @@
+"""Backfill inline placeholders (blurred thumbnail + colour) for stored images."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from blog.cache_utils import invalidate_blog_public_pages_cache
+from editor.image_placeholder import refresh_image_placeholders
+from editor.models import Post, PostGalleryImage
+from editor.post_render_service import refresh_post_rendered_bodies
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the LQIP data URI and dominant colour of every post cover and "
+        "gallery image not looked at yet (all of them with --force). Images "
+        "with transparency or unreadable files are marked and skipped later."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Recompute placeholders that are already stored.",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        covers, covers_failed = refresh_image_placeholders(
+            Post.objects.all(), "cover_image", force=force
+        )
+        gallery, gallery_failed = refresh_image_placeholders(
+            PostGalleryImage.objects.all(), "image", force=force
+        )
+        if gallery:
+            # Carousels are baked into rendered_body.
+            refresh_post_rendered_bodies(
+                Post.objects.filter(gallery_images__isnull=False).distinct()
+            )
+        if covers or gallery:
+            invalidate_blog_public_pages_cache()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Placeholders changed: {covers} cover(s), {gallery} gallery "
+                f"image(s); {covers_failed + gallery_failed} failed."
+            )
+        )
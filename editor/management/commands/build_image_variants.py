@@ -0,0 +1,52 @@
+"""Backfill the responsive AVIF/WebP ladder for stored covers and galleries."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.cache_utils import invalidate_blog_public_pages_cache
+from editor.image_variants import build_missing_image_variants, image_variant_widths
+from editor.models import Post
+from editor.post_render_service import refresh_post_rendered_bodies
+
+
+class Command(BaseCommand):
+    help = (
+        "Write AVIF and WebP copies of every post cover and gallery image at "
+        "IMAGE_VARIANT_WIDTHS and record them for srcset. Skips images that "
+        "already have a ladder unless --force (after changing the widths)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild every image, not only those without variants.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Encoding processes (default: IMAGE_VARIANT_WORKERS).",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if workers is None:
+            workers = getattr(settings, "IMAGE_VARIANT_WORKERS", 2)
+        built, failed = build_missing_image_variants(
+            force=options["force"], workers=max(1, workers)
+        )
+        if built:
+            # Gallery carousels are baked into rendered_body; cards read the ladder.
+            refresh_post_rendered_bodies(
+                Post.objects.filter(gallery_images__isnull=False).distinct()
+            )
+            invalidate_blog_public_pages_cache()
+        widths = ", ".join(str(width) for width in image_variant_widths())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {widths}w variants for {built} image(s); {failed} failed."
+            )
+        )
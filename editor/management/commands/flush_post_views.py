@@ -0,0 +1,36 @@
+"""Write buffered post detail views to ``Post.views`` (cron, deploy, shutdown)."""
+
+from __future__ import annotations
+
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from editor.view_count_service import flush_post_views, flush_post_views_until
+
+
+class Command(BaseCommand):
+    help = "Flush post view counts buffered in Redis to the database."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help=(
+                "Keep flushing every POST_VIEW_COUNT_FLUSH_INTERVAL seconds; "
+                "flush once more on SIGTERM/SIGINT and exit."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["loop"]:
+            stop = threading.Event()
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: stop.set())
+            interval = getattr(settings, "POST_VIEW_COUNT_FLUSH_INTERVAL", 0) or 60
+            flushed = flush_post_views_until(stop, interval)
+        else:
+            flushed = flush_post_views()
+        self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} buffered view(s)."))
@@ -0,0 +1,35 @@
+"""Worker that encodes uploads queued with IMAGE_PROCESSING_ASYNC."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from editor.image_jobs import run_image_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Claim queued image jobs and encode the delivery file, srcset ladder and "
+        "share JPEG in a process pool. Runs until stopped unless --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Encoding processes (default: IMAGE_JOB_WORKERS).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        if workers is None:
+            workers = getattr(settings, "IMAGE_JOB_WORKERS", 2)
+        processed = run_image_worker(workers=max(1, workers), once=options["once"])
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} image job(s)."))
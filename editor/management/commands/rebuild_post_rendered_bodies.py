@@ -0,0 +1,40 @@
+"""Re-render the stored detail-page HTML of every post."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from editor.models import Post
+from editor.post_render_service import refresh_post_rendered_bodies
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild Post.rendered_body (galleries expanded, image sizes, heading "
+        "anchors) after the gallery template or rendering rules change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Rows written per bulk UPDATE.",
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only posts with a body but no rendered HTML yet (after migrate).",
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by("pk")
+        if options["missing"]:
+            posts = posts.filter(rendered_body="").exclude(body="")
+        updated = refresh_post_rendered_bodies(
+            posts,
+            batch_size=max(1, options["batch_size"]),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt rendered body for {updated} post(s).")
+        )
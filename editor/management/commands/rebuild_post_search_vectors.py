@@ -0,0 +1,54 @@
+"""Recompute stored ``Post.search_vector`` (after changing POST_SEARCH_CONFIG)."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from editor.models import Post
+from editor.search_service import post_search_config, refresh_post_search_vectors
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the weighted title/body search vector for posts "
+        "using the configured text search config."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows updated per UPDATE statement.",
+        )
+        parser.add_argument(
+            "--missing-only",
+            action="store_true",
+            help="Only posts whose search vector is still empty.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        queryset = Post.objects.order_by("pk")
+        if options["missing_only"]:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        updated = 0
+        last_pk = 0
+        while True:
+            pks = list(
+                queryset.filter(pk__gt=last_pk).values_list("pk", flat=True)[
+                    :batch_size
+                ]
+            )
+            if not pks:
+                break
+            updated += refresh_post_search_vectors(Post.objects.filter(pk__in=pks))
+            last_pk = pks[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt search vectors for {updated} post(s) "
+                f"(config={post_search_config()})."
+            )
+        )
@@ -0,0 +1,40 @@
+"""Recompute stored ``Post`` previews, word counts and reading times."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from editor.models import Post
+from editor.post_text_service import refresh_post_text_derivatives
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill card preview, plain-text length, word count, reading time "
+        "and first sentence from each post body."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Rows written per bulk UPDATE.",
+        )
+        parser.add_argument(
+            "--missing",
+            action="store_true",
+            help="Only posts with a body but no stored text yet (after migrate).",
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by("pk")
+        if options["missing"]:
+            posts = posts.filter(plain_text_length=0).exclude(body="")
+        updated = refresh_post_text_derivatives(
+            posts,
+            batch_size=max(1, options["batch_size"]),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt text derivatives for {updated} post(s).")
+        )
@@ -4,32 +4,45 @@
 
 from __future__ import annotations
 
+import re
 from collections.abc import Callable
 
-from django.db.models import F
 from django.http import HttpRequest, HttpResponse
-from django.urls import Resolver404, resolve
 
-from blog.querysets import public_posts_queryset
+from editor.view_count_service import record_post_view, should_count_post_view
+
+# Post detail is the only single-segment page (``/<slug>/``) worth resolving.
+_POST_DETAIL_PATH_RE = re.compile(r"^/[^/]+/$")
 
 
 class PostDetailViewCountMiddleware:
-    """Bump ``Post.views`` on GET for published posts (even when HTML is cached)."""
+    """Count views of published posts (even when HTML is cached).
+
+    Increments are buffered and flushed in bulk by ``editor.view_count_service``.
+    """
 
     def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
         self.get_response = get_response
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
         # Use META so stubs match WSGI (avoids reportUnnecessaryComparison on .method).
-        if request.META.get("REQUEST_METHOD") == "GET":
-            try:
-                match = resolve(request.path_info)
-            except Resolver404:
-                match = None
-            if match is not None and match.view_name == "blog:post_detail":
-                slug = match.kwargs.get("slug")
-                if slug:
-                    public_posts_queryset().filter(slug=slug).update(
-                        views=F("views") + 1
-                    )
-        return self.get_response(request)
+        if (
+            request.META.get("REQUEST_METHOD") == "GET"
+            # Pre-rendering for nginx is not a visit (see blog.static_export).
+            and not getattr(request, "_static_export", False)
+            # 304: a returning reader revalidated a cached copy; still a view.
+            and response.status_code in (200, 304)
+            and _POST_DETAIL_PATH_RE.match(request.path_info)
+        ):
+            # Already resolved by the handler; no second ``resolve()`` needed.
+            match = getattr(request, "resolver_match", None)
+            slug = match.kwargs.get("slug") if match is not None else None
+            if (
+                match is not None
+                and match.view_name == "blog:post_detail"
+                and slug
+                and should_count_post_view(request, slug)
+            ):
+                record_post_view(slug)
+        return response
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0014_ensure_copied_id_sequences"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("status", "published")),
+                fields=["-published", "-id"],
+                name="editor_post_pub_keyset_idx",
+            ),
+        ),
+    ]
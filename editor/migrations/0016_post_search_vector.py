@@ -0,0 +1,41 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def backfill_search_vectors(apps, schema_editor) -> None:
+    Post = apps.get_model("editor", "Post")
+    config = (getattr(settings, "POST_SEARCH_CONFIG", "") or "").strip() or "russian"
+    Post.objects.update(
+        search_vector=SearchVector("title", weight="A", config=config)
+        + SearchVector("body", weight="B", config=config)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0015_post_pub_keyset_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                blank=True,
+                editable=False,
+                help_text="Weighted title/body tsvector; refreshed on save.",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="editor_post_search_gin"
+            ),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
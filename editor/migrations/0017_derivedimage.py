@@ -0,0 +1,51 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0016_post_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DerivedImage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source_name", models.CharField(max_length=255)),
+                ("source_hash", models.CharField(max_length=64)),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("share_jpeg", "Social share JPEG"),
+                            ("telegram_jpeg", "Telegram JPEG"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("storage_name", models.CharField(max_length=255)),
+                ("width", models.PositiveIntegerField()),
+                ("height", models.PositiveIntegerField()),
+                ("size_bytes", models.PositiveIntegerField()),
+                ("updated", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "editor_derivedimage",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("source_name", "kind"),
+                        name="editor_derivedimage_source_kind_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0017_derivedimage"),
+    ]
+
+    # Existing rows are filled by ``manage.py rebuild_post_text_derivatives
+    # --missing`` (entrypoint, after migrate) with the current text rules, so
+    # the migration never runs application code against a changed schema.
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="preview_text",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="plain_text_length",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="word_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="reading_minutes",
+            field=models.PositiveSmallIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="first_sentence",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0018_post_text_derivatives"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="rendered_body",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        # The backfill that ran here needs the live renderer (templates, srcset
+        # ladder, placeholders from later migrations); existing rows are now
+        # filled by ``manage.py rebuild_post_rendered_bodies --missing``
+        # (entrypoint, after migrate).
+        migrations.RunPython(migrations.RunPython.noop, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0019_post_rendered_body"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="derivedimage",
+            name="target_width",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name="derivedimage",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("share_jpeg", "Social share JPEG"),
+                    ("telegram_jpeg", "Telegram JPEG"),
+                    ("avif_variant", "Responsive AVIF"),
+                    ("webp_variant", "Responsive WebP"),
+                ],
+                max_length=32,
+            ),
+        ),
+        migrations.RemoveConstraint(
+            model_name="derivedimage",
+            name="editor_derivedimage_source_kind_uniq",
+        ),
+        migrations.AddConstraint(
+            model_name="derivedimage",
+            constraint=models.UniqueConstraint(
+                fields=("source_name", "kind", "target_width"),
+                name="editor_derivedimage_source_kind_width_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0020_derivedimage_target_width"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="cover_placeholder",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="cover_color",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=7
+            ),
+        ),
+        migrations.AddField(
+            model_name="postgalleryimage",
+            name="placeholder",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="postgalleryimage",
+            name="color",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=7
+            ),
+        ),
+    ]
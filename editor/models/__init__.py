@@ -1,3 +1,5 @@
+from editor.models.derived_image import DerivedImage
+from editor.models.image_job import ImageJob
 from editor.models.post import (
     POST_HISTORY_MAX_ENTRIES,
     Category,
@@ -12,6 +14,8 @@ from editor.models.post import (
 __all__ = [
     "POST_HISTORY_MAX_ENTRIES",
     "Category",
+    "DerivedImage",
+    "ImageJob",
     "Post",
     "PostGalleryImage",
     "PostHistory",
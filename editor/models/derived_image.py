@@ -0,0 +1,43 @@
+# pyright: reportAttributeAccessIssue=false
+from typing import ClassVar
+
+from django.db import models
+
+
+class DerivedImage(models.Model):
+    """A file generated from an uploaded image (share JPEG, Telegram JPEG…).
+
+    Keyed by the source storage path, kind and ``target_width`` (the rung of
+    the responsive ladder; ``0`` for single derivatives); ``source_hash``
+    records which bytes it was built from, so lookups need no storage I/O.
+    """
+
+    class Kind(models.TextChoices):
+        SHARE_JPEG = "share_jpeg", "Social share JPEG"
+        TELEGRAM_JPEG = "telegram_jpeg", "Telegram JPEG"
+        AVIF_VARIANT = "avif_variant", "Responsive AVIF"
+        WEBP_VARIANT = "webp_variant", "Responsive WebP"
+
+    source_name = models.CharField(max_length=255)
+    source_hash = models.CharField(max_length=64)
+    kind = models.CharField(max_length=32, choices=Kind.choices)
+    target_width = models.PositiveIntegerField(default=0)
+    storage_name = models.CharField(max_length=255)
+    width = models.PositiveIntegerField()
+    height = models.PositiveIntegerField()
+    size_bytes = models.PositiveIntegerField()
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "editor"
+        db_table = "editor_derivedimage"
+        constraints: ClassVar[list] = [
+            models.UniqueConstraint(
+                fields=["source_name", "kind", "target_width"],
+                name="editor_derivedimage_source_kind_width_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        label = f"{self.get_kind_display()} of {self.source_name}"
+        return f"{label} ({self.target_width}w)" if self.target_width else label
@@ -0,0 +1,54 @@
+# pyright: reportAttributeAccessIssue=false
+from typing import ClassVar
+
+from django.db import models
+
+
+class ImageJob(models.Model):
+    """Deferred processing of one uploaded image field (``editor.image_jobs``).
+
+    One row per ``(model, object, field)``: a new upload resets it to pending.
+    ``source_name`` is the stored original the worker encodes from.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSING = "processing", "Processing"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    model_label = models.CharField(max_length=100)
+    object_id = models.PositiveBigIntegerField()
+    field_name = models.CharField(max_length=64)
+    source_name = models.CharField(max_length=255)
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+    created = models.DateTimeField(auto_now_add=True)
+    started = models.DateTimeField(null=True, blank=True)
+    finished = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "editor"
+        db_table = "editor_imagejob"
+        constraints: ClassVar[list] = [
+            models.UniqueConstraint(
+                fields=["model_label", "object_id", "field_name"],
+                name="editor_imagejob_target_uniq",
+            ),
+        ]
+        indexes: ClassVar[list] = [
+            models.Index(
+                fields=["status", "created"], name="editor_imagejob_queue_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.model_label}#{self.object_id}.{self.field_name} "
+            f"({self.get_status_display()})"
+        )
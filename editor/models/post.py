@@ -5,6 +5,8 @@ import uuid
 from typing import ClassVar, cast
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError, models
 from django.urls import reverse
@@ -14,7 +16,13 @@ from django.utils.safestring import mark_safe
 from django.utils.text import slugify
 from taggit.managers import TaggableManager
 
-from editor.image_upload import normalize_image_field_file
+from editor.image_upload import (
+    enqueue_deferred_image_jobs,
+    normalize_image_field_file,
+)
+from editor.post_render_service import render_post_body
+from editor.post_text_service import POST_TEXT_FIELDS, apply_post_text_derivatives
+from editor.search_service import refresh_post_search_vectors
 
 
 def validate_image_extension(value):
@@ -306,6 +314,25 @@ class Post(models.Model):
         default=0,
         verbose_name="Views count",
     )
+    search_vector = SearchVectorField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Weighted title/body tsvector; refreshed on save.",
+    )
+    # Text derivatives of ``body`` for cards, feeds and series navigation;
+    # recomputed on save so list pages can defer ``body``.
+    preview_text = models.TextField(blank=True, default="", editable=False)
+    plain_text_length = models.PositiveIntegerField(default=0, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
+    reading_minutes = models.PositiveSmallIntegerField(default=1, editable=False)
+    first_sentence = models.TextField(blank=True, default="", editable=False)
+    # Detail-page HTML (galleries expanded, images and headings decorated);
+    # re-rendered on body/title saves and on gallery changes (editor.signals).
+    rendered_body = models.TextField(blank=True, default="", editable=False)
+    # Inline LQIP (WebP data URI) and dominant colour of the cover, set on upload.
+    cover_placeholder = models.TextField(blank=True, default="", editable=False)
+    cover_color = models.CharField(max_length=7, blank=True, default="", editable=False)
 
     class Meta:
         app_label = "editor"
@@ -314,6 +341,15 @@ class Post(models.Model):
             "-published",
             "-created",
         )
+        indexes = (
+            # Keyset pagination of public lists seeks by (published, id).
+            models.Index(
+                fields=["-published", "-id"],
+                name="editor_post_pub_keyset_idx",
+                condition=models.Q(status="published"),
+            ),
+            GinIndex(fields=["search_vector"], name="editor_post_search_gin"),
+        )
 
     def __str__(self):
         t = (self.title or "").strip()
@@ -353,6 +389,8 @@ class Post(models.Model):
                 )
 
         normalize_image_field_file(self, "cover_image", update_fields_set)
+        if update_fields_set is not None and "cover_image" in update_fields_set:
+            update_fields_set.update(("cover_placeholder", "cover_color"))
 
         slug_persisted = update_fields is None or "slug" in set(update_fields)
 
@@ -367,6 +405,16 @@ class Post(models.Model):
         if self.status == "published" and published_at is None:
             self.published = timezone.now()
         self._ensure_unique_slug()
+        if update_fields_set is None or "body" in update_fields_set:
+            apply_post_text_derivatives(self)
+            if update_fields_set is not None:
+                update_fields_set.update(POST_TEXT_FIELDS)
+        if update_fields_set is None or update_fields_set & {"title", "body"}:
+            self.rendered_body = render_post_body(self)
+            if update_fields_set is not None:
+                update_fields_set.add("rendered_body")
+        if update_fields_set is not None:
+            kwargs["update_fields"] = list(update_fields_set)
         try:
             super().save(*args, **kwargs)
         except IntegrityError as exc:
@@ -376,9 +424,14 @@ class Post(models.Model):
             self._ensure_unique_slug()
             super().save(*args, **kwargs)
 
+        enqueue_deferred_image_jobs(self)
+
         if slug_persisted:
             self._record_slug_redirect_if_changed(old_slug)
 
+        if update_fields_set is None or update_fields_set & {"title", "body"}:
+            refresh_post_search_vectors(Post.objects.filter(pk=self.pk))
+
     def get_absolute_url(self):
         return reverse("blog:post_detail", args=[self.slug])
 
@@ -593,6 +646,8 @@ class PostGalleryImage(models.Model):
         default=0,
         help_text="Order within this gallery (lower first).",
     )
+    placeholder = models.TextField(blank=True, default="", editable=False)
+    color = models.CharField(max_length=7, blank=True, default="", editable=False)
 
     class Meta:
         app_label = "editor"
@@ -609,4 +664,7 @@ class PostGalleryImage(models.Model):
         update_fields = kwargs.get("update_fields")
         update_fields_set = set(update_fields) if update_fields is not None else None
         normalize_image_field_file(self, "image", update_fields_set)
+        if update_fields_set is not None and "image" in update_fields_set:
+            kwargs["update_fields"] = [*update_fields_set, "placeholder", "color"]
         super().save(*args, **kwargs)
+        enqueue_deferred_image_jobs(self)
@@ -0,0 +1,214 @@
+"""Display HTML of ``Post.body`` stored on the row for the detail page.
+
+``[gallery:N]`` placeholders become carousels, ``<img>`` tags get lazy loading
+and intrinsic ``width``/``height`` from the ``DerivedImage`` registry (no
+layout shift, no storage reads), and headings get ``id`` anchors. Built on
+save and once per commit on gallery changes, so the detail page renders one
+stored blob instead of re-splitting the body on every request.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from html import escape, unescape
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlparse
+
+from django.conf import settings
+from django.db.models import F, QuerySet
+from django.template.loader import render_to_string
+
+from editor.html_document import html_document
+
+POST_GALLERY_TEMPLATE = "blog/post/post_gallery_carousel.html"
+HEADING_TAGS = frozenset({"h1", "h2", "h3", "h4", "h5", "h6"})
+_LAZY_IMAGE_ATTRS = (("loading", "lazy"), ("decoding", "async"))
+_ATTR_NAME_RE = re.compile(r"^[^\s\"'>/=]+$")
+_ID_ATTR_RE = re.compile(r"""\sid\s*=\s*["']?([^"'\s>]+)""", re.IGNORECASE)
+_IMG_SRC_RE = re.compile(r"""<img\b[^>]*?\ssrc\s*=\s*["']([^"']+)""", re.IGNORECASE)
+
+ImageSize = tuple[int, int] | None
+
+
+def _media_storage_name(src: str) -> str | None:
+    """Storage name of a MEDIA_ROOT image referenced by *src*; ``None`` if external."""
+    parsed = urlparse(src)
+    site_host = urlparse(getattr(settings, "SITE_URL", "") or "").netloc
+    media_path = urlparse(settings.MEDIA_URL or "").path
+    if parsed.netloc and parsed.netloc != site_host:
+        return None
+    if not media_path or not parsed.path.startswith(media_path):
+        return None
+    return unquote(parsed.path[len(media_path) :]) or None
+
+
+def registered_image_sizes(srcs: Iterable[str]) -> dict[str, ImageSize]:
+    """Pixel size of each media *src* from ``DerivedImage`` rows, in one query.
+
+    Delivery files are registered as the top rung of their own format; images
+    without a row get no size rather than a storage read.
+    """
+    from editor.image_variants import VARIANT_KINDS
+    from editor.models import DerivedImage
+
+    names = {src: _media_storage_name(src) for src in srcs}
+    wanted = {name for name in names.values() if name}
+    found: dict[str, tuple[int, int]] = {}
+    if wanted:
+        for name, width, height in DerivedImage.objects.filter(
+            source_name__in=wanted,
+            storage_name=F("source_name"),
+            kind__in=VARIANT_KINDS,
+        ).values_list("source_name", "width", "height"):
+            found[name] = (width, height)
+    return {src: found.get(name) if name else None for src, name in names.items()}
+
+
+def _start_tag(tag: str, attrs: list[tuple[str, str | None]]) -> str:
+    parts = [tag]
+    for name, value in attrs:
+        if not _ATTR_NAME_RE.match(name):
+            continue
+        parts.append(name if value is None else f'{name}="{escape(value)}"')
+    return f"<{' '.join(parts)}>"
+
+
+def _heading_slug(text: str) -> str:
+    from editor.models.post import slugify_segment
+
+    return slugify_segment(text)[:80].strip("-") or "section"
+
+
+class _DisplayRewriter(HTMLParser):
+    """Collect start-tag replacements; everything else is kept byte for byte."""
+
+    def __init__(self, source: str) -> None:
+        super().__init__(convert_charrefs=True)
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+        self._sizes = registered_image_sizes(
+            unescape(src) for src in _IMG_SRC_RE.findall(source)
+        )
+        # Ids written by the author win; generated anchors avoid all of them.
+        self._used_ids = set(_ID_ATTR_RE.findall(source))
+        self._heading: tuple[int, int, str, list] | None = None
+        self._heading_text: list[str] = []
+        self.replacements: list[tuple[int, int, str]] = []
+
+    def _offset(self) -> int:
+        lineno, column = self.getpos()
+        return self._line_starts[lineno - 1] + column
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        start = self._offset()
+        end = start + len(self.get_starttag_text() or "")
+        names = {name for name, _value in attrs}
+        if tag == "img":
+            attrs = [
+                *attrs,
+                *(
+                    (name, value)
+                    for name, value in _LAZY_IMAGE_ATTRS
+                    if name not in names
+                ),
+            ]
+            size = None
+            if not names & {"width", "height"}:
+                src = dict(attrs).get("src") or ""
+                size = self._sizes.get(src) if src else None
+            if size is not None:
+                attrs += [("width", str(size[0])), ("height", str(size[1]))]
+            self.replacements.append((start, end, _start_tag(tag, attrs)))
+        elif tag in HEADING_TAGS:
+            if "id" not in names:
+                self._heading = (start, end, tag, attrs)
+                self._heading_text = []
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.handle_starttag(tag, attrs)
+
+    def handle_data(self, data: str) -> None:
+        if self._heading is not None:
+            self._heading_text.append(data)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._heading is None or tag != self._heading[2]:
+            return
+        start, end, tag, attrs = self._heading
+        self._heading = None
+        base = _heading_slug("".join(self._heading_text))
+        anchor, suffix = base, 2
+        while anchor in self._used_ids:
+            anchor = f"{base}-{suffix}"
+            suffix += 1
+        self._used_ids.add(anchor)
+        self.replacements.append(
+            (start, end, _start_tag(tag, [*attrs, ("id", anchor)]))
+        )
+
+
+def decorate_display_html(html: str) -> str:
+    """Add lazy-loading and size attributes to images and ids to headings."""
+    rewriter = _DisplayRewriter(html)
+    rewriter.feed(html)
+    rewriter.close()
+    parts: list[str] = []
+    pos = 0
+    for start, end, replacement in sorted(rewriter.replacements):
+        parts += [html[pos:start], replacement]
+        pos = end
+    parts.append(html[pos:])
+    return "".join(parts)
+
+
+def render_post_body(post) -> str:
+    """Detail-page HTML of *post*: body with galleries expanded and decorated."""
+    from editor.image_variants import attach_image_variants
+
+    images_by_key: dict[int, list] = {}
+    if post.pk is not None:
+        images = list(post.gallery_images.all())
+        attach_image_variants(images, "image")
+        for image in images:
+            images_by_key.setdefault(image.gallery_key, []).append(image)
+    parts: list[str] = []
+    carousel_counter = 0
+    for segment in html_document(post.body).segments:
+        if segment.gallery_key is None:
+            parts.append(segment.html)
+            continue
+        carousel_counter += 1
+        parts.append(
+            render_to_string(
+                POST_GALLERY_TEMPLATE,
+                {
+                    "gallery_images": images_by_key.get(segment.gallery_key, []),
+                    # One post body per page: key + position are unique ids.
+                    "carousel_id": (
+                        f"postgallery-{segment.gallery_key}-{carousel_counter}"
+                    ),
+                    "post_title": post.title,
+                },
+            )
+        )
+    return decorate_display_html("".join(parts))
+
+
+def refresh_post_rendered_bodies(queryset: QuerySet, *, batch_size: int = 100) -> int:
+    """Re-render the stored display HTML for every row of *queryset*."""
+    manager = queryset.model._default_manager
+    updated = 0
+    batch = []
+    for post in (
+        queryset.only("pk", "title", "body")
+        .prefetch_related("gallery_images")
+        .iterator(chunk_size=batch_size)
+    ):
+        post.rendered_body = render_post_body(post)
+        batch.append(post)
+        if len(batch) >= batch_size:
+            updated += manager.bulk_update(batch, ["rendered_body"])
+            batch = []
+    if batch:
+        updated += manager.bulk_update(batch, ["rendered_body"])
+    return updated
@@ -0,0 +1,75 @@
+"""Plain-text derivatives of ``Post.body`` stored on the row for cards and feeds."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+
+from django.db.models import QuerySet
+
+from editor.html_document import first_sentence_of, html_document
+from editor.templatetags.editor_filters import (
+    _add_space_after_period,
+    preview_inline_space,
+    truncatechars_whole_words,
+)
+
+# Longer than any card cut (30 words / 152 chars) so templates can still truncate.
+POST_PREVIEW_MAX_CHARS = 600
+POST_FIRST_SENTENCE_MAX_CHARS = 300
+WORDS_PER_MINUTE = 200
+
+POST_TEXT_FIELDS = (
+    "preview_text",
+    "plain_text_length",
+    "word_count",
+    "reading_minutes",
+    "first_sentence",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class PostTextDerivatives:
+    preview_text: str
+    plain_text_length: int
+    word_count: int
+    reading_minutes: int
+    first_sentence: str
+
+
+def compute_post_text_derivatives(body: str | None) -> PostTextDerivatives:
+    """Strip *body* once and derive everything list pages show about its text."""
+    plain_text = html_document(body).plain_text
+    inline = preview_inline_space(plain_text)
+    preview = _add_space_after_period(inline)
+    word_count = len(preview.split())
+    return PostTextDerivatives(
+        preview_text=truncatechars_whole_words(preview, POST_PREVIEW_MAX_CHARS),
+        plain_text_length=len(inline),
+        word_count=word_count,
+        reading_minutes=max(1, round(word_count / WORDS_PER_MINUTE)),
+        first_sentence=truncatechars_whole_words(
+            first_sentence_of(plain_text), POST_FIRST_SENTENCE_MAX_CHARS
+        ),
+    )
+
+
+def apply_post_text_derivatives(post) -> None:
+    """Set the stored text columns on *post* from its current ``body``."""
+    for name, value in asdict(compute_post_text_derivatives(post.body)).items():
+        setattr(post, name, value)
+
+
+def refresh_post_text_derivatives(queryset: QuerySet, *, batch_size: int = 500) -> int:
+    """Recompute the stored text columns for every row of *queryset*."""
+    manager = queryset.model._default_manager
+    updated = 0
+    batch = []
+    for post in queryset.only("pk", "body").iterator(chunk_size=batch_size):
+        apply_post_text_derivatives(post)
+        batch.append(post)
+        if len(batch) >= batch_size:
+            updated += manager.bulk_update(batch, POST_TEXT_FIELDS)
+            batch = []
+    if batch:
+        updated += manager.bulk_update(batch, POST_TEXT_FIELDS)
+    return updated
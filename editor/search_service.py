@@ -0,0 +1,32 @@
+"""Stored full-text search vector for ``Post`` (title weight A, body weight B)."""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import QuerySet
+
+DEFAULT_POST_SEARCH_CONFIG = "russian"
+
+
+def post_search_config() -> str:
+    """Postgres text search configuration (stemming language) for posts."""
+    return (
+        getattr(settings, "POST_SEARCH_CONFIG", "") or ""
+    ).strip() or DEFAULT_POST_SEARCH_CONFIG
+
+
+def post_search_vector_expression() -> SearchVector:
+    config = post_search_config()
+    return SearchVector("title", weight="A", config=config) + SearchVector(
+        "body", weight="B", config=config
+    )
+
+
+def post_search_query(query: str) -> SearchQuery:
+    return SearchQuery(query, config=post_search_config())
+
+
+def refresh_post_search_vectors(queryset: QuerySet) -> int:
+    """Recompute ``search_vector`` in SQL for every row of *queryset*."""
+    return queryset.update(search_vector=post_search_vector_expression())
@@ -1,13 +1,29 @@
-"""Cache invalidation hooks for public post pages."""
+"""Cache invalidation hooks for public post pages.
+
+Only posts that are on the public site (have a ``SitePublication``) bump
+surrogate keys, so editor autosaves of drafts never touch the page cache.
+"""
 
 from __future__ import annotations
 
 from django.conf import settings
-from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from blog.cache_utils import (
+    bump_surrogate_keys,
+    category_key,
+    invalidate_blog_public_pages_cache,
+    post_key,
+    public_post_dependency_keys,
+    series_key,
+    tag_key,
+)
+from blog.context_processors import nav_categories_cache
 from blog.models import SitePublication
-from editor.cache_utils import invalidate_editor_public_pages_cache
+from blog.related_index import schedule_related_posts_rebuild
+from editor.image_jobs import image_job_pending
 from editor.image_upload import ensure_post_share_image
 from editor.models import (
     Category,
@@ -16,17 +32,54 @@ from editor.models import (
     PostSeries,
     PostSlugRedirect,
 )
+from editor.post_render_service import refresh_post_rendered_bodies
+
+
+def _post_is_on_site(post_id: int | None) -> bool:
+    if post_id is None:
+        return False
+    return SitePublication.objects.filter(post_id=post_id).exists()
+
+
+@receiver(pre_save, sender=Post)
+def _remember_on_site_category(sender, instance, **kwargs) -> None:
+    # One lookup tells whether the saved post is public, its old category and
+    # whether it enters or leaves ``public_posts_queryset``.
+    instance._on_site_category_ids = None
+    instance._on_site_visibility_changed = False
+    if instance.pk is None:
+        return
+    rows = list(
+        Post.objects.filter(pk=instance.pk, site_publication__isnull=False).values_list(
+            "category_id", "status", "published"
+        )[:1]
+    )
+    if rows:
+        category_id, status, published = rows[0]
+        instance._on_site_category_ids = {category_id, instance.category_id}
+        instance._on_site_visibility_changed = (
+            status != instance.status or published != instance.published
+        )
 
 
 @receiver(post_save, sender=Post)
-@receiver(post_delete, sender=Post)
 def _invalidate_on_post_change(sender, instance, **kwargs) -> None:
-    invalidate_editor_public_pages_cache()
+    category_ids = getattr(instance, "_on_site_category_ids", None)
+    if category_ids is None:
+        return
+    keys = {
+        post_key(instance.pk),
+        *(category_key(pk) for pk in category_ids if pk is not None),
+    }
+    if getattr(instance, "_on_site_visibility_changed", False):
+        # Counts, list order and series members all follow the public queryset.
+        keys |= public_post_dependency_keys(instance.pk)
+    bump_surrogate_keys(keys)
 
 
 def _share_image_gate_satisfied(post: Post) -> bool:
     if getattr(settings, "PUBLIC_SITE_ENABLED", True):
-        return SitePublication.objects.filter(post_id=post.pk).exists()
+        return _post_is_on_site(post.pk)
     return post.status == "published"
 
 
@@ -37,6 +90,9 @@ def _maybe_ensure_post_share_image(post: Post) -> None:
         return
     if not _share_image_gate_satisfied(post):
         return
+    if image_job_pending(post, "cover_image"):
+        # The image worker writes it next to the encoded cover.
+        return
     try:
         ensure_post_share_image(post)
     except (OSError, ValueError):
@@ -53,33 +109,65 @@ def _ensure_share_image_on_site_publication(sender, instance, **kwargs) -> None:
     _maybe_ensure_post_share_image(instance.post)
 
 
+def _render_changed_galleries(pending: set[int]) -> None:
+    # The first callback of a commit renders every pending post; the rest
+    # find the set empty.
+    post_ids = set(pending)
+    pending.clear()
+    if not post_ids:
+        return
+    refresh_post_rendered_bodies(Post.objects.filter(pk__in=post_ids))
+    on_site = SitePublication.objects.filter(post_id__in=post_ids).values_list(
+        "post_id", flat=True
+    )
+    bump_surrogate_keys(post_key(post_id) for post_id in on_site)
+
+
 @receiver(post_save, sender=PostGalleryImage)
 @receiver(post_delete, sender=PostGalleryImage)
 def _invalidate_on_gallery_change(sender, instance, **kwargs) -> None:
-    invalidate_editor_public_pages_cache()
+    # A bulk upload saves N images: re-render each post once, after commit.
+    connection = transaction.get_connection()
+    pending = getattr(connection, "_gallery_render_post_ids", None)
+    if pending is None:
+        pending = connection._gallery_render_post_ids = set()
+    pending.add(instance.post_id)
+    transaction.on_commit(lambda: _render_changed_galleries(pending))
 
 
 @receiver(post_save, sender=Category)
 @receiver(post_delete, sender=Category)
 def _invalidate_on_category_change(sender, **kwargs) -> None:
-    invalidate_editor_public_pages_cache()
+    # Category names render in the nav of every page.
+    nav_categories_cache.invalidate()
+    invalidate_blog_public_pages_cache()
 
 
 @receiver(post_save, sender=PostSeries)
 @receiver(post_delete, sender=PostSeries)
-def _invalidate_on_post_series_change(sender, **kwargs) -> None:
-    invalidate_editor_public_pages_cache()
+def _invalidate_on_post_series_change(sender, instance, **kwargs) -> None:
+    if _post_is_on_site(instance.post_id):
+        bump_surrogate_keys(
+            [post_key(instance.post_id), series_key(instance.series_id)]
+        )
 
 
 @receiver(post_save, sender=PostSlugRedirect)
 @receiver(post_delete, sender=PostSlugRedirect)
-def _invalidate_on_slug_redirect_change(sender, **kwargs) -> None:
-    invalidate_editor_public_pages_cache()
+def _invalidate_on_slug_redirect_change(sender, instance, **kwargs) -> None:
+    if _post_is_on_site(instance.post_id):
+        bump_surrogate_keys([post_key(instance.post_id)])
 
 
 @receiver(m2m_changed, sender=Post.tags.through)
-def _invalidate_on_post_tags_change(sender, instance, action, **kwargs) -> None:
-    if action not in ("post_add", "post_remove", "post_clear"):
+def _invalidate_on_post_tags_change(sender, instance, action, pk_set, **kwargs) -> None:
+    if not isinstance(instance, Post) or not _post_is_on_site(instance.pk):
+        return
+    if action in ("post_add", "post_remove"):
+        tag_ids = pk_set or set()
+    elif action == "pre_clear":
+        tag_ids = set(instance.tags.values_list("pk", flat=True))
+    else:
         return
-    if isinstance(instance, Post):
-        invalidate_editor_public_pages_cache()
+    bump_surrogate_keys([post_key(instance.pk), *(tag_key(pk) for pk in tag_ids)])
+    schedule_related_posts_rebuild()
@@ -1,26 +1,17 @@
 import re
-from html import unescape
 
 from django import template
-from django.utils.html import strip_tags
-
-register = template.Library()
-
-_GALLERY_PLACEHOLDER_RE = re.compile(r"\[gallery:\d+\]", re.IGNORECASE)
-_NBSP_RE = re.compile(r"[\u00a0\u202f]")
 
+from editor.html_document import (
+    GALLERY_PLACEHOLDER_RE,
+    first_sentence_of,
+    html_document,
+)
+from editor.html_document import (
+    decode_html_entities as _decode_html_entities,
+)
 
-def _decode_html_entities(value: str) -> str:
-    if not value:
-        return ""
-    text = str(value)
-    for _ in range(3):
-        decoded = unescape(text)
-        if decoded == text:
-            break
-        text = decoded
-    text = re.sub(r"&nbsp;", " ", text, flags=re.IGNORECASE)
-    return _NBSP_RE.sub(" ", text)
+register = template.Library()
 
 
 def _add_space_after_period(value: str) -> str:
@@ -52,36 +43,20 @@ def strip_gallery_placeholders(value):
     """Remove ``[gallery:N]`` editor placeholders from preview text."""
     if not value:
         return ""
-    text = _GALLERY_PLACEHOLDER_RE.sub("", str(value))
+    text = GALLERY_PLACEHOLDER_RE.sub("", str(value))
     return re.sub(r"[ \t]{2,}", " ", text)
 
 
 @register.filter
 def striptags_preserve_paragraphs(value):
     """
-    Strip HTML tags but preserve paragraph structure by converting
-    <p> and </p> tags to double newlines before stripping.
-    This ensures that linebreaks filter can properly create <p> tags.
+    Strip HTML tags but preserve paragraph structure: paragraphs and other
+    blocks become double newlines, ``<br>`` a single one, so the linebreaks
+    filter can rebuild ``<p>`` tags. Uses the shared parsed ``HtmlDocument``.
     """
     if not value:
         return ""
-
-    value = strip_gallery_placeholders(value)
-    value = re.sub(r"</p>\s*<p[^>]*>", "\n\n", str(value))
-    value = re.sub(r"<p[^>]*>", "\n\n", value)
-    value = re.sub(r"</p>", "", value)
-    value = re.sub(
-        r"</(?:div|section|article|blockquote|li|h[1-6])>",
-        "\n\n",
-        value,
-        flags=re.IGNORECASE,
-    )
-    value = re.sub(r"<br\s*/?>", "\n", value, flags=re.IGNORECASE)
-    value = strip_tags(value)
-    value = _decode_html_entities(value)
-    value = re.sub(r"\n{3,}", "\n\n", value)
-    value = value.strip()
-    return value
+    return html_document(str(value)).plain_text
 
 
 @register.filter
@@ -155,6 +130,10 @@ def needs_read_more_button(post) -> bool:
     if getattr(post, "short_description", None):
         raw = post.short_description
     else:
+        plain_length = getattr(post, "plain_text_length", None)
+        if isinstance(plain_length, int) and plain_length:
+            # Stored on save (``editor.post_text_service``); no body re-parse.
+            return plain_length > 152
         raw = getattr(post, "body", None) or ""
     text = preview_inline_space(striptags_preserve_paragraphs(raw))
     trunc = truncatechars_whole_words(text, 152)
@@ -199,8 +178,7 @@ def reading_time(value):
     """Calculate approximate reading time in minutes based on word count."""
     if not value:
         return 1
-    text = strip_tags(str(value))
-    word_count = len(text.split())
+    word_count = len(html_document(str(value)).plain_text.split())
     minutes = max(1, round(word_count / 200))
     return minutes
 
@@ -218,11 +196,4 @@ def first_sentence(value):
     """Return first sentence from HTML/text content."""
     if not value:
         return ""
-
-    text = strip_tags(str(value))
-    text = re.sub(r"\s+", " ", text).strip()
-    if not text:
-        return ""
-
-    parts = re.split(r"(?<=[.!?…])\s+", text, maxsplit=1)
-    return parts[0].strip()
+    return first_sentence_of(html_document(str(value)).plain_text)
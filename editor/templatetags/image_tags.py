@@ -0,0 +1,57 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import SafeString
+
+from editor.image_variants import IMAGE_SIZES, responsive_image
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_picture(
+    field_file, alt="", sizes="100vw", placeholder="", color="", **attrs
+) -> SafeString:
+    """
+    ``<picture>`` with AVIF/WebP ``srcset`` sources for an image field, falling
+    back to the delivery file. ``sizes`` is a slot name from ``IMAGE_SIZES``
+    or a literal value. ``placeholder`` (data URI) and ``color`` paint the
+    ``<img>`` background until the file loads. Extra keyword arguments become
+    ``<img>`` attributes, e.g. ``{% responsive_picture post.cover_image
+    alt=post.title sizes="card" placeholder=post.cover_placeholder
+    color=post.cover_color class="card-img-top" loading="lazy" %}``.
+    """
+    image = responsive_image(field_file)
+    if image is None:
+        return SafeString("")
+    # Sizes come from the ``DerivedImage`` ladder only; images without one
+    # (run build_image_variants) get none rather than a storage read per render.
+    width, height = image.width, image.height
+    img_attrs = {"src": image.src, "alt": alt}
+    if width and height:
+        img_attrs.update(width=width, height=height)
+    if not color.startswith("#"):
+        color = ""  # ``NO_PLACEHOLDER``: nothing to paint.
+    background = " ".join(
+        part for part in (color, f'url("{placeholder}")' if placeholder else "") if part
+    )
+    if background:
+        img_attrs["style"] = f"background: {background} center / cover no-repeat"
+    img_attrs.update({name: value for name, value in attrs.items() if value})
+    img = format_html(
+        "<img{}>",
+        format_html_join("", ' {}="{}"', img_attrs.items()),
+    )
+    if not image.sources:
+        return img
+    return format_html(
+        "<picture>{}{}</picture>",
+        format_html_join(
+            "",
+            '<source type="{}" srcset="{}" sizes="{}">',
+            (
+                (mime_type, srcset, IMAGE_SIZES.get(sizes, sizes))
+                for mime_type, srcset in image.sources
+            ),
+        ),
+        img,
+    )
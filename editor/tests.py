@@ -451,3 +451,598 @@ class PublicCardFilterTests(TestCase):
         post.body = "<p>" + ("word " * 80) + "</p>"
         self.assertTrue(needs_read_more_button(post))
         self.assertFalse(needs_read_more_button(None))
+
+
+class PostSearchVectorTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(
+            title="Путешествия",
+            slug="search-vector-post",
+            body="<p>Мы долго путешествовали по горам.</p>",
+            status="draft",
+        )
+
+    def test_save_stores_stemmed_vector(self):
+        from editor.search_service import post_search_query
+
+        matches = Post.objects.filter(search_vector=post_search_query("путешествие"))
+        self.assertEqual(list(matches), [self.post])
+
+    def test_body_edit_refreshes_vector(self):
+        from editor.search_service import post_search_query
+
+        self.post.body = "<p>Только про море.</p>"
+        self.post.save(update_fields=["body"])
+        self.assertFalse(
+            Post.objects.filter(search_vector=post_search_query("горы")).exists()
+        )
+        self.assertTrue(
+            Post.objects.filter(search_vector=post_search_query("морем")).exists()
+        )
+
+    def test_rebuild_command_backfills_missing_vectors(self):
+        from django.core.management import call_command
+
+        Post.objects.filter(pk=self.post.pk).update(search_vector=None)
+        out = io.StringIO()
+        call_command("rebuild_post_search_vectors", "--missing-only", stdout=out)
+        self.assertIn("1 post(s)", out.getvalue())
+        self.post.refresh_from_db()
+        self.assertIsNotNone(self.post.search_vector)
+
+
+class HtmlDocumentTests(TestCase):
+    def test_single_parse_yields_text_tokens_and_gallery_segments(self):
+        from editor.html_document import html_document
+
+        body = (
+            '<p>Intro &amp; <span style="font-weight:bold">bold</span>.</p>'
+            "[gallery:2]<p>Outro</p>"
+        )
+        document = html_document(body)
+        self.assertIs(html_document(body), document)
+        self.assertEqual(document.plain_text, "Intro & bold.\n\nOutro")
+        self.assertEqual(document.tag_counts["strong"], 1)
+        self.assertEqual(
+            [segment.gallery_key for segment in document.segments], [None, 2, None]
+        )
+        self.assertEqual(
+            "".join(segment.html for segment in document.segments),
+            body.replace("[gallery:2]", ""),
+        )
+
+    def test_text_quality_counts_html_paragraphs(self):
+        report = PostTextQualityService().evaluate(
+            TextQualityRequestDTO(
+                text="<h2>Title</h2><p>First one.</p><p>Second one.</p>",
+                content_format="html",
+                enable_extra_metrics=True,
+            )
+        )
+        self.assertEqual(report.text_meta.paragraphs, 3)
+        self.assertEqual(report.scores["structure"].raw["headings_count"], 1)
+
+    def test_benchmark_times_previous_converters_against_shared_parse(self):
+        from django.core.management import call_command
+
+        from editor.management.commands import _baseline_body_outputs as baseline
+        from sender.services.telegram_format import html_body_to_telegram_html
+
+        body = '<p>One <span style="font-weight:bold">two</span>.</p>[gallery:1]'
+        self.assertEqual(baseline.telegram_html(body), html_body_to_telegram_html(body))
+        Post.objects.create(title="Bench", slug="bench", body=body, status="draft")
+        out = io.StringIO()
+        call_command("benchmark_body_parsing", "--repeat", "1", stdout=out)
+        self.assertIn("previous converters:", out.getvalue())
+        self.assertIn("Shared parse speedup:", out.getvalue())
+
+
+class PostTextDerivativeTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(
+            title="Derivatives",
+            slug="derivatives-post",
+            body="<p>First line. Second line!</p>[gallery:1]<p>"
+            + ("word " * 400)
+            + "</p>",
+            status="draft",
+        )
+
+    def test_save_stores_card_text(self):
+        self.post.refresh_from_db()
+        self.assertTrue(self.post.preview_text.startswith("First line. Second line!"))
+        self.assertNotIn("[gallery:1]", self.post.preview_text)
+        self.assertLessEqual(len(self.post.preview_text), 601)
+        self.assertEqual(self.post.word_count, 404)
+        self.assertEqual(self.post.reading_minutes, 2)
+        self.assertGreater(self.post.plain_text_length, 152)
+        self.assertEqual(self.post.first_sentence, "First line.")
+
+    def test_body_edit_via_update_fields_refreshes_columns(self):
+        self.post.body = "<p>Short now.</p>"
+        self.post.save(update_fields=["body"])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.preview_text, "Short now.")
+        self.assertEqual(self.post.word_count, 2)
+        self.assertEqual(self.post.reading_minutes, 1)
+
+    def test_rebuild_command_backfills_columns(self):
+        from django.core.management import call_command
+
+        Post.objects.filter(pk=self.post.pk).update(preview_text="", word_count=0)
+        out = io.StringIO()
+        call_command("rebuild_post_text_derivatives", stdout=out)
+        self.assertIn("1 post(s)", out.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.word_count, 404)
+
+    def test_rebuild_missing_only_touches_unfilled_posts(self):
+        from django.core.management import call_command
+
+        Post.objects.filter(pk=self.post.pk).update(word_count=7)
+        out = io.StringIO()
+        call_command("rebuild_post_text_derivatives", "--missing", stdout=out)
+        self.assertIn("0 post(s)", out.getvalue())
+
+        Post.objects.filter(pk=self.post.pk).update(plain_text_length=0)
+        call_command("rebuild_post_text_derivatives", "--missing", stdout=out)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.word_count, 404)
+
+
+class PostRenderedBodyTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.post = Post.objects.create(
+            title="Rendered",
+            slug="rendered-post",
+            body="<h2>Введение</h2><p>Intro</p>[gallery:1]<h2>Введение</h2>",
+            status="draft",
+        )
+
+    def test_save_renders_headings_and_gallery(self):
+        from editor.models import PostGalleryImage
+
+        self.post.refresh_from_db()
+        self.assertIn('<h2 id="vvedenie">', self.post.rendered_body)
+        self.assertIn('<h2 id="vvedenie-2">', self.post.rendered_body)
+        self.assertIn('id="postgallery-1-1"', self.post.rendered_body)
+        self.assertNotIn("[gallery:1]", self.post.rendered_body)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image = PostGalleryImage.objects.create(
+                post=self.post, gallery_key=1, image=_minimal_jpeg_upload("slide.jpg")
+            )
+        self.post.refresh_from_db()
+        self.assertIn(image.image.url, self.post.rendered_body)
+        self.assertIn('loading="lazy" decoding="async"', self.post.rendered_body)
+        self.assertIn('width="8" height="8"', self.post.rendered_body)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            image.delete()
+        self.post.refresh_from_db()
+        self.assertNotIn("<img", self.post.rendered_body)
+
+    def test_bulk_gallery_upload_renders_body_once(self):
+        from editor import signals
+        from editor.models import PostGalleryImage
+
+        with (
+            mock.patch.object(
+                signals,
+                "refresh_post_rendered_bodies",
+                wraps=signals.refresh_post_rendered_bodies,
+            ) as refresh,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            for index in range(3):
+                PostGalleryImage.objects.create(
+                    post=self.post,
+                    gallery_key=1,
+                    image=_minimal_jpeg_upload(f"bulk-{index}.jpg"),
+                )
+        refresh.assert_called_once()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.rendered_body.count("carousel-item"), 3)
+
+    def test_body_image_sizes_come_from_the_registry(self):
+        from django.core.files.storage import default_storage
+
+        from editor.post_render_service import decorate_display_html
+
+        html = '<p><img src="/media/img/missing.webp" alt=""></p>'
+        with mock.patch.object(default_storage, "open", side_effect=AssertionError):
+            decorated = decorate_display_html(html)
+        self.assertNotIn("width=", decorated)
+        self.assertIn('loading="lazy"', decorated)
+
+    def test_rebuild_command_backfills_rendered_body(self):
+        from django.core.management import call_command
+
+        Post.objects.filter(pk=self.post.pk).update(rendered_body="")
+        out = io.StringIO()
+        call_command("rebuild_post_rendered_bodies", stdout=out)
+        self.assertIn("1 post(s)", out.getvalue())
+        self.post.refresh_from_db()
+        self.assertIn("<p>Intro</p>", self.post.rendered_body)
+
+    def test_rebuild_missing_skips_rendered_posts(self):
+        from django.core.management import call_command
+
+        out = io.StringIO()
+        call_command("rebuild_post_rendered_bodies", "--missing", stdout=out)
+        self.assertIn("0 post(s)", out.getvalue())
+
+
+@override_settings(POST_VIEW_COUNT_FLUSH_INTERVAL=60)
+class PostViewCountBufferTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        from blog.models import SitePublication
+
+        cache.clear()
+        author = cast(UserManager, User.objects).create_user(
+            email="views@example.com",
+            password="secret12345",
+        )
+        self.post = Post(
+            title="Viewed post",
+            slug="viewed-post",
+            author=author,
+            body="<p>Body</p>",
+            status="published",
+        )
+        self.post.save(_allow_publish_via_sender=True)
+        SitePublication.objects.create(post=self.post, published_at=self.post.published)
+        self.url = reverse("blog:post_detail", args=[self.post.slug])
+        self.client = Client(HTTP_USER_AGENT="Mozilla/5.0 (X11; Linux x86_64)")
+
+    def _views(self) -> int:
+        self.post.refresh_from_db()
+        return self.post.views
+
+    def test_views_are_buffered_until_flush(self):
+        from django.core.management import call_command
+
+        for _ in range(3):
+            self.client.get(self.url)
+        # The first view takes the flush slot; the rest wait in Redis.
+        self.assertEqual(self._views(), 1)
+
+        out = io.StringIO()
+        call_command("flush_post_views", stdout=out)
+        self.assertIn("Flushed 2", out.getvalue())
+        self.assertEqual(self._views(), 3)
+
+    def test_flusher_loop_flushes_once_more_when_stopped(self):
+        import threading
+
+        from editor.view_count_service import flush_post_views_until
+
+        for _ in range(3):
+            self.client.get(self.url)
+        stop = threading.Event()
+        stop.set()
+        self.assertEqual(flush_post_views_until(stop, interval=60), 2)
+        self.assertEqual(self._views(), 3)
+
+    def test_bots_are_not_counted(self):
+        from editor.view_count_service import flush_post_views
+
+        Client(HTTP_USER_AGENT="TelegramBot (like TwitterBot)").get(self.url)
+        Client().get(self.url)
+        flush_post_views()
+        self.assertEqual(self._views(), 0)
+
+    @override_settings(POST_VIEW_COUNT_DEDUPE_SECONDS=600)
+    def test_repeat_views_from_one_client_count_once(self):
+        from editor.view_count_service import flush_post_views
+
+        self.client.get(self.url)
+        self.client.get(self.url)
+        flush_post_views()
+        self.assertEqual(self._views(), 1)
+
+    def test_missing_posts_are_not_buffered(self):
+        from editor.view_count_service import flush_post_views
+
+        self.client.get("/no-such-post/")
+        self.assertEqual(flush_post_views(), 0)
+
+
+@override_settings(IMAGE_VARIANT_WIDTHS=(320, 640))
+class ImageVariantTests(TestCase):
+    def setUp(self):
+        buf = io.BytesIO()
+        Image.new("RGB", (700, 400), color=(20, 90, 160)).save(buf, format="JPEG")
+        self.post = Post.objects.create(
+            title="Variants",
+            slug="variants-post",
+            body="<p>Body</p>",
+            status="draft",
+            cover_image=SimpleUploadedFile(
+                "wide.jpg", buf.getvalue(), content_type="image/jpeg"
+            ),
+        )
+
+    def _webp_widths(self) -> list[int]:
+        from editor.models import DerivedImage
+
+        return sorted(
+            DerivedImage.objects.filter(
+                source_name=self.post.cover_image.name,
+                kind=DerivedImage.Kind.WEBP_VARIANT,
+            ).values_list("target_width", flat=True)
+        )
+
+    def test_upload_writes_ladder_and_template_renders_srcset(self):
+        from django.template import Context, Template
+
+        self.assertEqual([w for w in self._webp_widths() if w < 700], [320, 640])
+        post = Post.objects.get(pk=self.post.pk)
+        html = Template(
+            "{% load image_tags %}"
+            '{% responsive_picture post.cover_image alt="Cover" sizes="card" %}'
+        ).render(Context({"post": post}))
+        self.assertIn('<source type="image/webp"', html)
+        self.assertIn("-320w.webp 320w", html)
+        self.assertIn('width="700" height="400"', html)
+
+    def test_image_without_ladder_renders_without_reading_storage(self):
+        from django.core.files.storage import default_storage
+        from django.template import Context, Template
+
+        from editor.models import DerivedImage
+
+        DerivedImage.objects.all().delete()
+        post = Post.objects.get(pk=self.post.pk)
+        template = Template(
+            "{% load image_tags %}{% responsive_picture post.cover_image alt='C' %}"
+        )
+        with mock.patch.object(default_storage, "open", side_effect=AssertionError):
+            html = template.render(Context({"post": post}))
+        self.assertIn(post.cover_image.url, html)
+        self.assertNotIn("width=", html)
+
+    def test_backfill_command_rebuilds_missing_ladders(self):
+        from django.core.management import call_command
+
+        from editor.models import DerivedImage
+
+        DerivedImage.objects.filter(
+            kind__in=[
+                DerivedImage.Kind.AVIF_VARIANT,
+                DerivedImage.Kind.WEBP_VARIANT,
+            ]
+        ).delete()
+        out = io.StringIO()
+        call_command("build_image_variants", "--workers", "1", stdout=out)
+        self.assertIn("for 1 image(s); 0 failed", out.getvalue())
+        self.assertEqual([w for w in self._webp_widths() if w < 700], [320, 640])
+
+
+class ImagePlaceholderTests(TestCase):
+    def setUp(self):
+        buf = io.BytesIO()
+        Image.new("RGB", (300, 200), color=(200, 40, 40)).save(buf, format="PNG")
+        self.post = Post.objects.create(
+            title="Placeholder",
+            slug="placeholder-post",
+            body="<p>Body</p>",
+            status="draft",
+            cover_image=SimpleUploadedFile(
+                "red.png", buf.getvalue(), content_type="image/png"
+            ),
+        )
+
+    def test_upload_stores_placeholder_and_template_paints_it(self):
+        from django.template import Context, Template
+
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertTrue(post.cover_placeholder.startswith("data:image/webp;base64,"))
+        self.assertRegex(post.cover_color, r"^#[0-9a-f]{6}$")
+        red = int(post.cover_color[1:3], 16)
+        self.assertGreater(red, 150)
+        html = Template(
+            "{% load image_tags %}"
+            "{% responsive_picture post.cover_image alt=post.title "
+            "placeholder=post.cover_placeholder color=post.cover_color %}"
+        ).render(Context({"post": post}))
+        self.assertIn(f"background: {post.cover_color} url(", html)
+
+    def test_transparent_image_gets_no_placeholder(self):
+        from editor.image_placeholder import NO_PLACEHOLDER, compute_image_placeholder
+
+        im = Image.new("RGBA", (300, 200), color=(200, 40, 40, 255))
+        im.paste((0, 0, 0, 0), (0, 0, 150, 200))
+        placeholder = compute_image_placeholder(im)
+        self.assertEqual(
+            (placeholder.data_uri, placeholder.color), ("", NO_PLACEHOLDER)
+        )
+
+        opaque = compute_image_placeholder(Image.new("RGBA", (300, 200), "red"))
+        self.assertTrue(opaque.data_uri)
+
+    def test_backfill_command_fills_missing_placeholders(self):
+        from django.core.management import call_command
+
+        Post.objects.filter(pk=self.post.pk).update(
+            cover_placeholder="", cover_color=""
+        )
+        out = io.StringIO()
+        call_command("build_image_placeholders", stdout=out)
+        self.assertIn("1 cover(s)", out.getvalue())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertTrue(post.cover_placeholder.startswith("data:image/webp;base64,"))
+
+    def test_backfill_skips_images_already_looked_at(self):
+        from django.core.management import call_command
+        from django.template import Context, Template
+
+        from editor.image_placeholder import NO_PLACEHOLDER
+
+        Post.objects.filter(pk=self.post.pk).update(
+            cover_placeholder="", cover_color=""
+        )
+        with mock.patch(
+            "editor.image_placeholder.placeholder_from_storage",
+            side_effect=OSError("broken"),
+        ):
+            call_command("build_image_placeholders", stdout=io.StringIO())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertEqual(
+            (post.cover_placeholder, post.cover_color), ("", NO_PLACEHOLDER)
+        )
+
+        # Failed and transparent images are not re-read on the next deploy.
+        out = io.StringIO()
+        with (
+            mock.patch(
+                "editor.image_placeholder.placeholder_from_storage",
+                side_effect=AssertionError,
+            ),
+            mock.patch(
+                "editor.management.commands.build_image_placeholders."
+                "invalidate_blog_public_pages_cache"
+            ) as invalidate,
+        ):
+            call_command("build_image_placeholders", stdout=out)
+        self.assertIn("0 cover(s)", out.getvalue())
+        invalidate.assert_not_called()
+        html = Template(
+            "{% load image_tags %}"
+            "{% responsive_picture post.cover_image alt=post.title "
+            "placeholder=post.cover_placeholder color=post.cover_color %}"
+        ).render(Context({"post": post}))
+        self.assertNotIn("background:", html)
+
+
+@override_settings(IMAGE_PROCESSING_ASYNC=True, IMAGE_VARIANT_WIDTHS=(320,))
+class ImageJobTests(TestCase):
+    def setUp(self):
+        import tempfile
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        buf = io.BytesIO()
+        Image.new("RGB", (640, 360), color=(30, 120, 60)).save(buf, format="PNG")
+        self.post = Post.objects.create(
+            title="Queued cover",
+            slug="queued-cover",
+            body="<p>Body</p>",
+            status="draft",
+            cover_image=SimpleUploadedFile(
+                "queued.png", buf.getvalue(), content_type="image/png"
+            ),
+        )
+
+    def test_upload_stores_original_and_queues_job(self):
+        from editor.image_jobs import image_processing_status
+        from editor.models import ImageJob
+
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertTrue(post.cover_image.name.endswith(".png"))
+        self.assertTrue(post.cover_placeholder.startswith("data:image/webp"))
+        job = ImageJob.objects.get(object_id=post.pk, field_name="cover_image")
+        self.assertEqual(job.source_name, post.cover_image.name)
+        self.assertEqual(image_processing_status(post, "cover_image"), "pending")
+
+    def test_worker_encodes_and_replaces_original(self):
+        from django.core.files.storage import default_storage
+        from django.core.management import call_command
+
+        from editor.image_jobs import image_processing_status
+        from editor.models import DerivedImage
+
+        original = self.post.cover_image.name
+        out = io.StringIO()
+        call_command("process_image_jobs", "--once", "--workers", "1", stdout=out)
+        self.assertIn("Processed 1 image job(s)", out.getvalue())
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertFalse(post.cover_image.name.endswith(".png"))
+        self.assertFalse(default_storage.exists(original))
+        self.assertTrue(
+            DerivedImage.objects.filter(
+                source_name=post.cover_image.name,
+                kind=DerivedImage.Kind.SHARE_JPEG,
+            ).exists()
+        )
+        self.assertEqual(image_processing_status(post, "cover_image"), "done")
+
+
+class DerivedImageRegistryTests(TestCase):
+    def setUp(self):
+        self.post = Post.objects.create(
+            title="Cover registry",
+            slug="cover-registry",
+            body="<p>Body</p>",
+            status="draft",
+            cover_image=_minimal_jpeg_upload("registry.png"),
+        )
+
+    def test_cover_upload_registers_share_jpeg(self):
+        from editor.models import DerivedImage
+
+        entry = DerivedImage.objects.get(
+            source_name=self.post.cover_image.name,
+            kind=DerivedImage.Kind.SHARE_JPEG,
+        )
+        self.assertEqual((entry.width, entry.height), (1200, 630))
+        self.assertTrue(entry.storage_name.endswith("-share.jpg"))
+        self.assertEqual(len(entry.source_hash), 64)
+
+    def test_registered_share_image_needs_no_storage_io(self):
+        from django.core.files.storage import default_storage
+
+        from editor.image_upload import ensure_post_share_image
+
+        post = Post.objects.get(pk=self.post.pk)
+        with (
+            mock.patch.object(default_storage, "exists", side_effect=AssertionError),
+            mock.patch.object(default_storage, "open", side_effect=AssertionError),
+            self.assertNumQueries(1),
+        ):
+            share_name = ensure_post_share_image(post)
+            self.assertEqual(ensure_post_share_image(post), share_name)
+        self.assertTrue(share_name.endswith("-share.jpg"))
+
+    def test_share_image_is_rebuilt_when_the_share_size_changes(self):
+        from editor import image_upload
+        from editor.models import DerivedImage
+
+        post = Post.objects.get(pk=self.post.pk)
+        with mock.patch.object(
+            image_upload, "social_share_image_size", return_value=(600, 315)
+        ):
+            image_upload.ensure_post_share_image(post)
+        entry = DerivedImage.objects.get(
+            source_name=post.cover_image.name, kind=DerivedImage.Kind.SHARE_JPEG
+        )
+        self.assertEqual((entry.width, entry.height), (600, 315))
+
+    def test_share_image_url_never_generates_files(self):
+        from editor.models import DerivedImage
+        from sender.services.url_helpers import post_share_image_media_url
+
+        DerivedImage.objects.all().delete()
+        post = Post.objects.get(pk=self.post.pk)
+        self.assertIsNone(post_share_image_media_url(post))
+        self.assertFalse(DerivedImage.objects.exists())
+
+    def test_telegram_jpeg_is_encoded_once_per_source(self):
+        from editor import image_upload
+
+        source = self.post.cover_image.name
+        first = image_upload.ensure_telegram_jpeg(source)
+        with mock.patch.object(
+            image_upload,
+            "build_telegram_jpeg_from_image_bytes",
+            side_effect=AssertionError,
+        ):
+            self.assertEqual(image_upload.ensure_telegram_jpeg(source), first)
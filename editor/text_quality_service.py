@@ -4,13 +4,14 @@ import re
 from collections import Counter
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
-from html import unescape
 from itertools import pairwise
 from typing import Any, ClassVar
 from uuid import UUID, uuid4
 
 from django.conf import settings
 
+from editor.html_document import html_document
+
 try:
     import language_tool_python  # pyright: ignore[reportMissingImports]
 except ImportError:
@@ -25,7 +26,6 @@ MetricStatus = str
 
 _WORD_RE = re.compile(r"[A-Za-zА-Яа-яЁё]+(?:[-'][A-Za-zА-Яа-яЁё]+)*")
 _SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])[\s\n]+")
-_TAG_RE = re.compile(r"<[^>]+>")
 _WS_RE = re.compile(r"\s+")
 _MIXED_ALPHABET_RE = re.compile(r"(?=.*[A-Za-z])(?=.*[А-Яа-яЁё])[A-Za-zА-Яа-яЁё]+")
 _TRIPLE_CHAR_RE = re.compile(r"(.)\1{2,}")
@@ -511,8 +511,8 @@ class PostTextQualityService:
         )
 
     def _to_plain_text(self, html: str) -> str:
-        without_tags = _TAG_RE.sub(" ", html)
-        return unescape(without_tags)
+        # Shared parse: paragraphs/blocks come out as blank-line separated text.
+        return html_document(html).plain_text
 
     def _prepare_punctuation_text(self, prepared: _PreparedText) -> str:
         text = prepared.plain_text
@@ -1009,12 +1009,9 @@ class PostTextQualityService:
         heading_hits = 0
         list_hits = 0
         if content_format == "html":
-            heading_hits = len(
-                re.findall(r"<h[1-6][^>]*>", prepared.source_text, re.IGNORECASE)
-            )
-            list_hits = len(
-                re.findall(r"<(?:ul|ol)[^>]*>", prepared.source_text, re.IGNORECASE)
-            )
+            tag_counts = html_document(prepared.source_text).tag_counts
+            heading_hits = sum(tag_counts.get(f"h{level}", 0) for level in range(1, 7))
+            list_hits = tag_counts.get("ul", 0) + tag_counts.get("ol", 0)
         penalty = 0.0
         if paragraphs <= 1:
             penalty += 25
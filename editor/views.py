@@ -4,29 +4,20 @@ from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.http import Http404, HttpRequest, HttpResponsePermanentRedirect
 from django.shortcuts import get_object_or_404, render
-from django.views.decorators.cache import cache_page
 from taggit.models import Tag
 
 from blog.category_helpers import resolve_category_for_list
-from blog.querysets import public_posts_queryset
-from blog.related_posts import series_navigation, similar_and_newest_posts
+from blog.page_cache import public_page_cache as _public_page_cache
+from blog.querysets import POST_CARD_DEFERRED_FIELDS, public_posts_queryset
+from blog.related_posts import similar_and_newest_posts
+from blog.series_navigation import series_navigation
 from editor.forms import SearchForm
 from editor.image_upload import ensure_post_share_image, social_share_image_size
+from editor.image_variants import attach_image_variants
 from editor.models import Category, Post, PostSlugRedirect
 from sender.services.url_helpers import post_og_image_absolute_url
 
 
-def _public_page_cache(key_prefix: str):  # pragma: no cover
-    timeout = getattr(settings, "POST_PAGE_CACHE_TIMEOUT", 0)
-    if timeout <= 0 or settings.DEBUG or not getattr(settings, "IS_PRODUCTION", True):
-
-        def _noop(view):
-            return view
-
-        return _noop
-    return cache_page(timeout, key_prefix=key_prefix)
-
-
 def _label_for_category_slug(category_slug: str | None) -> str:  # pragma: no cover
     if not category_slug:
         return "Рубрика"
@@ -224,10 +215,7 @@ def post_detail(request, slug):  # pragma: no cover
 
 def post_detail_by_uuid(request, uuid):
     """View a post by secret UUID (any status, including draft)."""
-    post = get_object_or_404(
-        Post.objects.prefetch_related("gallery_images"),
-        uuid=uuid,
-    )
+    post = get_object_or_404(Post.objects.defer(*POST_CARD_DEFERRED_FIELDS), uuid=uuid)
     # Don't increment views for draft preview
 
     current_series, previous_post, next_post = series_navigation(post)
@@ -243,6 +231,10 @@ def post_detail_by_uuid(request, uuid):
 
     if post.cover_image and post.cover_image.name:
         ensure_post_share_image(post)
+    attach_image_variants(
+        [post, previous_post, next_post, *similar_posts, *newest_posts],
+        "cover_image",
+    )
 
     response = render(
         request,
@@ -31,4 +31,6 @@ PY
 
 wait_for_db
 python manage.py migrate --noinput
+python manage.py rebuild_post_text_derivatives --missing
+python manage.py rebuild_post_rendered_bodies --missing
 exec python manage.py runserver 0.0.0.0:8000
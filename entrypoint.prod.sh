@@ -5,11 +5,12 @@ APP_USER=appuser
 LOG_MOUNT=/app/logs
 FALLBACK_LOG_DIR=/tmp/shiftedblog_logs
 
-# Bind-mounted dirs the appuser must write (collectstatic, uploads, logs, backups).
+# Bind-mounted dirs the appuser must write (collectstatic, uploads, static export, logs, backups).
 WRITABLE_MOUNTS=(
   "${LOG_MOUNT}"
   /app/static
   /app/media
+  /app/static_site
   /backups
   "${FALLBACK_LOG_DIR}"
 )
@@ -35,7 +36,7 @@ for logfile in security.log authentication.log; do
   chmod 664 "${path}" 2>/dev/null || true
 done
 
-if [[ -d /editor-ui/dist-export ]]; then
+if [[ $# -eq 0 && -d /editor-ui/dist-export ]]; then
   echo "Syncing editor-ui dist to nginx volume..."
   mkdir -p /editor-ui/dist-export
   cp -a /editor-ui/dist/. /editor-ui/dist-export/
@@ -49,11 +50,26 @@ if ! runuser -u "${APP_USER}" -- test -w "${LOG_MOUNT}"; then
   log_dir_env="export SHIFTED_BLOG_LOG_DIR=${FALLBACK_LOG_DIR};"
 fi
 
+if [[ $# -gt 0 ]]; then
+  # Worker services (docker-compose.prod.yml): run one management command in the
+  # foreground so compose sees it exit and restarts it.
+  exec runuser -u "${APP_USER}" -- bash -c "
+set -euo pipefail
+${log_dir_env}
+exec python manage.py \"\$@\"
+" bash "$@"
+fi
+
 runuser -u "${APP_USER}" -- bash -c "
 set -euo pipefail
 ${log_dir_env}
 python manage.py collectstatic --noinput
 python manage.py migrate --noinput
+python manage.py rebuild_post_text_derivatives --missing
+python manage.py rebuild_post_rendered_bodies --missing
+python manage.py build_image_placeholders
+python manage.py export_static_site --full || echo "WARNING: static export failed; Django serves public pages" >&2
+python manage.py precompress_assets
 exec python -m gunicorn --bind 0.0.0.0:8000 --workers \${GUNICORN_WORKERS:-2} shiftedblog.wsgi:application \
   --timeout \${GUNICORN_TIMEOUT:-120} --graceful-timeout 30 \
   --max-requests \${GUNICORN_MAX_REQUESTS:-500} --max-requests-jitter 50 \
@@ -40,6 +40,15 @@ def _parse_bool(value: str | None, default: bool = True) -> bool:
     return value.strip().lower() in ("1", "true", "yes", "on")
 
 
+def _parse_int(value: str | None, default: int) -> int:
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value.strip())
+    except ValueError:
+        raise SystemExit(f"Expected an integer, got {value!r}.") from None
+
+
 def _canonical_origin(site_url: str, domain: str) -> str:
     url = (site_url or "").strip().rstrip("/")
     if url:
@@ -108,13 +117,114 @@ def _proxy_django_block() -> str:
 """
 
 
-def _editor_extra_locations(admin_url: str) -> str:
+def _load_modules(brotli: bool) -> str:
+    if not brotli:
+        return ""
+    # ngx_brotli dynamic modules (not part of the stock nginx image).
+    return (
+        "load_module modules/ngx_http_brotli_filter_module.so;\n"
+        "load_module modules/ngx_http_brotli_static_module.so;\n"
+    )
+
+
+def _precompressed_directives(brotli: bool) -> str:
+    # Serve the .gz/.br siblings written by ``manage.py precompress_assets``.
+    lines = ["            gzip_static on;"]
+    if brotli:
+        lines.append("            brotli_static on;")
+    return "\n".join(lines)
+
+
+def _http_caching_block(microcache_seconds: int, brotli: bool) -> str:
+    """Compression for proxied responses and, optionally, the microcache zone."""
+    text = """
+    # Compress Django responses on the fly; static files use precompressed copies.
+    gzip on;
+    gzip_vary on;
+    gzip_proxied any;
+    gzip_min_length 1024;
+    gzip_types text/plain text/css text/xml application/xml application/atom+xml
+               application/json application/javascript image/svg+xml;
+"""
+    if brotli:
+        text += """    brotli on;
+    brotli_types text/plain text/css text/xml application/xml application/atom+xml
+                 application/json application/javascript image/svg+xml;
+"""
+    if microcache_seconds <= 0:
+        return text
+    return (
+        text
+        + f"""
+    # Microcache for anonymous public pages in front of Django. Logged-in
+    # editors (session cookie) and API clients (Authorization) always bypass.
+    proxy_cache_path /var/cache/nginx/microcache levels=1:2 keys_zone=microcache:20m
+                     max_size=512m inactive=10m use_temp_path=off;
+    map "$request_method$cookie_sessionid$http_authorization" $microcache_bypass {{
+        default 1;
+        GET     0;
+        HEAD    0;
+    }}
+    # Post detail (/<slug>/) is never microcached: a cache hit would skip the view
+    # count. Fixed single-segment pages are still cached.
+    map $uri $microcache_skip {{
+        default     0;
+        ~^/[^/]+/$  1;
+        /feed/      0;
+        /sitemap/   0;
+        /search/    0;
+        /lenta/     0;
+    }}
+
+    # Purge hook: the static-export service (blog.microcache) re-fetches changed
+    # pages here, which replaces their cached copies. Only reachable on the
+    # compose network.
+    server {{
+        listen 8081;
+        server_name _;
+
+        location / {{
+            proxy_cache microcache;
+            proxy_cache_key "$host$request_uri";
+            proxy_cache_valid 200 301 {microcache_seconds}s;
+            proxy_cache_bypass 1;
+            proxy_pass http://web:8000;
+            proxy_set_header Host $host;
+            proxy_set_header X-Real-IP $remote_addr;
+            proxy_set_header X-Forwarded-Proto https;
+            proxy_redirect off;
+        }}
+    }}
+"""
+    )
+
+
+def _microcache_directives(microcache_seconds: int) -> str:
+    if microcache_seconds <= 0:
+        return ""
+    # Django's Cache-Control/Expires win when present; the TTL below covers the rest.
+    return f"""
+            proxy_cache microcache;
+            proxy_cache_key "$host$request_uri";
+            proxy_cache_valid 200 301 {microcache_seconds}s;
+            proxy_cache_bypass $microcache_bypass $microcache_skip;
+            proxy_no_cache $microcache_bypass $microcache_skip;
+            proxy_cache_lock on;
+            proxy_cache_lock_timeout 5s;
+            proxy_cache_use_stale updating error timeout
+                                  http_500 http_502 http_503 http_504;
+            proxy_cache_background_update on;
+"""
+
+
+def _editor_extra_locations(admin_url: str, *, precompressed: str = "") -> str:
     admin_path = admin_url.strip().strip("/") or "mellon"
     proxy = _proxy_django_block()
     return f"""
         location /static/ {{
             alias /static/;
             expires 7d;
+{precompressed}
             add_header Cache-Control "public, immutable";
         }}
 
@@ -143,6 +253,9 @@ def _main_https_server_block(
     https_names: list[str],
     ssl_certificate: str,
     ssl_certificate_key: str,
+    *,
+    microcache: str = "",
+    precompressed: str = "",
 ) -> str:
     if not https_names:
         return ""
@@ -152,6 +265,8 @@ def _main_https_server_block(
         "__HTTPS_SERVER_NAMES__": _join_names(https_names),
         "__SSL_CERTIFICATE__": ssl_certificate,
         "__SSL_CERTIFICATE_KEY__": ssl_certificate_key,
+        "__MICROCACHE_DIRECTIVES__": microcache,
+        "__PRECOMPRESSED_DIRECTIVES__": precompressed,
     }
     for key, value in replacements.items():
         text = text.replace(key, value)
@@ -177,6 +292,9 @@ def render(env: dict[str, str], template: str, *, template_root: Path | None = N
     redirect_from_editor = _split_hosts(env.get("REDIRECT_FROM_EDITOR_DOMAINS", ""))
     server_ip = env.get("SERVER_IP", "").strip()
     admin_url = env.get("ADMIN_URL", "mellon").strip() or "mellon"
+    microcache_seconds = _parse_int(env.get("NGINX_MICROCACHE_SECONDS"), 5)
+    brotli = _parse_bool(env.get("NGINX_BROTLI"), default=False)
+    precompressed = _precompressed_directives(brotli)
 
     canonical_origin = _canonical_origin(site_url, domain)
     canonical_host = urlparse(canonical_origin).hostname or domain
@@ -256,8 +374,14 @@ def render(env: dict[str, str], template: str, *, template_root: Path | None = N
         https_names,
         ssl_certificate,
         ssl_certificate_key,
+        microcache=_microcache_directives(microcache_seconds),
+        precompressed=precompressed,
+    )
+    editor_extra = (
+        ""
+        if public_site_enabled
+        else _editor_extra_locations(admin_url, precompressed=precompressed)
     )
-    editor_extra = "" if public_site_enabled else _editor_extra_locations(admin_url)
 
     replacements = {
         "__HTTP_SERVER_NAMES__": _join_names(http_names),
@@ -268,6 +392,9 @@ def render(env: dict[str, str], template: str, *, template_root: Path | None = N
         "__CSP_CONNECT_ORIGINS__": csp_origins,
         "__EDITOR_EXTRA_LOCATIONS__": editor_extra,
         "__REDIRECT_HTTPS_BLOCKS__": blocks,
+        "__NGINX_LOAD_MODULES__": _load_modules(brotli),
+        "__NGINX_HTTP_CACHING__": _http_caching_block(microcache_seconds, brotli),
+        "__PRECOMPRESSED_DIRECTIVES__": precompressed,
     }
     text = template
     for key, value in replacements.items():
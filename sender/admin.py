@@ -1,7 +1,12 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
 from core.models import User
-from sender.models import PostLink
+from sender.models import PostLink, PublishJob, TelegramDispatch
+from sender.services.publish_jobs import (
+    PublishJobActiveError,
+    cancel_publish_job,
+    retry_publish_job,
+)
 
 
 @admin.register(PostLink)
@@ -37,3 +42,122 @@ class PostLinkAdmin(admin.ModelAdmin):
     def has_delete_permission(self, request, obj=None):
         user = request.user
         return isinstance(user, User) and user.is_superuser
+
+
+@admin.register(PublishJob)
+class PublishJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "post",
+        "status",
+        "network_slugs",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "created_at")
+    search_fields = ("post__title", "post__slug")
+    readonly_fields = (
+        "post",
+        "network_slugs",
+        "telegram_format",
+        "crosslink_network",
+        "telegram_post_story",
+        "status",
+        "result",
+        "error",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    ordering = ("-created_at",)
+    actions = ("cancel_jobs", "retry_jobs")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        user = request.user
+        return isinstance(user, User) and user.is_staff
+
+    def has_delete_permission(self, request, obj=None):
+        user = request.user
+        return isinstance(user, User) and user.is_superuser
+
+    @admin.action(description="Cancel selected queued or running jobs")
+    def cancel_jobs(self, request, queryset):
+        reason = f"Cancelled by {request.user}."
+        cancelled = sum(
+            cancel_publish_job(job_id, reason=reason)
+            for job_id in queryset.values_list("pk", flat=True)
+        )
+        if cancelled:
+            self.message_user(
+                request,
+                f"Cancelled {cancelled} publish job(s).",
+                messages.SUCCESS,
+            )
+        else:
+            self.message_user(
+                request,
+                "Nothing to cancel: running jobs can be cancelled only once "
+                "their run has timed out.",
+                messages.INFO,
+            )
+
+    @admin.action(description="Retry selected failed jobs")
+    def retry_jobs(self, request, queryset):
+        for job_id in queryset.values_list("pk", flat=True):
+            try:
+                job = retry_publish_job(job_id)
+            except PublishJobActiveError as exc:
+                self.message_user(request, f"Cannot retry: {exc}", messages.ERROR)
+                continue
+            if job is None:
+                self.message_user(
+                    request,
+                    f"Publish job #{job_id} has not failed or was interrupted "
+                    "mid-run; publish the post again instead.",
+                    messages.INFO,
+                )
+            else:
+                self.message_user(
+                    request,
+                    f"Publish job #{job.pk} is {job.status}.",
+                    messages.SUCCESS,
+                )
+
+
+@admin.register(TelegramDispatch)
+class TelegramDispatchAdmin(admin.ModelAdmin):
+    list_display = (
+        "delivery_key",
+        "dispatch",
+        "method",
+        "post",
+        "message_id",
+        "sent_at",
+    )
+    list_filter = ("method", "sent_at")
+    search_fields = ("delivery_key", "post__title", "post__slug")
+    readonly_fields = (
+        "delivery_key",
+        "dispatch",
+        "method",
+        "digest",
+        "post",
+        "message_id",
+        "message_url",
+        "sent_at",
+    )
+    ordering = ("-sent_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        user = request.user
+        return isinstance(user, User) and user.is_staff
+
+    def has_delete_permission(self, request, obj=None):
+        user = request.user
+        return isinstance(user, User) and user.is_superuser
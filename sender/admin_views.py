@@ -13,7 +13,11 @@ from django.views.decorators.http import require_http_methods
 from core.models.network import NETWORK_SLUG_SITE, NETWORK_SLUG_TELEGRAM
 from editor import models as editor_models
 from sender.services.dto import StoryAvailabilityDTO
-from sender.services.post_sender import run_publish_job
+from sender.services.publish_jobs import (
+    PublishJobActiveError,
+    publish_job_result,
+    submit_publish_job,
+)
 from sender.services.telegram_channel import (
     channel_owner_has_premium,
     telegram_chat_id_from_secrets,
@@ -208,13 +212,28 @@ def publish_workflow(request: HttpRequest) -> HttpResponse:
         if request.POST.get("dest_telegram"):
             slugs.append(NETWORK_SLUG_TELEGRAM)
 
-        result = run_publish_job(
-            post_id,
-            slugs,
-            telegram_format=form_telegram_format,
-            telegram_crosslink_network=form_crosslink_network,
-            telegram_post_story=form_telegram_post_story,
-        )
+        try:
+            job = submit_publish_job(
+                post_id,
+                slugs,
+                telegram_format=form_telegram_format,
+                telegram_crosslink_network=form_crosslink_network,
+                telegram_post_story=form_telegram_post_story,
+            )
+        except PublishJobActiveError as exc:
+            messages.error(request, f"Cannot publish: {exc}")
+            return HttpResponseRedirect(reverse("sender_publish_workflow"))
+        result = publish_job_result(job)
+        if result is None:
+            if job.is_active:
+                messages.info(
+                    request,
+                    f"Publish job #{job.pk} queued; results appear under "
+                    "Sender → Publish jobs.",
+                )
+            else:
+                messages.error(request, f"Publish job #{job.pk} failed: {job.error}")
+            return HttpResponseRedirect(reverse("sender_publish_workflow"))
         for key, r in result.by_network.items():
             if key == "_":
                 messages.error(
@@ -239,6 +258,12 @@ def publish_workflow(request: HttpRequest) -> HttpResponse:
             )
         elif result.all_ok and not result.by_network.get("_"):
             messages.success(request, "Selected channels completed.")
+        elif not result.by_network.get("_"):
+            messages.info(
+                request,
+                f"Retry publish job #{job.pk} under Sender → Publish jobs to "
+                "resume without posting the sent messages again.",
+            )
 
         return HttpResponseRedirect(reverse("sender_publish_workflow"))
 
@@ -0,0 +1,25 @@
+"""Worker that runs publish jobs queued with PUBLISH_JOBS_ASYNC."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from sender.services.publish_jobs import run_publish_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued multi-channel publish jobs one at a time. Runs until stopped "
+        "unless --once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        processed = run_publish_worker(once=options["once"])
+        self.stdout.write(self.style.SUCCESS(f"Ran {processed} publish job(s)."))
@@ -0,0 +1,59 @@
+"""Report Telegram Bot API call latencies per method and the send queue."""
+
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from sender.services.telegram_http import (
+    LATENCY_BUCKETS,
+    bot_api_stats,
+    bucket_label,
+)
+from sender.services.telegram_publisher import _telegram_runtime
+from sender.services.telegram_rate_limit import send_queue_depth
+
+
+def _upper_bound(histogram: dict[str, int], quantile: float) -> str:
+    """Smallest bucket bound below which *quantile* of the calls finished."""
+    total = sum(histogram[bucket_label(b)] for b in LATENCY_BUCKETS)
+    running = 0
+    for bound in LATENCY_BUCKETS:
+        running += histogram[bucket_label(bound)]
+        if running >= quantile * total:
+            return f"<={bucket_label(bound)}s"
+    return "-"
+
+
+class Command(BaseCommand):
+    help = (
+        "Print call counts, mean latency and p50/p95 bucket of each Telegram "
+        "Bot API method, summed over all workers for the last 7 days, and the "
+        "number of sends waiting for the channel's rate limit."
+    )
+
+    def handle(self, *args, **options):
+        _secrets, _token, chat_id = _telegram_runtime()
+        if chat_id:
+            self.stdout.write(
+                f"Sends waiting for {chat_id}: {send_queue_depth(chat_id)}"
+            )
+        stats = bot_api_stats()
+        if not stats:
+            self.stdout.write("No Telegram API calls recorded.")
+            return
+        for method, histogram in sorted(stats.items()):
+            calls = sum(histogram[bucket_label(b)] for b in LATENCY_BUCKETS)
+            if not calls:
+                continue
+            mean_ms = histogram["sum_ms"] / calls
+            buckets = " ".join(
+                f"{bucket_label(b)}:{histogram[bucket_label(b)]}"
+                for b in LATENCY_BUCKETS
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{method}: {calls} calls, mean {mean_ms:.0f} ms, "
+                    f"p50 {_upper_bound(histogram, 0.5)}, "
+                    f"p95 {_upper_bound(histogram, 0.95)} [{buckets}]"
+                )
+            )
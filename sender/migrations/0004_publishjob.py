@@ -0,0 +1,77 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0022_imagejob"),
+        ("sender", "0003_postlink_message_and_story_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PublishJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("network_slugs", models.JSONField(default=list)),
+                ("telegram_format", models.CharField(max_length=32)),
+                (
+                    "crosslink_network",
+                    models.CharField(blank=True, default="", max_length=32),
+                ),
+                ("telegram_post_story", models.BooleanField(default=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "Queued"),
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="queued",
+                        max_length=16,
+                    ),
+                ),
+                ("result", models.JSONField(blank=True, null=True)),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="publish_jobs",
+                        to="editor.post",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sender_publishjob",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"],
+                        name="sender_publishjob_queue_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("status__in", ("queued", "running"))),
+                        fields=("post",),
+                        name="sender_publishjob_one_active_per_post",
+                    )
+                ],
+            },
+        ),
+    ]
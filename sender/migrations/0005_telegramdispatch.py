@@ -0,0 +1,57 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("editor", "0022_imagejob"),
+        ("sender", "0004_publishjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TelegramDispatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("delivery_key", models.CharField(max_length=64)),
+                ("dispatch", models.CharField(max_length=64)),
+                ("method", models.CharField(max_length=32)),
+                ("digest", models.CharField(max_length=64)),
+                ("message_id", models.BigIntegerField(blank=True, null=True)),
+                (
+                    "message_url",
+                    models.URLField(blank=True, default="", max_length=2048),
+                ),
+                ("sent_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="telegram_dispatches",
+                        to="editor.post",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "sender_telegramdispatch",
+                "ordering": ["sent_at", "pk"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("delivery_key", "dispatch"),
+                        name="sender_telegramdispatch_key_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sender", "0005_telegramdispatch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TelegramFile",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bot_id", models.CharField(max_length=32)),
+                ("storage_name", models.CharField(max_length=255)),
+                ("content_hash", models.CharField(max_length=64)),
+                ("file_id", models.CharField(max_length=255)),
+                (
+                    "file_unique_id",
+                    models.CharField(blank=True, default="", max_length=64),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "sender_telegramfile",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("bot_id", "storage_name", "content_hash"),
+                        name="sender_telegramfile_source_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
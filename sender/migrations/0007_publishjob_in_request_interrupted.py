@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("sender", "0006_telegramfile"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="publishjob",
+            name="in_request",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name="publishjob",
+            name="interrupted",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,3 +1,6 @@
 from sender.models.post_link import PostLink
+from sender.models.publish_job import PublishJob
+from sender.models.telegram_dispatch import TelegramDispatch
+from sender.models.telegram_file import TelegramFile
 
-__all__ = ["PostLink"]
+__all__ = ["PostLink", "PublishJob", "TelegramDispatch", "TelegramFile"]
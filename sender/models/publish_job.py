@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.db import models
+from django.db.models import BaseConstraint, Q
+
+
+class PublishJob(models.Model):
+    """One multi-channel publish request, run by ``manage.py process_publish_jobs``.
+
+    At most one queued or running job per post, so a double click or a second
+    editor cannot publish the same post twice in parallel.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    post = models.ForeignKey(
+        "editor.Post",
+        on_delete=models.CASCADE,
+        related_name="publish_jobs",
+    )
+    network_slugs = models.JSONField(default=list)
+    telegram_format = models.CharField(max_length=32)
+    crosslink_network = models.CharField(max_length=32, blank=True, default="")
+    telegram_post_story = models.BooleanField(default=False)
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.QUEUED,
+    )
+    # ``publish_job_result_to_dict`` of the finished run.
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default="")
+    # Run inside a web request (sync mode): gone once the gunicorn timeout passed.
+    in_request = models.BooleanField(default=False)
+    # Failed while a run may still have been sending: retrying under the same
+    # delivery key could post the same messages twice.
+    interrupted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        app_label = "sender"
+        db_table = "sender_publishjob"
+        constraints: ClassVar[list[BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=("post",),
+                condition=Q(status__in=("queued", "running")),
+                name="sender_publishjob_one_active_per_post",
+            ),
+        ]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(
+                fields=("status", "created_at"),
+                name="sender_publishjob_queue_idx",
+            ),
+        ]
+        ordering: ClassVar[list[str]] = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"Publish job #{self.pk} ({self.status}) for post {self.post_id}"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in (self.Status.QUEUED, self.Status.RUNNING)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.db import models
+
+
+class TelegramDispatch(models.Model):
+    """One Bot API send made under a delivery (idempotency) key.
+
+    A retry of the same delivery skips every dispatch recorded here and reuses
+    its ``message_id``, so a failure half-way through a series never re-posts
+    (or re-uploads) what already reached the channel.
+    """
+
+    delivery_key = models.CharField(max_length=64)
+    # Position in the plan, e.g. ``step0/photo`` or ``step1/rich/fallback2``.
+    dispatch = models.CharField(max_length=64)
+    method = models.CharField(max_length=32)
+    # sha256 of what was sent: a changed plan never matches an old checkpoint.
+    digest = models.CharField(max_length=64)
+    post = models.ForeignKey(
+        "editor.Post",
+        on_delete=models.CASCADE,
+        related_name="telegram_dispatches",
+        null=True,
+        blank=True,
+    )
+    message_id = models.BigIntegerField(null=True, blank=True)
+    message_url = models.URLField(max_length=2048, blank=True, default="")
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = "sender"
+        db_table = "sender_telegramdispatch"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=("delivery_key", "dispatch"),
+                name="sender_telegramdispatch_key_uniq",
+            ),
+        ]
+        ordering: ClassVar[list[str]] = ["sent_at", "pk"]
+
+    def __str__(self) -> str:
+        return f"{self.delivery_key} {self.dispatch} (message {self.message_id})"
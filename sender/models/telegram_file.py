@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import ClassVar
+
+from django.db import models
+
+
+class TelegramFile(models.Model):
+    """Bot API ``file_id`` of an image this bot already uploaded.
+
+    Keyed by bot, storage path and the SHA-256 of the stored bytes: a replaced
+    file misses the cache, and ``file_id`` values are only valid for the bot
+    that received them.
+    """
+
+    bot_id = models.CharField(max_length=32)
+    storage_name = models.CharField(max_length=255)
+    content_hash = models.CharField(max_length=64)
+    file_id = models.CharField(max_length=255)
+    file_unique_id = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = "sender"
+        db_table = "sender_telegramfile"
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.UniqueConstraint(
+                fields=("bot_id", "storage_name", "content_hash"),
+                name="sender_telegramfile_source_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.storage_name} (bot {self.bot_id})"
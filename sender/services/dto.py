@@ -14,6 +14,8 @@ class PublishResult:
     story_url: str = ""
     error: str = ""
     detail: str = ""
+    # Seconds Telegram asked to wait (flood control), if that was the error.
+    retry_after: int | None = None
 
     @property
     def url(self) -> str:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import logging
 import time
+import uuid
 from collections.abc import Callable, Iterable
 
 from django.db import transaction
@@ -18,6 +19,7 @@ from sender.services.telegram_format import (
     TELEGRAM_FORMAT_CROSSLINK,
     TELEGRAM_FORMAT_FULL,
 )
+from sender.services.telegram_rate_limit import max_retry_after
 from sender.services.telegram_stories import (
     check_story_availability,
     publish_story_for_post,
@@ -42,6 +44,11 @@ def _retry_call(
             return last
         if attempt < RETRIES - 1:
             delay = BACKOFF_SEC[min(attempt, len(BACKOFF_SEC) - 1)]
+            if last.retry_after:
+                # Flood control: wait as told, or give up if that is too long.
+                if last.retry_after > max_retry_after():
+                    return last
+                delay = max(delay, float(last.retry_after))
             time.sleep(delay)
     assert last is not None
     return last
@@ -124,13 +131,17 @@ def run_publish_job(
     telegram_format: str = TELEGRAM_FORMAT_FULL,
     telegram_crosslink_network: str | None = None,
     telegram_post_story: bool = False,
+    delivery_key: str = "",
 ) -> PublishJobResult:
     """Publish ``post_id`` to each network in ``network_slugs``.
 
     On full success across all selected networks, sets post status to ``published``.
     ``telegram_format`` selects full post vs crosslink for Telegram.
+    ``delivery_key`` checkpoints Telegram sends: retries (and later runs with
+    the same key) resume after the last message that reached the channel.
     """
     slugs = list(network_slugs)
+    delivery_key = delivery_key or f"run-{uuid.uuid4().hex}"
     by_network: dict[str, PublishResult] = {}
 
     if not slugs:
@@ -184,94 +195,98 @@ def run_publish_job(
         crosslink_network=telegram_crosslink_network,
     )
 
-    with transaction.atomic():
-        post = Post.objects.select_for_update().get(pk=post_id)
-        if post.status != "ready_to_publish":
-            return _invalid_job(
-                post_id,
-                error="invalid_status",
-                detail=f"Post must be ready_to_publish (got {post.status!r}).",
-            )
+    post = Post.objects.get(pk=post_id)
+    if post.status != "ready_to_publish":
+        return _invalid_job(
+            post_id,
+            error="invalid_status",
+            detail=f"Post must be ready_to_publish (got {post.status!r}).",
+        )
 
-        story_validation = _validate_telegram_story(
-            post,
-            telegram_post_story=telegram_post_story and NETWORK_SLUG_TELEGRAM in slugs,
+    story_validation = _validate_telegram_story(
+        post,
+        telegram_post_story=telegram_post_story and NETWORK_SLUG_TELEGRAM in slugs,
+    )
+    if story_validation is not None:
+        return _invalid_job(
+            post_id,
+            error=story_validation.error,
+            detail=story_validation.detail,
         )
-        if story_validation is not None:
+
+    crosslink_url: str | None = None
+    if (
+        NETWORK_SLUG_TELEGRAM in slugs
+        and telegram_format == TELEGRAM_FORMAT_CROSSLINK
+        and telegram_crosslink_network
+    ):
+        crosslink_url = crosslink_url_for_post(post, telegram_crosslink_network)
+        if not crosslink_url:
             return _invalid_job(
                 post_id,
-                error=story_validation.error,
-                detail=story_validation.detail,
+                error="missing_crosslink_url",
+                detail=(
+                    f"Could not resolve a public URL for crosslink target "
+                    f"{telegram_crosslink_network!r}."
+                ),
             )
 
-        crosslink_url: str | None = None
-        if (
-            NETWORK_SLUG_TELEGRAM in slugs
-            and telegram_format == TELEGRAM_FORMAT_CROSSLINK
-            and telegram_crosslink_network
-        ):
-            crosslink_url = crosslink_url_for_post(post, telegram_crosslink_network)
-            if not crosslink_url:
-                return _invalid_job(
-                    post_id,
-                    error="missing_crosslink_url",
-                    detail=(
-                        f"Could not resolve a public URL for crosslink target "
-                        f"{telegram_crosslink_network!r}."
-                    ),
-                )
-
-        for slug in slugs:
-            if slug == NETWORK_SLUG_SITE:
-                res = _retry_call(site_publisher.publish_to_site, post)
-            elif slug == NETWORK_SLUG_TELEGRAM:
-                res = _retry_call(
-                    telegram_publisher.publish_to_telegram,
+    for slug in slugs:
+        if slug == NETWORK_SLUG_SITE:
+            res = _retry_call(site_publisher.publish_to_site, post)
+        elif slug == NETWORK_SLUG_TELEGRAM:
+            res = _retry_call(
+                telegram_publisher.publish_to_telegram,
+                post,
+                format_mode=telegram_format,
+                crosslink_url=crosslink_url,
+                delivery_key=delivery_key,
+            )
+            if res.ok and telegram_post_story:
+                story_res = _retry_call(
+                    publish_story_for_post,
                     post,
-                    format_mode=telegram_format,
-                    crosslink_url=crosslink_url,
+                    message_url=res.message_url,
+                    message_id=res.message_id,
                 )
-                if res.ok and telegram_post_story:
-                    story_res = _retry_call(
-                        publish_story_for_post,
-                        post,
+                if not story_res.ok:
+                    res = story_res
+                else:
+                    res = PublishResult(
+                        ok=True,
                         message_url=res.message_url,
                         message_id=res.message_id,
+                        story_id=story_res.story_id,
+                        story_url=story_res.story_url,
                     )
-                    if not story_res.ok:
-                        res = story_res
-                    else:
-                        res = PublishResult(
-                            ok=True,
-                            message_url=res.message_url,
-                            message_id=res.message_id,
-                            story_id=story_res.story_id,
-                            story_url=story_res.story_url,
-                        )
-            else:
-                res = PublishResult(
-                    ok=False,
-                    error="unknown_network",
-                    detail=slug,
-                )
-            by_network[slug] = res
-            if res.ok:
-                network = Network.objects.get(slug=slug)
-                upsert_post_link(post, network, res)
-            else:
-                logger.warning(
-                    "Publish failed network=%s post_id=%s error=%s",
-                    slug,
-                    post_id,
-                    res.detail or res.error,
-                )
+        else:
+            res = PublishResult(
+                ok=False,
+                error="unknown_network",
+                detail=slug,
+            )
+        by_network[slug] = res
+        if res.ok:
+            network = Network.objects.get(slug=slug)
+            upsert_post_link(post, network, res)
+        else:
+            logger.warning(
+                "Publish failed network=%s post_id=%s error=%s",
+                slug,
+                post_id,
+                res.detail or res.error,
+            )
 
-        all_ok = all(by_network[s].ok for s in slugs)
-        status_updated = False
-        if all_ok:
-            post.status = "published"
-            post.save(_allow_publish_via_sender=True)
-            status_updated = True
+    all_ok = all(by_network[s].ok for s in slugs)
+    status_updated = False
+    if all_ok:
+        # Lock only for the transition: uploads above may take minutes.
+        with transaction.atomic():
+            post = Post.objects.select_for_update().get(pk=post_id)
+            if post.status == "ready_to_publish":
+                post.status = "published"
+                post.save(_allow_publish_via_sender=True)
+                status_updated = True
 
     return PublishJobResult(
         all_ok=all_ok,
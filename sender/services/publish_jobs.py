@@ -0,0 +1,313 @@
+"""Persisted publish requests, run outside the HTTP request (``PUBLISH_JOBS_ASYNC``).
+
+The API and admin queue a ``PublishJob`` and answer at once; the worker
+(``manage.py process_publish_jobs``) runs ``run_publish_job`` one job at a
+time, and clients poll the job for its status and per-network results. A
+failed job is retried in place (``retry_publish_job``) so its Telegram sends
+resume instead of being posted twice.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from sender.models import PublishJob
+from sender.services.dto import PublishJobResult, PublishResult
+from sender.services.post_sender import run_publish_job
+from sender.services.telegram_http import flush_bot_api_stats
+from sender.services.telegram_rate_limit import (
+    publish_request_sends,
+    publish_worker_sends,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PublishJobActiveError(Exception):
+    """The post already has a queued or running publish job."""
+
+    def __init__(self, job: PublishJob) -> None:
+        super().__init__(f"Publish job #{job.pk} is already {job.status}.")
+        self.job = job
+
+
+def publish_jobs_async() -> bool:
+    return bool(getattr(settings, "PUBLISH_JOBS_ASYNC", False))
+
+
+def _poll_seconds() -> float:
+    return float(getattr(settings, "PUBLISH_JOB_POLL_SECONDS", 2))
+
+
+def _job_timeout() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, "PUBLISH_JOB_TIMEOUT", 1800)))
+
+
+def _request_timeout() -> timedelta:
+    return timedelta(seconds=int(getattr(settings, "PUBLISH_JOB_REQUEST_TIMEOUT", 120)))
+
+
+def _dead_running_jobs(now: datetime) -> Q:
+    """Running jobs whose run is over: its request timed out, or it is stale."""
+    return Q(status=PublishJob.Status.RUNNING) & (
+        Q(started_at__lt=now - _job_timeout())
+        | Q(in_request=True, started_at__lt=now - _request_timeout())
+    )
+
+
+def publish_job_delivery_key(job: PublishJob) -> str:
+    """Idempotency key of the job's Telegram sends (see ``TelegramDispatch``).
+
+    Kept across ``retry_publish_job``, so a retried job skips what was sent.
+    """
+    return f"publish-job-{job.pk}"
+
+
+def publish_job_result_to_dict(result: PublishJobResult) -> dict[str, Any]:
+    by_network: dict[str, Any] = {}
+    for key, item in result.by_network.items():
+        by_network[key] = {
+            "ok": item.ok,
+            "message_url": item.message_url,
+            "message_id": item.message_id,
+            "story_id": item.story_id,
+            "story_url": item.story_url,
+            "error": item.error,
+            "detail": item.detail,
+        }
+    return {
+        "all_ok": result.all_ok,
+        "post_id": result.post_id,
+        "status_updated": result.status_updated,
+        "by_network": by_network,
+    }
+
+
+def publish_job_result(job: PublishJob) -> PublishJobResult | None:
+    """The stored result of a finished *job* as DTOs (``None`` while active)."""
+    data = job.result
+    if not data:
+        return None
+    return PublishJobResult(
+        all_ok=bool(data.get("all_ok")),
+        post_id=int(data.get("post_id") or job.post_id),
+        by_network={
+            key: PublishResult(**item)
+            for key, item in (data.get("by_network") or {}).items()
+        },
+        status_updated=bool(data.get("status_updated")),
+    )
+
+
+def publish_job_to_dict(job: PublishJob) -> dict[str, Any]:
+    return {
+        "id": job.pk,
+        "post_id": job.post_id,
+        "status": job.status,
+        "networks": list(job.network_slugs or []),
+        "result": job.result,
+        "error": job.error,
+        "interrupted": job.interrupted,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+    }
+
+
+def submit_publish_job(
+    post_id: int,
+    network_slugs: list[str],
+    *,
+    telegram_format: str,
+    telegram_crosslink_network: str | None = None,
+    telegram_post_story: bool = False,
+) -> PublishJob:
+    """Queue a publish of *post_id*; run it right away unless ``PUBLISH_JOBS_ASYNC``.
+
+    Raises ``PublishJobActiveError`` while another job for the post is active.
+    """
+    try:
+        with transaction.atomic():
+            job = PublishJob.objects.create(
+                post_id=post_id,
+                network_slugs=list(network_slugs),
+                telegram_format=telegram_format,
+                crosslink_network=telegram_crosslink_network or "",
+                telegram_post_story=telegram_post_story,
+            )
+    except IntegrityError:
+        _raise_active(post_id)
+        raise
+    return _run_unless_async(job)
+
+
+def retry_publish_job(job_id: int) -> PublishJob | None:
+    """Queue a failed job again under its delivery key; ``None`` if not retryable.
+
+    The retry resumes after the last Telegram message that reached the
+    channel, where a new publish would post everything again. Jobs failed
+    mid-run (``interrupted``) are refused: the lost run might still be
+    sending under the same key. Raises ``PublishJobActiveError`` while
+    another job for the post is active.
+    """
+    job = PublishJob.objects.get(pk=job_id)
+    try:
+        with transaction.atomic():
+            requeued = PublishJob.objects.filter(
+                pk=job_id, status=PublishJob.Status.FAILED, interrupted=False
+            ).update(
+                status=PublishJob.Status.QUEUED,
+                result=None,
+                error="",
+                in_request=False,
+                started_at=None,
+                finished_at=None,
+            )
+    except IntegrityError:
+        _raise_active(job.post_id)
+        raise
+    if not requeued:
+        return None
+    job.refresh_from_db()
+    return _run_unless_async(job)
+
+
+def _raise_active(post_id: int) -> None:
+    active = (
+        PublishJob.objects.filter(
+            post_id=post_id,
+            status__in=(PublishJob.Status.QUEUED, PublishJob.Status.RUNNING),
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if active is not None:
+        raise PublishJobActiveError(active) from None
+
+
+def _run_unless_async(job: PublishJob) -> PublishJob:
+    if (
+        not publish_jobs_async()
+        and claim_publish_job(job_id=job.pk, in_request=True) is not None
+    ):
+        # Sends past the request's pacing budget fail as rate_limited.
+        with publish_request_sends():
+            execute_publish_job(job.pk)
+        job.refresh_from_db()
+    return job
+
+
+def claim_publish_job(
+    *, job_id: int | None = None, in_request: bool = False
+) -> PublishJob | None:
+    """Mark the oldest queued job (or *job_id*) as running and return it."""
+    now = timezone.now()
+    with transaction.atomic():
+        # Never re-run a job the worker lost mid-way: it may have posted already.
+        PublishJob.objects.filter(_dead_running_jobs(now)).update(
+            status=PublishJob.Status.FAILED,
+            error="Worker did not finish the job.",
+            interrupted=True,
+            finished_at=now,
+        )
+        queued = PublishJob.objects.select_for_update(skip_locked=True).filter(
+            status=PublishJob.Status.QUEUED
+        )
+        if job_id is not None:
+            queued = queued.filter(pk=job_id)
+        job = queued.order_by("created_at").first()
+        if job is None:
+            return None
+        job.status = PublishJob.Status.RUNNING
+        job.started_at = now
+        job.in_request = in_request
+        job.save(update_fields=["status", "started_at", "in_request"])
+    return job
+
+
+def cancel_publish_job(job_id: int, *, reason: str) -> bool:
+    """Fail a queued job, or a running one whose run is over; ``False`` otherwise.
+
+    A sync request killed by the gunicorn timeout leaves its job ``running``;
+    it can be cancelled once ``PUBLISH_JOB_REQUEST_TIMEOUT`` has passed (worker
+    runs after ``PUBLISH_JOB_TIMEOUT``). A live run is never cancelled: it
+    would keep sending while a retry or new publish sends the same messages.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        queued = PublishJob.objects.filter(
+            pk=job_id, status=PublishJob.Status.QUEUED
+        ).update(
+            status=PublishJob.Status.FAILED,
+            error=reason[:1000],
+            finished_at=now,
+        )
+        if queued:
+            return True
+        return bool(
+            PublishJob.objects.filter(_dead_running_jobs(now), pk=job_id).update(
+                status=PublishJob.Status.FAILED,
+                error=reason[:1000],
+                interrupted=True,
+                finished_at=now,
+            )
+        )
+
+
+def execute_publish_job(job_id: int) -> PublishJob:
+    """Run a claimed job and store its outcome; errors land on the row."""
+    job = PublishJob.objects.get(pk=job_id)
+    try:
+        result = run_publish_job(
+            job.post_id,
+            job.network_slugs or [],
+            telegram_format=job.telegram_format,
+            telegram_crosslink_network=job.crosslink_network or None,
+            telegram_post_story=job.telegram_post_story,
+            delivery_key=publish_job_delivery_key(job),
+        )
+    except Exception as exc:
+        logger.exception("Publish job %s crashed", job.pk)
+        outcome = {
+            "status": PublishJob.Status.FAILED,
+            "error": f"{type(exc).__name__}: {exc}"[:1000],
+        }
+    else:
+        outcome = {
+            "status": (
+                PublishJob.Status.SUCCEEDED
+                if result.all_ok
+                else PublishJob.Status.FAILED
+            ),
+            "result": publish_job_result_to_dict(result),
+        }
+    PublishJob.objects.filter(pk=job.pk, status=PublishJob.Status.RUNNING).update(
+        finished_at=timezone.now(), **outcome
+    )
+    flush_bot_api_stats()
+    job.refresh_from_db()
+    return job
+
+
+def run_publish_worker(*, once: bool = False) -> int:
+    """Run queued jobs one by one until stopped (or the queue is empty with *once*)."""
+    processed = 0
+    # Only the worker waits out Telegram flood control in place.
+    with publish_worker_sends():
+        while True:
+            job = claim_publish_job()
+            if job is None:
+                if once:
+                    return processed
+                time.sleep(_poll_seconds())
+                continue
+            execute_publish_job(job.pk)
+            processed += 1
@@ -10,9 +10,10 @@ import requests
 from django.conf import settings
 from django.core.cache import cache
 
+from sender.services.telegram_http import bot_api_get
+
 logger = logging.getLogger(__name__)
 
-TG_API = "https://api.telegram.org"
 _CHAT_ID_NUMERIC = re.compile(r"^-?\d+$")
 _OWNER_PREMIUM_CACHE_PREFIX = "sender:tg:owner_premium:"
 _OWNER_PREMIUM_CACHE_TTL = 3600
@@ -37,27 +38,13 @@ def telegram_chat_id_from_secrets(secrets: dict[str, Any]) -> str:
     return f"@{name}" if name else ""
 
 
-def _proxies() -> dict[str, str] | None:
-    p = (
-        getattr(settings, "TELEGRAM_HTTP_PROXY", "")
-        or getattr(settings, "HTTPS_PROXY", "")
-        or getattr(settings, "HTTP_PROXY", "")
-    )
-    p = (p or "").strip()
-    if not p:
-        return None
-    return {"http": p, "https": p}
-
-
 def _api_get(
     token: str,
     method: str,
     params: dict[str, Any],
 ) -> dict[str, Any]:
-    url = f"{TG_API}/bot{token}/{method}"
     try:
-        resp = requests.get(url, params=params, timeout=30, proxies=_proxies())
-        return resp.json()
+        return bot_api_get(token, method, params).json()
     except (requests.RequestException, ValueError) as exc:
         logger.warning("Telegram %s failed: %s", method, exc)
         return {"ok": False, "description": str(exc)}
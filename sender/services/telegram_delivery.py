@@ -0,0 +1,110 @@
+"""Checkpoints of Telegram sends, so a retried publish resumes instead of repeating.
+
+Every Bot API call of a plan runs through ``TelegramDeliveryLog.run`` under a
+stable dispatch name. Successful sends are stored as ``TelegramDispatch`` rows
+keyed by the delivery (idempotency) key; a later attempt with the same key
+returns the recorded ``message_id`` without calling Telegram or reading the
+image files again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections.abc import Callable, Iterable
+
+from django.db import IntegrityError, transaction
+
+from sender.models import TelegramDispatch
+from sender.services.dto import PublishResult
+
+logger = logging.getLogger(__name__)
+
+SendOutcome = tuple[PublishResult, str, int | None]
+
+
+def _digest(method: str, parts: Iterable[object]) -> str:
+    h = hashlib.sha256(method.encode())
+    for part in parts:
+        h.update(b"\0")
+        h.update(str(part or "").encode())
+    return h.hexdigest()
+
+
+class TelegramDeliveryLog:
+    """Sends made under one delivery key; without a key nothing is persisted."""
+
+    def __init__(self, key: str = "", *, post_id: int | None = None) -> None:
+        self.key = key
+        self.post_id = post_id
+        self._sent: dict[str, TelegramDispatch] = {}
+        if key:
+            self._sent = {
+                row.dispatch: row
+                for row in TelegramDispatch.objects.filter(delivery_key=key)
+            }
+
+    def sent_under(self, prefix: str) -> bool:
+        """True if any dispatch named ``<prefix>…`` already went out."""
+        return any(name.startswith(prefix) for name in self._sent)
+
+    def run(
+        self,
+        dispatch: str,
+        method: str,
+        parts: Iterable[object],
+        send: Callable[[], SendOutcome],
+    ) -> SendOutcome:
+        """Call *send* unless *dispatch* was already sent with the same content."""
+        digest = _digest(method, parts)
+        done = self._sent.get(dispatch)
+        if done is not None:
+            if done.digest != digest:
+                # The post changed between attempts: resending would duplicate
+                # the part already in the channel, guessing would skip content.
+                return (
+                    PublishResult(
+                        ok=False,
+                        error="delivery_changed",
+                        detail=(
+                            f"{dispatch} was already sent with different "
+                            "content; publish again to start a new delivery."
+                        ),
+                    ),
+                    "",
+                    None,
+                )
+            return (
+                PublishResult(
+                    ok=True,
+                    message_url=done.message_url,
+                    message_id=done.message_id,
+                ),
+                done.message_url,
+                done.message_id,
+            )
+        res, link, message_id = send()
+        if res.ok:
+            row = TelegramDispatch(
+                delivery_key=self.key,
+                dispatch=dispatch,
+                method=method,
+                digest=digest,
+                post_id=self.post_id,
+                message_id=message_id,
+                message_url=link,
+            )
+            if self.key:
+                try:
+                    with transaction.atomic():
+                        row.save()
+                except IntegrityError:
+                    # Another run under the same key got there first; both
+                    # messages are in the channel, so report ours as sent.
+                    logger.warning(
+                        "Telegram dispatch %s of %s was sent twice",
+                        dispatch,
+                        self.key,
+                    )
+            self._sent[dispatch] = row
+        return res, link, message_id
@@ -0,0 +1,112 @@
+"""Bot API ``file_id`` cache: send a known image by reference, not by upload.
+
+Telegram answers every photo upload with a ``file_id``; sending that id again
+attaches the same file without the JPEG encode or the multipart upload.
+``TelegramFile`` rows map (bot, storage path, content hash) to the id taken
+from the response, so retries, series and re-publishes upload each image once.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, replace
+from typing import Any
+
+from editor.derived_image_service import storage_content_hash
+from sender.models import TelegramFile
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramPhotoSource:
+    storage_name: str
+    content_hash: str
+    # Cached id for this bot; empty when the file has to be uploaded.
+    file_id: str = ""
+
+
+def bot_id_from_token(token: str) -> str:
+    """Numeric bot id (the part before ``:``); file ids are valid per bot."""
+    return token.split(":", 1)[0]
+
+
+def photo_sources(
+    token: str, storage_names: Sequence[str]
+) -> list[TelegramPhotoSource]:
+    """Hash each stored file and attach its cached ``file_id``, in one query."""
+    hashes = {name: storage_content_hash(name) for name in dict.fromkeys(storage_names)}
+    cached = {
+        (name, content_hash): file_id
+        for name, content_hash, file_id in TelegramFile.objects.filter(
+            bot_id=bot_id_from_token(token),
+            storage_name__in=hashes,
+        ).values_list("storage_name", "content_hash", "file_id")
+    }
+    return [
+        TelegramPhotoSource(
+            storage_name=name,
+            content_hash=hashes[name],
+            file_id=cached.get((name, hashes[name]), ""),
+        )
+        for name in storage_names
+    ]
+
+
+def without_file_ids(
+    sources: Iterable[TelegramPhotoSource],
+) -> list[TelegramPhotoSource]:
+    return [replace(source, file_id="") for source in sources]
+
+
+def _largest_photo(message: Any) -> dict[str, Any] | None:
+    sizes = message.get("photo") if isinstance(message, dict) else None
+    if not isinstance(sizes, list) or not sizes:
+        return None
+    return max(
+        (size for size in sizes if isinstance(size, dict) and size.get("file_id")),
+        key=lambda size: (
+            int(size.get("width") or 0) * int(size.get("height") or 0),
+            int(size.get("file_size") or 0),
+        ),
+        default=None,
+    )
+
+
+def remember_photos(
+    token: str,
+    sources: Sequence[TelegramPhotoSource],
+    messages: Sequence[Any],
+) -> None:
+    """Store the ids Telegram returned for uploaded *sources* (same order)."""
+    bot_id = bot_id_from_token(token)
+    for source, message in zip(sources, messages, strict=False):
+        if source.file_id:
+            continue
+        photo = _largest_photo(message)
+        if photo is None:
+            continue
+        TelegramFile.objects.update_or_create(
+            bot_id=bot_id,
+            storage_name=source.storage_name,
+            content_hash=source.content_hash,
+            defaults={
+                "file_id": str(photo["file_id"]),
+                "file_unique_id": str(photo.get("file_unique_id") or ""),
+            },
+        )
+
+
+def forget_photos(token: str, sources: Iterable[TelegramPhotoSource]) -> None:
+    file_ids = [source.file_id for source in sources if source.file_id]
+    if file_ids:
+        TelegramFile.objects.filter(
+            bot_id=bot_id_from_token(token), file_id__in=file_ids
+        ).delete()
+
+
+def file_id_rejected(payload: dict[str, Any]) -> bool:
+    """True if Telegram refused a cached ``file_id`` (expired, other bot…)."""
+    desc = str(payload.get("description") or "").lower()
+    return any(
+        marker in desc
+        for marker in ("file identifier", "file_id", "file reference", "wrong file")
+    )
@@ -5,10 +5,10 @@ from __future__ import annotations
 import logging
 import re
 from html import escape, unescape
-from html.parser import HTMLParser
 
 from django.utils.html import strip_tags
 
+from editor.html_document import HtmlTokenHandler, first_sentence_of, html_document
 from editor.models import Post
 
 logger = logging.getLogger(__name__)
@@ -289,65 +289,6 @@ def sanitize_telegram_html(html: str) -> str:
     return text
 
 
-def _convert_headings_to_telegram_blocks(html: str) -> str:
-    """Headings → blank line + ``<b>title</b>`` + blank line."""
-
-    def repl(match: re.Match[str]) -> str:
-        inner = match.group(1) or ""
-        plain = re.sub(r"<[^>]+>", "", inner)
-        plain = unescape(plain).strip()
-        if not plain:
-            return _BLOCK_BREAK
-        return f"{_BLOCK_BREAK}<b>{escape_telegram_html(plain)}</b>{_BLOCK_BREAK}"
-
-    return re.sub(
-        r"<h[1-6][^>]*>(.*?)</h[1-6]>",
-        repl,
-        html,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-
-
-def normalize_editor_html(html: str) -> str:
-    """Map common CKEditor markup to Telegram-safe HTML before conversion."""
-    if not html:
-        return ""
-    text = html
-    text = re.sub(
-        r"<span[^>]*font-weight\s*:\s*(?:bold|[6-9]00)[^>]*>(.*?)</span>",
-        r"<strong>\1</strong>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*font-style\s*:\s*italic[^>]*>(.*?)</span>",
-        r"<em>\1</em>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*text-decoration\s*:\s*underline[^>]*>(.*?)</span>",
-        r"<u>\1</u>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*text-decoration\s*:\s*line-through[^>]*>(.*?)</span>",
-        r"<s>\1</s>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*>(.*?)</span>",
-        r"\1",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(r"<pre>\s*<code[^>]*>", "<pre>", text, flags=re.IGNORECASE)
-    text = re.sub(r"</code>\s*</pre>", "</pre>", text, flags=re.IGNORECASE)
-    return _convert_headings_to_telegram_blocks(text)
-
-
 def format_tags_line(post: Post) -> str:
     """One line: ``#tag`` tokens separated by spaces."""
     if post.pk is None:
@@ -398,24 +339,43 @@ def _map_tag_to_telegram(tag_l: str) -> str | None:
     return None
 
 
-class _TelegramHTMLConverter(HTMLParser):
-    """Walk editor HTML and emit Telegram-compatible HTML."""
+def _is_heading(tag_l: str) -> bool:
+    return tag_l.startswith("h") and tag_l[1:].isdigit()
+
+
+class _TelegramHTMLConverter(HtmlTokenHandler):
+    """Walk the parsed editor HTML and emit Telegram-compatible HTML.
+
+    Figures (and their captions) are dropped; headings become a blank line,
+    ``<b>plain heading text</b>`` and another blank line.
+    """
 
     def __init__(self) -> None:
-        super().__init__(convert_charrefs=True)
         self._out: list[str] = []
         self._tag_stack: list[str] = []
         self._in_pre = False
+        self._figure_depth = 0
+        self._heading_parts: list[str] | None = None
 
     def get_html(self) -> str:
+        if self._heading_parts is not None:
+            # Unclosed heading: keep its text as a plain run.
+            parts, self._heading_parts = self._heading_parts, None
+            self.handle_data("".join(parts))
         return sanitize_telegram_html("".join(self._out).strip())
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
         tag_l = tag.lower()
+        if tag_l == "figure":
+            self._figure_depth += 1
+            return
+        if self._figure_depth or self._heading_parts is not None:
+            return
         if tag_l == "br":
             self._out.append(_LINE_BREAK)
             return
-        if tag_l.startswith("h") and tag_l[1:].isdigit():
+        if _is_heading(tag_l):
+            self._heading_parts = []
             return
         if tag_l == "img":
             return
@@ -449,11 +409,18 @@ class _TelegramHTMLConverter(HTMLParser):
 
     def handle_endtag(self, tag: str) -> None:
         tag_l = tag.lower()
-        if tag_l.startswith("h") and tag_l[1:].isdigit():
+        if tag_l == "figure":
+            self._figure_depth = max(0, self._figure_depth - 1)
+            return
+        if self._figure_depth:
+            return
+        if self._heading_parts is not None:
+            if _is_heading(tag_l):
+                self._close_heading()
             return
         if tag_l == "img":
             return
-        if tag_l in ("ul", "ol", "figure", "table", "li"):
+        if tag_l in ("ul", "ol", "table", "li"):
             if tag_l == "li":
                 self._out.append(_LINE_BREAK)
             return
@@ -479,15 +446,22 @@ class _TelegramHTMLConverter(HTMLParser):
             self._out.append(_BLOCK_BREAK)
 
     def handle_data(self, data: str) -> None:
-        if not data:
+        if not data or self._figure_depth:
+            return
+        if self._heading_parts is not None:
+            self._heading_parts.append(data)
             return
         self._out.append(escape_telegram_html(_normalize_telegram_plain_text(data)))
 
-    def handle_entityref(self, name: str) -> None:
-        self.handle_data(unescape(f"&{name};"))
-
-    def handle_charref(self, name: str) -> None:
-        self.handle_data(unescape(f"&#{name};"))
+    def _close_heading(self) -> None:
+        plain = "".join(self._heading_parts or []).strip()
+        self._heading_parts = None
+        self._out.append(_BLOCK_BREAK)
+        if plain:
+            self.handle_starttag("b", [])
+            self.handle_data(plain)
+            self.handle_endtag("b")
+            self._out.append(_BLOCK_BREAK)
 
     def _open_tag(self, tag: str) -> None:
         self._out.append(f"<{tag}>")
@@ -507,26 +481,15 @@ def html_body_to_telegram_html(html: str) -> str:
     """Strip galleries/figures and convert remaining HTML to Telegram HTML."""
     if not html:
         return ""
-    cleaned = normalize_editor_html(html)
-    cleaned = _strip_gallery_placeholders(cleaned)
-    cleaned = re.sub(
-        r"<figure[^>]*>.*?</figure>",
-        "",
-        cleaned,
-        flags=re.DOTALL | re.IGNORECASE,
-    )
-    cleaned = re.sub(r"<img[^>]*>", "", cleaned, flags=re.IGNORECASE)
     parser = _TelegramHTMLConverter()
     try:
-        parser.feed(cleaned)
-        parser.close()
+        parser.feed_document(html_document(html))
     except Exception:
         logger.warning(
             "Telegram HTML conversion failed; using plain fallback",
             exc_info=True,
         )
-        from django.utils.html import strip_tags
-
+        cleaned = _strip_gallery_placeholders(html)
         plain = _normalize_telegram_plain_text(strip_tags(cleaned))
         return sanitize_telegram_html(escape_telegram_html(plain))
     return parser.get_html()
@@ -567,11 +530,7 @@ def prepare_outbound_telegram_html(text: str) -> str:
 
 
 def _first_sentence_from_text(value: str) -> str:
-    text = re.sub(r"\s+", " ", strip_tags(value or "")).strip()
-    if not text:
-        return ""
-    parts = re.split(r"(?<=[.!?…])\s+", text, maxsplit=1)
-    return parts[0].strip()
+    return first_sentence_of(html_document(value).plain_text)
 
 
 def crosslink_label_text(post: Post) -> str:
@@ -0,0 +1,210 @@
+"""Shared HTTP client for the Telegram Bot API.
+
+Every Bot API call (publisher, channel probe, story checks) goes through one
+pooled ``requests.Session`` per thread, so the messages of a series reuse a
+kept-alive TLS connection (and proxy tunnel) instead of opening one per call.
+Timeouts are per method; call latencies are counted into per-method
+histograms, flushed to the shared cache like the tiered cache stats and
+printed by ``manage.py telegram_api_stats``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+TG_API = "https://api.telegram.org"
+
+# Read timeout (seconds) per method; uploads get longer than plain calls.
+BOT_API_TIMEOUTS = {
+    "sendPhoto": 90,
+    "sendMediaGroup": 120,
+    "sendRichMessage": 120,
+    "sendMessage": 30,
+    "getMe": 15,
+    "getChat": 15,
+    "getChatMember": 15,
+    "getChatAdministrators": 15,
+}
+BOT_API_DEFAULT_TIMEOUT = 30
+BOT_API_CONNECT_TIMEOUT = 10
+# Kept-alive connections per host; publishing is sequential, probes are rare.
+BOT_API_POOL_SIZE = 4
+
+# Upper bounds (seconds) of the latency histogram buckets.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+BOT_API_STATS_KEY = "sender.tg_api:{method}:{bucket}"
+BOT_API_STATS_METHODS_KEY = "sender.tg_api:methods"
+BOT_API_STATS_TTL = 7 * 24 * 60 * 60
+_STATS_FLUSH_SECONDS = 30.0
+
+_local = threading.local()
+
+
+def bot_api_proxies() -> dict[str, str] | None:
+    p = (
+        getattr(settings, "TELEGRAM_HTTP_PROXY", "")
+        or getattr(settings, "HTTPS_PROXY", "")
+        or getattr(settings, "HTTP_PROXY", "")
+    )
+    p = (p or "").strip()
+    if not p:
+        return None
+    return {"http": p, "https": p}
+
+
+def bot_api_timeout(method: str) -> tuple[float, float]:
+    """``(connect, read)`` timeout of *method*; ``TELEGRAM_API_TIMEOUTS`` wins."""
+    overrides = getattr(settings, "TELEGRAM_API_TIMEOUTS", None) or {}
+    read = overrides.get(method) or BOT_API_TIMEOUTS.get(
+        method, BOT_API_DEFAULT_TIMEOUT
+    )
+    connect = getattr(settings, "TELEGRAM_API_CONNECT_TIMEOUT", BOT_API_CONNECT_TIMEOUT)
+    return float(connect), float(read)
+
+
+def bot_api_session() -> requests.Session:
+    """This thread's pooled session (rebuilt in forked children)."""
+    session = getattr(_local, "session", None)
+    if session is None or getattr(_local, "pid", None) != os.getpid():
+        session = requests.Session()
+        # No transport retries: a repeated POST may post twice.
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=BOT_API_POOL_SIZE,
+            max_retries=0,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _local.session = session
+        _local.pid = os.getpid()
+    return session
+
+
+def bot_api_post(token: str, method: str, **kwargs: Any) -> requests.Response:
+    """POST *method* (``json=`` or ``files=``); transport errors are raised."""
+    url = f"{TG_API}/bot{token}/{method}"
+    started = time.perf_counter()
+    try:
+        return bot_api_session().post(
+            url,
+            timeout=bot_api_timeout(method),
+            proxies=bot_api_proxies(),
+            **kwargs,
+        )
+    finally:
+        _latency.observe(method, time.perf_counter() - started)
+
+
+def bot_api_get(
+    token: str, method: str, params: dict[str, Any] | None = None
+) -> requests.Response:
+    url = f"{TG_API}/bot{token}/{method}"
+    started = time.perf_counter()
+    try:
+        return bot_api_session().get(
+            url,
+            params=params,
+            timeout=bot_api_timeout(method),
+            proxies=bot_api_proxies(),
+        )
+    finally:
+        _latency.observe(method, time.perf_counter() - started)
+
+
+def bucket_label(bound: float) -> str:
+    return "inf" if math.isinf(bound) else f"{bound:g}"
+
+
+class _LatencyHistogram:
+    """Per-method call counts by latency bucket, summed into the shared cache."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counts: Counter[tuple[str, str]] = Counter()
+        self._flushed_at = time.monotonic()
+
+    def observe(self, method: str, seconds: float) -> None:
+        bound = next(b for b in LATENCY_BUCKETS if seconds <= b)
+        now = time.monotonic()
+        with self._lock:
+            self._counts[method, bucket_label(bound)] += 1
+            self._counts[method, "sum_ms"] += round(seconds * 1000)
+            if now - self._flushed_at < _STATS_FLUSH_SECONDS:
+                return
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = now
+        self._flush(counts)
+
+    def flush(self) -> None:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._flushed_at = time.monotonic()
+        self._flush(counts)
+
+    def _flush(self, counts: Counter[tuple[str, str]]) -> None:
+        if not counts:
+            return
+        try:
+            methods = set(cache.get(BOT_API_STATS_METHODS_KEY) or ())
+            seen = {method for method, _bucket in counts}
+            if not seen <= methods:
+                cache.set(
+                    BOT_API_STATS_METHODS_KEY,
+                    sorted(methods | seen),
+                    BOT_API_STATS_TTL,
+                )
+            for (method, bucket), count in counts.items():
+                key = BOT_API_STATS_KEY.format(method=method, bucket=bucket)
+                try:
+                    if not cache.add(key, count, BOT_API_STATS_TTL):
+                        cache.incr(key, count)
+                except ValueError:
+                    # Counter expired between ``add`` and ``incr``; drop it.
+                    pass
+        except Exception:
+            logger.exception("Failed to record Telegram API latency stats")
+
+
+_latency = _LatencyHistogram()
+
+
+def flush_bot_api_stats() -> None:
+    """Write this process's pending latency counts to the shared cache now."""
+    _latency.flush()
+
+
+def bot_api_stats() -> dict[str, dict[str, int]]:
+    """Latency histogram per method (all workers, last 7 days).
+
+    Each entry maps bucket upper bounds (``"0.1"`` … ``"inf"``) to call counts,
+    plus ``sum_ms`` of all latencies.
+    """
+    labels = [*(bucket_label(b) for b in LATENCY_BUCKETS), "sum_ms"]
+    try:
+        methods = list(cache.get(BOT_API_STATS_METHODS_KEY) or ())
+        keys = {
+            (method, label): BOT_API_STATS_KEY.format(method=method, bucket=label)
+            for method in methods
+            for label in labels
+        }
+        values = cache.get_many(list(keys.values()))
+    except Exception:
+        logger.exception("Failed to read Telegram API latency stats")
+        return {}
+    return {
+        method: {label: int(values.get(keys[method, label]) or 0) for label in labels}
+        for method in methods
+    }
@@ -5,7 +5,8 @@ from __future__ import annotations
 import json
 import logging
 import os
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
+from functools import partial
 from typing import Any
 
 import requests
@@ -14,19 +15,29 @@ from django.core.files.storage import default_storage
 
 from core.models.network import NETWORK_SLUG_TELEGRAM, Credential, Network
 from core.models.telegram_settings import post_continuation_prefix
-from editor.image_upload import build_telegram_jpeg_from_image_bytes
+from editor.image_upload import ensure_telegram_jpeg
 from editor.models import Post
 from sender.services.dto import PublishResult
 from sender.services.telegram_channel import (
     channel_has_subscription,
     telegram_chat_id_from_secrets,
 )
+from sender.services.telegram_delivery import SendOutcome, TelegramDeliveryLog
+from sender.services.telegram_files import (
+    TelegramPhotoSource,
+    file_id_rejected,
+    forget_photos,
+    photo_sources,
+    remember_photos,
+    without_file_ids,
+)
 from sender.services.telegram_format import (
     TELEGRAM_FORMAT_CROSSLINK,
     TELEGRAM_FORMAT_FULL,
     prepare_outbound_telegram_html,
     truncate_telegram_html,
 )
+from sender.services.telegram_http import bot_api_post
 from sender.services.telegram_plan import (
     MAX_CAPTION_LEN,
     MAX_MEDIA_GROUP,
@@ -37,6 +48,7 @@ from sender.services.telegram_plan import (
     build_telegram_plan,
     text_dispatches_for_step,
 )
+from sender.services.telegram_rate_limit import paced_send, retry_after_from
 from sender.services.telegram_rich_format import (
     RichMediaAttachment,
     prepare_outbound_telegram_rich_html,
@@ -44,20 +56,9 @@ from sender.services.telegram_rich_format import (
 
 logger = logging.getLogger(__name__)
 
-TG_API = "https://api.telegram.org"
 PARSE_MODE = "HTML"
-
-
-def _proxies() -> dict[str, str] | None:
-    p = (
-        getattr(settings, "TELEGRAM_HTTP_PROXY", "")
-        or getattr(settings, "HTTPS_PROXY", "")
-        or getattr(settings, "HTTP_PROXY", "")
-    )
-    p = (p or "").strip()
-    if not p:
-        return None
-    return {"http": p, "https": p}
+# Error of a sendRichMessage attempt that the legacy sendMessage series replaces.
+RICH_MESSAGE_FALLBACK = "rich_message_fallback"
 
 
 def _telegram_secrets() -> dict[str, Any]:
@@ -105,58 +106,90 @@ def _photo_upload_file(storage_path: str) -> tuple[str, bytes, str]:
     """Return ``(field_name, bytes, mime)`` for multipart upload.
 
     Non-JPEG sources are re-encoded to JPEG without social-share cropping so
-    Telegram posts keep the original cover aspect ratio.
+    Telegram posts keep the original cover aspect ratio. The JPEG is stored
+    and registered (``editor.DerivedImage``), so reposts skip the re-encode.
     """
-    with default_storage.open(storage_path, "rb") as fh:
-        raw = fh.read()
     base = os.path.basename(storage_path)
     stem, ext = os.path.splitext(base)
     ext_l = ext.lower()
     if ext_l in (".avif", ".webp", ".png", ".gif", ".bmp", ".tiff"):
-        data = build_telegram_jpeg_from_image_bytes(raw)
-        return f"{stem}.jpg", data, "image/jpeg"
+        return f"{stem}.jpg", ensure_telegram_jpeg(storage_path), "image/jpeg"
+    with default_storage.open(storage_path, "rb") as fh:
+        raw = fh.read()
     if ext_l in (".jpg", ".jpeg"):
         return base, raw, "image/jpeg"
     return base or "image.jpg", raw, "image/jpeg"
 
 
+def _photo_media(
+    source: TelegramPhotoSource,
+    key: str,
+    fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]],
+) -> str:
+    """``media`` value for *source*: its cached ``file_id`` or a new attachment."""
+    if source.file_id:
+        return source.file_id
+    fields[key] = _photo_upload_file(source.storage_name)
+    return f"attach://{key}"
+
+
+def _post_with_photos(
+    token: str,
+    storage_paths: Sequence[str],
+    post: Callable[[list[TelegramPhotoSource]], tuple[dict[str, Any], Any]],
+) -> tuple[list[TelegramPhotoSource], dict[str, Any], Any]:
+    """Run *post* with cached file ids; upload instead if Telegram rejects them."""
+    sources = photo_sources(token, storage_paths)
+    payload, resp = post(sources)
+    if (
+        not payload.get("ok")
+        and any(source.file_id for source in sources)
+        and file_id_rejected(payload)
+    ):
+        logger.warning("Telegram rejected cached file ids: %s", payload)
+        forget_photos(token, sources)
+        sources = without_file_ids(sources)
+        payload, resp = post(sources)
+    return sources, payload, resp
+
+
+def _api_response_body(resp: requests.Response) -> dict[str, Any]:
+    try:
+        return resp.json()
+    except ValueError:
+        return {"ok": False, "description": resp.text[:500]}
+
+
 def _api_post_json(
     token: str,
     method: str,
     payload: dict[str, Any],
 ) -> tuple[dict[str, Any], requests.Response]:
-    url = f"{TG_API}/bot{token}/{method}"
-    resp = requests.post(
-        url,
-        json=payload,
-        timeout=90,
-        proxies=_proxies(),
-    )
-    try:
-        body = resp.json()
-    except ValueError:
-        body = {"ok": False, "description": resp.text[:500]}
-    return body, resp
+    def send() -> tuple[dict[str, Any], requests.Response]:
+        resp = bot_api_post(token, method, json=payload)
+        return _api_response_body(resp), resp
+
+    return paced_send(token, str(payload.get("chat_id") or ""), send)
 
 
 def _api_post_multipart(
     token: str,
     method: str,
     fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]],
+    *,
+    cost: int = 1,
 ) -> tuple[dict[str, Any], requests.Response]:
-    """Send multipart request; non-file fields use ``(None, value)`` tuples."""
-    url = f"{TG_API}/bot{token}/{method}"
-    resp = requests.post(
-        url,
-        files=fields,
-        timeout=90,
-        proxies=_proxies(),
-    )
-    try:
-        body = resp.json()
-    except ValueError:
-        body = {"ok": False, "description": resp.text[:500]}
-    return body, resp
+    """Send multipart request; non-file fields use ``(None, value)`` tuples.
+
+    *cost* is the number of messages it posts (photos of an album).
+    """
+
+    def send() -> tuple[dict[str, Any], requests.Response]:
+        resp = bot_api_post(token, method, files=fields)
+        return _api_response_body(resp), resp
+
+    chat_id = fields.get("chat_id") or (None, "")
+    return paced_send(token, str(chat_id[1]), send, cost=cost)
 
 
 def _fail_from_payload(
@@ -165,6 +198,14 @@ def _fail_from_payload(
     *,
     rich_message: bool = False,
 ) -> PublishResult:
+    retry_after = retry_after_from(payload)
+    if retry_after is not None:
+        return PublishResult(
+            ok=False,
+            error="rate_limited",
+            detail=f"Telegram flood control: retry after {retry_after} s.",
+            retry_after=retry_after,
+        )
     desc_raw = payload.get("description") or resp.text[:500]
     desc = _telegram_api_error_detail(str(desc_raw))
     lowered = str(desc_raw).lower()
@@ -202,42 +243,43 @@ def _normalize_legacy_fallback(
     return [part for part in legacy_fallback if part]
 
 
-def _send_rich_message(
+def _post_rich_message(
     token: str,
     chat_id: str,
     html: str,
+    media_items: list[RichMediaAttachment],
     *,
-    rich_media: list[RichMediaAttachment] | None = None,
-    legacy_fallback: str | Sequence[str] = "",
-) -> tuple[PublishResult, str, int | None]:
-    if not html:
-        return PublishResult(ok=True), "", None
-    html = prepare_outbound_telegram_rich_html(html)
-    media_items = list(rich_media or [])
+    can_fall_back: bool,
+) -> SendOutcome:
     if media_items:
-        fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]] = {
-            "chat_id": (None, str(chat_id)),
-        }
-        media_json: list[dict[str, Any]] = []
-        for i, item in enumerate(media_items):
-            key = f"richfile{i}"
-            fname, data, mime = _photo_upload_file(item.storage_path)
-            media_json.append(
-                {
-                    "id": item.media_id,
-                    "media": {
-                        "type": "photo",
-                        "media": f"attach://{key}",
+
+        def post(
+            sources: list[TelegramPhotoSource],
+        ) -> tuple[dict[str, Any], requests.Response]:
+            fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]] = {
+                "chat_id": (None, str(chat_id)),
+            }
+            media_json: list[dict[str, Any]] = []
+            for i, (item, source) in enumerate(zip(media_items, sources, strict=True)):
+                media_json.append(
+                    {
+                        "id": item.media_id,
+                        "media": {
+                            "type": "photo",
+                            "media": _photo_media(source, f"richfile{i}", fields),
+                        },
                     },
-                },
+                )
+            rich_message = {"html": html, "media": media_json}
+            fields["rich_message"] = (
+                None,
+                json.dumps(rich_message, separators=(",", ":")),
             )
-            fields[key] = (fname, data, mime)
-        rich_message = {"html": html, "media": media_json}
-        fields["rich_message"] = (
-            None,
-            json.dumps(rich_message, separators=(",", ":")),
+            return _api_post_multipart(token, "sendRichMessage", fields)
+
+        _sources, payload, resp = _post_with_photos(
+            token, [item.storage_path for item in media_items], post
         )
-        payload, resp = _api_post_multipart(token, "sendRichMessage", fields)
     else:
         payload, resp = _api_post_json(
             token,
@@ -254,17 +296,67 @@ def _send_rich_message(
             link,
             message_id,
         )
-    fallback_parts = _normalize_legacy_fallback(legacy_fallback)
-    if fallback_parts and _rich_message_fallback_enabled(payload):
+    if can_fall_back and _rich_message_fallback_enabled(payload):
         logger.warning(
-            "sendRichMessage failed; falling back to sendMessage (%s parts): %s",
-            len(fallback_parts),
+            "sendRichMessage failed; falling back to sendMessage: %s",
             payload.get("description"),
         )
-        return _send_message_series(token, chat_id, fallback_parts)
+        return (
+            PublishResult(
+                ok=False,
+                error=RICH_MESSAGE_FALLBACK,
+                detail=str(payload.get("description") or "")[:700],
+            ),
+            "",
+            None,
+        )
     return _fail_from_payload(payload, resp, rich_message=True), "", None
 
 
+def _send_rich_message(
+    token: str,
+    chat_id: str,
+    html: str,
+    *,
+    rich_media: list[RichMediaAttachment] | None = None,
+    legacy_fallback: str | Sequence[str] = "",
+    log: TelegramDeliveryLog | None = None,
+    dispatch: str = "rich",
+) -> SendOutcome:
+    if not html:
+        return PublishResult(ok=True), "", None
+    log = log if log is not None else TelegramDeliveryLog()
+    html = prepare_outbound_telegram_rich_html(html)
+    media_items = list(rich_media or [])
+    fallback_parts = _normalize_legacy_fallback(legacy_fallback)
+    fallback_dispatch = f"{dispatch}/fallback"
+    # Once part of the fallback series is out, finish it instead of mixing
+    # formats in the channel.
+    if not log.sent_under(fallback_dispatch):
+        res, link, message_id = log.run(
+            dispatch,
+            "sendRichMessage",
+            (html, *(f"{m.media_id}={m.storage_path}" for m in media_items)),
+            partial(
+                _post_rich_message,
+                token,
+                chat_id,
+                html,
+                media_items,
+                can_fall_back=bool(fallback_parts),
+            ),
+        )
+        if res.ok or res.error != RICH_MESSAGE_FALLBACK:
+            return res, link, message_id
+    return _send_message_series(
+        token,
+        chat_id,
+        fallback_parts,
+        log=log,
+        dispatch=fallback_dispatch,
+    )
+
+
 def _send_message(
     token: str,
     chat_id: str,
@@ -301,19 +393,28 @@ def _send_message_series(
     texts: Sequence[str],
     *,
     enable_link_preview: bool = False,
-) -> tuple[PublishResult, str, int | None]:
+    log: TelegramDeliveryLog | None = None,
+    dispatch: str = "message",
+) -> SendOutcome:
     """Send each non-empty text via sendMessage; stop on first failure."""
+    log = log if log is not None else TelegramDeliveryLog()
     first_link = ""
     first_message_id: int | None = None
     sent_any = False
-    for text in texts:
+    for index, text in enumerate(texts):
         if not text:
             continue
-        res, link, mid = _send_message(
-            token,
-            chat_id,
-            text,
-            enable_link_preview=enable_link_preview,
+        res, link, mid = log.run(
+            f"{dispatch}{index}",
+            "sendMessage",
+            (text, enable_link_preview),
+            partial(
+                _send_message,
+                token,
+                chat_id,
+                text,
+                enable_link_preview=enable_link_preview,
+            ),
         )
         if not res.ok:
             return res, first_link, first_message_id
@@ -341,20 +442,30 @@ def _send_photo(
     storage_path: str,
     caption: str | None,
 ) -> tuple[PublishResult, str, int | None]:
-    fname, photo_bytes, mime = _photo_upload_file(storage_path)
-    fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]] = {
-        "chat_id": (None, str(chat_id)),
-        "photo": (fname, photo_bytes, mime),
-    }
     if caption:
         caption = prepare_outbound_telegram_html(
             truncate_telegram_html(caption, MAX_CAPTION_LEN),
         )
-        fields["caption"] = (None, caption)
-        fields["parse_mode"] = (None, PARSE_MODE)
-    payload, resp = _api_post_multipart(token, "sendPhoto", fields)
+
+    def post(
+        sources: list[TelegramPhotoSource],
+    ) -> tuple[dict[str, Any], requests.Response]:
+        fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]] = {
+            "chat_id": (None, str(chat_id)),
+        }
+        if sources[0].file_id:
+            fields["photo"] = (None, sources[0].file_id)
+        else:
+            fields["photo"] = _photo_upload_file(storage_path)
+        if caption:
+            fields["caption"] = (None, caption)
+            fields["parse_mode"] = (None, PARSE_MODE)
+        return _api_post_multipart(token, "sendPhoto", fields)
+
+    sources, payload, resp = _post_with_photos(token, [storage_path], post)
     if not payload.get("ok"):
         return _fail_from_payload(payload, resp), "", None
+    remember_photos(token, sources, [payload.get("result")])
     message_id, link = _message_url_from_response(payload)
     return (
         PublishResult(ok=True, message_url=link, message_id=message_id),
@@ -371,26 +482,34 @@ def _send_media_group(
 ) -> tuple[PublishResult, str, int | None]:
     if not paths:
         return PublishResult(ok=True), "", None
-    media_json: list[dict[str, str]] = []
-    fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]] = {
-        "chat_id": (None, str(chat_id)),
-    }
-    for i, path in enumerate(paths[:MAX_MEDIA_GROUP]):
-        key = f"file{i}"
-        fname, data, mime = _photo_upload_file(path)
-        item: dict[str, str] = {"type": "photo", "media": f"attach://{key}"}
-        if i == 0 and caption:
-            item["caption"] = prepare_outbound_telegram_html(
-                truncate_telegram_html(caption, MAX_CAPTION_LEN),
-            )
-            item["parse_mode"] = PARSE_MODE
-        media_json.append(item)
-        fields[key] = (fname, data, mime)
-    fields["media"] = (None, json.dumps(media_json, separators=(",", ":")))
-    payload, resp = _api_post_multipart(token, "sendMediaGroup", fields)
+
+    def post(
+        sources: list[TelegramPhotoSource],
+    ) -> tuple[dict[str, Any], requests.Response]:
+        media_json: list[dict[str, str]] = []
+        fields: dict[str, tuple[str | None, str] | tuple[str, bytes, str]] = {
+            "chat_id": (None, str(chat_id)),
+        }
+        for i, source in enumerate(sources):
+            item: dict[str, str] = {
+                "type": "photo",
+                "media": _photo_media(source, f"file{i}", fields),
+            }
+            if i == 0 and caption:
+                item["caption"] = prepare_outbound_telegram_html(
+                    truncate_telegram_html(caption, MAX_CAPTION_LEN),
+                )
+                item["parse_mode"] = PARSE_MODE
+            media_json.append(item)
+        fields["media"] = (None, json.dumps(media_json, separators=(",", ":")))
+        return _api_post_multipart(token, "sendMediaGroup", fields, cost=len(sources))
+
+    sources, payload, resp = _post_with_photos(token, paths[:MAX_MEDIA_GROUP], post)
     if not payload.get("ok"):
         return _fail_from_payload(payload, resp), "", None
     result = payload.get("result") or []
+    if isinstance(result, list):
+        remember_photos(token, sources, result)
     first = result[0] if isinstance(result, list) and result else {}
     message_id, link = _message_url_from_response({"result": first})
     return (
@@ -406,8 +525,15 @@ def _execute_step(
     token: str,
     chat_id: str,
     has_subscription: bool,
-) -> tuple[PublishResult, str, int | None]:
-    """Run one plan step; return result, first message URL and id in step."""
+    log: TelegramDeliveryLog | None = None,
+    dispatch: str = "step",
+) -> SendOutcome:
+    """Run one plan step; return result, first message URL and id in step.
+
+    Each Bot API call goes through *log* under ``<dispatch>/<part>``, so a
+    retried step skips the sends that already succeeded.
+    """
+    log = log if log is not None else TelegramDeliveryLog()
     dispatches = text_dispatches_for_step(
         step,
         has_subscription=has_subscription,
@@ -422,20 +548,19 @@ def _execute_step(
     first_message_id: int | None = None
     link_preview = step.enable_link_preview
 
-    if step.combined_album:
-        for chunk_idx, chunk in enumerate(_chunk_media(step.media_paths)):
-            chunk_caption = (
-                caption if chunk_idx == 0 and step.caption_on_media_group else None
-            )
-            res, link, mid = _send_media_group(token, chat_id, chunk, chunk_caption)
-            if not res.ok:
-                return res, first_link, first_message_id
+    def track(outcome: SendOutcome) -> PublishResult:
+        nonlocal first_link, first_message_id
+        res, link, mid = outcome
+        if res.ok:
             if link and not first_link:
                 first_link = link
             if mid is not None and first_message_id is None:
                 first_message_id = mid
+        return res
+
+    def send_text() -> SendOutcome:
         if rich_message:
-            res, link, mid = _send_rich_message(
+            return _send_rich_message(
                 token,
                 chat_id,
                 rich_message,
@@ -443,26 +568,42 @@ def _execute_step(
                 legacy_fallback=(
                     step.legacy_fallback_series() or ([message] if message else [])
                 ),
+                log=log,
+                dispatch=f"{dispatch}/rich",
             )
-            if not res.ok:
-                return res, first_link, first_message_id
-            if link and not first_link:
-                first_link = link
-            if mid is not None and first_message_id is None:
-                first_message_id = mid
-        elif message:
-            res, link, mid = _send_message(
-                token,
-                chat_id,
-                message,
-                enable_link_preview=link_preview,
+        if message:
+            return log.run(
+                f"{dispatch}/message",
+                "sendMessage",
+                (message, link_preview),
+                partial(
+                    _send_message,
+                    token,
+                    chat_id,
+                    message,
+                    enable_link_preview=link_preview,
+                ),
+            )
+        return PublishResult(ok=True), "", None
+
+    if step.combined_album:
+        for chunk_idx, chunk in enumerate(_chunk_media(step.media_paths)):
+            chunk_caption = (
+                caption if chunk_idx == 0 and step.caption_on_media_group else None
+            )
+            res = track(
+                log.run(
+                    f"{dispatch}/album{chunk_idx}",
+                    "sendMediaGroup",
+                    (*chunk, chunk_caption),
+                    partial(_send_media_group, token, chat_id, chunk, chunk_caption),
+                )
             )
             if not res.ok:
                 return res, first_link, first_message_id
-            if link and not first_link:
-                first_link = link
-            if mid is not None and first_message_id is None:
-                first_message_id = mid
+        res = track(send_text())
+        if not res.ok:
+            return res, first_link, first_message_id
         return (
             PublishResult(
                 ok=True,
@@ -474,52 +615,32 @@ def _execute_step(
         )
 
     if step.cover_path:
-        res, link, mid = _send_photo(token, chat_id, step.cover_path, caption)
-        if not res.ok:
-            return res, first_link, first_message_id
-        if link and not first_link:
-            first_link = link
-        if mid is not None and first_message_id is None:
-            first_message_id = mid
-
-    if rich_message:
-        res, link, mid = _send_rich_message(
-            token,
-            chat_id,
-            rich_message,
-            rich_media=step.rich_media,
-            legacy_fallback=(
-                step.legacy_fallback_series() or ([message] if message else [])
-            ),
-        )
-        if not res.ok:
-            return res, first_link, first_message_id
-        if link and not first_link:
-            first_link = link
-        if mid is not None and first_message_id is None:
-            first_message_id = mid
-    elif message:
-        res, link, mid = _send_message(
-            token,
-            chat_id,
-            message,
-            enable_link_preview=link_preview,
+        res = track(
+            log.run(
+                f"{dispatch}/photo",
+                "sendPhoto",
+                (step.cover_path, caption),
+                partial(_send_photo, token, chat_id, step.cover_path, caption),
+            )
         )
         if not res.ok:
             return res, first_link, first_message_id
-        if link and not first_link:
-            first_link = link
-        if mid is not None and first_message_id is None:
-            first_message_id = mid
 
-    for chunk in _chunk_media(step.media_paths):
-        res, link, mid = _send_media_group(token, chat_id, chunk)
+    res = track(send_text())
+    if not res.ok:
+        return res, first_link, first_message_id
+
+    for chunk_idx, chunk in enumerate(_chunk_media(step.media_paths)):
+        res = track(
+            log.run(
+                f"{dispatch}/album{chunk_idx}",
+                "sendMediaGroup",
+                tuple(chunk),
+                partial(_send_media_group, token, chat_id, chunk),
+            )
+        )
         if not res.ok:
             return res, first_link, first_message_id
-        if link and not first_link:
-            first_link = link
-        if mid is not None and first_message_id is None:
-            first_message_id = mid
 
     return (
         PublishResult(
@@ -597,7 +718,13 @@ def publish_to_telegram(
     *,
     format_mode: str = TELEGRAM_FORMAT_FULL,
     crosslink_url: str | None = None,
+    delivery_key: str = "",
 ) -> PublishResult:
+    """Send the post's plan to the channel.
+
+    With a *delivery_key*, every send is checkpointed: calling again with the
+    same key resumes after the last successful send instead of re-posting.
+    """
     secrets, token, chat_id = _telegram_runtime()
 
     if not token or not chat_id:
@@ -622,13 +749,16 @@ def publish_to_telegram(
 
     stored_link = ""
     stored_message_id: int | None = None
+    log = TelegramDeliveryLog(delivery_key, post_id=post.pk)
 
-    for step in plan.steps:
+    for index, step in enumerate(plan.steps):
         res, step_link, step_message_id = _execute_step(
             step,
             token=token,
             chat_id=chat_id,
             has_subscription=plan.has_subscription,
+            log=log,
+            dispatch=f"step{index}",
         )
         if not res.ok:
             return res
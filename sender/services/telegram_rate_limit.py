@@ -0,0 +1,286 @@
+"""Pacing of Bot API sends under Telegram's flood limits.
+
+Telegram lets a bot send about 30 messages per second overall and about 20
+per minute into one channel; going faster earns a 429 whose
+``parameters.retry_after`` says how long to back off. Every send reserves
+tokens from a bucket for its chat and one for the bot (an album costs one per
+photo) and sleeps until they are available, so a long series goes out at the
+highest rate that does not trip flood control. A 429 blocks the chat's bucket
+for ``retry_after`` seconds; inside the publish worker the send is repeated
+once the wait is over.
+
+Buckets live in process memory. With ``PUBLISH_JOBS_ASYNC`` the worker is the
+only sender; otherwise every web process paces its own sends. A request never
+waits out flood control, and sleeps at most ``TELEGRAM_REQUEST_MAX_PACING_WAIT``
+seconds in total for tokens (``publish_request_sends``): past that the send
+fails with ``rate_limited`` before reaching Telegram, as waiting would outlive
+the gunicorn timeout, and the job can be retried. The number of sends waiting
+per chat is kept in the shared cache for ``manage.py telegram_api_stats``.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+from sender.services.telegram_files import bot_id_from_token
+
+logger = logging.getLogger(__name__)
+
+# A 429 is waited out in place this many times before the send fails.
+RETRY_AFTER_ATTEMPTS = 3
+QUEUE_DEPTH_KEY = "sender.tg_api:queue:{chat_id}"
+QUEUE_DEPTH_TTL = 60 * 60
+
+
+def pacing_enabled() -> bool:
+    """Pace sends in production only: tests and dev never sleep for tokens."""
+    return bool(getattr(settings, "TELEGRAM_RATE_LIMIT", True)) and bool(
+        getattr(settings, "IS_PRODUCTION", True)
+    )
+
+
+_worker = threading.local()
+
+
+@contextmanager
+def publish_worker_sends() -> Iterator[None]:
+    """Mark sends of this thread as the publish worker's: 429s may be waited out."""
+    previous = getattr(_worker, "active", False)
+    _worker.active = True
+    try:
+        yield
+    finally:
+        _worker.active = previous
+
+
+@contextmanager
+def publish_request_sends() -> Iterator[None]:
+    """Share one ``TELEGRAM_REQUEST_MAX_PACING_WAIT`` budget across these sends."""
+    previous = getattr(_worker, "pacing_budget", None)
+    _worker.pacing_budget = _request_max_pacing_wait()
+    try:
+        yield
+    finally:
+        _worker.pacing_budget = previous
+
+
+def _request_max_pacing_wait() -> float:
+    return float(getattr(settings, "TELEGRAM_REQUEST_MAX_PACING_WAIT", 10))
+
+
+def _pacing_budget() -> float | None:
+    """Seconds this thread may still sleep for tokens; ``None`` in the worker."""
+    if getattr(_worker, "active", False):
+        return None
+    budget = getattr(_worker, "pacing_budget", None)
+    return _request_max_pacing_wait() if budget is None else budget
+
+
+class PacingBudgetError(Exception):
+    """Tokens for a send outside the worker are further off than it may wait."""
+
+    def __init__(self, wait: float) -> None:
+        super().__init__(f"Send would wait {wait:.1f} s for rate-limit tokens.")
+        self.wait = wait
+
+
+def max_retry_after() -> int:
+    """Longest ``retry_after`` (seconds) waited out instead of failing the send.
+
+    Zero outside ``publish_worker_sends``: web requests fail fast.
+    """
+    if not getattr(_worker, "active", False):
+        return 0
+    return int(getattr(settings, "TELEGRAM_MAX_RETRY_AFTER", 60))
+
+
+def retry_after_from(payload: dict[str, Any]) -> int | None:
+    """``parameters.retry_after`` of a 429 answer; ``None`` for anything else."""
+    if payload.get("ok") or payload.get("error_code") != 429:
+        return None
+    parameters = payload.get("parameters") or {}
+    try:
+        return max(1, int(parameters.get("retry_after") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
+class TokenBucket:
+    """*rate* tokens per second, at most *capacity* saved up."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        # Tokens accrue from here on; in the future while flood control lasts.
+        self._updated = time.monotonic()
+
+    def blocked_for(self, now: float) -> float:
+        return max(self._updated - now, 0.0)
+
+    def reserve(self, cost: float, now: float) -> float:
+        """Take *cost* tokens (going into debt); seconds until they are earned."""
+        elapsed = max(now - self._updated, 0.0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = max(self._updated, now)
+        self._tokens -= cost
+        debt = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        return self.blocked_for(now) + debt
+
+    def refund(self, cost: float) -> None:
+        """Give back tokens of a reservation that was not sent."""
+        self._tokens = min(self.capacity, self._tokens + cost)
+
+    def block(self, seconds: float, now: float) -> None:
+        """Nothing leaves for *seconds* (flood control); then one message may."""
+        self._updated = max(self._updated, now + seconds)
+        self._tokens = min(self._tokens, 1.0)
+
+
+class TelegramRateLimiter:
+    """Token buckets per (bot, chat) and per bot, shared by all threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._chats: dict[tuple[str, str], TokenBucket] = {}
+        self._bots: dict[str, TokenBucket] = {}
+
+    def _chat_bucket(self, bot_id: str, chat_id: str) -> TokenBucket:
+        bucket = self._chats.get((bot_id, chat_id))
+        if bucket is None:
+            per_minute = getattr(settings, "TELEGRAM_CHAT_MESSAGES_PER_MINUTE", 20)
+            bucket = TokenBucket(
+                per_minute / 60,
+                getattr(settings, "TELEGRAM_CHAT_MESSAGE_BURST", per_minute),
+            )
+            self._chats[bot_id, chat_id] = bucket
+        return bucket
+
+    def _bot_bucket(self, bot_id: str) -> TokenBucket:
+        bucket = self._bots.get(bot_id)
+        if bucket is None:
+            per_second = getattr(settings, "TELEGRAM_BOT_MESSAGES_PER_SECOND", 30)
+            bucket = TokenBucket(per_second, per_second)
+            self._bots[bot_id] = bucket
+        return bucket
+
+    def acquire(self, bot_id: str, chat_id: str, cost: int = 1) -> float:
+        """Wait until *cost* messages may go to *chat_id*; seconds waited.
+
+        Raises ``PacingBudgetError`` (tokens untouched) when a send outside
+        the worker would wait longer than its remaining pacing budget.
+        """
+        budget = _pacing_budget()
+        with self._lock:
+            now = time.monotonic()
+            chat = self._chat_bucket(bot_id, chat_id)
+            if pacing_enabled():
+                bot = self._bot_bucket(bot_id)
+                wait = max(chat.reserve(cost, now), bot.reserve(cost, now))
+                if chat.blocked_for(now) > max_retry_after():
+                    # Too long to wait here: the send meets Telegram's 429 and fails.
+                    wait = 0.0
+                elif budget is not None and wait > budget:
+                    chat.refund(cost)
+                    bot.refund(cost)
+                    raise PacingBudgetError(wait)
+            else:
+                # Without pacing only flood-control blocks are waited out.
+                wait = chat.blocked_for(now)
+                if wait > max_retry_after():
+                    wait = 0.0
+        if wait <= 0:
+            return 0.0
+        if budget is not None and getattr(_worker, "pacing_budget", None) is not None:
+            _worker.pacing_budget = budget - wait
+        _track_waiting(chat_id, 1)
+        try:
+            time.sleep(wait)
+        finally:
+            _track_waiting(chat_id, -1)
+        return wait
+
+    def penalize(self, bot_id: str, chat_id: str, retry_after: float) -> None:
+        with self._lock:
+            self._chat_bucket(bot_id, chat_id).block(retry_after, time.monotonic())
+
+
+_limiter = TelegramRateLimiter()
+
+
+def _track_waiting(chat_id: str, delta: int) -> None:
+    key = QUEUE_DEPTH_KEY.format(chat_id=chat_id)
+    try:
+        if delta > 0:
+            if not cache.add(key, delta, QUEUE_DEPTH_TTL):
+                cache.incr(key, delta)
+        else:
+            cache.decr(key, -delta)
+    except ValueError:
+        # Counter expired while a send was waiting.
+        pass
+    except Exception:
+        logger.exception("Failed to track Telegram send queue depth")
+
+
+def send_queue_depth(chat_id: str) -> int:
+    """Sends currently sleeping for *chat_id*'s tokens, across all workers."""
+    try:
+        depth = cache.get(QUEUE_DEPTH_KEY.format(chat_id=chat_id))
+    except Exception:
+        logger.exception("Failed to read Telegram send queue depth")
+        return 0
+    return max(0, int(depth or 0))
+
+
+def paced_send(
+    token: str,
+    chat_id: str,
+    send: Callable[[], tuple[dict[str, Any], Any]],
+    *,
+    cost: int = 1,
+    limiter: TelegramRateLimiter | None = None,
+) -> tuple[dict[str, Any], Any]:
+    """Run *send* once tokens allow; wait out and repeat it on a 429.
+
+    A 429 longer than ``max_retry_after()`` is returned to the caller at once;
+    so is a send past the request's pacing budget, as a 429 Telegram never saw
+    (with no response object).
+    """
+    limiter = limiter or _limiter
+    bot_id = bot_id_from_token(token)
+    attempts = 0
+    while True:
+        try:
+            limiter.acquire(bot_id, chat_id, cost)
+        except PacingBudgetError as exc:
+            logger.warning("Telegram send to chat %s deferred: %s", chat_id, exc)
+            retry_after = math.ceil(exc.wait)
+            return {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {retry_after}",
+                "parameters": {"retry_after": retry_after},
+            }, None
+        payload, resp = send()
+        retry_after = retry_after_from(payload)
+        if retry_after is None:
+            return payload, resp
+        logger.warning(
+            "Telegram flood control for chat %s: retry after %ss",
+            chat_id,
+            retry_after,
+        )
+        limiter.penalize(bot_id, chat_id, retry_after)
+        attempts += 1
+        if retry_after > max_retry_after() or attempts >= RETRY_AFTER_ATTEMPTS:
+            return payload, resp
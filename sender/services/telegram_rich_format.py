@@ -7,8 +7,10 @@ import re
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from html import escape, unescape
-from html.parser import HTMLParser
 
+from django.utils.html import strip_tags
+
+from editor.html_document import HtmlTokenHandler, html_document
 from editor.models import Post
 from sender.services.telegram_format import (
     _GALLERY_PLACEHOLDER_RE,
@@ -171,46 +173,6 @@ class RichMessagePayload:
         return [item.storage_path for item in self.media]
 
 
-def normalize_editor_html_for_rich(html: str) -> str:
-    """Map common CKEditor markup to semantic HTML (keep heading tags)."""
-    if not html:
-        return ""
-    text = html
-    text = re.sub(
-        r"<span[^>]*font-weight\s*:\s*(?:bold|[6-9]00)[^>]*>(.*?)</span>",
-        r"<strong>\1</strong>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*font-style\s*:\s*italic[^>]*>(.*?)</span>",
-        r"<em>\1</em>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*text-decoration\s*:\s*underline[^>]*>(.*?)</span>",
-        r"<u>\1</u>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*text-decoration\s*:\s*line-through[^>]*>(.*?)</span>",
-        r"<s>\1</s>",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(
-        r"<span[^>]*>(.*?)</span>",
-        r"\1",
-        text,
-        flags=re.IGNORECASE | re.DOTALL,
-    )
-    text = re.sub(r"<pre>\s*<code[^>]*>", "<pre>", text, flags=re.IGNORECASE)
-    text = re.sub(r"</code>\s*</pre>", "</pre>", text, flags=re.IGNORECASE)
-    return text
-
-
 def _normalize_plain_text(text: str) -> str:
     if not text:
         return ""
@@ -331,8 +293,8 @@ def rich_photo_tag(media_id: str, *, caption: str = "") -> str:
     return f"<figure>{img}<figcaption>{safe_caption}</figcaption></figure>"
 
 
-class _TelegramRichHTMLConverter(HTMLParser):
-    """Walk editor HTML and emit Telegram rich-message HTML with media blocks."""
+class _TelegramRichHTMLConverter(HtmlTokenHandler):
+    """Walk the parsed editor HTML and emit rich-message HTML with media blocks."""
 
     def __init__(
         self,
@@ -342,7 +304,6 @@ class _TelegramRichHTMLConverter(HTMLParser):
         max_media: int = MAX_RICH_MEDIA,
         skip_storage_paths: set[str] | None = None,
     ) -> None:
-        super().__init__(convert_charrefs=True)
         self._out: list[str] = []
         self._tag_stack: list[str] = []
         self._in_pre = False
@@ -506,12 +467,6 @@ class _TelegramRichHTMLConverter(HTMLParser):
             self._resume_block_tag = None
         self._out.append(escape_telegram_html(_normalize_plain_text(data)))
 
-    def handle_entityref(self, name: str) -> None:
-        self.handle_data(unescape(f"&{name};"))
-
-    def handle_charref(self, name: str) -> None:
-        self.handle_data(unescape(f"&#{name};"))
-
     def _emit_photo(self, *, src: str, caption: str = "") -> None:
         if not src or self._resolve is None:
             return
@@ -588,24 +543,19 @@ def html_body_to_telegram_rich_html(
     """Convert body HTML to rich-message HTML; keep single images as media blocks."""
     if not html:
         return RichMessagePayload()
-    cleaned = normalize_editor_html_for_rich(html)
-    cleaned = _strip_gallery_placeholders(cleaned)
     parser = _TelegramRichHTMLConverter(
         resolve_storage_path=resolve_storage_path,
         skip_storage_paths=skip_storage_paths,
         max_media=max_media,
     )
     try:
-        parser.feed(cleaned)
-        parser.close()
+        parser.feed_document(html_document(html))
     except Exception:
         logger.warning(
             "Telegram rich HTML conversion failed; using plain fallback",
             exc_info=True,
         )
-        from django.utils.html import strip_tags
-
-        plain = _normalize_plain_text(strip_tags(cleaned))
+        plain = _normalize_plain_text(strip_tags(_strip_gallery_placeholders(html)))
         return RichMessagePayload(
             html=sanitize_telegram_rich_html(f"<p>{escape_telegram_html(plain)}</p>"),
         )
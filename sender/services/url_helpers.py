@@ -8,10 +8,7 @@ from django.http import HttpRequest
 from django.urls import reverse
 
 from core.models.network import NETWORK_SLUG_SITE
-from editor.image_upload import (
-    share_jpeg_has_social_dimensions,
-    social_share_storage_name,
-)
+from editor.image_upload import registered_post_share_image
 from editor.models import Post
 
 
@@ -56,18 +53,18 @@ def _share_image_cache_bust(post: Post) -> int:
 
 
 def post_share_image_media_url(post: Post) -> str | None:
-    """Relative URL to nginx-served share JPEG, or ``None`` if unavailable."""
+    """Relative URL to nginx-served share JPEG, or ``None`` if none is built yet.
+
+    Read-only: generation happens in ``ensure_post_share_image`` (signals,
+    detail view, ``post_og_image``).
+    """
     if not post.cover_image or not post.cover_image.name:
         return None
 
-    share_name = social_share_storage_name(post.cover_image.name)
-    if not default_storage.exists(share_name):
+    share_name = registered_post_share_image(post)
+    if share_name is None:
         return None
 
-    with default_storage.open(share_name, "rb") as share_file:
-        if not share_jpeg_has_social_dimensions(share_file.read()):
-            return None
-
     media_path = default_storage.url(share_name)
     version = _share_image_cache_bust(post)
     joiner = "&" if "?" in media_path else "?"
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import io
+from datetime import timedelta
 from typing import cast
 from unittest import mock
 
@@ -11,16 +12,26 @@ from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from PIL import Image
 
 from blog.models import SitePublication
 from core.models import NETWORK_SLUG_SITE, NETWORK_SLUG_TELEGRAM, Credential, Network
 from core.models.telegram_settings import TelegramNetworkSettings
 from core.models.user import User, UserManager
+from editor.derived_image_service import storage_content_hash
 from editor.models import Category, Post, PostGalleryImage
-from sender.models import PostLink
+from sender.models import PostLink, PublishJob, TelegramDispatch, TelegramFile
 from sender.services.dto import PublishResult, StoryAvailabilityDTO
 from sender.services.post_sender import run_publish_job
+from sender.services.publish_jobs import (
+    cancel_publish_job,
+    claim_publish_job,
+    execute_publish_job,
+    publish_job_delivery_key,
+    retry_publish_job,
+    submit_publish_job,
+)
 from sender.services.story_media import StoryMediaError, resolve_story_image_path
 from sender.services.telegram_channel import (
     channel_has_subscription,
@@ -28,6 +39,7 @@ from sender.services.telegram_channel import (
 )
 from sender.services.telegram_format import (
     TELEGRAM_FORMAT_CROSSLINK,
+    TELEGRAM_FORMAT_FULL,
     adjust_split_index_for_telegram_html,
     balance_telegram_html,
     build_crosslink_message,
@@ -47,6 +59,7 @@ from sender.services.telegram_plan import (
     caption_for_step,
 )
 from sender.services.telegram_publisher import resolve_telegram_plan
+from sender.services.telegram_rate_limit import publish_worker_sends
 from sender.services.telegram_rich_format import (
     MAX_RICH_MESSAGE_LEN,
     build_formatted_rich_message,
@@ -115,8 +128,11 @@ class TelegramPhotoUploadAspectTests(TestCase):
             with Image.open(io.BytesIO(data)) as im:
                 self.assertEqual(im.size, (240, 480))
         finally:
-            if default_storage.exists(path):
-                default_storage.delete(path)
+            from editor.image_upload import telegram_jpeg_storage_name
+
+            for name in (path, telegram_jpeg_storage_name(path)):
+                if default_storage.exists(name):
+                    default_storage.delete(name)
 
     def test_send_media_group_and_json_parse_fallback(self):
         from sender.services.telegram_publisher import (
@@ -146,7 +162,7 @@ class TelegramPhotoUploadAspectTests(TestCase):
         }
         ok_resp.text = "{}"
         with mock.patch(
-            "sender.services.telegram_publisher.requests.post",
+            "sender.services.telegram_http.requests.Session.post",
             return_value=ok_resp,
         ):
             result, link, mid = _send_media_group(
@@ -166,7 +182,7 @@ class TelegramPhotoUploadAspectTests(TestCase):
         fail_resp.json.return_value = {"ok": False, "description": "file too big"}
         fail_resp.text = "file too big"
         with mock.patch(
-            "sender.services.telegram_publisher.requests.post",
+            "sender.services.telegram_http.requests.Session.post",
             return_value=fail_resp,
         ):
             failed, _, _ = _send_photo("token", "@chan", path, "Cap")
@@ -177,7 +193,7 @@ class TelegramPhotoUploadAspectTests(TestCase):
         bad_json.json.side_effect = ValueError("no json")
         bad_json.text = "not-json"
         with mock.patch(
-            "sender.services.telegram_publisher.requests.post",
+            "sender.services.telegram_http.requests.Session.post",
             return_value=bad_json,
         ):
             body, _resp = _api_post_json("token", "sendMessage", {"chat_id": "@chan"})
@@ -200,6 +216,298 @@ class TelegramPhotoUploadAspectTests(TestCase):
         self.assertEqual(gray.mode, "RGB")
 
 
+class TelegramFileIdCacheTests(TestCase):
+    def setUp(self):
+        author = cast(UserManager, User.objects).create_user(
+            email="file-id@example.com",
+            password="x",
+        )
+        self.post = Post.objects.create(
+            title="File id",
+            slug="file-id-post",
+            author=author,
+            cover_image=_minimal_jpeg_upload("c.jpg"),
+            body="<p>Body</p>",
+            status="ready_to_publish",
+        )
+        self.path = self.post.cover_image.name
+
+    def _response(self, payload):
+        resp = mock.Mock()
+        resp.json.return_value = payload
+        resp.text = "{}"
+        return resp
+
+    def test_second_send_reuses_file_id_without_upload(self):
+        from sender.services.telegram_publisher import _send_media_group, _send_photo
+
+        uploaded = self._response(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": 5,
+                    "chat": {"username": "chan"},
+                    "photo": [
+                        {"file_id": "small", "width": 90, "height": 60},
+                        {
+                            "file_id": "big",
+                            "file_unique_id": "u1",
+                            "width": 120,
+                            "height": 80,
+                        },
+                    ],
+                },
+            }
+        )
+        with mock.patch(
+            "sender.services.telegram_http.requests.Session.post",
+            return_value=uploaded,
+        ) as post_mock:
+            first, _, _ = _send_photo("123:token", "@chan", self.path, None)
+            self.assertTrue(first.ok)
+            self.assertIsInstance(
+                post_mock.call_args.kwargs["files"]["photo"][1], bytes
+            )
+            cached = TelegramFile.objects.get(bot_id="123", storage_name=self.path)
+            self.assertEqual(cached.file_id, "big")
+
+            with mock.patch(
+                "sender.services.telegram_publisher._photo_upload_file"
+            ) as upload:
+                _send_photo("123:token", "@chan", self.path, "Cap")
+                self.assertEqual(
+                    post_mock.call_args.kwargs["files"]["photo"], (None, "big")
+                )
+                _send_media_group("123:token", "@chan", [self.path])
+                upload.assert_not_called()
+            media = __import__("json").loads(
+                post_mock.call_args.kwargs["files"]["media"][1]
+            )
+            self.assertEqual(media[0]["media"], "big")
+
+        # File ids belong to one bot; another token uploads again.
+        self.assertFalse(
+            TelegramFile.objects.filter(bot_id="456", storage_name=self.path).exists()
+        )
+
+    def test_rejected_file_id_is_forgotten_and_reuploaded(self):
+        from sender.services.telegram_files import bot_id_from_token
+        from sender.services.telegram_publisher import _send_photo
+
+        TelegramFile.objects.create(
+            bot_id=bot_id_from_token("123:token"),
+            storage_name=self.path,
+            content_hash=storage_content_hash(self.path),
+            file_id="stale",
+        )
+        rejected = self._response(
+            {"ok": False, "description": "Bad Request: wrong file identifier"}
+        )
+        ok = self._response(
+            {"ok": True, "result": {"message_id": 6, "chat": {"username": "chan"}}}
+        )
+        with mock.patch(
+            "sender.services.telegram_http.requests.Session.post",
+            side_effect=[rejected, ok],
+        ) as post_mock:
+            result, _, mid = _send_photo("123:token", "@chan", self.path, None)
+        self.assertTrue(result.ok)
+        self.assertEqual(mid, 6)
+        self.assertEqual(post_mock.call_count, 2)
+        self.assertIsInstance(post_mock.call_args.kwargs["files"]["photo"][1], bytes)
+        self.assertFalse(TelegramFile.objects.filter(file_id="stale").exists())
+
+
+class TelegramHttpClientTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(TELEGRAM_API_TIMEOUTS={"getMe": 5})
+    def test_calls_share_session_with_method_timeouts_and_latency_stats(self):
+        from sender.services.telegram_channel import _api_get
+        from sender.services.telegram_http import (
+            bot_api_session,
+            bot_api_stats,
+            flush_bot_api_stats,
+        )
+
+        resp = mock.Mock()
+        resp.json.return_value = {"ok": True, "result": {"id": 1}}
+        with mock.patch(
+            "sender.services.telegram_http.requests.Session.get",
+            return_value=resp,
+        ) as get:
+            self.assertTrue(_api_get("token", "getMe", {})["ok"])
+            self.assertTrue(_api_get("token", "getChat", {"chat_id": "@c"})["ok"])
+        self.assertIs(bot_api_session(), bot_api_session())
+        self.assertEqual(get.call_args_list[0].kwargs["timeout"], (10.0, 5.0))
+        self.assertEqual(get.call_args_list[1].kwargs["timeout"], (10.0, 15.0))
+
+        flush_bot_api_stats()
+        stats = bot_api_stats()
+        self.assertEqual(sum(stats["getMe"].values()) - stats["getMe"]["sum_ms"], 1)
+        self.assertIn("getChat", stats)
+
+
+class TelegramRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(
+        IS_PRODUCTION=True,
+        TELEGRAM_CHAT_MESSAGES_PER_MINUTE=60,
+        TELEGRAM_CHAT_MESSAGE_BURST=2,
+    )
+    def test_album_sends_are_paced_and_counted_as_waiting(self):
+        from sender.services.telegram_rate_limit import (
+            TelegramRateLimiter,
+            send_queue_depth,
+        )
+
+        limiter = TelegramRateLimiter()
+        depths: list[int] = []
+        with (
+            mock.patch(
+                "sender.services.telegram_rate_limit.time.monotonic",
+                return_value=100.0,
+            ),
+            mock.patch(
+                "sender.services.telegram_rate_limit.time.sleep",
+                side_effect=lambda _s: depths.append(send_queue_depth("@chan")),
+            ) as sleep,
+            publish_worker_sends(),
+        ):
+            self.assertEqual(limiter.acquire("1", "@chan"), 0.0)
+            self.assertEqual(limiter.acquire("1", "@chan"), 0.0)
+            # An album of three photos waits for three more tokens at 1/s.
+            self.assertAlmostEqual(limiter.acquire("1", "@chan", cost=3), 3.0)
+        sleep.assert_called_once()
+        self.assertEqual(depths, [1])
+        self.assertEqual(send_queue_depth("@chan"), 0)
+
+    @override_settings(
+        IS_PRODUCTION=True,
+        TELEGRAM_CHAT_MESSAGES_PER_MINUTE=60,
+        TELEGRAM_CHAT_MESSAGE_BURST=1,
+        TELEGRAM_REQUEST_MAX_PACING_WAIT=2,
+    )
+    def test_web_request_stops_pacing_past_its_budget(self):
+        from sender.services.telegram_publisher import _fail_from_payload
+        from sender.services.telegram_rate_limit import (
+            TelegramRateLimiter,
+            paced_send,
+            publish_request_sends,
+        )
+
+        limiter = TelegramRateLimiter()
+        ok = {"ok": True, "result": {"message_id": 1}}
+        send = mock.Mock(return_value=(ok, None))
+        clock = [100.0]
+        with (
+            mock.patch(
+                "sender.services.telegram_rate_limit.time.monotonic",
+                side_effect=lambda: clock[0],
+            ),
+            mock.patch(
+                "sender.services.telegram_rate_limit.time.sleep",
+                side_effect=lambda seconds: clock.__setitem__(0, clock[0] + seconds),
+            ) as sleep,
+        ):
+            with publish_request_sends():
+                # Burst, then 1 s of pacing each: the 2 s budget covers two more.
+                for _ in range(3):
+                    payload, _resp = paced_send(
+                        "1:token", "@chan", send, limiter=limiter
+                    )
+                    self.assertTrue(payload["ok"])
+                payload, resp = paced_send("1:token", "@chan", send, limiter=limiter)
+            # The refused send gave its tokens back: the next one waits 1 s.
+            self.assertAlmostEqual(limiter.acquire("1", "@chan"), 1.0)
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(sleep.call_count, 3)
+        self.assertIsNone(resp)
+        self.assertEqual(_fail_from_payload(payload, resp).error, "rate_limited")
+
+    def test_retry_after_is_waited_out_and_the_send_repeated(self):
+        from sender.services.telegram_rate_limit import (
+            TelegramRateLimiter,
+            paced_send,
+        )
+
+        flood = {
+            "ok": False,
+            "error_code": 429,
+            "description": "Too Many Requests: retry after 7",
+            "parameters": {"retry_after": 7},
+        }
+        ok = {"ok": True, "result": {"message_id": 1}}
+        send = mock.Mock(side_effect=[(flood, None), (ok, None)])
+        with (
+            mock.patch("sender.services.telegram_rate_limit.time.sleep") as sleep,
+            publish_worker_sends(),
+        ):
+            payload, _resp = paced_send(
+                "1:token", "@chan", send, limiter=TelegramRateLimiter()
+            )
+        self.assertTrue(payload["ok"])
+        self.assertEqual(send.call_count, 2)
+        self.assertAlmostEqual(sleep.call_args.args[0], 7, delta=0.5)
+
+    def test_web_request_fails_fast_on_flood_control(self):
+        from sender.services.post_sender import _retry_call
+        from sender.services.telegram_publisher import _fail_from_payload
+        from sender.services.telegram_rate_limit import (
+            TelegramRateLimiter,
+            paced_send,
+        )
+
+        flood = {
+            "ok": False,
+            "error_code": 429,
+            "parameters": {"retry_after": 7},
+        }
+        limiter = TelegramRateLimiter()
+        send = mock.Mock(return_value=(flood, None))
+        with (
+            mock.patch("sender.services.telegram_rate_limit.time.sleep") as sleep,
+            mock.patch("sender.services.post_sender.time.sleep") as backoff,
+        ):
+            payload, _resp = paced_send("1:token", "@chan", send, limiter=limiter)
+            # The chat stays blocked, but the next request does not sleep for it.
+            self.assertEqual(limiter.acquire("1", "@chan"), 0.0)
+            func = mock.Mock(return_value=_fail_from_payload(payload, mock.Mock()))
+            result = _retry_call(func)
+        self.assertEqual(result.error, "rate_limited")
+        send.assert_called_once()
+        func.assert_called_once()
+        sleep.assert_not_called()
+        backoff.assert_not_called()
+
+    @override_settings(TELEGRAM_MAX_RETRY_AFTER=10)
+    def test_long_flood_wait_fails_without_retrying(self):
+        from sender.services.post_sender import _retry_call
+        from sender.services.telegram_publisher import _fail_from_payload
+
+        result = _fail_from_payload(
+            {
+                "ok": False,
+                "error_code": 429,
+                "parameters": {"retry_after": 3600},
+            },
+            mock.Mock(text=""),
+        )
+        self.assertEqual(result.error, "rate_limited")
+        self.assertEqual(result.retry_after, 3600)
+        func = mock.Mock(return_value=result)
+        with (
+            mock.patch("sender.services.post_sender.time.sleep") as sleep,
+            publish_worker_sends(),
+        ):
+            self.assertIs(_retry_call(func), result)
+        func.assert_called_once()
+        sleep.assert_not_called()
+
+
 class TelegramFormatTests(TestCase):
     def test_title_body_tags_template(self):
         post = Post(title="Title", body="<p>Hello <strong>world</strong></p>")
@@ -941,7 +1249,7 @@ class TelegramPublishJobTests(TestCase):
             },
         }
         mock_resp.text = "{}"
-        with mock.patch("sender.services.telegram_publisher.requests.post") as m:
+        with mock.patch("sender.services.telegram_http.requests.Session.post") as m:
             m.return_value = mock_resp
             r = run_publish_job(
                 self.post.pk,
@@ -1112,6 +1420,117 @@ class TelegramPublishJobTests(TestCase):
         last_text = send_message_calls[-1][0][2]["text"]
         self.assertIn("TAIL-MARKER", last_text)
 
+    @override_settings(TELEGRAM_USE_RICH_MESSAGES=False)
+    def test_retry_resumes_series_after_failed_message(self):
+        self.post.body = "<p>" + ("word " * 2500) + "TAIL-MARKER</p>"
+        self.post.save(update_fields=["body"])
+        ok_payload = {
+            "ok": True,
+            "result": {"message_id": 42, "chat": {"username": "chan", "id": -100}},
+        }
+        fail_payload = {"ok": False, "error_code": 502, "description": "Bad Gateway"}
+        mock_resp = mock.Mock()
+        mock_resp.text = "{}"
+        sent: list[str] = []
+        failures = [fail_payload]
+
+        def post_json(_token, _method, payload):
+            # The second message fails once; everything else goes through.
+            if len(sent) == 1 and failures:
+                return failures.pop(), mock_resp
+            sent.append(payload["text"])
+            return ok_payload, mock_resp
+
+        with (
+            mock.patch(
+                "sender.services.telegram_publisher._api_post_multipart",
+                return_value=(ok_payload, mock_resp),
+            ) as photo_api,
+            mock.patch(
+                "sender.services.telegram_publisher._api_post_json",
+                side_effect=post_json,
+            ),
+            mock.patch("sender.services.post_sender.time.sleep"),
+        ):
+            result = run_publish_job(
+                self.post.pk,
+                [NETWORK_SLUG_TELEGRAM],
+                delivery_key="resume-test",
+            )
+            self.assertTrue(result.all_ok)
+            photo_api.assert_called_once()
+            self.assertGreater(len(sent), 1)
+            self.assertEqual(len(sent), len(set(sent)))
+            self.assertIn("TAIL-MARKER", sent[-1])
+            dispatches = TelegramDispatch.objects.filter(delivery_key="resume-test")
+            self.assertEqual(dispatches.count(), len(sent) + 1)
+
+            # Same key again: everything is already in the channel.
+            from sender.services.telegram_publisher import publish_to_telegram
+
+            again = publish_to_telegram(self.post, delivery_key="resume-test")
+        self.assertTrue(again.ok)
+        self.assertEqual(again.message_id, 42)
+        photo_api.assert_called_once()
+        self.assertEqual(len(sent), dispatches.count() - 1)
+
+    @override_settings(TELEGRAM_USE_RICH_MESSAGES=False)
+    def test_retried_job_resumes_after_exhausted_retries(self):
+        self.post.body = "<p>" + ("word " * 2500) + "TAIL-MARKER</p>"
+        self.post.save(update_fields=["body"])
+        ok_payload = {
+            "ok": True,
+            "result": {"message_id": 42, "chat": {"username": "chan", "id": -100}},
+        }
+        fail_payload = {"ok": False, "error_code": 502, "description": "Bad Gateway"}
+        mock_resp = mock.Mock()
+        mock_resp.text = "{}"
+        sent: list[str] = []
+        outage = {"on": True}
+
+        def post_json(_token, _method, payload):
+            # The second message fails on every attempt of the first job.
+            if len(sent) == 1 and outage["on"]:
+                return fail_payload, mock_resp
+            sent.append(payload["text"])
+            return ok_payload, mock_resp
+
+        with (
+            mock.patch(
+                "sender.services.telegram_publisher._api_post_multipart",
+                return_value=(ok_payload, mock_resp),
+            ) as photo_api,
+            mock.patch(
+                "sender.services.telegram_publisher._api_post_json",
+                side_effect=post_json,
+            ),
+            mock.patch("sender.services.post_sender.time.sleep"),
+        ):
+            job = submit_publish_job(
+                self.post.pk,
+                [NETWORK_SLUG_TELEGRAM],
+                telegram_format=TELEGRAM_FORMAT_FULL,
+            )
+            self.assertEqual(job.status, PublishJob.Status.FAILED)
+            self.assertEqual(len(sent), 1)
+
+            outage["on"] = False
+            retried = retry_publish_job(job.pk)
+
+        assert retried is not None
+        self.assertEqual(retried.pk, job.pk)
+        self.assertEqual(retried.status, PublishJob.Status.SUCCEEDED)
+        photo_api.assert_called_once()
+        self.assertEqual(len(sent), len(set(sent)))
+        self.assertIn("TAIL-MARKER", sent[-1])
+        self.assertEqual(
+            TelegramDispatch.objects.filter(
+                delivery_key=publish_job_delivery_key(job)
+            ).count(),
+            len(sent) + 1,
+        )
+        self.assertIsNone(retry_publish_job(job.pk))
+
     def test_telegram_numeric_chat_id_unchanged(self):
         net = Network.objects.get(slug=NETWORK_SLUG_TELEGRAM)
         cred = Credential.objects.get(network=net)
@@ -1126,7 +1545,7 @@ class TelegramPublishJobTests(TestCase):
             },
         }
         mock_resp.text = "{}"
-        with mock.patch("sender.services.telegram_publisher.requests.post") as m:
+        with mock.patch("sender.services.telegram_http.requests.Session.post") as m:
             m.return_value = mock_resp
             r = run_publish_job(self.post.pk, [NETWORK_SLUG_TELEGRAM])
         self.assertTrue(r.all_ok)
@@ -1177,7 +1596,7 @@ class CrosslinkPublishJobTests(TestCase):
         self.post.short_description = "Crosslink teaser"
         self.post.save()
         self.post.tags.add("news")
-        with mock.patch("sender.services.telegram_publisher.requests.post") as m:
+        with mock.patch("sender.services.telegram_http.requests.Session.post") as m:
             m.return_value = mock_resp
             r = run_publish_job(
                 self.post.pk,
@@ -1264,7 +1683,7 @@ class StoryAvailabilityTests(TestCase):
             },
         }
         mock_resp.text = "{}"
-        with mock.patch("sender.services.telegram_publisher.requests.post") as m:
+        with mock.patch("sender.services.telegram_http.requests.Session.post") as m:
             m.return_value = mock_resp
             r = run_publish_job(
                 post.pk,
@@ -1397,7 +1816,7 @@ class StoryPublishJobTests(TestCase):
 
     def test_story_success_stores_message_and_story_on_postlink(self):
         with (
-            mock.patch("sender.services.telegram_publisher.requests.post") as tg_api,
+            mock.patch("sender.services.telegram_http.requests.Session.post") as tg_api,
             mock.patch(
                 "sender.services.post_sender.check_story_availability",
             ) as avail,
@@ -1430,7 +1849,7 @@ class StoryPublishJobTests(TestCase):
 
     def test_story_failure_fails_job_and_keeps_post_unpublished(self):
         with (
-            mock.patch("sender.services.telegram_publisher.requests.post") as tg_api,
+            mock.patch("sender.services.telegram_http.requests.Session.post") as tg_api,
             mock.patch(
                 "sender.services.post_sender.check_story_availability",
             ) as avail,
@@ -1558,7 +1977,7 @@ class PublishWorkflowViewTests(TestCase):
         )
         self.client.force_login(self.admin)
         url = reverse("sender_publish_workflow")
-        with mock.patch("sender.admin_views.run_publish_job") as publish_job:
+        with mock.patch("sender.admin_views.submit_publish_job") as publish_job:
             rsp = self.client.get(
                 url,
                 {"post_id": post.pk, "preview_telegram": "1"},
@@ -1730,6 +2149,154 @@ class PublishJobGuardTests(TestCase):
         self.assertEqual(attempts["n"], 3)
 
 
+class PublishJobQueueTests(TestCase):
+    def setUp(self):
+        self.admin = cast(UserManager, User.objects).create_superuser(
+            email="job-queue@example.com",
+            password="pw",
+        )
+        self.post = Post.objects.create(
+            title="Queued",
+            slug="job-queue",
+            author=self.admin,
+            body="<p>Body</p>",
+            status="ready_to_publish",
+            category=Category.objects.create(name="Cat"),
+        )
+
+    def _running_job(self, **kwargs) -> PublishJob:
+        return PublishJob.objects.create(
+            post=self.post,
+            network_slugs=[NETWORK_SLUG_SITE],
+            telegram_format=TELEGRAM_FORMAT_FULL,
+            status=PublishJob.Status.RUNNING,
+            started_at=timezone.now(),
+            **kwargs,
+        )
+
+    @override_settings(PUBLISH_JOB_TIMEOUT=60)
+    def test_stale_running_job_is_failed_not_rerun(self):
+        job = self._running_job()
+        PublishJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(minutes=5)
+        )
+        self.assertIsNone(claim_publish_job())
+        job.refresh_from_db()
+        self.assertEqual(job.status, PublishJob.Status.FAILED)
+        self.assertEqual(job.error, "Worker did not finish the job.")
+        self.assertTrue(job.interrupted)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, "ready_to_publish")
+
+    def test_crash_is_recorded_on_the_job(self):
+        job = self._running_job()
+        with mock.patch(
+            "sender.services.publish_jobs.run_publish_job",
+            side_effect=RuntimeError("boom"),
+        ):
+            job = execute_publish_job(job.pk)
+        self.assertEqual(job.status, PublishJob.Status.FAILED)
+        self.assertEqual(job.error, "RuntimeError: boom")
+        self.assertIsNotNone(job.finished_at)
+
+    def test_live_running_job_cannot_be_cancelled(self):
+        job = self._running_job(in_request=True)
+        self.assertFalse(cancel_publish_job(job.pk, reason="Cancelled."))
+        job.refresh_from_db()
+        self.assertEqual(job.status, PublishJob.Status.RUNNING)
+
+    @override_settings(PUBLISH_JOB_REQUEST_TIMEOUT=120)
+    def test_timed_out_request_job_is_cancelled_but_never_retried(self):
+        job = self._running_job(in_request=True)
+        PublishJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(minutes=3)
+        )
+        self.assertTrue(cancel_publish_job(job.pk, reason="Cancelled."))
+        self.assertFalse(cancel_publish_job(job.pk, reason="Cancelled."))
+        job.refresh_from_db()
+        self.assertEqual(job.status, PublishJob.Status.FAILED)
+        self.assertTrue(job.interrupted)
+        self.assertIsNone(retry_publish_job(job.pk))
+
+        again = submit_publish_job(
+            self.post.pk,
+            [NETWORK_SLUG_SITE],
+            telegram_format=TELEGRAM_FORMAT_FULL,
+        )
+        self.assertEqual(again.status, PublishJob.Status.SUCCEEDED)
+        self.assertTrue(again.in_request)
+
+    def test_worker_job_is_not_cancelled_before_the_job_timeout(self):
+        job = self._running_job()
+        PublishJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(minutes=3)
+        )
+        self.assertFalse(cancel_publish_job(job.pk, reason="Cancelled."))
+
+    def test_cancelled_queued_job_can_be_retried(self):
+        job = PublishJob.objects.create(
+            post=self.post,
+            network_slugs=[NETWORK_SLUG_SITE],
+            telegram_format=TELEGRAM_FORMAT_FULL,
+        )
+        self.assertTrue(cancel_publish_job(job.pk, reason="Cancelled."))
+        job.refresh_from_db()
+        self.assertFalse(job.interrupted)
+        retried = retry_publish_job(job.pk)
+        assert retried is not None
+        self.assertEqual(retried.status, PublishJob.Status.SUCCEEDED)
+
+    def test_concurrent_runs_under_one_key_do_not_crash_the_log(self):
+        from sender.services.telegram_delivery import TelegramDeliveryLog
+
+        first = TelegramDeliveryLog("dup-key", post_id=self.post.pk)
+        second = TelegramDeliveryLog("dup-key", post_id=self.post.pk)
+
+        def send():
+            return PublishResult(ok=True, message_id=7), "https://t.me/chan/7", 7
+
+        for log in (first, second):
+            res, _link, message_id = log.run("message:0", "sendMessage", ["x"], send)
+            self.assertTrue(res.ok)
+            self.assertEqual(message_id, 7)
+        self.assertEqual(
+            TelegramDispatch.objects.filter(delivery_key="dup-key").count(), 1
+        )
+
+    def test_admin_action_cancels_queued_jobs(self):
+        job = PublishJob.objects.create(
+            post=self.post,
+            network_slugs=[NETWORK_SLUG_SITE],
+            telegram_format=TELEGRAM_FORMAT_FULL,
+        )
+        self.client.force_login(self.admin)
+        rsp = self.client.post(
+            reverse("admin:sender_publishjob_changelist"),
+            {"action": "cancel_jobs", "_selected_action": [job.pk]},
+            follow=True,
+        )
+        self.assertContains(rsp, "Cancelled 1 publish job(s).")
+        job.refresh_from_db()
+        self.assertEqual(job.status, PublishJob.Status.FAILED)
+        self.assertEqual(job.error, f"Cancelled by {self.admin}.")
+
+    @override_settings(PUBLISH_JOBS_ASYNC=True)
+    def test_workflow_reports_queued_job(self):
+        self.client.force_login(self.admin)
+        rsp = self.client.post(
+            reverse("sender_publish_workflow"),
+            {
+                "workflow_action": "publish",
+                "post_id": self.post.pk,
+                "dest_site": "1",
+            },
+            follow=True,
+        )
+        job = PublishJob.objects.get(post=self.post)
+        self.assertEqual(job.status, PublishJob.Status.QUEUED)
+        self.assertContains(rsp, f"Publish job #{job.pk} queued")
+
+
 class TelegramPublisherHelperTests(TestCase):
     def test_missing_credentials_fail_publish(self):
         author = cast(UserManager, User.objects).create_user(
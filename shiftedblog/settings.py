@@ -264,12 +264,72 @@ CACHES = {
     }
 }
 
-# Full-page cache for public post list/detail (Redis + cache_page). Set 0 to disable.
-# Purged on post/category/gallery/tag/redirect changes (editor.signals).
-# View counts still increment in DB on every GET (middleware), but the number shown in
+# Full-page cache for public post list/detail (Redis, anonymous visitors only).
+# Set 0 to disable. Pages record surrogate keys (post/tag/category/series) and
+# expire when an on-site change bumps one of them (blog.cache_utils, editor.signals).
+# View counts are still recorded on every GET (middleware), but the number shown in
 # cached HTML may lag until purge or TTL.
 POST_PAGE_CACHE_TIMEOUT = get_int_env("POST_PAGE_CACHE_TIMEOUT", 300)
 
+# After TTL or a surrogate-key bump a page stays in Redis this many more seconds and
+# is served stale while one worker (holding a lock) re-renders it. 0 disables.
+POST_PAGE_CACHE_STALE_TIMEOUT = get_int_env("POST_PAGE_CACHE_STALE_TIMEOUT", 600)
+
+# Rebuild lock expiry: a worker that dies mid-render frees the page after this long.
+POST_PAGE_CACHE_LOCK_TIMEOUT = get_int_env("POST_PAGE_CACHE_LOCK_TIMEOUT", 30)
+
+# Post detail views are buffered in Redis and written to Post.views in one bulk UPDATE
+# at most this often; ``manage.py flush_post_views --loop`` (view-count-flusher
+# service) flushes on the same interval when traffic is quiet. 0 = UPDATE per view.
+POST_VIEW_COUNT_FLUSH_INTERVAL = get_int_env("POST_VIEW_COUNT_FLUSH_INTERVAL", 60)
+# Skip crawlers, link previews (Telegram, Facebook...) and empty User-Agents.
+POST_VIEW_COUNT_SKIP_BOTS = get_bool_env("POST_VIEW_COUNT_SKIP_BOTS", True)
+# Count one view per client (IP + User-Agent) and post within this window. 0 = off.
+POST_VIEW_COUNT_DEDUPE_SECONDS = get_int_env("POST_VIEW_COUNT_DEDUPE_SECONDS", 0)
+
+# Flag precomputed "similar posts" (blog.related_index) for a rebuild when a post
+# is published/unpublished or an on-site post is retagged; the related-posts
+# service (manage.py rebuild_related_posts --loop) picks the flag up. When False,
+# rely on cron: manage.py rebuild_related_posts.
+RELATED_POSTS_REBUILD_ON_CHANGE = get_bool_env("RELATED_POSTS_REBUILD_ON_CHANGE", True)
+# Seconds between checks of the rebuild flag in rebuild_related_posts --loop.
+RELATED_POSTS_POLL_SECONDS = get_int_env("RELATED_POSTS_POLL_SECONDS", 30)
+
+# Posts per /sitemap-posts.xml?p=N page; /sitemap.xml is the index of those pages.
+SITEMAP_PAGE_SIZE = get_int_env("SITEMAP_PAGE_SIZE", 5000)
+
+# Pre-rendered public pages for nginx (blog.static_export; manage.py
+# export_static_site). Empty disables the export; nginx then proxies everything.
+STATIC_EXPORT_ROOT = os.environ.get("STATIC_EXPORT_ROOT", "").strip()
+# Flag invalidated pages for ``export_static_site --loop`` (the static-export
+# service) once the change commits. When False they are served by Django until
+# the next full export.
+STATIC_EXPORT_REFRESH_ON_CHANGE = get_bool_env("STATIC_EXPORT_REFRESH_ON_CHANGE", True)
+# Seconds the static-export service waits between checks for flagged changes.
+STATIC_EXPORT_POLL_SECONDS = get_int_env("STATIC_EXPORT_POLL_SECONDS", 5)
+# Processes for ``export_static_site --full``.
+STATIC_EXPORT_WORKERS = get_int_env("STATIC_EXPORT_WORKERS", 4)
+
+# nginx microcache refresh server (scripts/render_nginx_conf.py, port 8081): after a
+# change the static-export service re-fetches the affected pages there. Empty =
+# rely on the short TTL.
+NGINX_MICROCACHE_REFRESH_URL = os.environ.get(
+    "NGINX_MICROCACHE_REFRESH_URL", ""
+).strip()
+
+# Seconds a worker reuses its in-process copy of site settings, Telegram settings
+# and nav categories before re-checking the Redis version stamp
+# (core.services.tiered_cache). Production only; 0 re-checks on every read.
+TIERED_CACHE_L1_TTL = get_int_env("TIERED_CACHE_L1_TTL", 5)
+
+# Public post lists page by (published, id) cursor instead of OFFSET; legacy
+# ``?page=N`` links 301 to the cursor URL. Set False for classic numbered pages.
+POST_LIST_KEYSET_PAGINATION = get_bool_env("POST_LIST_KEYSET_PAGINATION", True)
+
+# Postgres text search config for the stored Post.search_vector (stemming language).
+# After changing it run ``manage.py rebuild_post_search_vectors``.
+POST_SEARCH_CONFIG = os.environ.get("POST_SEARCH_CONFIG", "russian").strip()
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -343,6 +403,24 @@ IMAGE_UPLOAD_AVIF_QUALITY = get_int_env("IMAGE_UPLOAD_AVIF_QUALITY", 72)
 IMAGE_UPLOAD_AVIF_SPEED = get_int_env("IMAGE_UPLOAD_AVIF_SPEED", 6)
 IMAGE_UPLOAD_WEBP_QUALITY = get_int_env("IMAGE_UPLOAD_WEBP_QUALITY", 85)
 IMAGE_UPLOAD_JPEG_QUALITY = get_int_env("IMAGE_UPLOAD_JPEG_QUALITY", 88)
+# Responsive srcset ladder (editor.image_variants): AVIF + WebP copies of covers
+# and gallery images at these widths; rungs wider than the upload are skipped.
+IMAGE_VARIANT_WIDTHS = tuple(
+    int(width)
+    for width in os.environ.get("IMAGE_VARIANT_WIDTHS", "320,640,1024,1600").split(",")
+    if width.strip().isdigit()
+)
+# Processes for ``manage.py build_image_variants`` backfills.
+IMAGE_VARIANT_WORKERS = get_int_env("IMAGE_VARIANT_WORKERS", 2)
+# Encode uploads in ``manage.py process_image_jobs`` instead of the request: the
+# request stores the original plus a placeholder and queues an ``ImageJob``.
+IMAGE_PROCESSING_ASYNC = get_bool_env("IMAGE_PROCESSING_ASYNC", False)
+# Encoding processes of the image worker.
+IMAGE_JOB_WORKERS = get_int_env("IMAGE_JOB_WORKERS", 2)
+# Seconds an idle worker waits before polling the queue again.
+IMAGE_JOB_POLL_SECONDS = get_int_env("IMAGE_JOB_POLL_SECONDS", 2)
+# A job still "processing" after this many seconds is assumed lost and retried.
+IMAGE_JOB_TIMEOUT = get_int_env("IMAGE_JOB_TIMEOUT", 600)
 
 # Fernet encryption for ``core.Credential``.
 # Key: url-safe base64 from Fernet.generate_key().
@@ -352,6 +430,17 @@ CREDENTIALS_ENCRYPTION_KEY = os.environ.get("CREDENTIALS_ENCRYPTION_KEY", "").st
 HTTP_PROXY = os.environ.get("HTTP_PROXY", "").strip()
 HTTPS_PROXY = os.environ.get("HTTPS_PROXY", "").strip()
 TELEGRAM_HTTP_PROXY = os.environ.get("TELEGRAM_HTTP_PROXY", "").strip()
+# Bot API timeouts: connect seconds, and read seconds per method overriding the
+# defaults in ``sender.services.telegram_http``, e.g. "sendMediaGroup=180,getMe=5".
+TELEGRAM_API_CONNECT_TIMEOUT = get_int_env("TELEGRAM_API_CONNECT_TIMEOUT", 10)
+TELEGRAM_API_TIMEOUTS = {
+    method.strip(): int(seconds)
+    for method, _, seconds in (
+        item.partition("=")
+        for item in os.environ.get("TELEGRAM_API_TIMEOUTS", "").split(",")
+    )
+    if method.strip() and seconds.strip().isdigit()
+}
 
 # Optional bootstrap for Telegram when DB credentials are not set yet.
 TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "").strip()
@@ -368,8 +457,31 @@ TELEGRAM_CHANNEL_HAS_SUBSCRIPTION = get_bool_env(
 TELEGRAM_API_ID = os.environ.get("TELEGRAM_API_ID", "").strip()
 TELEGRAM_API_HASH = os.environ.get("TELEGRAM_API_HASH", "").strip()
 TELEGRAM_OPERATOR_SESSION = os.environ.get("TELEGRAM_OPERATOR_SESSION", "").strip()
+# Pace Bot API sends under Telegram's flood limits (production only): messages
+# per minute and burst into one channel, and messages per second per bot.
+TELEGRAM_RATE_LIMIT = get_bool_env("TELEGRAM_RATE_LIMIT", True)
+TELEGRAM_CHAT_MESSAGES_PER_MINUTE = get_int_env("TELEGRAM_CHAT_MESSAGES_PER_MINUTE", 20)
+TELEGRAM_CHAT_MESSAGE_BURST = get_int_env("TELEGRAM_CHAT_MESSAGE_BURST", 20)
+TELEGRAM_BOT_MESSAGES_PER_SECOND = get_int_env("TELEGRAM_BOT_MESSAGES_PER_SECOND", 30)
+# Longest 429 ``retry_after`` (seconds) the publish worker waits out; longer
+# ones fail the publish. Publishes run in the request never wait.
+TELEGRAM_MAX_RETRY_AFTER = get_int_env("TELEGRAM_MAX_RETRY_AFTER", 60)
+# Total seconds a publish run inside a web request (``PUBLISH_JOBS_ASYNC`` off)
+# may sleep for rate-limit tokens; later sends fail as rate_limited. Series
+# longer than the chat burst need the publish worker.
+TELEGRAM_REQUEST_MAX_PACING_WAIT = get_int_env("TELEGRAM_REQUEST_MAX_PACING_WAIT", 10)
 # Bot API 10.1 rich messages (headings, lists, tables) via sendRichMessage.
 TELEGRAM_USE_RICH_MESSAGES = get_bool_env("TELEGRAM_USE_RICH_MESSAGES", False)
+# Publish from ``manage.py process_publish_jobs`` instead of the request: the API
+# answers 202 with a job id to poll. When False jobs run inside the request.
+PUBLISH_JOBS_ASYNC = get_bool_env("PUBLISH_JOBS_ASYNC", False)
+# Seconds an idle publish worker waits before polling the queue again.
+PUBLISH_JOB_POLL_SECONDS = get_int_env("PUBLISH_JOB_POLL_SECONDS", 2)
+# A job still running after this many seconds is marked failed (never re-run).
+PUBLISH_JOB_TIMEOUT = get_int_env("PUBLISH_JOB_TIMEOUT", 1800)
+# A sync-mode job cannot outlive its request: gunicorn kills the worker after
+# ``--timeout`` seconds, so staff may cancel such a job once this has passed.
+PUBLISH_JOB_REQUEST_TIMEOUT = get_int_env("GUNICORN_TIMEOUT", 120)
 
 # Optional local Python checker integration for post text quality checks in admin.
 # Uses optional python libs (language_tool_python / pyspellchecker) if installed.
@@ -7,14 +7,14 @@ The `urlpatterns` list routes URLs to views. For more information please see:
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.contrib.sitemaps.views import sitemap
+from django.contrib.sitemaps import views as sitemap_views
 from django.urls import include, path
 from django.views.generic import TemplateView
 from drf_spectacular.views import SpectacularAPIView
 from two_factor.urls import urlpatterns as tf_urlpatterns
 
 import core.urls  # noqa: F401 - loads admin site customization
-from blog.sitemap import PostSitemap
+from blog.sitemap import cached_sitemap_view, sitemaps
 from core.views import (
     admin_session_keepalive,
     custom_image_upload,
@@ -27,8 +27,6 @@ from shiftedblog.rate_limited_views import (
     RateLimitedSetupView,
 )
 
-sitemaps = {"posts": PostSitemap}
-
 zen_html_file = settings.DZEN_VERIFICATION_FILE
 
 # Admin URL path (configurable via ADMIN_URL environment variable)
@@ -60,10 +58,16 @@ urlpatterns = [
     path("", include("editor.urls", namespace="editor")),
     path(
         "sitemap.xml",
-        sitemap,
-        {"sitemaps": sitemaps},
+        cached_sitemap_view(sitemap_views.index, "blog.sitemap_index"),
+        {"sitemaps": sitemaps, "sitemap_url_name": "sitemap_section"},
         name="sitemap",
     ),
+    path(
+        "sitemap-<section>.xml",
+        cached_sitemap_view(sitemap_views.sitemap, "blog.sitemap"),
+        {"sitemaps": sitemaps},
+        name="sitemap_section",
+    ),
     path(
         "api/editor/v1/schema/",
         SpectacularAPIView.as_view(),